@@ -2,13 +2,17 @@
 # agent.py - LangGraph 에이전트 및 워크플로우 
 # =============================================================================
 
-from typing import TypedDict, Literal, Optional, List, Dict
+from typing import TypedDict, Literal, Optional, List, Dict, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import threading
+import time
 import warnings
 from langgraph.graph import StateGraph, START, END
 
-from .llm_utils import ChatbotConfig, get_user_metadata, analyze_question_intent
-from .rag_retriever import UnifiedRAGRetriever, search_documents_with_access_control
+from .llm_utils import get_chatbot_config, get_user_metadata, analyze_question_intent
+from .rag_retriever import get_rag_retriever, get_search_executor, search_documents_with_access_control
+from .session_store import SessionStore, create_session_store, compact_history
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -27,14 +31,16 @@ class ChatState(TypedDict):
     qna_dialog_log: List[str]
     dialog_log: List[str]
     summary_draft: Optional[str]
+    history_summary: Optional[str]
     llm_response: Optional[str]
+    timings: Optional[Dict[str, float]]
 
 # =============================================================================
 # 2. 설정 및 초기화
 # =============================================================================
 
-config = ChatbotConfig()
-rag_retriever = UnifiedRAGRetriever(config)
+config = get_chatbot_config()
+rag_retriever = get_rag_retriever()
 
 # =============================================================================
 # 3. LangGraph 노드들
@@ -67,8 +73,15 @@ def route_chat_mode(state: ChatState) -> str:
     else:
         return "qna_agent"
 
-def qna_agent_node(state: ChatState) -> ChatState:
-    """RAG 검색기를 사용하는 개선된 QnA 에이전트 노드"""
+def conversation_text(state: ChatState, log_key: str) -> str:
+    """대화 기록 텍스트. 압축된 이전 대화가 있으면 요약을 앞에 붙인다"""
+    dialog = "\n".join(state[log_key])
+    if state.get("history_summary"):
+        return f"[이전 대화 요약]\n{state['history_summary']}\n\n[최근 대화]\n{dialog}"
+    return dialog
+
+def prepare_qna_prompt(state: ChatState) -> str:
+    """QnA 턴 준비 (대화 기록 추가 → 검색 → 프롬프트 생성). 일반/스트리밍 응답이 공유"""
     query = state["user_input"]
     user_metadata = {
         "emp_no": state["user_id"],
@@ -79,7 +92,7 @@ def qna_agent_node(state: ChatState) -> ChatState:
     state["qna_dialog_log"].append(f"사용자: {query}")
 
     # ✅ 문맥 분석 - 이전 대화에서 언급된 키워드 추출
-    previous_context = "\n".join(state["qna_dialog_log"][:-1])  # 현재 입력 제외
+    previous_context = "\n".join([state.get("history_summary") or ""] + state["qna_dialog_log"][:-1])  # 현재 입력 제외
     
     # 이전 대화에서 중요한 키워드들 추출
     context_keywords = []
@@ -96,32 +109,30 @@ def qna_agent_node(state: ChatState) -> ChatState:
         enhanced_query = f"{query} {' '.join(context_keywords[:3])}"
         print(f"🔍 확장된 쿼리: '{enhanced_query}'")
 
-    # 🎯 RAG 검색기를 통한 문서 검색 (권한 제어 자동 적용)
-    report_results = search_documents_with_access_control(
-        query=enhanced_query, 
-        user_metadata=user_metadata, 
-        filter_type="report", 
-        top_k=5
-    )["matches"]
-
-    # 정책 문서 검색 (RAG 검색기 사용)
-    try:
-        policy_results = rag_retriever.search_policies(enhanced_query, top_k=3)
-    except:
-        policy_results = []
-
-    # 이의제기 사례 검색 (RAG 검색기 사용)
-    try:
-        appeal_results = rag_retriever.search_appeals(enhanced_query, top_k=2)
-    except:
-        appeal_results = []
-
-    all_matches = report_results + policy_results + appeal_results
+    # ✅ 현재 질문의 의도 파악 - 검색과 동시에 진행
+    timings = {}
+    node_start = time.perf_counter()
+
+    def timed_intent():
+        intent_start = time.perf_counter()
+        try:
+            return analyze_question_intent(query, previous_context)
+        finally:
+            timings["intent_ms"] = round((time.perf_counter() - intent_start) * 1000, 1)
+
+    intent_future = get_search_executor().submit(timed_intent)
+
+    # 🎯 RAG 검색 - 임베딩 1회, 리포트(권한 제어)/정책/이의제기 사례 동시 검색 후 점수순 병합
+    retrieval_start = time.perf_counter()
+    best_matches = rag_retriever.get_best_matches(
+        query, user_metadata, enhanced_query=enhanced_query, total_k=None, timings=timings
+    )
     retrieved_docs = [{
-        "content": match["metadata"]["content"],
+        "content": match["metadata"].get("content", ""),
         "source": match["metadata"].get("type", "unknown"),
         "score": match["score"]
-    } for match in all_matches]
+    } for match in best_matches]
+    timings["retrieval_ms"] = round((time.perf_counter() - retrieval_start) * 1000, 1)
 
     print(f" 총 검색 결과: {len(retrieved_docs)}개 문서")
 
@@ -132,7 +143,7 @@ def qna_agent_node(state: ChatState) -> ChatState:
     )
 
     # ✅ 전체 대화 히스토리 활용 (최근 것만이 아니라 중요한 부분 포함)
-    full_conversation = "\n".join(state["qna_dialog_log"])
+    full_conversation = conversation_text(state, "qna_dialog_log")
     
     # 사용자가 이전에 물어본 중요한 질문들 추출
     important_previous_questions = []
@@ -148,8 +159,7 @@ def qna_agent_node(state: ChatState) -> ChatState:
     if len(important_previous_questions) > 1:
         conversation_summary = f"\n**이전 대화 요약**: 사용자가 {', '.join(important_previous_questions[-2:])}에 대해 문의했습니다."
 
-    # ✅ 현재 질문의 의도 파악
-    question_intent = analyze_question_intent(query, previous_context)
+    question_intent = intent_future.result()
 
     # ✅ 개선된 프롬프트 - 문맥 강화
     prompt = f"""
@@ -194,16 +204,54 @@ def qna_agent_node(state: ChatState) -> ChatState:
 - 시간대별 데이터가 있으면 변화 추이도 설명
 """
 
-    llm_response = config.llm.predict(prompt)
-    
+    timings["prepare_ms"] = round((time.perf_counter() - node_start) * 1000, 1)
     state["retrieved_docs"] = retrieved_docs
+    state["timings"] = timings
+    return prompt
+
+def finalize_qna_response(state: ChatState, llm_response: str) -> ChatState:
     state["llm_response"] = llm_response.strip()
     state["qna_dialog_log"].append(f"챗봇: {llm_response.strip()}")
-    
+    timings = state.get("timings") or {}
+    timings["total_ms"] = round(timings.get("prepare_ms", 0) + timings.get("llm_ms", 0), 1)
+    print(f"⏱️ QnA 단계별 소요 시간(ms): {timings}")
     return state
 
-def appeal_dialogue_node(state: ChatState) -> ChatState:
-    """RAG 검색기를 사용하는 권한 제어 적용된 이의제기 대화 노드"""
+def invoke_llm(state: ChatState, prompt: str) -> str:
+    """LLM 전체 응답 대기 후 반환 (소요 시간은 state['timings']['llm_ms'])"""
+    llm_start = time.perf_counter()
+    llm_response = config.llm.predict(prompt)
+    state["timings"] = {**(state.get("timings") or {}), "llm_ms": round((time.perf_counter() - llm_start) * 1000, 1)}
+    return llm_response
+
+def stream_llm(state: ChatState, prompt: str) -> Iterator[str]:
+    """
+    LLM 응답을 토큰 단위로 yield.
+    첫 토큰까지 걸린 시간(ttft_ms)과 전체 생성 시간(llm_ms)을 state['timings']에 기록한다.
+    """
+    llm_start = time.perf_counter()
+    ttft_ms = None
+    for chunk in config.llm.stream(prompt):
+        token = getattr(chunk, "content", chunk)
+        if not token:
+            continue
+        if ttft_ms is None:
+            ttft_ms = round((time.perf_counter() - llm_start) * 1000, 1)
+            print(f"⚡ 첫 토큰까지 {ttft_ms}ms")
+        yield token
+    state["timings"] = {
+        **(state.get("timings") or {}),
+        "ttft_ms": ttft_ms,
+        "llm_ms": round((time.perf_counter() - llm_start) * 1000, 1),
+    }
+
+def qna_agent_node(state: ChatState) -> ChatState:
+    """RAG 검색기를 사용하는 개선된 QnA 에이전트 노드"""
+    prompt = prepare_qna_prompt(state)
+    return finalize_qna_response(state, invoke_llm(state, prompt))
+
+def prepare_appeal_prompt(state: ChatState) -> str:
+    """이의제기 대화 턴 준비 (대화 기록 추가 → 필요 시 팩트 검색 → 프롬프트 생성)"""
     query = state["user_input"]
     user_metadata = {
         "emp_no": state["user_id"],
@@ -261,7 +309,7 @@ def appeal_dialogue_node(state: ChatState) -> ChatState:
         print("ℹ️ 팩트 체크 불필요한 질문")
 
     # ✅ 전체 대화 히스토리 포함 (최근 것만이 아니라 전체)
-    full_conversation = "\n".join(state["dialog_log"])
+    full_conversation = conversation_text(state, "dialog_log")
     
     # ✅ 사용자의 핵심 불만사항 추출
     user_messages = [msg for msg in state["dialog_log"] if msg.startswith("사용자:")]
@@ -314,20 +362,23 @@ def appeal_dialogue_node(state: ChatState) -> ChatState:
 - 3문장 이상의 긴 답변
 """
 
-    # LLM 호출
-    llm_response = config.llm.predict(prompt)
+    state["retrieved_docs"] = retrieved_docs
+    return prompt
 
-    # 상태 업데이트
+def finalize_appeal_response(state: ChatState, llm_response: str) -> ChatState:
     state["dialog_log"].append(f"챗봇: {llm_response.strip()}")
     state["llm_response"] = llm_response.strip()
-    state["retrieved_docs"] = retrieved_docs
-
     return state
 
-def summary_generator_node(state: ChatState) -> ChatState:
-    """전체 문맥을 반영하는 요약 생성 노드"""
+def appeal_dialogue_node(state: ChatState) -> ChatState:
+    """RAG 검색기를 사용하는 권한 제어 적용된 이의제기 대화 노드"""
+    prompt = prepare_appeal_prompt(state)
+    return finalize_appeal_response(state, invoke_llm(state, prompt))
+
+def prepare_summary_prompt(state: ChatState) -> str:
+    """이의제기 요약 프롬프트 생성"""
     # ✅ 전체 대화 기록 사용
-    full_conversation = "\n".join(state["dialog_log"])
+    full_conversation = conversation_text(state, "dialog_log")
     
     # 사용자 발언만 추출해서 핵심 불만 파악
     user_statements = []
@@ -365,48 +416,164 @@ def summary_generator_node(state: ChatState) -> ChatState:
 팀장이 상황을 명확히 이해하고 적절한 피드백을 제공할 수 있도록 작성해주세요.
 """
 
-    llm_response = config.llm.predict(prompt)
+    return prompt
+
+def finalize_summary_response(state: ChatState, llm_response: str) -> ChatState:
     state["summary_draft"] = llm_response.strip()
     state["llm_response"] = llm_response.strip()
     return state
 
+def summary_generator_node(state: ChatState) -> ChatState:
+    """전체 문맥을 반영하는 요약 생성 노드"""
+    prompt = prepare_summary_prompt(state)
+    return finalize_summary_response(state, invoke_llm(state, prompt))
+
+# 노드 이름 → (프롬프트 준비, 응답 반영) - 스트리밍 응답에서 LangGraph 노드와 같은 단계를 재사용
+NODE_STEPS = {
+    "qna_agent": (prepare_qna_prompt, finalize_qna_response),
+    "appeal_dialogue": (prepare_appeal_prompt, finalize_appeal_response),
+    "summary_generator": (prepare_summary_prompt, finalize_summary_response),
+}
+
+def summarize_dialog(previous_summary: str, messages: List[str]) -> str:
+    """대화 압축용 요약 - 기존 요약에 오래된 메시지 내용을 합친다"""
+    prompt = f"""
+아래는 SK 성과평가 챗봇과 사용자의 이전 대화입니다. 이후 대화에서 문맥으로 쓸 수 있도록 요약해주세요.
+
+** 기존 요약:**
+{previous_summary or "(없음)"}
+
+** 추가로 요약할 대화:**
+{chr(10).join(messages)}
+
+** 요약 조건:**
+1. 사용자가 물어본 내용, 제기한 불만/문제, 챗봇이 제공한 핵심 수치와 답변을 유지
+2. 기존 요약 내용도 빠짐없이 포함해 하나의 요약으로 작성
+3. 10문장 이내
+"""
+    return config.llm.predict(prompt)
+
 # =============================================================================
 # 4. 세션 관리 클래스
 # =============================================================================
 
 class SessionManager:
-    def __init__(self):
-        self.sessions = {}
-    
+    """
+    세션 저장소(session_store.py) 위에서 사용자/모드별 대화 기록을 관리.
+    대화가 토큰 예산(SESSION_TOKEN_BUDGET)을 넘으면 오래된 메시지를 history_summary로 압축해
+    매 턴 프롬프트에 들어가는 대화 길이를 일정하게 유지한다.
+    압축(LLM 요약)은 응답 경로가 아니라 백그라운드 스레드에서 실행하고, 그동안 추가된 턴은 그대로 유지한다.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None, count_tokens=None, summarize=None):
+        self.settings = config.settings
+        self.store = store or create_session_store(self.settings)
+        self._count_tokens = count_tokens
+        self._summarize = summarize or summarize_dialog
+        self._lock = threading.Lock()
+        self._compacting = set()
+        self._recheck = set()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-compact")
+        purged = self.store.purge_expired()
+        if purged:
+            print(f"🧹 만료된 챗봇 세션 {purged}개 삭제")
+
+    @staticmethod
+    def _session_key(user_id: str, chat_mode: str) -> str:
+        return f"{user_id}_{chat_mode}"
+
+    @staticmethod
+    def _log_key(chat_mode: str) -> str:
+        return "dialog_log" if chat_mode == "appeal_to_manager" else "qna_dialog_log"
+
+    def count_tokens(self, text: str) -> int:
+        return (self._count_tokens or config.llm.get_num_tokens)(text)
+
     def get_session_state(self, user_id: str, chat_mode: str) -> Dict:
-        session_key = f"{user_id}_{chat_mode}"
-        return self.sessions.get(session_key, {})
+        return self.store.get(self._session_key(user_id, chat_mode)) or {}
     
     def save_session_state(self, user_id: str, chat_mode: str, state: ChatState):
-        session_key = f"{user_id}_{chat_mode}"
-        self.sessions[session_key] = {
+        """대화 기록을 그대로 저장하고, 예산을 넘었으면 백그라운드 압축을 예약"""
+        key, log_key = self._session_key(user_id, chat_mode), self._log_key(chat_mode)
+        session_data = {
             "qna_dialog_log": state.get("qna_dialog_log", []),
             "dialog_log": state.get("dialog_log", []),
+            "history_summary": state.get("history_summary") or "",
             "updated_at": datetime.now().isoformat()
         }
-    
+        with self._lock:
+            self.store.save(key, session_data)
+        self._schedule_compaction(key, log_key)
+
+    def _schedule_compaction(self, key: str, log_key: str):
+        with self._lock:
+            if key in self._compacting:
+                # 진행 중인 압축이 끝나면 새로 저장된 턴 기준으로 한 번 더 확인
+                self._recheck.add(key)
+                return
+            self._compacting.add(key)
+        self._compactor.submit(self._compact, key, log_key)
+
+    def _compact(self, key: str, log_key: str):
+        """
+        저장된 대화가 예산을 넘으면 오래된 메시지를 요약으로 합쳐 다시 저장.
+        요약하는 동안 새 턴이 저장됐을 수 있으므로, 저장 직전에 다시 읽어
+        앞부분(요약한 메시지)과 기존 요약이 그대로일 때만 그 뒤의 메시지를 모두 남기고 교체한다.
+        """
+        try:
+            data = self.store.get(key)
+            if not data:
+                return
+            dialog_log = list(data.get(log_key, []))
+            summary = data.get("history_summary") or ""
+            recent, new_summary = compact_history(
+                dialog_log, summary,
+                token_budget=self.settings.SESSION_TOKEN_BUDGET,
+                keep_recent=self.settings.SESSION_KEEP_RECENT,
+                count_tokens=self.count_tokens,
+                summarize=self._summarize,
+            )
+            if len(recent) == len(dialog_log):
+                return
+            older = dialog_log[:len(dialog_log) - len(recent)]
+            with self._lock:
+                current = self.store.get(key)
+                if not current or (current.get("history_summary") or "") != summary:
+                    return
+                current_log = list(current.get(log_key, []))
+                if current_log[:len(older)] != older:
+                    return
+                current[log_key] = current_log[len(older):]
+                current["history_summary"] = new_summary
+                self.store.save(key, current)
+        except Exception as e:
+            print(f"⚠️ 백그라운드 대화 압축 실패 ({key}): {e}")
+        finally:
+            with self._lock:
+                self._compacting.discard(key)
+                recheck = key in self._recheck
+                self._recheck.discard(key)
+            if recheck:
+                self._schedule_compaction(key, log_key)
+
+    def wait_for_compactions(self, timeout: Optional[float] = None):
+        """예약된 압축이 모두 끝날 때까지 대기 (압축 스레드는 1개라 빈 작업이 끝나면 앞선 작업도 끝난 것)"""
+        self._compactor.submit(lambda: None).result(timeout=timeout)
+
     def clear_session(self, user_id: str, chat_mode: str):
-        session_key = f"{user_id}_{chat_mode}"
-        if session_key in self.sessions:
-            del self.sessions[session_key]
+        self.store.delete(self._session_key(user_id, chat_mode))
 
     def auto_generate_summary_on_exit(self, user_id: str, chatbot_instance) -> Optional[str]:
         """이의제기 모드 종료 시 자동으로 요약 생성"""
-        session_key = f"{user_id}_appeal_to_manager"
+        session_data = self.get_session_state(user_id, "appeal_to_manager")
         
-        if session_key not in self.sessions:
+        if not session_data:
             return None
             
-        session_data = self.sessions[session_key]
         dialog_log = session_data.get("dialog_log", [])
         
-        # 대화가 2개 이상의 메시지가 있을 때만 요약 생성
-        if len(dialog_log) >= 4:  # 사용자 2회 + 챗봇 2회 이상
+        # 대화가 2개 이상의 메시지가 있을 때만 요약 생성 (압축된 이전 대화가 있으면 충분히 긴 대화)
+        if len(dialog_log) >= 4 or session_data.get("history_summary"):  # 사용자 2회 + 챗봇 2회 이상
             print("🔄 이의제기 대화 종료 - 자동으로 요약을 생성합니다...")
             
             try:
@@ -465,21 +632,19 @@ class SKChatbot:
     def __init__(self):
         self.workflow = create_chatbot_workflow()
     
-    def chat(self, user_id: str, chat_mode: str, user_input: str, appeal_complete: bool = False) -> Dict:
+    def _load_state(self, user_id: str, chat_mode: str, user_input: str, appeal_complete: bool) -> Dict:
         saved_state = session_manager.get_session_state(user_id, chat_mode)
-        
-        current_state = {
+        return {
             "user_id": user_id,
             "chat_mode": chat_mode,
             "user_input": user_input,
             "appeal_complete": appeal_complete,
             "qna_dialog_log": saved_state.get("qna_dialog_log", []),
             "dialog_log": saved_state.get("dialog_log", []),
+            "history_summary": saved_state.get("history_summary", ""),
         }
-        
-        result_state = self.workflow.invoke(current_state)
-        session_manager.save_session_state(user_id, chat_mode, result_state)
-        
+
+    def _build_response(self, user_id: str, chat_mode: str, appeal_complete: bool, result_state: ChatState) -> Dict:
         if chat_mode == "appeal_to_manager" and appeal_complete:
             return {
                 "type": "appeal_summary",
@@ -498,6 +663,43 @@ class SKChatbot:
                 "response": result_state["llm_response"],
                 "user_id": user_id
             }
+
+    def chat(self, user_id: str, chat_mode: str, user_input: str, appeal_complete: bool = False) -> Dict:
+        current_state = self._load_state(user_id, chat_mode, user_input, appeal_complete)
+        
+        result_state = self.workflow.invoke(current_state)
+        session_manager.save_session_state(user_id, chat_mode, result_state)
+        
+        return self._build_response(user_id, chat_mode, appeal_complete, result_state)
+
+    def chat_stream(self, user_id: str, chat_mode: str, user_input: str, appeal_complete: bool = False) -> Iterator[Dict]:
+        """
+        chat()의 스트리밍 버전. LangGraph 노드와 같은 준비/반영 단계(NODE_STEPS)를 직접 실행하고
+        LLM 응답만 토큰 단위로 내보낸다.
+        - {"event": "token", "data": "..."}  : 생성되는 토큰
+        - {"event": "done", "data": {...}}   : chat()과 같은 최종 응답 + timings (ttft_ms 포함)
+        전체 응답은 마지막에 대화 기록에 추가되고 세션에 저장된다.
+        클라이언트가 중간에 연결을 끊거나(GeneratorExit) LLM 오류가 나도 사용자 입력과 받은 만큼의 응답은 저장한다.
+        """
+        state = initialize_state(self._load_state(user_id, chat_mode, user_input, appeal_complete))
+        prepare, finalize = NODE_STEPS[route_chat_mode(state)]
+        prompt = prepare(state)
+
+        tokens = []
+        try:
+            for token in stream_llm(state, prompt):
+                tokens.append(token)
+                yield {"event": "token", "data": token}
+        finally:
+            result_state = finalize(state, "".join(tokens)) if tokens else state
+            try:
+                session_manager.save_session_state(user_id, chat_mode, result_state)
+            except Exception as e:
+                print(f"❌ 스트리밍 대화 세션 저장 실패: {e}")
+
+        response = self._build_response(user_id, chat_mode, appeal_complete, result_state)
+        response["timings"] = result_state.get("timings") or {}
+        yield {"event": "done", "data": response}
     
     def get_session_history(self, user_id: str, chat_mode: str) -> List[str]:
         saved_state = session_manager.get_session_state(user_id, chat_mode)
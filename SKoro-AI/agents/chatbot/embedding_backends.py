@@ -0,0 +1,226 @@
+# =============================================================================
+# embedding_backends.py - 임베딩 백엔드 (PyTorch / ONNX Runtime)
+# =============================================================================
+
+import json
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+# ONNX 변환 모델 저장 위치 (프로젝트 루트의 data/models)
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../'))
+DEFAULT_ONNX_DIR = os.path.join(_PROJECT_ROOT, 'data', 'models')
+
+# 백엔드 비교용 샘플 문장
+AGREEMENT_SAMPLES = [
+    "내 등급은?",
+    "달성률이 왜 낮아?",
+    "팀 평가 기준과 산출 방식을 알려주세요",
+    "2분기 업무별 기여도와 점수 변화 추이",
+    "이의제기 절차는 어떻게 되나요?",
+]
+
+
+class OnnxSentenceEmbeddings:
+    """
+    KR-SBERT(sentence-transformers) 모델을 ONNX Runtime으로 실행하는 임베딩.
+    - 최초 사용 시 PyTorch 모델을 ONNX로 변환해 onnx_dir에 저장 (이후 재사용)
+    - quantize=True이면 동적 int8 양자화 모델 사용 (PyTorch 결과와 일치 검증 후에만 쓰도록 기본값은 False)
+    - sentence-transformers와 같은 mean pooling, 입력은 batch_size 단위로 묶어서 실행
+    HuggingFaceEmbeddings와 같은 embed_query / embed_documents 인터페이스를 제공한다.
+    """
+
+    def __init__(self, model_name: str, onnx_dir: Optional[str] = None, quantize: bool = False,
+                 batch_size: int = 32, max_length: int = 256, num_threads: int = 0):
+        self.model_name = model_name
+        self.onnx_dir = os.path.join(onnx_dir or DEFAULT_ONNX_DIR, model_name.replace("/", "__"))
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.num_threads = num_threads
+        self._lock = threading.Lock()
+
+        from transformers import AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.session = self._load_session()
+
+    @property
+    def fp32_path(self) -> str:
+        return os.path.join(self.onnx_dir, "model.onnx")
+
+    @property
+    def int8_path(self) -> str:
+        return os.path.join(self.onnx_dir, "model.int8.onnx")
+
+    @property
+    def model_path(self) -> str:
+        return self.int8_path if self.quantize else self.fp32_path
+
+    @property
+    def agreement_path(self) -> str:
+        return os.path.join(self.onnx_dir, "agreement.json")
+
+    def _export(self):
+        """PyTorch → ONNX 변환 (동적 batch/sequence 축)"""
+        import torch
+        from transformers import AutoModel
+
+        os.makedirs(self.onnx_dir, exist_ok=True)
+        model = AutoModel.from_pretrained(self.model_name)
+        model.eval()
+        sample = self.tokenizer(["변환용 샘플 문장"], return_tensors="pt")
+        tmp_path = self.fp32_path + ".tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+                tmp_path,
+                input_names=["input_ids", "attention_mask", "token_type_ids"],
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "token_type_ids": {0: "batch", 1: "sequence"},
+                    "last_hidden_state": {0: "batch", 1: "sequence"},
+                },
+                opset_version=14,
+            )
+        os.replace(tmp_path, self.fp32_path)
+        print(f"✅ ONNX 변환 완료: {self.fp32_path}")
+
+    def _quantize(self):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp_path = self.int8_path + ".tmp"
+        quantize_dynamic(self.fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, self.int8_path)
+        print(f"✅ int8 양자화 완료: {self.int8_path}")
+
+    def _load_session(self):
+        import onnxruntime as ort
+
+        with self._lock:
+            if not os.path.exists(self.fp32_path):
+                self._export()
+            if self.quantize and not os.path.exists(self.int8_path):
+                self._quantize()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        session = ort.InferenceSession(self.model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {item.name for item in session.get_inputs()}
+        return session
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np")
+        inputs = {name: encoded[name].astype(np.int64) for name in self._input_names if name in encoded}
+        last_hidden_state = self.session.run(None, inputs)[0]
+        # mean pooling (padding 토큰 제외)
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        return (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._encode_batch(texts[start:start + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _torch_embeddings(model_name: str, batch_size: int = 32):
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=model_name, encode_kwargs={"batch_size": batch_size})
+
+
+def create_embedding_model(model_name: str, backend: str = "torch", quantize: bool = False,
+                           batch_size: int = 32, onnx_dir: Optional[str] = None, tolerance: float = 0.99):
+    """
+    설정된 백엔드의 임베딩 모델 생성.
+    onnx 백엔드는 PyTorch 결과와의 코사인 유사도가 tolerance 이상일 때만 사용하고,
+    준비(변환/로드)에 실패하거나 일치 검증에 실패하면 PyTorch(HuggingFaceEmbeddings)로 되돌아간다.
+    """
+    if backend == "onnx":
+        reference = None
+        try:
+            candidate = OnnxSentenceEmbeddings(model_name, onnx_dir=onnx_dir, quantize=quantize, batch_size=batch_size)
+
+            def load_reference():
+                nonlocal reference
+                reference = _torch_embeddings(model_name, batch_size)
+                return reference
+
+            worst = ensure_agreement(candidate, load_reference)
+            if worst >= tolerance:
+                return candidate
+            print(f"⚠️ ONNX 임베딩 결과가 PyTorch와 다름 (최소 코사인 {worst:.4f} < {tolerance}) - PyTorch 백엔드로 대체합니다")
+        except Exception as e:
+            print(f"⚠️ ONNX 임베딩 백엔드 준비 실패 - PyTorch 백엔드로 대체합니다: {e}")
+        if reference is not None:
+            return reference
+
+    return _torch_embeddings(model_name, batch_size)
+
+
+def cosine_agreement(reference, candidate, sentences: Optional[List[str]] = None) -> List[float]:
+    """같은 문장에 대한 두 임베딩 모델 결과의 코사인 유사도 목록"""
+    sentences = sentences or AGREEMENT_SAMPLES
+    ref = np.asarray(reference.embed_documents(sentences), dtype=np.float64)
+    cand = np.asarray(candidate.embed_documents(sentences), dtype=np.float64)
+    norms = np.linalg.norm(ref, axis=1) * np.linalg.norm(cand, axis=1)
+    return ((ref * cand).sum(axis=1) / np.clip(norms, 1e-12, None)).tolist()
+
+
+def ensure_agreement(candidate: OnnxSentenceEmbeddings, load_reference) -> float:
+    """
+    ONNX 모델과 PyTorch 결과의 최소 코사인 유사도.
+    변환된 모델 파일마다 한 번만 비교하고 결과를 onnx_dir/agreement.json에 기록해 재사용한다
+    (매 시작마다 PyTorch 모델을 함께 로드하지 않도록).
+    """
+    model_file = os.path.basename(candidate.model_path)
+    signature = f"{os.path.getmtime(candidate.model_path):.0f}"
+    records = {}
+    if os.path.exists(candidate.agreement_path):
+        try:
+            with open(candidate.agreement_path, encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            records = {}
+
+    record = records.get(model_file)
+    if record and record.get("signature") == signature:
+        return record["min_cosine"]
+
+    worst = min(cosine_agreement(load_reference(), candidate))
+    records[model_file] = {"signature": signature, "min_cosine": worst}
+    with open(candidate.agreement_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    return worst
+
+
+def verify_onnx_backend(model_name: str, quantize: bool = False, tolerance: float = 0.99) -> bool:
+    """ONNX 백엔드 결과가 PyTorch 결과와 tolerance 이상 일치하는지 확인"""
+    reference = _torch_embeddings(model_name)
+    candidate = OnnxSentenceEmbeddings(model_name, quantize=quantize)
+    similarities = cosine_agreement(reference, candidate)
+    worst = min(similarities)
+    print(f"🔍 PyTorch ↔ ONNX{'(int8)' if quantize else ''} 코사인 유사도: 최소 {worst:.4f} / 기준 {tolerance}")
+    return worst >= tolerance
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="ONNX 임베딩 백엔드 변환 및 PyTorch 결과 일치 검증")
+    parser.add_argument("--model", default="snunlp/KR-SBERT-V40K-klueNLI-augSTS")
+    parser.add_argument("--quantize", action="store_true", help="int8 양자화 모델로 검증")
+    parser.add_argument("--tolerance", type=float, default=0.99)
+    args = parser.parse_args()
+
+    sys.exit(0 if verify_onnx_backend(args.model, args.quantize, args.tolerance) else 1)
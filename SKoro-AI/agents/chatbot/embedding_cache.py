@@ -0,0 +1,216 @@
+# =============================================================================
+# embedding_cache.py - 질의 임베딩 캐시 (정규화 + 메모리 LRU + SQLite 영구 저장)
+# =============================================================================
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 질의 끝의 물음표/마침표 등은 의미에 영향이 없으므로 제거
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.~,;:ㅎㅋ]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """유니코드 정규화(NFKC) → 소문자 → 공백 정리 → 끝 문장부호 제거"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCTUATION.sub("", text) or text
+
+
+def query_key(query: str) -> str:
+    """정규화한 질의의 SHA-256 - 캐시 키 (저장소에는 질의 원문을 남기지 않음)"""
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+
+def default_cache_path() -> str:
+    """프로젝트 루트의 data/cache/query_embeddings.sqlite"""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../'))
+    cache_dir = os.path.join(project_root, 'data', 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, 'query_embeddings.sqlite')
+
+
+class QueryEmbeddingCache:
+    """
+    정규화된 질의 → 임베딩 벡터 캐시. 키는 정규화한 질의의 해시이고, 임베딩은 사용자가 입력한 원문으로 계산한다.
+    - 메모리 LRU (max_items 초과 시 가장 오래 사용하지 않은 항목 삭제)
+    - persist_path가 있으면 새로 계산한 벡터를 백그라운드 스레드가 모아서 SQLite에 저장 (질의 원문 없이 해시만),
+      시작 시 많이 쓰인 질의부터 다시 적재
+    - 벡터는 모델별로 분리 (모델이 바뀌면 저장된 벡터를 쓰지 않음)
+    """
+
+    def __init__(self, model_name: str, max_items: int = 2048, persist_path: Optional[str] = None,
+                 flush_interval: float = 5.0):
+        self.model_name = model_name
+        self.max_items = max_items
+        self.persist_path = persist_path
+        self.flush_interval = flush_interval
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._hit_counts: Dict[str, int] = {}
+        self._pending: Dict[str, Tuple[List[float], float]] = {}  # 저장 대기 중인 새 벡터 {key: (vector, created_at)}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # SQLite 쓰기는 요청 스레드가 아닌 writer 스레드/flush에서만
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        if persist_path:
+            self._conn = sqlite3.connect(persist_path, check_same_thread=False, timeout=30)
+            with self._write_lock:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                # 이전 형식(질의 원문 저장) 테이블은 삭제
+                self._conn.execute("DROP TABLE IF EXISTS query_embeddings")
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS query_embedding_vectors (
+                        model TEXT NOT NULL,
+                        query_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        hits INTEGER NOT NULL DEFAULT 0,
+                        last_used_at REAL NOT NULL,
+                        PRIMARY KEY (model, query_hash)
+                    )
+                """)
+                self._conn.commit()
+            self._writer = threading.Thread(target=self._write_loop, name="embedding-cache-writer", daemon=True)
+            self._writer.start()
+
+    # ---------------- 메모리 LRU ----------------
+
+    def _remember_locked(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, query: str) -> Optional[List[float]]:
+        key = query_key(query)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            self._hit_counts[key] = self._hit_counts.get(key, 0) + 1
+            return vector
+
+    def _store(self, key: str, vector: List[float]):
+        with self._lock:
+            self._remember_locked(key, vector)
+            if self._conn is not None:
+                self._pending[key] = (vector, time.time())
+
+    def get_or_embed(self, query: str, embed: Callable[[str], List[float]]) -> List[float]:
+        """캐시에 있으면 반환, 없으면 질의 원문을 임베딩해서 저장 (정규화는 키에만 사용)"""
+        vector = self.get(query)
+        if vector is not None:
+            return vector
+        vector = list(embed(query))
+        self._store(query_key(query), vector)
+        return vector
+
+    # ---------------- 영구 저장 (백그라운드 일괄 쓰기) ----------------
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._write_pending()
+            except Exception as e:
+                print(f"⚠️ 질의 임베딩 저장 실패: {e}")
+
+    def _write_pending(self, include_hits: bool = False):
+        """대기 중인 새 벡터(와 include_hits면 hit 수)를 한 트랜잭션으로 저장"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            hit_counts = {}
+            if include_hits:
+                hit_counts, self._hit_counts = self._hit_counts, {}
+        if not pending and not hit_counts:
+            return
+        with self._write_lock:
+            if pending:
+                self._conn.executemany(
+                    "INSERT INTO query_embedding_vectors (model, query_hash, vector, hits, last_used_at) "
+                    "VALUES (?, ?, ?, 0, ?) "
+                    "ON CONFLICT(model, query_hash) DO UPDATE SET vector = excluded.vector, last_used_at = excluded.last_used_at",
+                    [(self.model_name, key, array("f", vector).tobytes(), created_at)
+                     for key, (vector, created_at) in pending.items()]
+                )
+            if hit_counts:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE query_embedding_vectors SET hits = hits + ?, last_used_at = ? WHERE model = ? AND query_hash = ?",
+                    [(count, now, self.model_name, key) for key, count in hit_counts.items()]
+                )
+            self._conn.commit()
+
+    def load(self, limit: Optional[int] = None) -> int:
+        """저장된 벡터를 많이 쓰인 순으로 메모리에 적재 (최대 limit / max_items개)"""
+        if self._conn is None:
+            return 0
+        limit = min(limit or self.max_items, self.max_items)
+        with self._write_lock:
+            rows = self._conn.execute(
+                "SELECT query_hash, vector FROM query_embedding_vectors WHERE model = ? "
+                "ORDER BY hits DESC, last_used_at DESC LIMIT ?",
+                (self.model_name, limit)
+            ).fetchall()
+        with self._lock:
+            # 많이 쓰인 질의가 LRU 뒤쪽(최근)에 오도록 역순으로 넣음
+            for key, blob in reversed(rows):
+                self._remember_locked(key, array("f", blob).tolist())
+        return len(rows)
+
+    def flush(self):
+        """대기 중인 벡터와 메모리에 쌓인 hit 수를 저장소에 반영 (다음 시작 시 적재 우선순위)"""
+        if self._conn is None:
+            return
+        self._write_pending(include_hits=True)
+
+    def close(self):
+        """writer 스레드 종료 후 남은 내용 저장"""
+        if self._conn is None or self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._writer is not None:
+            self._writer.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+    def prewarm(self, queries: Iterable[str], embed: Callable[[str], List[float]]) -> int:
+        """목록 중 아직 캐시에 없는 질의를 미리 임베딩. 새로 계산한 개수 반환"""
+        computed = 0
+        for query in queries:
+            key = query_key(query)
+            with self._lock:
+                cached = key in self._memory
+            if not cached:
+                self._store(key, list(embed(query)))
+                computed += 1
+        return computed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "entries": len(self._memory),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "persist_path": self.persist_path,
+                "pending_writes": len(self._pending),
+            }
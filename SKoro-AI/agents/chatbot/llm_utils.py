@@ -4,9 +4,9 @@
 
 import os
 import sys
-from sqlalchemy import create_engine, text
+import threading
+import time
 from langchain_openai import ChatOpenAI
-from langchain_huggingface import HuggingFaceEmbeddings
 from pinecone import Pinecone
 from dotenv import load_dotenv
 
@@ -14,59 +14,150 @@ load_dotenv()
 
 # DB 설정
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), '../..')))
-from config.settings import DatabaseConfig
+from config.settings import DatabaseConfig, ChatbotSettings
+from .embedding_cache import QueryEmbeddingCache, default_cache_path
+from .embedding_backends import OnnxSentenceEmbeddings, create_embedding_model
+from .local_vector_store import open_local_index
+from .user_metadata import get_user_metadata_cache
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
 class ChatbotConfig:
+    """
+    챗봇 공용 자원(LLM, 임베딩 모델, Pinecone 인덱스) 레지스트리.
+    각 자원은 처음 사용할 때 한 번만 생성하고, 이후에는 같은 인스턴스를 재사용한다.
+    워커당 하나만 만들어 쓰도록 get_chatbot_config()로 가져온다.
+    """
+
+    EMBEDDING_MODEL_NAME = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0)
-        self.embedding_model = HuggingFaceEmbeddings(
-            model_name="snunlp/KR-SBERT-V40K-klueNLI-augSTS"
-        )
-        self.pc = Pinecone(
+        self.settings = ChatbotSettings()
+        self._resources = {}
+        self._lock = threading.RLock()
+
+    def _get_or_create(self, name: str, factory):
+        resource = self._resources.get(name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(name)
+                if resource is None:
+                    resource = factory()
+                    self._resources[name] = resource
+        return resource
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        return self._get_or_create("llm", lambda: ChatOpenAI(model="gpt-4o", temperature=0))
+
+    @property
+    def embedding_backend(self) -> str:
+        """실제로 로드된 백엔드 이름 (onnx 준비 실패로 torch로 대체된 경우 포함)"""
+        model = self.embedding_model
+        if isinstance(model, OnnxSentenceEmbeddings):
+            return "onnx-int8" if model.quantize else "onnx"
+        return "torch"
+
+    @property
+    def embedding_model(self):
+        """CHATBOT_EMBEDDING_BACKEND 설정에 따른 임베딩 모델 (torch / onnx)"""
+        return self._get_or_create("embedding_model", lambda: create_embedding_model(
+            self.EMBEDDING_MODEL_NAME,
+            backend=self.settings.EMBEDDING_BACKEND,
+            quantize=self.settings.EMBEDDING_QUANTIZE,
+            batch_size=self.settings.EMBEDDING_BATCH_SIZE,
+            onnx_dir=self.settings.EMBEDDING_ONNX_DIR or None,
+            tolerance=self.settings.EMBEDDING_ONNX_TOLERANCE
+        ))
+
+    @property
+    def embedding_cache(self) -> QueryEmbeddingCache:
+        return self._get_or_create("embedding_cache", lambda: QueryEmbeddingCache(
+            model_name=f"{self.EMBEDDING_MODEL_NAME}:{self.embedding_backend}",
+            max_items=self.settings.EMBEDDING_CACHE_SIZE,
+            persist_path=(self.settings.EMBEDDING_CACHE_PATH or default_cache_path())
+            if self.settings.EMBEDDING_CACHE_PERSIST else None
+        ))
+
+    def embed_query(self, query: str):
+        """캐시를 거치는 질의 임베딩"""
+        return self.embedding_cache.get_or_embed(query, self.embedding_model.embed_query)
+
+    @property
+    def pc(self) -> Pinecone:
+        return self._get_or_create("pc", lambda: Pinecone(
             api_key=os.getenv("PINECONE_API_KEY")
-        )
-        self.index_reports = self.pc.Index(os.getenv("PINECONE_INDEX_REPORTS"))
-        self.index_policy = self.pc.Index(os.getenv("PINECONE_INDEX_POLICY"))
-        self.index_appeals = self.pc.Index(os.getenv("PINECONE_INDEX_APPEALS"))
+        ))
+
+    def _open_index(self, env_name: str, default_name: str):
+        """설정된 벡터 저장소의 인덱스 핸들 (Pinecone Index 또는 같은 인터페이스의 로컬 FAISS 인덱스)"""
+        index_name = os.getenv(env_name)
+        if self.settings.VECTOR_BACKEND == "faiss":
+            return open_local_index(index_name or default_name, self.settings.VECTOR_STORE_DIR or None)
+        return self.pc.Index(index_name)
+
+    @property
+    def index_reports(self):
+        return self._get_or_create("index_reports", lambda: self._open_index("PINECONE_INDEX_REPORTS", "reports"))
+
+    @property
+    def index_policy(self):
+        return self._get_or_create("index_policy", lambda: self._open_index("PINECONE_INDEX_POLICY", "policy"))
+
+    @property
+    def index_appeals(self):
+        return self._get_or_create("index_appeals", lambda: self._open_index("PINECONE_INDEX_APPEALS", "appeals"))
+
+    def warm_up(self):
+        """모델 로드 + 인덱스 연결 + 자주 쓰는 질의 임베딩 적재 (첫 요청 지연 제거)"""
+        start = time.time()
+        self.embedding_model.embed_query("워밍업")
+        try:
+            loaded = self.embedding_cache.load(self.settings.PREWARM_TOP_N)
+            computed = self.embedding_cache.prewarm(self.settings.prewarm_queries, self.embedding_model.embed_query)
+            print(f"📦 질의 임베딩 캐시: 저장분 {loaded}개 적재, 사전 계산 {computed}개")
+        except Exception as e:
+            print(f"⚠️ 질의 임베딩 캐시 준비 실패: {e}")
+        try:
+            print(f"👥 사용자 메타데이터 {get_user_metadata_cache().preload()}명 적재")
+        except Exception as e:
+            print(f"⚠️ 사용자 메타데이터 적재 실패 (요청 시 개별 조회): {e}")
+        for name in ("llm", "index_reports", "index_policy", "index_appeals"):
+            getattr(self, name)
+        print(f"✅ 챗봇 자원 워밍업 완료 ({time.time() - start:.1f}초)")
+
+    def is_ready(self) -> bool:
+        """임베딩 모델이 메모리에 올라왔는지 여부"""
+        return "embedding_model" in self._resources
+
+    def flush(self):
+        """종료 시 대기 중인 임베딩과 캐시 사용 통계 저장"""
+        cache = self._resources.get("embedding_cache")
+        if cache is not None:
+            cache.close()
+
+    def status(self) -> dict:
+        return {"ready": self.is_ready(), "loaded": sorted(self._resources)}
+
+
+_chatbot_config = None
+_chatbot_config_lock = threading.Lock()
+
+
+def get_chatbot_config() -> ChatbotConfig:
+    """프로세스 전역 챗봇 자원 레지스트리 반환 (없으면 생성)"""
+    global _chatbot_config
+    if _chatbot_config is None:
+        with _chatbot_config_lock:
+            if _chatbot_config is None:
+                _chatbot_config = ChatbotConfig()
+    return _chatbot_config
 
 
 def get_user_metadata(user_id: str) -> dict:
-    """사용자 메타데이터 조회"""
-    try:
-        with engine.connect() as conn:
-            query = text("""
-                SELECT e.role, e.team_id, t.team_name
-                FROM employees e
-                JOIN teams t ON e.team_id = t.team_id
-                WHERE e.emp_no = :user_id
-            """)
-            result = conn.execute(query, {"user_id": user_id}).fetchone()
-            if result:
-                return {
-                    "emp_no": user_id,
-                    "role": result.role,
-                    "team_id": result.team_id,
-                    "team_name": result.team_name
-                }
-            else:
-                return {
-                    "emp_no": user_id,
-                    "role": "MEMBER", 
-                    "team_id": "default", 
-                    "team_name": "default"
-                }
-    except Exception as e:
-        print(f"❌ 사용자 정보 조회 실패: {str(e)}")
-        return {
-            "emp_no": user_id,
-            "role": "MEMBER", 
-            "team_id": "default", 
-            "team_name": "default"
-        }
+    """사용자 메타데이터 조회 (캐시 우선, 없거나 만료된 경우에만 DB 조회)"""
+    return get_user_metadata_cache().get(user_id)
 
 def analyze_question_intent(current_query: str, previous_context: str) -> str:
     """현재 질문의 의도를 분석하는 함수"""
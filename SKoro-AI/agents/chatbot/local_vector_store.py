@@ -0,0 +1,344 @@
+# =============================================================================
+# local_vector_store.py - 로컬 FAISS 벡터 저장소 (Pinecone Index 대체)
+# =============================================================================
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../'))
+DEFAULT_STORE_DIR = os.path.join(_PROJECT_ROOT, 'data', 'vector_store')
+
+# 역색인을 만들어 두는 메타데이터 필드 (검색 전에 후보 문서를 좁히는 데 사용)
+INDEXED_FIELDS = ("accessible_by", "type", "emp_no")
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def _match_condition(value, condition) -> bool:
+    """Pinecone 필터 조건 하나를 메타데이터 값에 적용 ($in / $eq / $ne / $nin 및 단순 값)"""
+    values = _as_list(value)
+    if isinstance(condition, dict):
+        for op, expected in condition.items():
+            if op == "$in" and not any(v in expected for v in values):
+                return False
+            if op == "$nin" and any(v in expected for v in values):
+                return False
+            if op == "$eq" and expected not in values:
+                return False
+            if op == "$ne" and expected in values:
+                return False
+        return True
+    return condition in values
+
+
+class LocalVectorIndex:
+    """
+    Pinecone Index와 같은 query / upsert / delete 인터페이스의 로컬 FAISS 인덱스.
+    - 코사인 유사도 (정규화한 벡터의 내적, IndexFlatIP)
+    - 인덱스 파일은 가능하면 메모리 매핑으로 연다
+    - accessible_by / type / emp_no / namespace 역색인으로 필터에 맞는 문서만 골라서 점수 계산
+      (권한 필터가 검색 후가 아니라 검색 전에 적용됨)
+    저장 형식: {path}/manifest.json → 현재 버전의 index-{version}.faiss + docs-{version}.json
+    (docs는 id, namespace, metadata - 벡터 순서와 동일). 다른 프로세스가 저장하면 manifest가 바뀌므로
+    query 시 이를 확인해 새 버전을 다시 읽는다. manifest가 없으면 이전 형식(index.faiss + docs.json)을 읽는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._index = None
+        self._docs: List[Dict] = []
+        self._inverted: Dict[str, Dict[str, Set[int]]] = {}
+        self._namespaces: Dict[str, Set[int]] = {}
+        self._pending: Optional[Dict[str, Dict]] = None  # upsert/delete 후 다시 만들 전체 문서 (id → 문서)
+        self._manifest_stamp = None  # 마지막으로 읽은 manifest 파일의 (mtime_ns, size)
+        self.version: Optional[str] = None
+        self.load()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.path, "index.faiss")
+
+    @property
+    def docs_path(self) -> str:
+        return os.path.join(self.path, "docs.json")
+
+    def _manifest_file_stamp(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _current_files(self):
+        """(version, index 파일, docs 파일) - manifest가 없으면 이전 형식 파일"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            index_file = manifest.get("index_file")
+            return (manifest["version"],
+                    os.path.join(self.path, index_file) if index_file else None,
+                    os.path.join(self.path, manifest["docs_file"]))
+        if os.path.exists(self.index_path) and os.path.exists(self.docs_path):
+            return None, self.index_path, self.docs_path
+        return None, None, None
+
+    # ---------------- 로드 / 역색인 ----------------
+
+    def load(self):
+        import faiss
+
+        with self._lock:
+            stamp = self._manifest_file_stamp()
+            version, index_path, docs_path = self._current_files()
+            if docs_path is None:
+                self._index, self._docs = None, []
+            else:
+                if index_path is None:
+                    self._index = None
+                else:
+                    try:
+                        self._index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                    except Exception:
+                        # 메모리 매핑을 지원하지 않는 인덱스 형식이면 일반 로드
+                        self._index = faiss.read_index(index_path)
+                with open(docs_path, encoding="utf-8") as f:
+                    self._docs = json.load(f)
+            self._pending = None
+            self._manifest_stamp = stamp
+            self.version = version
+            self._build_inverted()
+
+    def _reload_if_changed(self):
+        """다른 프로세스가 새 버전을 저장했으면 다시 읽음 (이 인스턴스에 저장하지 않은 변경이 있으면 유지)"""
+        if self._pending is not None:
+            return
+        if self._manifest_file_stamp() != self._manifest_stamp:
+            self.load()
+
+    def _build_inverted(self):
+        inverted = {field: {} for field in INDEXED_FIELDS}
+        namespaces: Dict[str, Set[int]] = {}
+        for position, doc in enumerate(self._docs):
+            namespaces.setdefault(doc.get("namespace", ""), set()).add(position)
+            metadata = doc.get("metadata", {})
+            for field in INDEXED_FIELDS:
+                if field in metadata:
+                    for value in _as_list(metadata[field]):
+                        inverted[field].setdefault(str(value), set()).add(position)
+        self._inverted = inverted
+        self._namespaces = namespaces
+
+    def _candidates(self, namespace: str, filter: Optional[Dict]) -> Optional[Set[int]]:
+        """필터에 맞는 문서 위치 집합. 역색인으로 좁힌 뒤 나머지 조건은 메타데이터로 확인"""
+        candidates = set(self._namespaces.get(namespace, set()))
+        for field, condition in (filter or {}).items():
+            if not candidates:
+                break
+            if field in self._inverted and (not isinstance(condition, dict) or set(condition) <= {"$in", "$eq"}):
+                expected = condition.get("$in", [condition.get("$eq")]) if isinstance(condition, dict) else [condition]
+                allowed = set()
+                for value in expected:
+                    allowed |= self._inverted[field].get(str(value), set())
+                candidates &= allowed
+            else:
+                candidates = {
+                    position for position in candidates
+                    if _match_condition(self._docs[position].get("metadata", {}).get(field), condition)
+                }
+        return candidates
+
+    # ---------------- Pinecone 호환 API ----------------
+
+    def query(self, vector: List[float], top_k: int = 5, include_metadata: bool = True,
+              filter: Optional[Dict] = None, namespace: str = "", **kwargs) -> Dict:
+        import faiss
+
+        with self._lock:
+            self._reload_if_changed()
+            self._rebuild_if_pending()
+            if self._index is None or not self._docs:
+                return {"matches": []}
+            candidates = self._candidates(namespace or "", filter)
+            if not candidates:
+                return {"matches": []}
+
+            query = _normalize(np.asarray([vector], dtype=np.float32))
+            k = min(top_k, len(candidates))
+            selector = faiss.IDSelectorBatch(np.fromiter(candidates, dtype=np.int64))
+            scores, positions = self._index.search(query, k, params=faiss.SearchParameters(sel=selector))
+            docs = self._docs  # 락 밖에서 다른 버전으로 다시 읽혀도 이번 검색 결과와 같은 목록 사용
+
+        matches = []
+        for score, position in zip(scores[0], positions[0]):
+            if position < 0:
+                continue
+            doc = docs[position]
+            match = {"id": doc["id"], "score": float(score)}
+            if include_metadata:
+                match["metadata"] = doc.get("metadata", {})
+            matches.append(match)
+        return {"matches": matches, "namespace": namespace or ""}
+
+    def _all_docs(self) -> Dict[str, Dict]:
+        if self._pending is None:
+            vectors = self._index.reconstruct_n(0, self._index.ntotal) if self._index is not None else []
+            self._pending = {
+                doc["id"]: {**doc, "values": vectors[position]}
+                for position, doc in enumerate(self._docs)
+            }
+        return self._pending
+
+    def upsert(self, vectors: Iterable, namespace: str = "", **kwargs) -> Dict:
+        """vectors: [{"id", "values", "metadata"}] 또는 (id, values, metadata) 튜플"""
+        count = 0
+        with self._lock:
+            self._reload_if_changed()
+            docs = self._all_docs()
+            for item in vectors:
+                if not isinstance(item, dict):
+                    item = dict(zip(("id", "values", "metadata"), item))
+                docs[item["id"]] = {
+                    "id": item["id"],
+                    "namespace": namespace or "",
+                    "metadata": item.get("metadata", {}),
+                    "values": np.asarray(item["values"], dtype=np.float32),
+                }
+                count += 1
+        return {"upserted_count": count}
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False, namespace: str = "", **kwargs):
+        with self._lock:
+            self._reload_if_changed()
+            docs = self._all_docs()
+            if delete_all:
+                for doc_id in [doc_id for doc_id, doc in docs.items() if doc["namespace"] == (namespace or "")]:
+                    del docs[doc_id]
+            for doc_id in ids or []:
+                docs.pop(doc_id, None)
+        return {}
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100, namespace: str = "", **kwargs):
+        """문서 ID를 limit개씩 묶어서 생성 (Pinecone 서버리스 Index.list와 같은 형태)"""
+        with self._lock:
+            self._reload_if_changed()
+            self._rebuild_if_pending()
+            ids = [doc["id"] for doc in self._docs
+                   if doc.get("namespace", "") == (namespace or "") and (not prefix or doc["id"].startswith(prefix))]
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def describe_index_stats(self, **kwargs) -> Dict:
+        with self._lock:
+            self._reload_if_changed()
+            self._rebuild_if_pending()
+            return {
+                "total_vector_count": len(self._docs),
+                "dimension": self._index.d if self._index is not None else 0,
+                "namespaces": {name: {"vector_count": len(positions)} for name, positions in self._namespaces.items()},
+            }
+
+    # ---------------- 재구성 / 저장 ----------------
+
+    def _rebuild_if_pending(self):
+        if self._pending is None:
+            return
+        import faiss
+
+        docs = list(self._pending.values())
+        self._pending = None
+        self._docs = [{"id": doc["id"], "namespace": doc["namespace"], "metadata": doc["metadata"]} for doc in docs]
+        if docs:
+            vectors = _normalize(np.vstack([doc["values"] for doc in docs]).astype(np.float32))
+            self._index = faiss.IndexFlatIP(vectors.shape[1])
+            self._index.add(vectors)
+        else:
+            self._index = None
+        self._build_inverted()
+
+    def save(self):
+        """
+        새 버전 파일(index-{version}.faiss, docs-{version}.json)을 쓴 뒤 manifest를 교체
+        (읽는 워커는 항상 같은 버전의 인덱스와 문서 목록을 본다). 이전 버전 파일은 삭제한다.
+        """
+        import faiss
+
+        with self._lock:
+            self._rebuild_if_pending()
+            os.makedirs(self.path, exist_ok=True)
+            version = str(time.time_ns())
+            index_file = f"index-{version}.faiss" if self._index is not None else None
+            docs_file = f"docs-{version}.json"
+            if index_file:
+                faiss.write_index(self._index, os.path.join(self.path, index_file))
+            with open(os.path.join(self.path, docs_file), "w", encoding="utf-8") as f:
+                json.dump(self._docs, f, ensure_ascii=False)
+            with open(self.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"version": version, "index_file": index_file, "docs_file": docs_file,
+                           "count": len(self._docs)}, f)
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+            self._manifest_stamp = self._manifest_file_stamp()
+            self.version = version
+
+            current = {index_file, docs_file}
+            for stale in glob.glob(os.path.join(self.path, "index-*.faiss")) + glob.glob(os.path.join(self.path, "docs-*.json")):
+                if os.path.basename(stale) not in current:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+        print(f"💾 로컬 벡터 인덱스 저장: {self.path} ({len(self._docs)}개, 버전 {version})")
+
+
+def open_local_index(name: str, base_dir: Optional[str] = None) -> LocalVectorIndex:
+    return LocalVectorIndex(os.path.join(base_dir or DEFAULT_STORE_DIR, name))
+
+
+def copy_from_pinecone(pinecone_index, local_index: LocalVectorIndex, namespaces: Iterable[str] = ("", "default"),
+                       batch_size: int = 100) -> int:
+    """Pinecone 인덱스의 벡터/메타데이터를 로컬 인덱스로 복사 (서버리스 인덱스의 list API 사용)"""
+    copied = 0
+    for namespace in namespaces:
+        for ids in pinecone_index.list(namespace=namespace, limit=batch_size):
+            fetched = pinecone_index.fetch(ids=list(ids), namespace=namespace)
+            vectors = fetched.get("vectors", {})
+            local_index.upsert([
+                {"id": vector_id, "values": vector["values"], "metadata": vector.get("metadata", {})}
+                for vector_id, vector in vectors.items()
+            ], namespace=namespace)
+            copied += len(vectors)
+    local_index.save()
+    return copied
+
+
+if __name__ == "__main__":
+    # Pinecone 인덱스 3개를 로컬 FAISS 저장소로 복사
+    from dotenv import load_dotenv
+    from pinecone import Pinecone
+
+    load_dotenv()
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    for env_name in ("PINECONE_INDEX_REPORTS", "PINECONE_INDEX_POLICY", "PINECONE_INDEX_APPEALS"):
+        index_name = os.getenv(env_name)
+        if not index_name:
+            print(f"⚠️ {env_name} 미설정 - 건너뜀")
+            continue
+        count = copy_from_pinecone(pc.Index(index_name), open_local_index(index_name))
+        print(f"✅ {index_name}: {count}개 복사 완료")
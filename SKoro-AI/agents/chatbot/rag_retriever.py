@@ -2,18 +2,52 @@
 # rag_retriever.py - RAG 검색 및 권한 제어
 # =============================================================================
 
-from typing import List, Dict
-from .llm_utils import ChatbotConfig
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from .llm_utils import ChatbotConfig, get_chatbot_config
+
+# 인덱스별 기본 검색 개수
+DEFAULT_TOP_K = {"reports": 5, "policies": 3, "appeals": 2}
+
+# 점수가 같을 때 우선할 출처 (개인/팀 리포트 > 정책 > 이의제기 사례)
+SOURCE_PRIORITY = {"report": 0, "policy": 1, "appeal": 2}
+
+# 세 인덱스 동시 조회 + 의도 분석용 공용 스레드 풀 (요청마다 풀을 만들지 않음)
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rag-search")
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    return _search_executor
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
 
 class UnifiedRAGRetriever:
     """권한 제어가 통합된 RAG 검색기"""
     
     def __init__(self, config: ChatbotConfig):
         self.config = config
-        self.embedding_model = config.embedding_model
-        self.index_reports = config.index_reports
-        self.index_policy = config.index_policy
-        self.index_appeals = config.index_appeals
+
+    # 자원은 config에서 처음 사용할 때 로드 (검색기 생성만으로 모델을 올리지 않음)
+    @property
+    def embedding_model(self):
+        return self.config.embedding_model
+
+    @property
+    def index_reports(self):
+        return self.config.index_reports
+
+    @property
+    def index_policy(self):
+        return self.config.index_policy
+
+    @property
+    def index_appeals(self):
+        return self.config.index_appeals
     
     def _apply_access_control(self, user_metadata: dict, base_filter: dict = None) -> dict:
         """새로운 accessible_by 필드 기반 권한 제어"""
@@ -49,7 +83,12 @@ class UnifiedRAGRetriever:
     
         return validated_matches
     
-    def search_reports(self, query: str, user_metadata: dict, top_k: int = 5) -> List[Dict]:
+    def embed(self, query: str) -> List[float]:
+        """검색 쿼리 임베딩 (세 인덱스 검색에 같은 벡터를 재사용, 정규화된 질의 기준 캐시)"""
+        return self.config.embed_query(query)
+
+    def search_reports(self, query: str, user_metadata: dict, top_k: int = 5,
+                       query_embedding: Optional[List[float]] = None) -> List[Dict]:
         """권한 제어가 적용된 리포트 검색"""
         print(f"📊 리포트 검색: '{query}'")
         
@@ -61,7 +100,8 @@ class UnifiedRAGRetriever:
             )
             
             # 검색 실행
-            query_embedding = self.embedding_model.embed_query(query)
+            if query_embedding is None:
+                query_embedding = self.embed(query)
             results = self.index_reports.query(
                 vector=query_embedding,
                 top_k=top_k,
@@ -82,12 +122,14 @@ class UnifiedRAGRetriever:
             print(f"❌ 리포트 검색 실패: {str(e)}")
             return []
     
-    def search_policies(self, query: str, top_k: int = 3) -> List[Dict]:
+    def search_policies(self, query: str, top_k: int = 3,
+                        query_embedding: Optional[List[float]] = None) -> List[Dict]:
         """정책 문서 검색 (모든 사용자 접근 가능)"""
         print(f"📋 정책 검색: '{query}'")
         
         try:
-            query_embedding = self.embedding_model.embed_query(query)
+            if query_embedding is None:
+                query_embedding = self.embed(query)
             results = self.index_policy.query(
                 vector=query_embedding,
                 top_k=top_k,
@@ -105,12 +147,14 @@ class UnifiedRAGRetriever:
             print(f"❌ 정책 검색 실패: {str(e)}")
             return []
     
-    def search_appeals(self, query: str, top_k: int = 2) -> List[Dict]:
+    def search_appeals(self, query: str, top_k: int = 2,
+                       query_embedding: Optional[List[float]] = None) -> List[Dict]:
         """이의제기 사례 검색 (모든 사용자 접근 가능)"""
         print(f"📝 이의제기 사례 검색: '{query}'")
         
         try:
-            query_embedding = self.embedding_model.embed_query(query)
+            if query_embedding is None:
+                query_embedding = self.embed(query)
             results = self.index_appeals.query(
                 vector=query_embedding,
                 top_k=top_k,
@@ -127,39 +171,85 @@ class UnifiedRAGRetriever:
             print(f"❌ 이의제기 사례 검색 실패: {str(e)}")
             return []
     
-    def comprehensive_search(self, query: str, user_metadata: dict, enhanced_query: str = None) -> Dict[str, List[Dict]]:
-        """종합 검색 - 모든 소스에서 권한 제어 적용"""
+    def comprehensive_search(self, query: str, user_metadata: dict, enhanced_query: str = None,
+                             top_k: Optional[Dict[str, int]] = None,
+                             timings: Optional[Dict[str, float]] = None) -> Dict[str, List[Dict]]:
+        """
+        종합 검색 - 모든 소스에서 권한 제어 적용.
+        쿼리는 한 번만 임베딩하고 세 인덱스는 동시에 조회한다.
+        timings가 주어지면 단계별 소요 시간(ms)을 기록한다.
+        """
         search_query = enhanced_query or query
+        top_k = {**DEFAULT_TOP_K, **(top_k or {})}
+        timings = timings if timings is not None else {}
         print(f"\n🔍 종합 검색 시작: '{search_query}'")
         print(f"👤 사용자: {user_metadata.get('emp_no')} ({user_metadata.get('role')})")
-        
-        results = {
-            "reports": self.search_reports(search_query, user_metadata, top_k=5),
-            "policies": self.search_policies(search_query, top_k=3),
-            "appeals": self.search_appeals(search_query, top_k=2)
+
+        start = time.perf_counter()
+        try:
+            query_embedding = self.embed(search_query)
+        except Exception as e:
+            print(f"❌ 쿼리 임베딩 실패: {str(e)}")
+            return {source: [] for source in top_k}
+        timings["embed_ms"] = _elapsed_ms(start)
+
+        def timed(name, func, *args):
+            def run():
+                stage_start = time.perf_counter()
+                try:
+                    return func(*args)
+                finally:
+                    timings[f"search_{name}_ms"] = _elapsed_ms(stage_start)
+            return run
+
+        start = time.perf_counter()
+        executor = get_search_executor()
+        futures = {
+            "reports": executor.submit(timed("reports", self.search_reports, search_query, user_metadata,
+                                             top_k["reports"], query_embedding)),
+            "policies": executor.submit(timed("policies", self.search_policies, search_query,
+                                              top_k["policies"], query_embedding)),
+            "appeals": executor.submit(timed("appeals", self.search_appeals, search_query,
+                                             top_k["appeals"], query_embedding)),
         }
-        
+        # search_* 는 내부에서 예외를 잡아 빈 리스트를 반환
+        results = {source: future.result() for source, future in futures.items()}
+        timings["search_ms"] = _elapsed_ms(start)
+
         total_docs = sum(len(docs) for docs in results.values())
         print(f"🎯 종합 검색 완료: 총 {total_docs}개 문서")
-        
+
         return results
-    
-    def get_best_matches(self, query: str, user_metadata: dict, enhanced_query: str = None, total_k: int = 4) -> List[Dict]:
-        """최적의 문서들을 종합해서 반환 (권한 제어 적용)"""
-        results = self.comprehensive_search(query, user_metadata, enhanced_query)
-        
-        # 모든 결과를 점수순으로 정렬
-        all_docs = []
-        for source_type, docs in results.items():
-            all_docs.extend(docs)
-        
-        # 점수순 정렬 후 상위 문서 반환
-        sorted_docs = sorted(all_docs, key=lambda x: x["score"], reverse=True)
-        final_docs = sorted_docs[:total_k]
-        
+
+    def get_best_matches(self, query: str, user_metadata: dict, enhanced_query: str = None,
+                         total_k: Optional[int] = 4, top_k: Optional[Dict[str, int]] = None,
+                         timings: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        최적의 문서들을 종합해서 반환 (권한 제어 적용).
+        세 소스 결과를 합쳐 같은 내용은 점수가 높은 하나만 남기고, 점수 → 출처 우선순위 순으로 재정렬한다.
+        total_k=None이면 재정렬된 전체 결과를 반환한다.
+        """
+        results = self.comprehensive_search(query, user_metadata, enhanced_query, top_k=top_k, timings=timings)
+
+        start = time.perf_counter()
+        best_by_content: Dict[str, Dict] = {}
+        for docs in results.values():
+            for doc in docs:
+                key = doc["content"] or str(id(doc))
+                if key not in best_by_content or doc["score"] > best_by_content[key]["score"]:
+                    best_by_content[key] = doc
+
+        sorted_docs = sorted(
+            best_by_content.values(),
+            key=lambda x: (-x["score"], SOURCE_PRIORITY.get(x["source"], len(SOURCE_PRIORITY)))
+        )
+        final_docs = sorted_docs if total_k is None else sorted_docs[:total_k]
+        if timings is not None:
+            timings["rerank_ms"] = _elapsed_ms(start)
+
         print(f"📋 최종 선별: {len(final_docs)}개 최적 문서")
         return final_docs
-    
+
     def _format_matches(self, matches: List, source_type: str) -> List[Dict]:
         """검색 결과를 통일된 형태로 포맷팅"""
         formatted = []
@@ -175,20 +265,31 @@ class UnifiedRAGRetriever:
         
         return formatted
 
+_rag_retriever = None
+_rag_retriever_lock = threading.Lock()
+
+
+def get_rag_retriever() -> UnifiedRAGRetriever:
+    """공용 챗봇 자원을 사용하는 프로세스 전역 검색기"""
+    global _rag_retriever
+    if _rag_retriever is None:
+        with _rag_retriever_lock:
+            if _rag_retriever is None:
+                _rag_retriever = UnifiedRAGRetriever(get_chatbot_config())
+    return _rag_retriever
+
+
 def search_documents_with_access_control(query: str, user_metadata: dict, filter_type: str = None, top_k: int = 5):
     """RAG 검색기를 사용하는 권한 제어 검색 - 기존 인터페이스 유지"""
-    from .llm_utils import ChatbotConfig
-    config = ChatbotConfig()
-    rag_retriever = UnifiedRAGRetriever(config)
+    rag_retriever = get_rag_retriever()
     
     if filter_type == "report":
         matches = rag_retriever.search_reports(query, user_metadata, top_k)
         return {"matches": matches}
     else:
-        # 종합 검색
-        report_matches = rag_retriever.search_reports(query, user_metadata, top_k=3)
-        policy_matches = rag_retriever.search_policies(query, top_k=2)
-        appeal_matches = rag_retriever.search_appeals(query, top_k=1)
-        
-        all_matches = report_matches + policy_matches + appeal_matches
-        return {"matches": all_matches}
\ No newline at end of file
+        # 종합 검색 (임베딩 1회 + 세 인덱스 동시 조회)
+        results = rag_retriever.comprehensive_search(
+            query, user_metadata, top_k={"reports": 3, "policies": 2, "appeals": 1}
+        )
+        all_matches = results["reports"] + results["policies"] + results["appeals"]
+        return {"matches": all_matches}
@@ -0,0 +1,261 @@
+# =============================================================================
+# session_store.py - 챗봇 세션 저장소 (메모리 LRU+TTL / SQLite / MariaDB) 및 대화 압축
+# =============================================================================
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+SESSION_TABLE = "chatbot_sessions"
+
+
+def default_session_db_path() -> str:
+    """프로젝트 루트의 data/cache/chatbot_sessions.sqlite"""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../'))
+    cache_dir = os.path.join(project_root, 'data', 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, 'chatbot_sessions.sqlite')
+
+
+class SessionStore(ABC):
+    """
+    세션 키(f"{user_id}_{chat_mode}") → 세션 데이터(dict) 저장소 인터페이스.
+    ttl_seconds 동안 갱신되지 않은 세션은 만료되어 조회되지 않는다 (0이면 만료 없음).
+    """
+
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+
+    def _expired(self, updated_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - updated_at > self.ttl_seconds
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict]:
+        """만료되지 않은 세션 데이터 (없으면 None)"""
+
+    @abstractmethod
+    def save(self, key: str, data: Dict):
+        """세션 데이터 저장 (갱신 시각도 함께 기록)"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """세션 삭제"""
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def stats(self) -> Dict:
+        return {"backend": type(self).__name__, "ttl_seconds": self.ttl_seconds}
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 메모리 저장소. max_sessions 초과 시 가장 오래 사용하지 않은 세션부터 삭제"""
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: int = 0):
+        super().__init__(ttl_seconds)
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                del self._sessions[key]
+                return None
+            self._sessions.move_to_end(key)
+            return entry[1]
+
+    def save(self, key: str, data: Dict):
+        with self._lock:
+            self._sessions[key] = (time.time(), data)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            expired = [key for key, (updated_at, _) in self._sessions.items() if self._expired(updated_at)]
+            for key in expired:
+                del self._sessions[key]
+        return len(expired)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**super().stats(), "sessions": len(self._sessions), "max_sessions": self.max_sessions}
+
+
+class SQLiteSessionStore(SessionStore):
+    """로컬 SQLite 파일 저장소 (재시작 후에도 유지, 같은 서버의 여러 워커가 공유)"""
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: int = 0):
+        super().__init__(ttl_seconds)
+        self.path = path or default_session_db_path()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SESSION_TABLE} (
+                    session_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT payload, updated_at FROM {SESSION_TABLE} WHERE session_key = ?", (key,)
+            ).fetchone()
+        if row is None or self._expired(row[1]):
+            return None
+        return json.loads(row[0])
+
+    def save(self, key: str, data: Dict):
+        with self._lock:
+            self._conn.execute(f"""
+                INSERT INTO {SESSION_TABLE} (session_key, payload, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(session_key) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at
+            """, (key, json.dumps(data, ensure_ascii=False), time.time()))
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {SESSION_TABLE} WHERE session_key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {SESSION_TABLE} WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {SESSION_TABLE}").fetchone()[0]
+        return {**super().stats(), "sessions": count, "path": self.path}
+
+
+class MariaDBSessionStore(SessionStore):
+    """공유 DB 엔진(db.get_engine) 저장소 - 여러 서버/워커가 같은 세션을 본다"""
+
+    def __init__(self, ttl_seconds: int = 0):
+        super().__init__(ttl_seconds)
+        from sqlalchemy import text
+        from db import get_engine, unit_of_work
+
+        self._text = text
+        self._engine = get_engine()
+        self._unit_of_work = unit_of_work
+
+    @staticmethod
+    def table_exists() -> bool:
+        """세션 테이블이 있는지 확인 (테이블은 migrations/에서 생성)"""
+        from sqlalchemy import inspect
+        from db import get_engine
+
+        try:
+            if inspect(get_engine()).has_table(SESSION_TABLE):
+                return True
+            logging.warning(f"[챗봇 세션] {SESSION_TABLE} 테이블이 없습니다 - 'python -m migrations'로 생성하세요")
+        except Exception as e:
+            logging.warning(f"[챗봇 세션] 세션 테이블 확인 실패: {e}")
+        return False
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._engine.connect() as connection:
+            row = connection.execute(self._text(
+                f"SELECT payload, updated_at FROM {SESSION_TABLE} WHERE session_key = :key"
+            ), {"key": key}).fetchone()
+        if row is None or self._expired(row.updated_at):
+            return None
+        return json.loads(row.payload)
+
+    def save(self, key: str, data: Dict):
+        with self._unit_of_work() as connection:
+            connection.execute(self._text(f"""
+                INSERT INTO {SESSION_TABLE} (session_key, payload, updated_at) VALUES (:key, :payload, :updated_at)
+                ON DUPLICATE KEY UPDATE payload = VALUES(payload), updated_at = VALUES(updated_at)
+            """), {"key": key, "payload": json.dumps(data, ensure_ascii=False), "updated_at": time.time()})
+
+    def delete(self, key: str):
+        with self._unit_of_work() as connection:
+            connection.execute(self._text(f"DELETE FROM {SESSION_TABLE} WHERE session_key = :key"), {"key": key})
+
+    def purge_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        with self._unit_of_work() as connection:
+            result = connection.execute(self._text(
+                f"DELETE FROM {SESSION_TABLE} WHERE updated_at < :cutoff"
+            ), {"cutoff": time.time() - self.ttl_seconds})
+            return result.rowcount
+
+
+def create_session_store(settings) -> SessionStore:
+    """ChatbotSettings.SESSION_BACKEND(memory / sqlite / mariadb)에 맞는 저장소 생성. 실패하면 메모리 저장소"""
+    backend = settings.SESSION_BACKEND
+    try:
+        if backend == "sqlite":
+            return SQLiteSessionStore(settings.SESSION_DB_PATH or None, settings.SESSION_TTL_SECONDS)
+        if backend == "mariadb":
+            if MariaDBSessionStore.table_exists():
+                return MariaDBSessionStore(settings.SESSION_TTL_SECONDS)
+            print(f"⚠️ 세션 저장소(mariadb) 테이블 없음 - 메모리 저장소 사용")
+    except Exception as e:
+        print(f"⚠️ 세션 저장소({backend}) 초기화 실패 - 메모리 저장소 사용: {e}")
+    return InMemorySessionStore(settings.SESSION_MAX, settings.SESSION_TTL_SECONDS)
+
+
+# =============================================================================
+# 대화 압축 (rolling summary)
+# =============================================================================
+
+def compaction_split(dialog_log: List[str], summary: str, token_budget: int, keep_recent: int,
+                     count_tokens: Callable[[str], int]) -> int:
+    """압축할 오래된 메시지 수 - (기존 요약 + 대화 기록)이 token_budget 이내이면 0"""
+    if token_budget <= 0 or len(dialog_log) <= keep_recent:
+        return 0
+    if count_tokens("\n".join([summary or ""] + dialog_log)) <= token_budget:
+        return 0
+    return len(dialog_log) - keep_recent
+
+
+def compact_history(dialog_log: List[str], summary: str, token_budget: int, keep_recent: int,
+                    count_tokens: Callable[[str], int],
+                    summarize: Callable[[str, List[str]], str]) -> Tuple[List[str], str]:
+    """
+    (기존 요약 + 대화 기록)이 token_budget 토큰을 넘으면 최근 keep_recent개 메시지만 남기고
+    나머지는 summarize(기존 요약, 오래된 메시지들)로 요약에 합친다.
+    예산 이내이면 그대로 반환. 요약에 실패하면 원본을 유지한다.
+    """
+    split = compaction_split(dialog_log, summary, token_budget, keep_recent, count_tokens)
+    if not split:
+        return dialog_log, summary
+
+    older, recent = dialog_log[:split], dialog_log[split:]
+    try:
+        new_summary = summarize(summary or "", older).strip()
+    except Exception as e:
+        print(f"⚠️ 대화 압축 실패 - 원본 유지: {e}")
+        return dialog_log, summary
+    print(f"🗜️ 대화 압축: 메시지 {len(older)}개 → 요약 {len(new_summary)}자 (최근 {len(recent)}개 유지)")
+    return recent, new_summary
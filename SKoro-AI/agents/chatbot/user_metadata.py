@@ -0,0 +1,259 @@
+# =============================================================================
+# user_metadata.py - 사용자 메타데이터(권한 제어용 role/team) TTL 캐시
+# =============================================================================
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import bindparam, inspect, text
+
+from db import get_engine, get_read_engine, unit_of_work
+
+GENERATION_TABLE = "user_metadata_generation"
+INVALIDATION_TABLE = "user_metadata_invalidations"
+ALL_USERS = "*"
+
+_USER_METADATA_QUERY = """
+    SELECT e.emp_no, e.role, e.team_id, t.team_name
+    FROM employees e
+    JOIN teams t ON e.team_id = t.team_id
+"""
+
+
+def default_user_metadata(user_id: str) -> dict:
+    """사원 정보가 없거나 조회에 실패했을 때의 기본값 (가장 좁은 권한)"""
+    return {
+        "emp_no": user_id,
+        "role": "MEMBER",
+        "team_id": "default",
+        "team_name": "default"
+    }
+
+
+def _row_to_metadata(row) -> dict:
+    return {
+        "emp_no": row.emp_no,
+        "role": row.role,
+        "team_id": row.team_id,
+        "team_name": row.team_name
+    }
+
+
+class UserMetadataCache:
+    """
+    emp_no → {emp_no, role, team_id, team_name} 캐시.
+    - 시작 시 preload()로 전체 사원을 한 번에 적재 → 채팅 경로는 보통 DB 조회 없음
+    - ttl_seconds가 지난 항목은 다음 조회 때 DB에서 다시 읽는다
+    - 인사 변경/평가 워크플로우 완료 시 invalidate()로 무효화. 무효화는 DB의 세대 번호와 사원별 기록
+      (migrations/003)에 남기고, 모든 프로세스가 조회 시 sync_seconds마다 새 기록을 읽어 로컬 캐시에 반영한다
+      (다른 워커/서버에서 호출한 무효화도 sync_seconds 이내에 반영됨)
+    사원 정보가 없거나 조회에 실패한 경우는 캐시하지 않는다 (신규 입사자가 기본 권한에 고정되지 않도록).
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, sync_seconds: float = 5.0):
+        self.ttl_seconds = ttl_seconds
+        self.sync_seconds = sync_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._seen_generation: Optional[int] = None  # 로컬 캐시에 반영한 마지막 무효화 세대
+        self._synced_at = 0.0
+        self._shared: Optional[bool] = None  # 무효화 테이블 사용 가능 여부 (최초 확인 후 고정)
+        self.hits = 0
+        self.misses = 0
+        self.preloaded_at: Optional[float] = None
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return not self.ttl_seconds or time.time() - loaded_at <= self.ttl_seconds
+
+    # ---------------- 공유 무효화 기록 ----------------
+
+    def _shared_available(self) -> bool:
+        if self._shared is None:
+            try:
+                self._shared = inspect(get_engine()).has_table(INVALIDATION_TABLE)
+            except Exception as e:
+                logging.warning(f"[사용자 메타데이터] 무효화 테이블 확인 실패: {e}")
+                return False
+            if not self._shared:
+                logging.warning(f"[사용자 메타데이터] {INVALIDATION_TABLE} 테이블이 없어 무효화는 현재 프로세스에만 적용됩니다 "
+                                f"- 'python -m migrations'로 생성하세요")
+        return self._shared
+
+    def _current_generation(self, connection) -> int:
+        return connection.execute(text(f"SELECT generation FROM {GENERATION_TABLE} WHERE id = 1")).scalar() or 0
+
+    def sync_invalidations(self, force: bool = False) -> int:
+        """
+        다른 프로세스가 남긴 무효화 기록을 로컬 캐시에 반영 (sync_seconds마다 최대 1회, 쿼리 1번).
+        복제본 지연으로 무효화를 놓치지 않도록 primary 엔진에서 읽는다. 삭제한 항목 수 반환
+        """
+        if not force and time.time() - self._synced_at < self.sync_seconds:
+            return 0
+        if not self._shared_available() or not self._sync_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._synced_at = time.time()
+            with get_engine().connect() as connection:
+                if self._seen_generation is None:
+                    self._seen_generation = self._current_generation(connection)
+                    return 0
+                rows = connection.execute(text(f"""
+                    SELECT emp_no, generation FROM {INVALIDATION_TABLE} WHERE generation > :seen
+                """), {"seen": self._seen_generation}).fetchall()
+            if not rows:
+                return 0
+            self._seen_generation = max(row.generation for row in rows)
+            emp_nos = {row.emp_no for row in rows}
+            with self._lock:
+                if ALL_USERS in emp_nos:
+                    removed = len(self._entries)
+                    self._entries.clear()
+                    return removed
+                targets = [emp_no for emp_no in emp_nos if emp_no in self._entries]
+                for emp_no in targets:
+                    del self._entries[emp_no]
+                return len(targets)
+        except Exception as e:
+            logging.warning(f"[사용자 메타데이터] 무효화 기록 조회 실패: {e}")
+            return 0
+        finally:
+            self._sync_lock.release()
+
+    def _record_invalidation(self, emp_nos: Set[str]):
+        """무효화 기록 저장 - 세대 번호 행을 갱신(행 잠금으로 직렬화)한 뒤 대상 사원 기록을 그 세대로 교체"""
+        if not emp_nos or not self._shared_available():
+            return
+        try:
+            with unit_of_work() as connection:
+                connection.execute(text(f"UPDATE {GENERATION_TABLE} SET generation = generation + 1 WHERE id = 1"))
+                generation = self._current_generation(connection)
+                connection.execute(text(f"DELETE FROM {INVALIDATION_TABLE} WHERE emp_no IN :emp_nos")
+                                   .bindparams(bindparam("emp_nos", expanding=True)), {"emp_nos": sorted(emp_nos)})
+                now = datetime.now()
+                connection.execute(text(f"""
+                    INSERT INTO {INVALIDATION_TABLE} (emp_no, generation, updated_at)
+                    VALUES (:emp_no, :generation, :updated_at)
+                """), [{"emp_no": emp_no, "generation": generation, "updated_at": now} for emp_no in sorted(emp_nos)])
+        except Exception as e:
+            logging.warning(f"[사용자 메타데이터] 무효화 기록 저장 실패 (현재 프로세스에만 적용): {e}")
+
+    def _team_members(self, team_ids: Set[str]) -> Set[str]:
+        """현재 DB 기준 팀원 (팀을 옮겨 온 사원 포함)"""
+        if not team_ids:
+            return set()
+        try:
+            with get_engine().connect() as connection:
+                rows = connection.execute(text("SELECT emp_no FROM employees WHERE team_id IN :team_ids")
+                                          .bindparams(bindparam("team_ids", expanding=True)),
+                                          {"team_ids": sorted(team_ids)})
+                return {row.emp_no for row in rows}
+        except Exception as e:
+            logging.warning(f"[사용자 메타데이터] 팀원 조회 실패: {e}")
+            return set()
+
+    # ---------------- 조회 ----------------
+
+    def get(self, user_id: str) -> dict:
+        self.sync_invalidations()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and self._fresh(entry[0]):
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+
+        metadata = self._fetch(user_id)
+        if metadata is None:
+            return default_user_metadata(user_id)
+        with self._lock:
+            self._entries[user_id] = (time.time(), metadata)
+        return dict(metadata)
+
+    def _fetch(self, user_id: str) -> Optional[dict]:
+        try:
+            with get_read_engine().connect() as conn:
+                row = conn.execute(
+                    text(_USER_METADATA_QUERY + " WHERE e.emp_no = :user_id"), {"user_id": user_id}
+                ).fetchone()
+            return _row_to_metadata(row) if row else None
+        except Exception as e:
+            print(f"❌ 사용자 정보 조회 실패: {str(e)}")
+            return None
+
+    def preload(self) -> int:
+        """전체 사원 메타데이터 일괄 적재 (쿼리 1회). 적재한 사원 수 반환"""
+        # 적재 전에 세대 번호를 읽어 두면 적재 도중의 무효화도 다음 동기화에서 반영된다
+        self.sync_invalidations(force=True)
+        with get_read_engine().connect() as conn:
+            rows = conn.execute(text(_USER_METADATA_QUERY)).fetchall()
+        now = time.time()
+        with self._lock:
+            self._entries = {row.emp_no: (now, _row_to_metadata(row)) for row in rows}
+            self.preloaded_at = now
+        return len(rows)
+
+    def invalidate(self, emp_nos: Optional[Iterable[str]] = None, team_ids: Optional[Iterable] = None) -> int:
+        """
+        emp_nos / team_ids에 해당하는 사원 무효화. 둘 다 없으면 전체 무효화.
+        team_ids는 사원 단위로 풀어서 기록한다 - DB 기준 현재 팀원 + 로컬 캐시에 그 팀으로 남아 있는 사원
+        (팀을 옮긴 사원은 옛 팀/새 팀 어느 쪽으로 무효화해도 반영됨).
+        로컬 캐시에서 바로 삭제하고 공유 기록을 남겨 다른 프로세스도 다음 동기화 때 삭제한다. 로컬에서 삭제한 항목 수 반환
+        """
+        if emp_nos is None and team_ids is None:
+            with self._lock:
+                removed = len(self._entries)
+                self._entries.clear()
+            self._record_invalidation({ALL_USERS})
+            return removed
+
+        team_ids = {str(team_id) for team_id in team_ids or []}
+        targets = set(emp_nos or []) | self._team_members(team_ids)
+        with self._lock:
+            targets |= {emp_no for emp_no, (_, metadata) in self._entries.items()
+                        if str(metadata["team_id"]) in team_ids}
+            removed = [emp_no for emp_no in targets if emp_no in self._entries]
+            for emp_no in removed:
+                del self._entries[emp_no]
+        self._record_invalidation(targets)
+        return len(removed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+                "preloaded_at": self.preloaded_at,
+                "shared_invalidation": bool(self._shared),
+                "seen_generation": self._seen_generation,
+            }
+
+
+_user_metadata_cache = None
+_user_metadata_cache_lock = threading.Lock()
+
+
+def get_user_metadata_cache() -> UserMetadataCache:
+    """프로세스 전역 사용자 메타데이터 캐시 반환 (없으면 생성)"""
+    global _user_metadata_cache
+    if _user_metadata_cache is None:
+        with _user_metadata_cache_lock:
+            if _user_metadata_cache is None:
+                from config.settings import ChatbotSettings
+                _user_metadata_cache = UserMetadataCache(ChatbotSettings.USER_METADATA_TTL_SECONDS,
+                                                         ChatbotSettings.USER_METADATA_SYNC_SECONDS)
+    return _user_metadata_cache
+
+
+def invalidate_user_metadata(emp_nos: Optional[Iterable[str]] = None, team_ids: Optional[Iterable] = None) -> int:
+    """인사 변경 / 평가 워크플로우 완료 시 호출하는 무효화 훅"""
+    removed = get_user_metadata_cache().invalidate(emp_nos, team_ids)
+    print(f"🔄 사용자 메타데이터 캐시 무효화: {removed}개")
+    return removed
@@ -0,0 +1,556 @@
+# =============================================================================
+# vector_sync.py - 리포트 벡터DB 증분 동기화 (청크 내용 해시 + manifest)
+# =============================================================================
+#
+# 전체 삭제 후 재구축 대신, 팀/분기 단위로 리포트 청크를 만들어
+#   - 내용 해시가 바뀐 청크만 다시 임베딩해서 upsert
+#   - 더 이상 만들어지지 않는 청크(orphan)는 인덱스와 manifest에서 삭제
+# 한다. manifest는 DB 테이블(migrations/002)에 저장하므로 여러 워커/서버가 같은 기준을 공유한다.
+#
+# 문서 ID는 {emp_no}_individual_p{period_id}_{i} / team{team_id}_team_p{period_id}_{i} 형식이다.
+# 이전 vectorDB_build의 ID({emp_no}_individual_{i}, {emp_no}_team_{i})로 만든 인덱스는
+# --migrate-legacy-ids로 한 번 전환한다 (전체 기간 동기화 후 이전 형식 문서 삭제).
+#
+# 사용 예시:
+#   python -m agents.chatbot.vector_sync --period-id 2
+#   python -m agents.chatbot.vector_sync --period-id 2 --teams 1,3
+#   python -m agents.chatbot.vector_sync --migrate-legacy-ids
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from sqlalchemy import bindparam, inspect, text
+
+from db import get_engine, unit_of_work
+
+MANIFEST_TABLE = "vector_sync_manifest"
+CHUNK_MAX_LENGTH = 1500
+EMBED_BATCH_SIZE = 256
+UPSERT_BATCH_SIZE = 100
+MAX_IN_FLIGHT_UPSERTS = 4
+PROCESS_POOL_MIN_TEAMS = 4
+
+# 이전 vectorDB_build 문서 ID ({emp_no}_individual_{i}, {emp_no}_team_{i}) - 기간(_p{period_id}) 없음
+LEGACY_DOC_ID = re.compile(r".+_(individual|team)_\d+")
+
+
+def manifest_table_exists() -> bool:
+    """manifest 테이블이 있는지 확인 (테이블은 migrations/에서 생성)"""
+    try:
+        if inspect(get_engine()).has_table(MANIFEST_TABLE):
+            return True
+        logging.warning(f"[벡터 동기화] {MANIFEST_TABLE} 테이블이 없습니다 - 'python -m migrations'로 생성하세요")
+    except Exception as e:
+        logging.warning(f"[벡터 동기화] manifest 테이블 확인 실패: {e}")
+    return False
+
+
+# ---------------- 리포트 → 텍스트 청크 ----------------
+
+def report_to_text(report) -> str:
+    """JSON 리포트를 섹션 단위 텍스트로 변환 (최상위 키 = 섹션 제목)"""
+    if isinstance(report, (bytes, bytearray)):
+        report = report.decode("utf-8")
+    if isinstance(report, str):
+        try:
+            report = json.loads(report)
+        except (TypeError, ValueError):
+            return report
+    if isinstance(report, dict):
+        sections = []
+        for title, body in report.items():
+            content = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False, indent=1, default=str)
+            sections.append(f"## {title}\n{content}")
+        return "\n\n".join(sections)
+    return json.dumps(report, ensure_ascii=False, indent=1, default=str)
+
+
+def chunk_report_text(report_text: str, max_length: int = CHUNK_MAX_LENGTH) -> List[str]:
+    """섹션(## 제목) 경계로 나눈 뒤, 긴 섹션은 줄 단위로 max_length 이하가 되도록 다시 나눈다"""
+    chunks: List[str] = []
+    for section in re.split(r"\n(?=## )", report_text or ""):
+        section = section.strip()
+        if not section:
+            continue
+        if len(section) <= max_length:
+            chunks.append(section)
+            continue
+        current = ""
+        for line in section.split("\n"):
+            while len(current) + len(line) + (1 if current else 0) > max_length:
+                room = max_length - len(current) - (1 if current else 0)
+                if current and room < max_length // 10:
+                    # 남은 공간이 너무 작으면 현재 청크를 닫고 새 청크에서 이어서 자름
+                    chunks.append(current)
+                    current = ""
+                    continue
+                piece, line = line[:room], line[room:]
+                chunks.append(f"{current}\n{piece}" if current else piece)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+# ---------------- 리포트 행 조회 (기간 단위 set 조회) ----------------
+
+def _team_filter(column: str, team_ids: Optional[List[int]]) -> str:
+    return f"AND {column} IN :team_ids" if team_ids else ""
+
+
+def _bind(query: str, team_ids: Optional[List[int]]):
+    statement = text(query)
+    if team_ids:
+        statement = statement.bindparams(bindparam("team_ids", expanding=True))
+    return statement
+
+
+def fetch_report_rows(connection, period_id: int, team_ids: Optional[List[int]] = None) -> Dict[int, Dict]:
+    """
+    기간의 팀/팀원/리포트를 3번의 쿼리로 조회.
+    반환: {team_id: {"team": {...}, "members": [...], "reports": {emp_no: report}}}
+    연말(is_final) 분기는 final_evaluation_reports, 그 외는 feedback_reports의 개인 리포트를 사용한다.
+    """
+    params = {"period_id": period_id}
+    if team_ids:
+        params["team_ids"] = list(team_ids)
+    is_final = connection.execute(
+        text("SELECT is_final FROM periods WHERE period_id = :period_id"), {"period_id": period_id}
+    ).scalar()
+    report_table = "final_evaluation_reports" if is_final else "feedback_reports"
+    report_type = "annual" if is_final else "quarterly"
+
+    teams: Dict[int, Dict] = {}
+    for row in connection.execute(_bind(f"""
+        SELECT te.team_id, t.team_name, te.report
+        FROM team_evaluations te
+        JOIN teams t ON te.team_id = t.team_id
+        WHERE te.period_id = :period_id {_team_filter("te.team_id", team_ids)}
+    """, team_ids), params):
+        teams[row.team_id] = {
+            "team": {"team_id": row.team_id, "team_name": row.team_name, "report": row.report,
+                     "period_id": period_id, "report_type": report_type},
+            "members": [],
+            "reports": {},
+        }
+
+    for row in connection.execute(_bind(f"""
+        SELECT e.emp_no, e.emp_name, e.role, e.team_id
+        FROM employees e
+        WHERE e.team_id IN (SELECT team_id FROM team_evaluations WHERE period_id = :period_id)
+        {_team_filter("e.team_id", team_ids)}
+        ORDER BY e.emp_no
+    """, team_ids), params):
+        if row.team_id in teams:
+            teams[row.team_id]["members"].append(dict(row._mapping))
+
+    for row in connection.execute(_bind(f"""
+        SELECT te.team_id, r.emp_no, r.report
+        FROM {report_table} r
+        JOIN team_evaluations te ON r.team_evaluation_id = te.team_evaluation_id
+        WHERE te.period_id = :period_id AND r.report IS NOT NULL {_team_filter("te.team_id", team_ids)}
+    """, team_ids), params):
+        if row.team_id in teams:
+            teams[row.team_id]["reports"][row.emp_no] = row.report
+
+    return teams
+
+
+# ---------------- 청크 문서 생성 ----------------
+
+def build_team_documents(team_data: Dict, max_length: int = CHUNK_MAX_LENGTH) -> List[Dict]:
+    """
+    팀 하나의 리포트 청크 문서 목록 [{"id", "content", "metadata"}] (DB 접근 없는 순수 함수).
+    권한 규칙은 vectorDB_build와 같다.
+      - 개인 리포트: 본인 + 팀 매니저
+      - 팀 리포트: 팀 매니저만
+    """
+    team = team_data["team"]
+    period_id = team["period_id"]
+    managers = [member["emp_no"] for member in team_data["members"] if member["role"] == "MANAGER"]
+    base_metadata = {
+        "team_id": team["team_id"],
+        "team_name": team["team_name"] or "",
+        "period_id": period_id,
+        "report_type": team["report_type"],
+    }
+
+    documents = []
+
+    def add_chunks(report, doc_prefix: str, doc_type: str, accessible_by: List[str], extra: Dict):
+        for i, chunk in enumerate(chunk_report_text(report_to_text(report), max_length)):
+            doc_id = f"{doc_prefix}_p{period_id}_{i}"
+            documents.append({
+                "id": doc_id,
+                "content": chunk,
+                "metadata": {
+                    **base_metadata,
+                    **extra,
+                    "chunk_index": i,
+                    "type": doc_type,
+                    "doc_id": doc_id,
+                    "accessible_by": accessible_by,
+                    "content": chunk,
+                },
+            })
+
+    for member in team_data["members"]:
+        report = team_data["reports"].get(member["emp_no"])
+        if not report:
+            continue
+        accessible_by = [member["emp_no"]] + [manager for manager in managers if manager != member["emp_no"]]
+        add_chunks(report, f"{member['emp_no']}_individual", "individual_report", accessible_by, {
+            "emp_no": member["emp_no"],
+            "emp_name": member["emp_name"] or "",
+            "role": member["role"] or "",
+        })
+
+    if team["report"] and managers:
+        add_chunks(team["report"], f"team{team['team_id']}_team", "team_report", managers, {
+            "emp_no": managers[0],
+            "role": "MANAGER",
+        })
+
+    return documents
+
+
+def content_hash(document: Dict) -> str:
+    payload = json.dumps([document["content"], document["metadata"]], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------- 파이프라인 구성 요소 ----------------
+
+def iter_team_documents(teams: Dict[int, Dict], team_ids: List[int], workers: Optional[int] = None):
+    """
+    (team_id, 청크 문서 목록)을 team_ids 순서대로 생성.
+    workers가 2 이상이고 팀 수가 PROCESS_POOL_MIN_TEAMS 이상이면 청크 생성을 프로세스 풀(spawn)에서 병렬로 처리한다.
+    기본(workers=None)은 현재 프로세스에서 처리 - 워크플로우 훅처럼 몇 개 팀만 동기화할 때는 프로세스 기동 비용이 더 크다.
+    프로세스 풀은 CLI 전체 구축(--rebuild / --migrate-legacy-ids)에서만 사용한다.
+    """
+    present = [team_id for team_id in team_ids if team_id in teams]
+    workers = workers or 1
+    if workers > 1 and len(present) >= PROCESS_POOL_MIN_TEAMS:
+        chunksize = max(1, len(present) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # map은 입력 순서대로 결과를 내보내므로, 앞 팀을 임베딩하는 동안 뒤 팀 청크 생성이 계속 진행됨
+            yield from zip(present, pool.map(build_team_documents, [teams[team_id] for team_id in present],
+                                             chunksize=chunksize))
+    else:
+        for team_id in present:
+            yield team_id, build_team_documents(teams[team_id])
+    # 리포트가 사라진 팀 (manifest에만 남은 청크 삭제용)
+    for team_id in team_ids:
+        if team_id not in teams:
+            yield team_id, []
+
+
+class BoundedUploader:
+    """upsert를 스레드 풀에서 동시에 실행하되, 진행 중인 배치 수를 max_in_flight로 제한 (메모리 상한)"""
+
+    def __init__(self, index, max_in_flight: int = MAX_IN_FLIGHT_UPSERTS):
+        self.index = index
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="vector-upsert")
+        self._futures = []
+
+    def _upsert(self, vectors: List[Dict]):
+        try:
+            self.index.upsert(vectors=vectors)
+        finally:
+            self._slots.release()
+
+    def submit(self, vectors: List[Dict]):
+        self._slots.acquire()
+        self._futures.append(self._executor.submit(self._upsert, vectors))
+
+    def wait(self):
+        """모든 upsert 완료 대기 - 하나라도 실패하면 예외를 그대로 전달"""
+        for future in self._futures:
+            future.result()
+        self._futures = []
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def peak_memory_mb() -> Optional[float]:
+    """현재 프로세스(+자식 프로세스 중 최대) 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024  # macOS는 bytes, Linux는 KB
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak / divisor, 1)
+
+
+# ---------------- 동기화 ----------------
+
+class ReportVectorSync:
+    """
+    리포트 인덱스 증분 동기화.
+    index / embedding_model을 주지 않으면 챗봇 공용 자원(get_chatbot_config)을 사용한다.
+    """
+
+    def __init__(self, index=None, embedding_model=None, index_name: Optional[str] = None):
+        if index is None or embedding_model is None:
+            from agents.chatbot.llm_utils import get_chatbot_config
+            config = get_chatbot_config()
+            index = index if index is not None else config.index_reports
+            embedding_model = embedding_model if embedding_model is not None else config.embedding_model
+            backend = config.settings.VECTOR_BACKEND
+        else:
+            backend = "custom"
+        self.index = index
+        self.embedding_model = embedding_model
+        self.index_name = index_name or f"{backend}:{os.getenv('PINECONE_INDEX_REPORTS') or 'reports'}"
+        self.available = manifest_table_exists()
+
+    def _load_manifest(self, period_id: int, team_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+        team_ids = list(team_ids)
+        manifest: Dict[int, Dict[str, str]] = {team_id: {} for team_id in team_ids}
+        if not team_ids:
+            return manifest
+        with get_engine().connect() as connection:
+            rows = connection.execute(text(f"""
+                SELECT team_id, doc_id, content_hash FROM {MANIFEST_TABLE}
+                WHERE index_name = :index_name AND period_id = :period_id AND team_id IN :team_ids
+            """).bindparams(bindparam("team_ids", expanding=True)),
+                {"index_name": self.index_name, "period_id": period_id, "team_ids": team_ids})
+            for row in rows:
+                manifest.setdefault(row.team_id, {})[row.doc_id] = row.content_hash
+        return manifest
+
+    def _save_manifest(self, period_id: int, upserted: List[Dict], deleted_ids: List[str]):
+        now = datetime.now()
+        removed = [doc["id"] for doc in upserted] + deleted_ids
+        with unit_of_work() as connection:
+            for start in range(0, len(removed), UPSERT_BATCH_SIZE):
+                connection.execute(text(f"""
+                    DELETE FROM {MANIFEST_TABLE} WHERE index_name = :index_name AND doc_id IN :doc_ids
+                """).bindparams(bindparam("doc_ids", expanding=True)),
+                    {"index_name": self.index_name, "doc_ids": removed[start:start + UPSERT_BATCH_SIZE]})
+            if upserted:
+                connection.execute(text(f"""
+                    INSERT INTO {MANIFEST_TABLE} (index_name, doc_id, period_id, team_id, content_hash, updated_at)
+                    VALUES (:index_name, :doc_id, :period_id, :team_id, :content_hash, :updated_at)
+                """), [
+                    {"index_name": self.index_name, "doc_id": doc["id"], "period_id": period_id,
+                     "team_id": doc["metadata"]["team_id"], "content_hash": doc["hash"], "updated_at": now}
+                    for doc in upserted
+                ])
+
+    def clear_manifest(self, period_id: Optional[int] = None):
+        """manifest 삭제 (period_id를 주면 해당 기간만)"""
+        with unit_of_work() as connection:
+            if period_id is None:
+                connection.execute(text(f"DELETE FROM {MANIFEST_TABLE} WHERE index_name = :index_name"),
+                                   {"index_name": self.index_name})
+            else:
+                connection.execute(text(f"""
+                    DELETE FROM {MANIFEST_TABLE} WHERE index_name = :index_name AND period_id = :period_id
+                """), {"index_name": self.index_name, "period_id": period_id})
+
+    def _embed_and_submit(self, documents: List[Dict], uploader: "BoundedUploader"):
+        """한 배치를 임베딩하고 upsert 배치들을 업로더에 넘김 (업로드는 다음 임베딩과 겹쳐서 진행)"""
+        vectors = self.embedding_model.embed_documents([doc["content"] for doc in documents])
+        for start in range(0, len(documents), UPSERT_BATCH_SIZE):
+            uploader.submit([
+                {"id": doc["id"], "values": list(vector), "metadata": doc["metadata"]}
+                for doc, vector in zip(documents[start:start + UPSERT_BATCH_SIZE],
+                                       vectors[start:start + UPSERT_BATCH_SIZE])
+            ])
+
+    def sync(self, period_id: int, team_ids: Optional[List[int]] = None, dry_run: bool = False,
+             full: bool = False, build_workers: Optional[int] = None, embed_batch_size: int = EMBED_BATCH_SIZE,
+             max_in_flight: int = MAX_IN_FLIGHT_UPSERTS) -> Dict:
+        """
+        기간(및 지정 팀)의 리포트 청크를 manifest와 비교해 변경분만 반영.
+        team_ids가 없으면 해당 기간의 전체 팀을 동기화한다. full=True이면 해시와 관계없이 모두 다시 임베딩한다.
+
+        조회(기간 단위 set 조회) → 청크 생성(팀 수가 많으면 프로세스 풀) → 변경분만 embed_batch_size 단위 임베딩
+        → 최대 max_in_flight개 upsert 동시 진행 순으로 스트리밍 처리한다.
+        """
+        if not self.available:
+            raise RuntimeError("벡터 동기화 manifest 테이블을 사용할 수 없습니다.")
+        started_at = time.perf_counter()
+
+        with get_engine().connect() as connection:
+            teams = fetch_report_rows(connection, period_id, team_ids)
+        manifest = self._load_manifest(period_id, team_ids or list(teams))
+        fetched_at = time.perf_counter()
+
+        uploader = None if dry_run else BoundedUploader(self.index, max_in_flight)
+        changed: List[Dict] = []
+        deleted_ids: List[str] = []
+        buffer: List[Dict] = []
+        built = unchanged = 0
+        try:
+            for team_id, documents in iter_team_documents(teams, list(manifest), build_workers):
+                stored = manifest[team_id]
+                current_ids = set()
+                built += len(documents)
+                for document in documents:
+                    document["hash"] = content_hash(document)
+                    current_ids.add(document["id"])
+                    if not full and stored.get(document["id"]) == document["hash"]:
+                        unchanged += 1
+                        continue
+                    changed.append(document)
+                    if uploader is not None:
+                        buffer.append(document)
+                        if len(buffer) >= embed_batch_size:
+                            self._embed_and_submit(buffer, uploader)
+                            buffer = []
+                deleted_ids.extend(doc_id for doc_id in stored if doc_id not in current_ids)
+
+            if uploader is not None:
+                if buffer:
+                    self._embed_and_submit(buffer, uploader)
+                uploader.wait()
+        finally:
+            if uploader is not None:
+                uploader.close()
+
+        if not dry_run:
+            for start in range(0, len(deleted_ids), UPSERT_BATCH_SIZE):
+                self.index.delete(ids=deleted_ids[start:start + UPSERT_BATCH_SIZE])
+            if hasattr(self.index, "save"):
+                # 로컬 FAISS 인덱스는 파일로 저장해야 다른 워커가 읽을 수 있음
+                self.index.save()
+            self._save_manifest(period_id, changed, deleted_ids)
+
+        elapsed = time.perf_counter() - started_at
+        stats = {
+            "period_id": period_id, "teams": sorted(manifest), "built": built, "upserted": len(changed),
+            "deleted": len(deleted_ids), "unchanged": unchanged, "dry_run": dry_run, "full": full,
+            "fetch_seconds": round(fetched_at - started_at, 2), "elapsed_seconds": round(elapsed, 2),
+            "docs_per_second": round(built / elapsed, 1) if elapsed else 0.0,
+            "embedded_per_second": round(len(changed) / elapsed, 1) if elapsed and not dry_run else 0.0,
+            "peak_memory_mb": peak_memory_mb(),
+        }
+        logging.info(f"[벡터 동기화] 기간 {period_id} 팀 {stats['teams']}: "
+                     f"upsert {stats['upserted']}, 삭제 {stats['deleted']}, 변경 없음 {stats['unchanged']} "
+                     f"({stats['elapsed_seconds']}초, {stats['docs_per_second']} docs/s)")
+        return stats
+
+    def _period_ids(self) -> List[int]:
+        with get_engine().connect() as connection:
+            return [row[0] for row in connection.execute(
+                text("SELECT DISTINCT period_id FROM team_evaluations ORDER BY period_id"))]
+
+    def rebuild(self, period_id: Optional[int] = None, **kwargs) -> Dict:
+        """
+        기간 리포트를 전부 다시 임베딩해서 재구축.
+        period_id를 주면 그 기간의 문서(ID의 _p{period_id}_)와 manifest만 지우고 다시 만든다 (다른 기간 문서는 유지).
+        period_id가 없으면 인덱스 전체를 지우고 리포트가 있는 모든 기간을 다시 만든다.
+        """
+        if period_id is None:
+            self.index.delete(delete_all=True)
+            self.clear_manifest()
+            periods = [self.sync(pid, full=True, **kwargs) for pid in self._period_ids()]
+            return {"periods": periods, "built": sum(stats["built"] for stats in periods)}
+
+        marker = f"_p{period_id}_"
+        stale_ids = [doc_id for ids in self.index.list() for doc_id in ids if marker in doc_id]
+        for start in range(0, len(stale_ids), UPSERT_BATCH_SIZE):
+            self.index.delete(ids=stale_ids[start:start + UPSERT_BATCH_SIZE])
+        self.clear_manifest(period_id)
+        return self.sync(period_id, full=True, **kwargs)
+
+    def migrate_legacy_ids(self, dry_run: bool = False, **kwargs) -> Dict:
+        """
+        이전 vectorDB_build ID 형식에서 한 번 전환.
+        리포트가 있는 모든 기간을 동기화해 새 ID 문서를 만든 뒤, 이전 형식 ID 문서를 인덱스에서 삭제한다
+        (삭제 전에 새 문서가 들어가므로 전환 중에도 검색 결과가 비지 않음).
+        """
+        period_ids = self._period_ids()
+        periods = [self.sync(period_id, dry_run=dry_run, **kwargs) for period_id in period_ids]
+
+        legacy_ids = [doc_id for ids in self.index.list() for doc_id in ids if LEGACY_DOC_ID.fullmatch(doc_id)]
+        if not dry_run:
+            for start in range(0, len(legacy_ids), UPSERT_BATCH_SIZE):
+                self.index.delete(ids=legacy_ids[start:start + UPSERT_BATCH_SIZE])
+            if hasattr(self.index, "save"):
+                self.index.save()
+        logging.info(f"[벡터 동기화] ID 형식 전환: 기간 {period_ids} 동기화, 이전 형식 문서 {len(legacy_ids)}개 삭제")
+        return {"periods": periods, "legacy_deleted": len(legacy_ids), "dry_run": dry_run}
+
+
+def sync_team_reports(period_id: int, team_ids: List[int]) -> Optional[Dict]:
+    """워크플로우 리포트 단계 직후 호출 - 실패해도 평가 결과에는 영향 없이 경고만 남긴다 (청크 생성은 현재 프로세스에서)"""
+    try:
+        return ReportVectorSync().sync(period_id, team_ids, build_workers=1)
+    except Exception as e:
+        logging.warning(f"[벡터 동기화] 기간 {period_id} 팀 {team_ids} 동기화 실패 (다음 동기화에서 재시도): {e}")
+        return None
+
+
+def _print_summary(stats: Dict):
+    print(f"  [기간 {stats['period_id']}] 대상 팀: {len(stats['teams'])}개 / 생성 청크: {stats['built']}개")
+    print(f"  upsert: {stats['upserted']}개 / 삭제: {stats['deleted']}개 / 변경 없음: {stats['unchanged']}개")
+    print(f"  조회: {stats['fetch_seconds']}초 / 전체: {stats['elapsed_seconds']}초")
+    print(f"  처리량: {stats['docs_per_second']} docs/s (임베딩 {stats['embedded_per_second']} docs/s)")
+    print(f"  최대 메모리: {stats['peak_memory_mb']} MB")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="리포트 벡터DB 증분 동기화 / 재구축")
+    parser.add_argument("--period-id", type=int, default=None, help="--rebuild에서 생략하면 전체 기간")
+    parser.add_argument("--teams", type=str, default=None, help="쉼표로 구분한 팀 ID (생략 시 전체 팀)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 건수만 계산하고 반영하지 않음")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="기간 문서 삭제 후 재구축 (--period-id 생략 시 인덱스 전체를 모든 기간으로 재구축)")
+    parser.add_argument("--migrate-legacy-ids", action="store_true",
+                        help="전체 기간 동기화 후 이전 vectorDB_build ID 형식 문서 삭제 (한 번 실행)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="청크 생성 프로세스 수 (기본: 재구축/전환은 CPU 수(최대 4), 증분 동기화는 현재 프로세스)")
+    parser.add_argument("--embed-batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT_UPSERTS, help="동시 upsert 배치 수")
+    args = parser.parse_args()
+
+    offline_build = args.rebuild or args.migrate_legacy_ids
+    teams = [int(team_id) for team_id in args.teams.split(",")] if args.teams else None
+    options = {
+        "build_workers": args.workers if args.workers is not None or not offline_build else min(4, os.cpu_count() or 1),
+        "embed_batch_size": args.embed_batch_size,
+        "max_in_flight": args.max_in_flight,
+    }
+    if not offline_build and args.period_id is None:
+        parser.error("--period-id가 필요합니다")
+
+    sync = ReportVectorSync()
+    if args.migrate_legacy_ids:
+        result = sync.migrate_legacy_ids(dry_run=args.dry_run, **options)
+        periods = result["periods"]
+        print(f"✅ ID 형식 전환: 기간 {len(periods)}개 동기화, 이전 형식 문서 {result['legacy_deleted']}개 삭제")
+    elif args.rebuild:
+        result = sync.rebuild(args.period_id, **options)
+        periods = result["periods"] if args.period_id is None else [result]
+    else:
+        periods = [sync.sync(args.period_id, teams, dry_run=args.dry_run, **options)]
+
+    print("\n" + "=" * 60)
+    print("📊 벡터DB 동기화 요약")
+    print("=" * 60)
+    for stats in periods:
+        _print_summary(stats)
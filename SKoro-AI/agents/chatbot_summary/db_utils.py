@@ -5,7 +5,8 @@
 
 import pandas as pd
 from typing import List, Dict, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from db import get_engine
 
 
 class DatabaseManager:
@@ -18,7 +19,7 @@ class DatabaseManager:
         Args:
             database_url: 데이터베이스 연결 URL
         """
-        self.engine = create_engine(database_url, pool_pre_ping=True)
+        self.engine = get_engine(database_url)
     
     def test_connection(self) -> bool:
         """
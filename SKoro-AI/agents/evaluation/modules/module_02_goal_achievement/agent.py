@@ -38,6 +38,9 @@ class Module2State(TypedDict):
     
     # 특별 전달 데이터 (서브모듈 간 필요시만)
     team_context_guide: Optional[Dict]
+    
+    # 팀 단위 조회 스냅샷 (data_collection_submodule에서 적재)
+    team_snapshot: Optional[TeamPeriodSnapshot]
 
 # ================================================================
 # 에러 처리 클래스
@@ -50,6 +53,15 @@ class DataIntegrityError(Exception):
 # 서브모듈 함수들
 # ================================================================
 
+def get_team_snapshot(state: Module2State) -> TeamPeriodSnapshot:
+    """state의 팀 스냅샷 반환 (서브모듈을 단독 호출한 경우 여기서 적재)"""
+    if not state.get('team_snapshot'):
+        state['team_snapshot'] = TeamPeriodSnapshot.load(
+            state['team_id'], state['period_id'],
+            state['target_task_ids'], state['target_team_kpi_ids']
+        )
+    return state['team_snapshot']
+
 def data_collection_submodule(state: Module2State) -> Module2State:
     """데이터 수집 서브모듈"""
     print(f"   📋 데이터 수집 중...")
@@ -61,9 +73,14 @@ def data_collection_submodule(state: Module2State) -> Module2State:
     
     state['team_evaluation_id'] = team_evaluation_id
     
+    # 팀원 / 누적 Task / KPI / 등급 기준을 한 번에 적재
+    state['team_snapshot'] = None
+    snapshot = get_team_snapshot(state)
+    print(f"      • 스냅샷 적재: 팀원 {len(snapshot.members)}명, Task {len(snapshot.tasks)}개, KPI {len(snapshot.kpis)}개")
+    
     # evaluation_type 확인/설정
     for kpi_id in state['target_team_kpi_ids']:
-        evaluation_type = check_evaluation_type(kpi_id)
+        evaluation_type = snapshot.get_evaluation_type(kpi_id)
         print(f"      • KPI {kpi_id}: {evaluation_type} 평가")
     
     print(f"   ✅ 데이터 수집 완료")
@@ -73,12 +90,14 @@ def achievement_and_grade_calculation_submodule(state: Module2State) -> Module2S
     """달성률+등급 계산 서브모듈 (통합) - 우리가 상의한 배치 처리"""
     print(f"   🎯 달성률 및 등급 계산 중...")
     
-    updated_task_ids = []
+    snapshot = get_team_snapshot(state)
     batch_data = []
+    summary_updates = {}  # {task_summary_id: data} - 계산이 끝난 뒤 한 번에 저장
+    task_ids_by_summary = {}
     
     # 배치용 데이터 준비
     for task_id in state['target_task_ids']:
-        task_data = fetch_cumulative_task_data(task_id, state['period_id'])
+        task_data = snapshot.get_cumulative_task(task_id)
         if not task_data:
             continue
             
@@ -88,7 +107,7 @@ def achievement_and_grade_calculation_submodule(state: Module2State) -> Module2S
             "target_level": task_data.get('target_level', ''),
             "cumulative_performance": task_data.get('cumulative_performance', ''),
             "cumulative_summary": task_data.get('cumulative_task_summary', ''),
-            "kpi_data": fetch_team_kpi_data(task_data.get('team_kpi_id') or 0)
+            "kpi_data": snapshot.get_kpi(task_data.get('team_kpi_id') or 0)
         })
     
     # 배치 처리 (15개씩)
@@ -111,8 +130,13 @@ def achievement_and_grade_calculation_submodule(state: Module2State) -> Module2S
             if state['report_type'] == "annual" and result.get('grade'):
                 update_data["ai_assessed_grade"] = result['grade']
             
-            if update_task_summary(task_summary_id, update_data):
-                updated_task_ids.append(task_data['task_id'])
+            summary_updates[task_summary_id] = update_data
+            task_ids_by_summary[task_summary_id] = task_data['task_id']
+    
+    # 팀 단위 한 트랜잭션으로 일괄 저장
+    saved_summary_ids = bulk_update_task_summaries(summary_updates)
+    snapshot.apply_task_summary_updates({ts_id: summary_updates[ts_id] for ts_id in saved_summary_ids})
+    updated_task_ids = [task_ids_by_summary[ts_id] for ts_id in saved_summary_ids]
     
     state['updated_task_ids'] = updated_task_ids
     print(f"   ✅ 달성률 계산 완료: {len(updated_task_ids)}개 Task 업데이트")
@@ -122,20 +146,25 @@ def contribution_calculation_submodule(state: Module2State) -> Module2State:
     """기여도 계산 서브모듈 - 우리가 상의한 하이브리드 방식"""
     print(f"   ⚖️ 기여도 계산 중...")
     
-    updated_task_ids = []
+    snapshot = get_team_snapshot(state)
+    summary_updates = {}  # {task_summary_id: data} - 마지막에 최종 기여도와 함께 한 트랜잭션으로 저장
+    task_ids_by_summary = {}
     kpi_contributions_by_emp = {}  # {emp_no: total_score} - 하이브리드 3단계 결과
+    contributions_by_kpi = {}  # {kpi_id: {emp_no: 기여도}} - 디버깅 출력에 재사용
     
     # KPI별로 처리
     for kpi_id in state['target_team_kpi_ids']:
-        evaluation_type = check_evaluation_type(kpi_id)
-        kpi_data = fetch_team_kpi_data(kpi_id)
+        evaluation_type = snapshot.get_evaluation_type(kpi_id)
+        kpi_data = snapshot.get_kpi(kpi_id)
+        kpi_tasks = snapshot.get_kpi_tasks(kpi_id)
         
         if evaluation_type == "quantitative":
             # 정량 평가: 개인성과/팀전체성과 × 100
-            contributions = calculate_quantitative_contributions(kpi_id, state['period_id'])
+            contributions = calculate_quantitative_contributions(kpi_id, state['period_id'], kpi_tasks)
         else:
             # 정성 평가: LLM 기반 상대 평가
-            contributions = calculate_qualitative_contributions(kpi_id, state['period_id'], kpi_data)
+            contributions = calculate_qualitative_contributions(kpi_id, state['period_id'], kpi_data, kpi_tasks)
+        contributions_by_kpi[kpi_id] = contributions
         
         # 🔧 추가: KPI별 기여도 합계 검증
         total_contribution = sum(contributions.values())
@@ -144,7 +173,6 @@ def contribution_calculation_submodule(state: Module2State) -> Module2State:
         print(f"      ✅ KPI {kpi_id} 기여도 합계: {total_contribution:.1f}%")
         
         # 하이브리드 1단계: 참여자 수 보정
-        kpi_tasks = fetch_kpi_tasks(kpi_id, state['period_id'])
         participants_count = len(set(task['emp_no'] for task in kpi_tasks))
         
         print(f"      • KPI {kpi_id}: {evaluation_type} 평가, 참여자 {participants_count}명")
@@ -165,18 +193,19 @@ def contribution_calculation_submodule(state: Module2State) -> Module2State:
         
         # Task별 기여도 업데이트 (원래 KPI별 기여도 저장)
         for task in kpi_tasks:
-            task_data = fetch_cumulative_task_data(task['task_id'], state['period_id'])
+            task_data = snapshot.get_cumulative_task(task['task_id'])
             if not task_data:
                 continue
                 
             emp_contribution = contributions.get(task['emp_no'], 0)
             
-            update_data = {
+            if not task_data.get('task_summary_id'):
+                continue
+            
+            summary_updates[task_data['task_summary_id']] = {
                 "ai_contribution_score": int(emp_contribution)  # KPI별 원래 기여도
             }
-            
-            if update_task_summary(task_data['task_summary_id'], update_data):
-                updated_task_ids.append(task['task_id'])
+            task_ids_by_summary[task_data['task_summary_id']] = task['task_id']
     
     # 하이브리드 3단계: 팀 내 % 기여도 변환
     total_team_score = sum(kpi_contributions_by_emp.values())
@@ -195,59 +224,54 @@ def contribution_calculation_submodule(state: Module2State) -> Module2State:
             for emp_no in kpi_contributions_by_emp:
                 final_contributions[emp_no] = round(equal_share, 2)
     
-    # 최종 기여도를 feedback_reports 또는 final_evaluation_reports에 저장
-    save_final_contributions_to_db(state, final_contributions)
+    # Task별 기여도 + 최종 기여도(feedback_reports 또는 final_evaluation_reports)를 한 번에 저장
+    with unit_of_work() as connection:
+        saved_summary_ids = bulk_update_task_summaries(summary_updates, connection)
+        save_final_contributions_to_db(state, final_contributions, connection)
+    snapshot.apply_task_summary_updates({ts_id: summary_updates[ts_id] for ts_id in saved_summary_ids})
+    updated_task_ids = [task_ids_by_summary[ts_id] for ts_id in saved_summary_ids]
     
-    # 디버깅: 하이브리드 계산 과정 시각화
-    debug_contribution_calculation(state)
+    # 정성 KPI는 calculate_qualitative_contributions에서 team_kpis를 갱신하므로 KPI만 재조회
+    snapshot.refresh_kpis()
+    
+    # 디버깅: 하이브리드 계산 과정 시각화 (위에서 계산한 기여도 재사용)
+    debug_contribution_calculation(state, contributions_by_kpi)
     
     state['updated_task_ids'] = list(set((state['updated_task_ids'] or []) + updated_task_ids))
     print(f"   ✅ 기여도 계산 완료: {len(updated_task_ids)}개 Task 업데이트, {len(final_contributions)}명 최종 기여도 저장")
     return state
 
-def save_final_contributions_to_db(state: Module2State, final_contributions: Dict[str, float]):
+def save_final_contributions_to_db(state: Module2State, final_contributions: Dict[str, float], connection=None):
     """최종 기여도를 DB에 저장"""
-    team_members = fetch_team_members(state['team_id'])
+    team_members = get_team_snapshot(state).members
     
-    for member in team_members:
-        if member.get('role') == 'MANAGER':
-            continue
-            
-        emp_no = member['emp_no']
-        final_contribution = final_contributions.get(emp_no, 0)
-        
-        if state['report_type'] == "quarterly":
-            # 분기별: feedback_reports에 저장
-            save_feedback_report(
-                emp_no, 
-                state['team_evaluation_id'] or 0,
-                {"contribution_rate": int(final_contribution)}  # 기존 컬럼명 사용
-            )
-        else:
-            # 연말: final_evaluation_reports에 저장
-            save_final_evaluation_report(
-                emp_no,
-                state['team_evaluation_id'] or 0,
-                {"contribution_rate": int(final_contribution)}  # 기존 컬럼명 사용
-            )
-
-def debug_contribution_calculation(state: Module2State):
+    contribution_data = {
+        member['emp_no']: {"contribution_rate": int(final_contributions.get(member['emp_no'], 0))}  # 기존 컬럼명 사용
+        for member in team_members
+        if member.get('role') != 'MANAGER'
+    }
+    
+    if state['report_type'] == "quarterly":
+        # 분기별: feedback_reports에 저장
+        bulk_save_feedback_reports(state['team_evaluation_id'] or 0, contribution_data, connection)
+    else:
+        # 연말: final_evaluation_reports에 저장
+        bulk_save_final_evaluation_reports(state['team_evaluation_id'] or 0, contribution_data, connection)
+
+def debug_contribution_calculation(state: Module2State, contributions_by_kpi: Dict[int, Dict[str, float]]):
     """기여도 계산 과정 디버깅 - 하이브리드 방식 검증"""
     print(f"\n🔍 기여도 계산 과정 디버깅")
     print(f"{'='*50}")
     
-    # 1단계: KPI별 원래 기여도 수집
+    snapshot = get_team_snapshot(state)
+    
+    # 1단계: KPI별 원래 기여도 수집 (LLM 재호출 없이 계산 결과 재사용)
     kpi_contributions = {}
     for kpi_id in state['target_team_kpi_ids']:
-        evaluation_type = check_evaluation_type(kpi_id)
-        kpi_data = fetch_team_kpi_data(kpi_id)
-        kpi_tasks = fetch_kpi_tasks(kpi_id, state['period_id'])
+        kpi_data = snapshot.get_kpi(kpi_id)
+        kpi_tasks = snapshot.get_kpi_tasks(kpi_id)
         participants_count = len(set(task['emp_no'] for task in kpi_tasks))
-        
-        if evaluation_type == "quantitative":
-            contributions = calculate_quantitative_contributions(kpi_id, state['period_id'])
-        else:
-            contributions = calculate_qualitative_contributions(kpi_id, state['period_id'], kpi_data)
+        contributions = contributions_by_kpi.get(kpi_id, {})
         
         kpi_contributions[kpi_id] = {
             'kpi_name': kpi_data.get('kpi_name', f'KPI{kpi_id}'),
@@ -303,34 +327,36 @@ def team_analysis_submodule(state: Module2State) -> Module2State:
     """팀 목표 분석 서브모듈 - 우리가 상의한 LLM 기반"""
     print(f"   🏢 팀 목표 분석 중...")
     
-    updated_kpi_ids = []
+    snapshot = get_team_snapshot(state)
+    kpi_updates = {}  # {team_kpi_id: data} - LLM 계산이 끝난 뒤 한 번에 저장
     kpi_rates = []
     
     # 정량 평가 KPI들 처리 (LLM으로 팀 KPI 달성률 계산)
     for kpi_id in state['target_team_kpi_ids']:
-        evaluation_type = check_evaluation_type(kpi_id)
+        evaluation_type = snapshot.get_evaluation_type(kpi_id)
         
         if evaluation_type == "quantitative":
             # 정량 KPI도 LLM이 종합 판단
-            kpi_data = fetch_team_kpi_data(kpi_id)
-            kpi_rate = calculate_team_kpi_achievement_rate(kpi_id, state['period_id'], kpi_data)
+            kpi_data = snapshot.get_kpi(kpi_id)
+            kpi_rate = calculate_team_kpi_achievement_rate(kpi_id, state['period_id'], kpi_data,
+                                                           snapshot.get_kpi_tasks(kpi_id))
             
-            update_data = {
+            kpi_updates[kpi_id] = {
                 "ai_kpi_progress_rate": int(kpi_rate['rate']),
                 "ai_kpi_analysis_comment": kpi_rate['comment']
             }
-            
-            if update_team_kpi(kpi_id, update_data):
-                updated_kpi_ids.append(kpi_id)
-                kpi_rates.append(kpi_rate['rate'])
+            kpi_rates.append(kpi_rate['rate'])
         else:
             # 정성 KPI는 이미 서브모듈 3에서 처리됨
-            kpi_data = fetch_team_kpi_data(kpi_id)
+            kpi_data = snapshot.get_kpi(kpi_id)
             if kpi_data.get('ai_kpi_progress_rate') is not None:
                 kpi_rates.append(kpi_data['ai_kpi_progress_rate'])
     
+    updated_kpi_ids = bulk_update_team_kpis(kpi_updates)
+    snapshot.apply_team_kpi_updates({kpi_id: kpi_updates[kpi_id] for kpi_id in updated_kpi_ids})
+    
     # 팀 전체 평균 달성률 계산 (KPI 비중 고려)
-    team_average_rate = calculate_team_average_achievement_rate(state['target_team_kpi_ids'])
+    team_average_rate = calculate_team_average_achievement_rate(state['target_team_kpi_ids'], snapshot.kpis)
     
     # team_evaluations 업데이트
     team_eval_data = {
@@ -355,7 +381,7 @@ def comment_generation_submodule(state: Module2State) -> Module2State:
     print(f"   📝 코멘트 생성 중...")
     
     # 팀 일관성 가이드 생성
-    team_context_guide = generate_team_consistency_guide(state['team_id'], state['period_id'])
+    team_context_guide = generate_team_consistency_guide(state['team_id'], state['period_id'], get_team_snapshot(state))
     state['team_context_guide'] = team_context_guide
     
     # 통합 코멘트 생성기 사용
@@ -368,10 +394,12 @@ def comment_generation_submodule(state: Module2State) -> Module2State:
 
 def generate_task_comments_unified(state: Module2State):
     """Task별 코멘트 생성 (통합 시스템)"""
+    snapshot = get_team_snapshot(state)
     period_type = "annual" if state['report_type'] == "annual" else "quarterly"
+    comment_updates = {}
     
     for task_id in state['target_task_ids']:
-        task_data = fetch_cumulative_task_data(task_id, state['period_id'])
+        task_data = snapshot.get_cumulative_task(task_id)
         if not task_data:
             continue
         
@@ -380,27 +408,28 @@ def generate_task_comments_unified(state: Module2State):
         comment = generator.generate(task_data)
         
         if task_data.get('task_summary_id'):
-            update_task_summary(task_data['task_summary_id'], {
+            comment_updates[task_data['task_summary_id']] = {
                 "ai_analysis_comment_task": comment
-            })
+            }
+    
+    saved_summary_ids = bulk_update_task_summaries(comment_updates)
+    snapshot.apply_task_summary_updates({ts_id: comment_updates[ts_id] for ts_id in saved_summary_ids})
 
 def generate_individual_summary_comments_unified(state: Module2State):
     """개인 종합 코멘트 생성 (통합 시스템)"""
     if 'feedback_report_ids' not in state or state['feedback_report_ids'] is None:
         state['feedback_report_ids'] = []
-    team_members = fetch_team_members(state['team_id'])
+    snapshot = get_team_snapshot(state)
+    team_members = snapshot.members
     period_type = "annual" if state['report_type'] == "annual" else "quarterly"
+    comments_by_emp = {}
     
     for member in team_members:
         if member.get('role') == 'MANAGER':
             continue
         
         # 개인 Task 데이터 수집
-        individual_tasks = []
-        for task_id in state['target_task_ids']:
-            task_data = fetch_cumulative_task_data(task_id, state['period_id'])
-            if task_data and task_data.get('emp_no') == member['emp_no']:
-                individual_tasks.append(task_data)
+        individual_tasks = snapshot.get_member_tasks(member['emp_no'], state['target_task_ids'])
         
         if not individual_tasks:
             continue
@@ -412,34 +441,35 @@ def generate_individual_summary_comments_unified(state: Module2State):
             "tasks": individual_tasks
         })
         
-        # 분기별/연말별 저장
-        if state['report_type'] == "quarterly":
-            feedback_report_id = save_feedback_report(
-                member['emp_no'], 
-                state['team_evaluation_id'] or 0,
-                {"ai_overall_contribution_summary_comment": comment}
-            )
-            if state['feedback_report_ids'] is None:
-                state['feedback_report_ids'] = []
-            state['feedback_report_ids'].append(feedback_report_id)
-        else:  # annual
-            final_report_id = save_final_evaluation_report(
-                member['emp_no'],
-                state['team_evaluation_id'] or 0, 
-                {"ai_annual_performance_summary_comment": comment}
-            )
-            if state['final_evaluation_report_ids'] is None:
-                state['final_evaluation_report_ids'] = []
-            state['final_evaluation_report_ids'].append(final_report_id)
+        comments_by_emp[member['emp_no']] = comment
+    
+    # 분기별/연말별 일괄 저장
+    if state['report_type'] == "quarterly":
+        saved_ids = bulk_save_feedback_reports(
+            state['team_evaluation_id'] or 0,
+            {emp_no: {"ai_overall_contribution_summary_comment": comment} for emp_no, comment in comments_by_emp.items()}
+        )
+        if state['feedback_report_ids'] is None:
+            state['feedback_report_ids'] = []
+        state['feedback_report_ids'].extend(saved_ids[emp_no] for emp_no in comments_by_emp if emp_no in saved_ids)
+    else:  # annual
+        saved_ids = bulk_save_final_evaluation_reports(
+            state['team_evaluation_id'] or 0,
+            {emp_no: {"ai_annual_performance_summary_comment": comment} for emp_no, comment in comments_by_emp.items()}
+        )
+        if state['final_evaluation_report_ids'] is None:
+            state['final_evaluation_report_ids'] = []
+        state['final_evaluation_report_ids'].extend(saved_ids[emp_no] for emp_no in comments_by_emp if emp_no in saved_ids)
 
 def generate_team_overall_comment_unified(state: Module2State):
     """팀 전체 분석 코멘트 생성 (통합 시스템)"""
     if 'final_evaluation_report_ids' not in state or state['final_evaluation_report_ids'] is None:
         state['final_evaluation_report_ids'] = []
     # 팀 KPI 데이터 수집
+    snapshot = get_team_snapshot(state)
     team_kpis_data = []
     for kpi_id in state['target_team_kpi_ids']:
-        kpi_data = fetch_team_kpi_data(kpi_id)
+        kpi_data = snapshot.get_kpi(kpi_id)
         if kpi_data:
             team_kpis_data.append(kpi_data)
     
@@ -463,47 +493,46 @@ def db_update_submodule(state: Module2State) -> Module2State:
     print(f"   💾 최종 DB 업데이트 중...")
     
     try:
-        with engine.begin() as transaction:
-            # 이미 각 서브모듈에서 업데이트했으므로 최종 검증만 수행
-            
+        # 1~2. 분기별/연말 추가 업데이트는 한 트랜잭션으로 저장 (실패 시 전체 rollback)
+        with unit_of_work() as connection:
             # 1. 분기별 추가 업데이트 (ranking, cumulative 데이터)
             if state['report_type'] == "quarterly":
-                update_quarterly_specific_data(state)
+                update_quarterly_specific_data(state, connection)
             
             # 2. 연말 추가 업데이트 (final_evaluation_reports 추가 필드)
             elif state['report_type'] == "annual":
-                update_annual_specific_data(state)
-            
-            # 3. 업데이트 결과 검증
-            validation_result = validate_final_update_results(state)
-            
-            if not validation_result['success']:
-                raise DataIntegrityError(f"Final validation failed: {validation_result['errors']}")
-            
-            # 4. 업데이트 통계 로깅
-            updated_tasks = len(state['updated_task_ids'] or [])
-            updated_kpis = len(state['updated_team_kpi_ids'] or [])
-            updated_feedback_reports = len(state['feedback_report_ids'] or [])
-            updated_final_reports = len(state['final_evaluation_report_ids'] or [])
+                update_annual_specific_data(state, connection)
+        
+        # 3. 업데이트 결과 검증 (commit 이후 조회)
+        validation_result = validate_final_update_results(state)
+        
+        if not validation_result['success']:
+            raise DataIntegrityError(f"Final validation failed: {validation_result['errors']}")
+        
+        # 4. 업데이트 통계 로깅
+        updated_tasks = len(state['updated_task_ids'] or [])
+        updated_kpis = len(state['updated_team_kpi_ids'] or [])
+        updated_feedback_reports = len(state['feedback_report_ids'] or [])
+        updated_final_reports = len(state['final_evaluation_report_ids'] or [])
+        
+        print(f"      • Task 업데이트: {updated_tasks}개")
+        print(f"      • KPI 업데이트: {updated_kpis}개")
+        print(f"      • 피드백 리포트: {updated_feedback_reports}개")
+        print(f"      • 최종 리포트: {updated_final_reports}개")
+        
+        # 5. 최종 상태 로깅
+        if state['report_type'] == "quarterly":
+            print(f"      • 분기 평가 완료")
+        else:
+            print(f"      • 연말 평가 완료")
             
-            print(f"      • Task 업데이트: {updated_tasks}개")
-            print(f"      • KPI 업데이트: {updated_kpis}개")
-            print(f"      • 피드백 리포트: {updated_feedback_reports}개")
-            print(f"      • 최종 리포트: {updated_final_reports}개")
+        return state
             
-            # 5. 최종 상태 로깅
-            if state['report_type'] == "quarterly":
-                print(f"      • 분기 평가 완료")
-            else:
-                print(f"      • 연말 평가 완료")
-                
-            return state
-                
     except Exception as e:
         print(f"   ❌ 최종 DB 업데이트 실패: {e}")
         raise
 
-def update_quarterly_specific_data(state: Module2State):
+def update_quarterly_specific_data(state: Module2State, connection=None):
     """분기별 전용 데이터 업데이트 - 개인 달성률 기반 순위 매기기"""
     print(f"      📊 분기별 전용 데이터 업데이트 중...")
     
@@ -511,7 +540,7 @@ def update_quarterly_specific_data(state: Module2State):
     team_ranking_result = calculate_team_ranking(state)
     
     # 2. 순위 결과를 feedback_reports에 저장 (기여도는 이미 하이브리드 3단계에서 저장됨)
-    update_team_ranking_to_feedback_reports(state, team_ranking_result)
+    update_team_ranking_to_feedback_reports(state, team_ranking_result, connection)
     
     print(f"      ✅ 분기별 순위 업데이트 완료: {len(team_ranking_result)}명")
     print(f"      📊 팀 내 달성률 순위:")
@@ -522,7 +551,8 @@ def calculate_team_ranking(state: Module2State) -> List[Dict]:
     """팀 내 개인별 달성률 기반 순위 계산"""
     print(f"        🏆 팀 내 순위 계산 중...")
     
-    team_members = fetch_team_members(state['team_id'])
+    snapshot = get_team_snapshot(state)
+    team_members = snapshot.members
     member_achievements = []
     
     for member in team_members:
@@ -530,11 +560,7 @@ def calculate_team_ranking(state: Module2State) -> List[Dict]:
             continue
             
         # 개인별 Task 수집
-        individual_tasks = []
-        for task_id in state['target_task_ids']:
-            task_data = fetch_cumulative_task_data(task_id, state['period_id'])
-            if task_data and task_data.get('emp_no') == member['emp_no']:
-                individual_tasks.append(task_data)
+        individual_tasks = snapshot.get_member_tasks(member['emp_no'], state['target_task_ids'])
         
         if individual_tasks:
             # 가중평균 달성률 계산 (기여도는 이미 하이브리드 3단계에서 계산되어 저장됨)
@@ -579,52 +605,43 @@ def calculate_team_ranking(state: Module2State) -> List[Dict]:
     
     return member_achievements
 
-def update_team_ranking_to_feedback_reports(state: Module2State, team_ranking: List[Dict]):
+def update_team_ranking_to_feedback_reports(state: Module2State, team_ranking: List[Dict], connection=None):
     """팀 순위 결과를 feedback_reports에 저장"""
     print(f"        💾 순위 결과를 feedback_reports에 저장 중...")
     
-    updated_count = 0
-    
+    ranking_data = {}
     for i, member_data in enumerate(team_ranking):
-        ranking = i + 1
-        
         # feedback_reports 업데이트 데이터 - 기여도는 이미 올바르게 저장되어 있으므로 제외
-        feedback_data = {
-            'ranking': ranking,  # 팀 내 순위 (1, 2, 3, ...)
+        ranking_data[member_data['emp_no']] = {
+            'ranking': i + 1,  # 팀 내 순위 (1, 2, 3, ...)
             'ai_achievement_rate': int(member_data['avg_achievement_rate']),  # 가중평균 달성률
             # 'contribution_rate': int(member_data['avg_contribution_rate'])  # 삭제 - 하이브리드 3단계 기여도가 이미 저장됨
         }
-        
-        # 기존 feedback_report 업데이트 또는 새로 생성
-        feedback_report_id = save_feedback_report(
-            member_data['emp_no'],
-            state['team_evaluation_id'] or 0,
-            feedback_data
-        )
-        
-        updated_count += 1
-        
-        # 순위 저장 결과 로깅
-        print(f"          {ranking}위: {member_data['emp_name']}({member_data['emp_no']}) - {member_data['avg_achievement_rate']:.1f}% → feedback_report_id: {feedback_report_id}")
+    
+    # 기존 feedback_report 업데이트 또는 새로 생성 (팀 전체 일괄)
+    saved_ids = bulk_save_feedback_reports(state['team_evaluation_id'] or 0, ranking_data, connection)
+    updated_count = len(saved_ids)
+    
+    # 순위 저장 결과 로깅
+    for i, member_data in enumerate(team_ranking):
+        print(f"          {i + 1}위: {member_data['emp_name']}({member_data['emp_no']}) - {member_data['avg_achievement_rate']:.1f}% → feedback_report_id: {saved_ids.get(member_data['emp_no'])}")
     
     print(f"        ✅ {updated_count}명의 순위 정보 저장 완료")
 
-def update_annual_specific_data(state: Module2State):
+def update_annual_specific_data(state: Module2State, connection=None):
     """연말 전용 데이터 업데이트 - Task Weight 기반 가중평균"""
     print(f"      📊 연말 전용 데이터 업데이트 중...")
     
-    team_members = fetch_team_members(state['team_id'])
+    snapshot = get_team_snapshot(state)
+    team_members = snapshot.members
+    annual_data = {}
     
     for member in team_members:
         if member.get('role') == 'MANAGER':
             continue
             
         # 개인별 Task 수집
-        individual_tasks = []
-        for task_id in state['target_task_ids']:
-            task_data = fetch_cumulative_task_data(task_id, state['period_id'])
-            if task_data and task_data.get('emp_no') == member['emp_no']:
-                individual_tasks.append(task_data)
+        individual_tasks = snapshot.get_member_tasks(member['emp_no'], state['target_task_ids'])
         
         if individual_tasks:
             # 가중평균 계산
@@ -639,16 +656,12 @@ def update_annual_specific_data(state: Module2State):
                 print(f"          • {task_name}: {task_achievement}% × {task_weight} = {task_achievement * task_weight}")
             print(f"          = {result['achievement_rate']:.1f}% (총 가중치: {result['total_weight']})")
             
-            # final_evaluation_reports 업데이트
-            final_data = {
+            # final_evaluation_reports 업데이트 데이터
+            annual_data[member['emp_no']] = {
                 'ai_annual_achievement_rate': int(result['achievement_rate'])
             }
-            
-            save_final_evaluation_report(
-                member['emp_no'],
-                state['team_evaluation_id'] or 0,
-                final_data
-            )
+    
+    bulk_save_final_evaluation_reports(state['team_evaluation_id'] or 0, annual_data, connection)
     
     print(f"      ✅ 연말 데이터 업데이트 완료: {len([m for m in team_members if m.get('role') != 'MANAGER'])}명")
 
@@ -658,9 +671,15 @@ def validate_final_update_results(state: Module2State) -> Dict[str, Any]:
     warnings = []
     
     try:
+        # 저장된 값을 확인해야 하므로 스냅샷을 DB에서 다시 적재 (집합 쿼리 몇 번으로 전체 검증)
+        saved = TeamPeriodSnapshot.load(
+            state['team_id'], state['period_id'],
+            state['target_task_ids'], state['target_team_kpi_ids']
+        )
+        
         # 1. Task 업데이트 검증
         for task_id in (state['updated_task_ids'] or []):
-            task_data = fetch_cumulative_task_data(task_id, state['period_id'])
+            task_data = saved.get_cumulative_task(task_id)
             
             # 필수 필드 검증
             if task_data.get('ai_achievement_rate') is None:
@@ -678,7 +697,7 @@ def validate_final_update_results(state: Module2State) -> Dict[str, Any]:
         
         # 2. Team KPI 업데이트 검증
         for kpi_id in (state['updated_team_kpi_ids'] or []):
-            kpi_data = fetch_team_kpi_data(kpi_id)
+            kpi_data = saved.get_kpi(kpi_id)
             
             if kpi_data.get('ai_kpi_progress_rate') is None:
                 errors.append(f"KPI {kpi_id}: ai_kpi_progress_rate not updated")
@@ -733,7 +752,7 @@ def validate_final_update_results(state: Module2State) -> Dict[str, Any]:
                 pass
         
         # 6. 데이터 일관성 검증
-        consistency_errors = validate_data_consistency(state)
+        consistency_errors = validate_data_consistency(state, saved)
         errors.extend(consistency_errors)
         
         success = len(errors) == 0
@@ -812,7 +831,7 @@ def validate_team_ranking_data(state: Module2State) -> Dict[str, Any]:
                     errors.append(f"순위 {i+1}위({ranking_data[i]['emp_no']})의 달성률 {current_rate}%가 {i+2}위({ranking_data[i+1]['emp_no']})의 달성률 {next_rate}%보다 낮음")
             
             # 4. 팀원 수와 순위 수 일치 검증
-            team_members = fetch_team_members(state['team_id'])
+            team_members = get_team_snapshot(state).members
             non_manager_count = len([m for m in team_members if m.get('role') != 'MANAGER'])
             
             if len(ranking_data) != non_manager_count:
@@ -841,14 +860,14 @@ def validate_team_ranking_data(state: Module2State) -> Dict[str, Any]:
             'team_member_count': 0
         }
 
-def validate_data_consistency(state: Module2State) -> List[str]:
-    """데이터 일관성 검증"""
+def validate_data_consistency(state: Module2State, saved: TeamPeriodSnapshot) -> List[str]:
+    """데이터 일관성 검증 (saved: 저장 후 다시 적재한 스냅샷)"""
     errors = []
     
     try:
         # 2. 달성률 범위 검증
         for task_id in state['updated_task_ids'] or []:
-            task_data = fetch_cumulative_task_data(task_id, state['period_id'])
+            task_data = saved.get_cumulative_task(task_id)
             achievement_rate = task_data.get('ai_achievement_rate', 0)
             
             if not (0 <= achievement_rate <= 200):
@@ -867,7 +886,7 @@ def validate_data_consistency(state: Module2State) -> List[str]:
                 team_avg = result.scalar_one_or_none()
                 
                 # 개별 Task들의 가중평균과 팀 평균이 크게 다르지 않은지 확인
-                calculated_avg = calculate_team_average_achievement_rate(state['target_team_kpi_ids'])
+                calculated_avg = calculate_team_average_achievement_rate(state['target_team_kpi_ids'], saved.kpis)
                 
                 if team_avg and abs(team_avg - calculated_avg) > 15:
                     errors.append(f"Team average inconsistency: stored {team_avg} vs calculated {calculated_avg}")
@@ -81,11 +81,12 @@ def calculate_individual_weighted_achievement_rate(individual_tasks: List[Dict])
 # 평가 기준 처리
 # ================================================================
 
-def get_evaluation_criteria(team_kpi_id: int) -> List[str]:
-    """우리가 상의한 평가 기준 처리 로직"""
+def get_evaluation_criteria(team_kpi_id: int, kpi_data: Optional[Dict] = None) -> List[str]:
+    """우리가 상의한 평가 기준 처리 로직 (kpi_data를 넘기면 DB 재조회 생략)"""
     from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_team_kpi_data
     
-    kpi_data = fetch_team_kpi_data(team_kpi_id)
+    if kpi_data is None:
+        kpi_data = fetch_team_kpi_data(team_kpi_id)
     grade_rule = kpi_data.get('grade_rule')
     
     if grade_rule and grade_rule.strip():
@@ -123,11 +124,12 @@ def parse_criteria_from_grade_rule(grade_rule: str) -> Optional[List[str]]:
 # 기여도 계산 함수들
 # ================================================================
 
-def calculate_quantitative_contributions(kpi_id: int, period_id: int) -> Dict[str, float]:
-    """정량 평가 기여도 계산"""
+def calculate_quantitative_contributions(kpi_id: int, period_id: int, tasks: Optional[List[Dict]] = None) -> Dict[str, float]:
+    """정량 평가 기여도 계산 (tasks를 넘기면 DB 재조회 생략)"""
     from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_kpi_tasks
     
-    tasks = fetch_kpi_tasks(kpi_id, period_id)
+    if tasks is None:
+        tasks = fetch_kpi_tasks(kpi_id, period_id)
     
     # 개인별 성과 수집
     emp_performance = {}
@@ -159,14 +161,17 @@ def calculate_quantitative_contributions(kpi_id: int, period_id: int) -> Dict[st
 # 팀 분석 계산 함수들
 # ================================================================
 
-def calculate_team_average_achievement_rate(team_kpi_ids: List[int]) -> float:
-    """팀 전체 평균 달성률 계산 (KPI 비중 고려)"""
+def calculate_team_average_achievement_rate(team_kpi_ids: List[int], kpi_data_by_id: Optional[Dict[int, Dict]] = None) -> float:
+    """팀 전체 평균 달성률 계산 (KPI 비중 고려, kpi_data_by_id를 넘기면 DB 재조회 생략)"""
     
     total_weight = 0
     weighted_sum = 0
     
     for kpi_id in team_kpi_ids:
-        kpi_data = fetch_team_kpi_data(kpi_id)
+        if kpi_data_by_id is not None:
+            kpi_data = kpi_data_by_id.get(kpi_id, {})
+        else:
+            kpi_data = fetch_team_kpi_data(kpi_id)
         weight = kpi_data.get('weight', 0)
         rate = kpi_data.get('ai_kpi_progress_rate', 0)
         
@@ -12,20 +12,25 @@ from agents.evaluation.modules.module_02_goal_achievement.db_utils import *
 from agents.evaluation.modules.module_02_goal_achievement.calculation_utils import *
 
 # LLM 클라이언트 설정
-llm_client = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 
 # ================================================================
 # 팀 일관성 가이드 생성 함수
 # ================================================================
 
-def generate_team_consistency_guide(team_id: int, period_id: int) -> Dict:
-    """팀 단위 일관성 가이드 생성 - 우리가 상의한 방식"""
-    team_members = fetch_team_members(team_id)
-    
-    # 실제 팀의 KPI ID 조회
-    _, team_kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
-    
-    team_avg_rate = calculate_team_average_achievement_rate(team_kpi_ids)
+def generate_team_consistency_guide(team_id: int, period_id: int, snapshot: Optional[TeamPeriodSnapshot] = None) -> Dict:
+    """팀 단위 일관성 가이드 생성 - 우리가 상의한 방식 (snapshot을 넘기면 DB 재조회 생략)"""
+    if snapshot is not None:
+        team_members = snapshot.members
+        team_kpi_ids = list(snapshot.kpis.keys())
+        team_avg_rate = calculate_team_average_achievement_rate(team_kpi_ids, snapshot.kpis)
+    else:
+        team_members = fetch_team_members(team_id)
+        
+        # 실제 팀의 KPI ID 조회
+        _, team_kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        
+        team_avg_rate = calculate_team_average_achievement_rate(team_kpi_ids)
     
     # 팀 성과 수준에 따른 가이드라인 결정
     if team_avg_rate >= 90:
@@ -6,18 +6,19 @@ import sys
 import os
 import json
 from typing import Dict, List, Optional, Any
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Row
 from dotenv import load_dotenv
 
 from config.settings import *
+from db import get_engine, unit_of_work, bulk_update
 
 load_dotenv()
 
 # DB 설정
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict[str, Any]:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -150,6 +151,160 @@ def fetch_team_tasks_and_kpis(team_id: int, period_id: int):
         })]
         return task_ids, kpi_ids
 
+# ================================================================
+# 팀 단위 스냅샷 (N+1 조회 제거)
+# ================================================================
+
+class TeamPeriodSnapshot:
+    """
+    (team_id, period_id) 단위로 모듈 2가 읽는 데이터를 한 번에 적재한 스냅샷.
+    Task/KPI마다 fetch_* 를 반복 호출하지 않고 몇 개의 집합 쿼리로 팀원, 누적 Task,
+    KPI, 등급 기준을 읽어 온다. 서브모듈이 DB에 쓴 값은 apply_* 로 스냅샷에도 반영한다.
+    """
+
+    def __init__(self, team_id: int, period_id: int):
+        self.team_id = team_id
+        self.period_id = period_id
+        self.members: List[Dict] = []
+        self.tasks: Dict[int, Dict] = {}            # {task_id: fetch_cumulative_task_data 형태}
+        self.kpis: Dict[int, Dict] = {}             # {team_kpi_id: fetch_team_kpi_data 형태}
+        self.kpi_tasks: Dict[int, List[Dict]] = {}  # {team_kpi_id: fetch_kpi_tasks 형태}
+
+    @classmethod
+    def load(cls, team_id: int, period_id: int, task_ids: List[int], kpi_ids: List[int]) -> "TeamPeriodSnapshot":
+        snapshot = cls(team_id, period_id)
+        with engine.connect() as connection:
+            snapshot._load_members(connection)
+            snapshot._load_tasks(connection, task_ids, kpi_ids)
+            snapshot._load_kpis(connection, kpi_ids)
+        return snapshot
+
+    def _load_members(self, connection):
+        query = text("""
+            SELECT emp_no, emp_name, cl, position, role 
+            FROM employees 
+            WHERE team_id = :team_id
+        """)
+        self.members = [row_to_dict(row) for row in connection.execute(query, {"team_id": self.team_id})]
+
+    def _load_tasks(self, connection, task_ids: List[int], kpi_ids: List[int]):
+        """대상 Task + 팀 KPI에 속한 Task의 누적 task_summaries를 한 번에 조회"""
+        self.tasks = {}
+        self.kpi_tasks = {}
+        if not task_ids and not kpi_ids:
+            return
+        query = text("""
+            SELECT ts.*, t.task_name, t.target_level, t.weight, t.emp_no, t.team_kpi_id, 
+                   e.emp_name, tk.kpi_name, tk.kpi_description
+            FROM task_summaries ts
+            JOIN tasks t ON ts.task_id = t.task_id
+            JOIN employees e ON t.emp_no = e.emp_no
+            JOIN team_kpis tk ON t.team_kpi_id = tk.team_kpi_id
+            WHERE (t.task_id IN :task_ids OR t.team_kpi_id IN :kpi_ids)
+            AND ts.period_id <= :period_id
+            ORDER BY ts.task_id, ts.period_id
+        """).bindparams(bindparam("task_ids", expanding=True), bindparam("kpi_ids", expanding=True))
+        results = connection.execute(query, {
+            # 빈 리스트는 IN ()이 되지 않도록 존재할 수 없는 ID로 대체
+            "task_ids": list(task_ids) or [-1],
+            "kpi_ids": list(kpi_ids) or [-1],
+            "period_id": self.period_id
+        })
+
+        summaries_by_task: Dict[int, List[Dict]] = {}
+        for row in results:
+            summary = row_to_dict(row)
+            summaries_by_task.setdefault(summary['task_id'], []).append(summary)
+
+        for task_id, task_summaries in summaries_by_task.items():
+            latest = task_summaries[-1]
+            cumulative_summary = "\n".join([
+                f"Q{ts['period_id']}: {ts['task_summary']}" 
+                for ts in task_summaries if ts['task_summary']
+            ])
+            self.tasks[task_id] = {
+                **latest,
+                "cumulative_task_summary": cumulative_summary,
+                "cumulative_performance": latest.get('task_performance', ''),
+                "participation_periods": len(task_summaries)
+            }
+            # 최신 분기 Task만 KPI별로 묶음 (fetch_kpi_tasks와 동일)
+            if latest['period_id'] == self.period_id:
+                self.kpi_tasks.setdefault(latest['team_kpi_id'], []).append({
+                    key: latest.get(key) for key in (
+                        "task_id", "task_name", "target_level", "weight", "emp_no",
+                        "emp_name", "task_summary", "task_performance", "period_id"
+                    )
+                })
+
+    def _load_kpis(self, connection, kpi_ids: List[int]):
+        """팀 KPI + 등급 기준 조회 (KPI 전용 grades가 없으면 공통 grades 사용)"""
+        self.kpis = {}
+        if not kpi_ids:
+            return
+        kpi_query = text("""
+            SELECT * FROM team_kpis WHERE team_kpi_id IN :kpi_ids
+        """).bindparams(bindparam("kpi_ids", expanding=True))
+        grade_query = text("""
+            SELECT team_kpi_id, grade_rule, grade_s, grade_a, grade_b, grade_c, grade_d
+            FROM grades
+            WHERE team_kpi_id IN :kpi_ids OR team_kpi_id IS NULL
+        """).bindparams(bindparam("kpi_ids", expanding=True))
+
+        grades_by_kpi: Dict[Optional[int], Dict] = {}
+        for row in connection.execute(grade_query, {"kpi_ids": list(kpi_ids)}):
+            grade = row_to_dict(row)
+            grades_by_kpi.setdefault(grade.pop('team_kpi_id'), grade)
+
+        default_grade = grades_by_kpi.get(None, {})
+        empty_grade = {"grade_rule": None, "grade_s": None, "grade_a": None,
+                       "grade_b": None, "grade_c": None, "grade_d": None}
+        for row in connection.execute(kpi_query, {"kpi_ids": list(kpi_ids)}):
+            kpi = row_to_dict(row)
+            grade = grades_by_kpi.get(kpi['team_kpi_id'], default_grade) or empty_grade
+            self.kpis[kpi['team_kpi_id']] = {**kpi, **grade}
+
+    # ---------------- 조회 ----------------
+
+    def get_cumulative_task(self, task_id: int) -> Dict:
+        return self.tasks.get(task_id, {})
+
+    def get_kpi(self, team_kpi_id: int) -> Dict:
+        return self.kpis.get(team_kpi_id, {})
+
+    def get_kpi_tasks(self, team_kpi_id: int) -> List[Dict]:
+        return self.kpi_tasks.get(team_kpi_id, [])
+
+    def get_evaluation_type(self, team_kpi_id: int) -> str:
+        # 값이 없으면 check_evaluation_type과 동일하게 정량 평가로 간주
+        return self.get_kpi(team_kpi_id).get('evaluation_type') or "quantitative"
+
+    def get_member_tasks(self, emp_no: str, task_ids: List[int]) -> List[Dict]:
+        return [
+            self.tasks[task_id] for task_id in task_ids
+            if task_id in self.tasks and self.tasks[task_id].get('emp_no') == emp_no
+        ]
+
+    # ---------------- 쓰기 반영 ----------------
+
+    def apply_task_summary_updates(self, updates: Dict[int, Dict]):
+        """bulk_update_task_summaries로 저장한 값을 스냅샷에 반영 - {task_summary_id: data}"""
+        for task in self.tasks.values():
+            data = updates.get(task.get('task_summary_id'))
+            if data:
+                task.update(data)
+
+    def apply_team_kpi_updates(self, updates: Dict[int, Dict]):
+        """bulk_update_team_kpis로 저장한 값을 스냅샷에 반영 - {team_kpi_id: data}"""
+        for kpi_id, data in updates.items():
+            if kpi_id in self.kpis:
+                self.kpis[kpi_id].update(data)
+
+    def refresh_kpis(self):
+        """다른 함수가 team_kpis를 직접 갱신한 경우 KPI만 다시 조회"""
+        with engine.connect() as connection:
+            self._load_kpis(connection, list(self.kpis.keys()))
+
 # ================================================================
 # 데이터 업데이트 함수들
 # ================================================================
@@ -285,6 +440,93 @@ def save_final_evaluation_report(emp_no: str, team_evaluation_id: int, data: Dic
             }).scalar_one()
             return new_id
 
+# ================================================================
+# 배치 쓰기 함수들 (팀-모듈 단위 한 트랜잭션)
+# ================================================================
+
+def _bulk_update_existing(table: str, id_column: str, updates: Dict[int, Dict], connection=None) -> List[int]:
+    """
+    존재하는 행만 다중 행 업데이트 - 존재 확인 쿼리 1회 + bulk_update.
+    반영된 id 목록을 입력 순서대로 반환 (행이 없는 id는 기존 한 건씩 UPDATE처럼 반영 목록에서 제외)
+    """
+    updates = {row_id: data for row_id, data in updates.items() if row_id and data}
+    if not updates:
+        return []
+    check_query = text(f"""
+        SELECT {id_column} FROM {table} WHERE {id_column} IN :ids
+    """).bindparams(bindparam("ids", expanding=True))
+    with unit_of_work(connection) as conn:
+        existing = {row[0] for row in conn.execute(check_query, {"ids": list(updates)})}
+        bulk_update(conn, table, id_column, {
+            row_id: data for row_id, data in updates.items() if row_id in existing
+        })
+    missing = [row_id for row_id in updates if row_id not in existing]
+    if missing:
+        print(f"   ⚠️ {table} 업데이트 실패 (행 없음): {id_column} {missing}")
+    return [row_id for row_id in updates if row_id in existing]
+
+def bulk_update_task_summaries(updates: Dict[int, Dict], connection=None) -> List[int]:
+    """task_summaries 다중 행 업데이트 - {task_summary_id: data}, 실제로 행이 있어 반영된 task_summary_id 목록 반환"""
+    return _bulk_update_existing("task_summaries", "task_summary_id", updates, connection)
+
+def bulk_update_team_kpis(updates: Dict[int, Dict], connection=None) -> List[int]:
+    """team_kpis 다중 행 업데이트 - {team_kpi_id: data}, 실제로 행이 있어 반영된 team_kpi_id 목록 반환"""
+    return _bulk_update_existing("team_kpis", "team_kpi_id", updates, connection)
+
+def _bulk_save_reports(table: str, id_column: str, team_evaluation_id: int,
+                       data_by_emp: Dict[str, Dict], connection=None) -> Dict[str, int]:
+    """리포트 테이블 일괄 저장/업데이트 - (emp_no, team_evaluation_id) 기준 upsert"""
+    data_by_emp = {emp_no: data for emp_no, data in data_by_emp.items() if data}
+    if not data_by_emp:
+        return {}
+
+    check_query = text(f"""
+        SELECT emp_no, {id_column} FROM {table}
+        WHERE team_evaluation_id = :team_evaluation_id AND emp_no IN :emp_nos
+    """).bindparams(bindparam("emp_nos", expanding=True))
+    params = {"team_evaluation_id": team_evaluation_id, "emp_nos": list(data_by_emp.keys())}
+
+    with unit_of_work(connection) as conn:
+        existing = {row[0]: row[1] for row in conn.execute(check_query, params)}
+
+        # 기존 레코드 업데이트
+        bulk_update(conn, table, id_column, {
+            existing[emp_no]: data for emp_no, data in data_by_emp.items() if emp_no in existing
+        })
+
+        # 신규 레코드 생성 (컬럼 구성이 같은 행끼리 executemany)
+        insert_groups: Dict[tuple, List[Dict]] = {}
+        for emp_no, data in data_by_emp.items():
+            if emp_no in existing:
+                continue
+            insert_groups.setdefault(tuple(data.keys()), []).append({
+                "emp_no": emp_no,
+                "team_evaluation_id": team_evaluation_id,
+                **data
+            })
+        for data_cols, rows in insert_groups.items():
+            cols = ["emp_no", "team_evaluation_id"] + list(data_cols)
+            placeholders = [f":{col}" for col in cols]
+            insert_query = text(f"""
+                INSERT INTO {table} ({', '.join(cols)})
+                VALUES ({', '.join(placeholders)})
+            """)
+            conn.execute(insert_query, rows)
+
+        if insert_groups:
+            existing = {row[0]: row[1] for row in conn.execute(check_query, params)}
+    return existing
+
+def bulk_save_feedback_reports(team_evaluation_id: int, data_by_emp: Dict[str, Dict], connection=None) -> Dict[str, int]:
+    """feedback_reports 일괄 저장/업데이트 - {emp_no: feedback_report_id} 반환"""
+    return _bulk_save_reports("feedback_reports", "feedback_report_id",
+                              team_evaluation_id, data_by_emp, connection)
+
+def bulk_save_final_evaluation_reports(team_evaluation_id: int, data_by_emp: Dict[str, Dict], connection=None) -> Dict[str, int]:
+    """final_evaluation_reports 일괄 저장/업데이트 - {emp_no: final_evaluation_report_id} 반환"""
+    return _bulk_save_reports("final_evaluation_reports", "final_evaluation_report_id",
+                              team_evaluation_id, data_by_emp, connection)
+
 def calculate_year_over_year_growth(team_id: int, current_period_id: int, current_rate: float) -> Optional[float]:
     """전년 대비 성장률 계산 (periods 테이블 활용)"""
     try:
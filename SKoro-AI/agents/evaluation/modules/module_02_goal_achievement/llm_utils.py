@@ -6,7 +6,7 @@ import re
 import json
 import time
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -14,11 +14,14 @@ from dotenv import load_dotenv
 
 from agents.evaluation.modules.module_02_goal_achievement.calculation_utils import *
 from agents.evaluation.modules.module_02_goal_achievement.db_utils import *
+from shared.llm_gateway import get_llm_gateway
 
 load_dotenv()
 
-# LLM 클라이언트 설정
-llm_client = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# LLM 클라이언트 설정 (공용 게이트웨이의 클라이언트 재사용)
+LLM_MODEL = "gpt-4o-mini"
+llm_gateway = get_llm_gateway()
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 logger = logging.getLogger(__name__)
 
 def extract_json_from_llm_response(text: str) -> str:
@@ -43,19 +46,25 @@ def robust_llm_call(prompt: str, validation_func, max_retries: int = 3, context:
     """견고한 LLM 호출 - 우리가 상의한 에러 처리"""
     last_error = None
     
+    # 검증 함수가 다르면 같은 프롬프트라도 캐시를 분리
+    schema = getattr(validation_func, "__name__", None)
+    
     for attempt in range(max_retries):
         try:
-            response = llm_client.invoke(prompt)
+            # 속도 제한 / 429 재시도 / 응답 캐시는 게이트웨이에서 처리
+            response = llm_gateway.invoke(prompt, model=LLM_MODEL, module="module2", schema=schema)
             content = str(response.content)
             validated_result = validation_func(content)
             return validated_result
             
         except Exception as e:
             last_error = e
+            # 검증에 실패한 응답이 캐시에 남아 재시도마다 재사용되지 않도록 제거
+            llm_gateway.discard_cached(prompt, model=LLM_MODEL, schema=schema)
             logger.warning(f"LLM call attempt {attempt + 1} failed for {context}: {e}")
             
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # 지수 백오프
+                time.sleep(llm_gateway.backoff_delay(attempt))  # jitter 포함 지수 백오프
     
     logger.error(f"All LLM attempts failed for {context}: {last_error}")
     raise LLMValidationError(f"Failed after {max_retries} attempts: {last_error}")
@@ -235,12 +244,14 @@ def batch_calculate_achievement_and_grades(batch_data: List[Dict], include_grade
     
     return robust_llm_call(str(prompt.format()), validate_batch_response, context="batch achievement calculation")
 
-def calculate_qualitative_contributions(kpi_id: int, period_id: int, kpi_data: Dict) -> Dict[str, float]:
-    """정성 평가 기여도 계산 - 우리가 상의한 grade_rule 기반"""
+def calculate_qualitative_contributions(kpi_id: int, period_id: int, kpi_data: Dict,
+                                        tasks: Optional[List[Dict]] = None) -> Dict[str, float]:
+    """정성 평가 기여도 계산 - 우리가 상의한 grade_rule 기반 (tasks를 넘기면 DB 재조회 생략)"""
     from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_kpi_tasks
     
-    tasks = fetch_kpi_tasks(kpi_id, period_id)
-    evaluation_criteria = get_evaluation_criteria(kpi_id)
+    if tasks is None:
+        tasks = fetch_kpi_tasks(kpi_id, period_id)
+    evaluation_criteria = get_evaluation_criteria(kpi_id, kpi_data or None)
     
     # LLM 프롬프트 구성
     criteria_text = "\n".join([f"- {criterion}" for criterion in evaluation_criteria])
@@ -292,11 +303,13 @@ def calculate_qualitative_contributions(kpi_id: int, period_id: int, kpi_data: D
     
     return result['individual_contributions']
 
-def calculate_team_kpi_achievement_rate(kpi_id: int, period_id: int, kpi_data: Dict) -> Dict:
-    """팀 KPI 달성률 LLM 계산"""
+def calculate_team_kpi_achievement_rate(kpi_id: int, period_id: int, kpi_data: Dict,
+                                        tasks: Optional[List[Dict]] = None) -> Dict:
+    """팀 KPI 달성률 LLM 계산 (tasks를 넘기면 DB 재조회 생략)"""
     from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_kpi_tasks
     
-    tasks = fetch_kpi_tasks(kpi_id, period_id)
+    if tasks is None:
+        tasks = fetch_kpi_tasks(kpi_id, period_id)
     
     tasks_text = ""
     for task in tasks:
@@ -133,16 +133,16 @@ def context_generation_submodule(state: Module3AgentState) -> Dict:
             messages = messages + [HumanMessage(content="모듈 3: 키워드 데이터 없음, 맥락 생성 스킵")]
             return {"messages": messages, "peer_evaluation_summary_sentences": []}
         
-        summary_sentences = []
-        
-        for i in range(len(keyword_collections)):
+        def generate_context_sentence(i: int) -> str:
             keywords = keyword_collections[i] if i < len(keyword_collections) else ""
             work_situation = task_summaries[i] if i < len(task_summaries) else ""
             weight = evaluation_weights[i] if i < len(evaluation_weights) else 1.0
             
             llm_result = call_llm_for_peer_evaluation_context(keywords, work_situation, weight)
-            summary_sentence = llm_result.get("context_sentence", "업무 진행 과정에서 동료가 다양한 특성을 보임")
-            summary_sentences.append(summary_sentence)
+            return llm_result.get("context_sentence", "업무 진행 과정에서 동료가 다양한 특성을 보임")
+        
+        # 평가자별 문장 생성은 서로 독립이므로 동시에 호출 (결과는 평가자 순서 유지)
+        summary_sentences = llm_gateway.map(generate_context_sentence, range(len(keyword_collections)), module="module3")
         
         messages = messages + [HumanMessage(content=f"모듈 3: 동료평가 맥락 생성 완료 ({len(summary_sentences)}개 문장)")]
         
@@ -1,15 +1,16 @@
 # ai-performance-management-system/shared/tools/py
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from typing import Optional, List, Dict, Any
 from collections import defaultdict
 import json
 
 from config.settings import DatabaseConfig
+from db import get_engine, unit_of_work
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 
 # --- 도우미 함수: SQLAlchemy Row 객체를 딕셔너리로 변환 ---
@@ -212,7 +213,8 @@ def save_feedback_peer_summary(emp_no: str, period_id: int, ai_peer_talk_summary
             print(f"Warning: team_evaluation_id를 찾을 수 없습니다. emp_no={emp_no}, period_id={period_id}")
             return None
         
-        with engine.connect() as connection:
+        # 조회 + 저장을 한 트랜잭션으로 처리 (블록 종료 시 한 번 commit)
+        with unit_of_work() as connection:
             # 기존 레코드 확인
             check_query = text("""
                 SELECT feedback_report_id 
@@ -238,7 +240,6 @@ def save_feedback_peer_summary(emp_no: str, period_id: int, ai_peer_talk_summary
                     "ai_peer_talk_summary": ai_peer_talk_summary,
                     "feedback_id": row_to_dict(existing)["feedback_report_id"]
                 })
-                connection.commit()
                 
                 print(f"DB: feedback_reports 업데이트 완료 - emp_no={emp_no}")
                 return row_to_dict(existing)["feedback_report_id"]
@@ -255,7 +256,6 @@ def save_feedback_peer_summary(emp_no: str, period_id: int, ai_peer_talk_summary
                     "emp_no": emp_no,
                     "ai_peer_talk_summary": ai_peer_talk_summary
                 })
-                connection.commit()
                 
                 # 삽입된 ID 조회
                 new_id = result.lastrowid
@@ -277,7 +277,8 @@ def save_final_evaluation_peer_summary(emp_no: str, period_id: int, ai_peer_talk
             print(f"Warning: team_evaluation_id를 찾을 수 없습니다. emp_no={emp_no}, period_id={period_id}")
             return None
         
-        with engine.connect() as connection:
+        # 조회 + 저장을 한 트랜잭션으로 처리 (블록 종료 시 한 번 commit)
+        with unit_of_work() as connection:
             # 기존 레코드 확인
             check_query = text("""
                 SELECT final_evaluation_report_id 
@@ -303,7 +304,6 @@ def save_final_evaluation_peer_summary(emp_no: str, period_id: int, ai_peer_talk
                     "ai_peer_talk_summary": ai_peer_talk_summary,
                     "final_evaluation_id": row_to_dict(existing)["final_evaluation_report_id"]
                 })
-                connection.commit()
                 
                 print(f"DB: final_evaluation_reports 업데이트 완료 - emp_no={emp_no}")
                 return row_to_dict(existing)["final_evaluation_report_id"]
@@ -320,7 +320,6 @@ def save_final_evaluation_peer_summary(emp_no: str, period_id: int, ai_peer_talk
                     "emp_no": emp_no,
                     "ai_peer_talk_summary": ai_peer_talk_summary
                 })
-                connection.commit()
                 
                 # 삽입된 ID 조회
                 new_id = result.lastrowid
@@ -12,9 +12,13 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
+from shared.llm_gateway import get_llm_gateway
+
 
 # --- LLM 클라이언트 인스턴스 (전역 설정) ---
-llm_client = ChatOpenAI(model="gpt-4o", temperature=0) 
+LLM_MODEL = "gpt-4o"
+llm_gateway = get_llm_gateway()
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 print(f"LLM Client initialized with model: {llm_client.model_name}, temperature: {llm_client.temperature}")
 
 # --- LLM 응답에서 JSON 코드 블록 추출 도우미 함수 ---
@@ -93,10 +97,10 @@ def call_llm_for_peer_evaluation_context(keywords: str, work_situation: str, wei
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
     try:
-        response = chain.invoke({"keywords": keywords, "work_situation": work_situation, "weight": weight})
+        # 공용 게이트웨이 경유 (속도 제한 / 429 재시도 / 모듈별 동시 호출 상한)
+        messages = prompt.format_messages()
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module3")
         json_output_raw = response.content
 
         json_output = _extract_json_from_llm_response(str(json_output_raw))
@@ -116,9 +120,13 @@ def call_llm_for_peer_evaluation_context(keywords: str, work_situation: str, wei
         
     except json.JSONDecodeError as e:
         print(f"LLM 응답 JSON 파싱 오류: {e}. 원본 응답: '{json_output_raw}'. 파싱 시도 텍스트: '{json_output[:100]}...'")
+        # 파싱/검증에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return {"context_sentence": "업무 진행 과정에서 동료가 다양한 특성을 보임"}
     except ValueError as e:
         print(f"LLM 응답 데이터 유효성 오류: {e}. 원본 응답: '{json_output_raw}'. 파싱 시도 텍스트: '{json_output[:100]}...'")
+        # 파싱/검증에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return {"context_sentence": "업무 진행 과정에서 동료가 다양한 특성을 보임"}
     except Exception as e:
         print(f"LLM 호출 중 예기치 않은 오류 발생: {e}. 원본 응답: '{json_output_raw}'")
@@ -229,14 +237,9 @@ def call_llm_for_final_feedback_generation(weighted_analysis: Dict, top_sentence
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
     try:
-        response = chain.invoke({
-            "weighted_analysis": weighted_analysis, 
-            "top_sentences": top_sentences, 
-            "target_emp_no": target_emp_no
-        })
+        messages = prompt.format_messages()
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module3")
         json_output_raw = response.content
         
         json_output = _extract_json_from_llm_response(str(json_output_raw))
@@ -262,9 +265,13 @@ def call_llm_for_final_feedback_generation(weighted_analysis: Dict, top_sentence
 
     except json.JSONDecodeError as e:
         print(f"LLM 응답 JSON 파싱 오류: {e}. 원본 응답: '{json_output_raw}'. 파싱 시도 텍스트: '{json_output[:100]}...'")
+        # 파싱/검증에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return _generate_fallback_feedback(top_positive, top_negative, total_evals)
     except ValueError as e:
         print(f"LLM 응답 데이터 유효성 오류: {e}. 원본 응답: '{json_output_raw}'. 파싱 시도 텍스트: '{json_output[:100]}...'")
+        # 파싱/검증에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return _generate_fallback_feedback(top_positive, top_negative, total_evals)
     except Exception as e:
         print(f"LLM 호출 중 예기치 않은 오류 발생: {e}. 원본 응답: '{json_output_raw}'")
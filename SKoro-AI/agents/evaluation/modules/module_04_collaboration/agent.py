@@ -91,25 +91,30 @@ def individual_collaboration_analysis_submodule(state: Module4State) -> Module4S
     confirmed_collaborations = []
     
     if state["collaboration_relationships"]:
-        for relation in state["collaboration_relationships"]:
-            task_summary = relation["task_summary"]
-            potential_collaborators = relation["potential_collaborators"]
-            
-            if task_summary and potential_collaborators:
-                llm_collaboration_result = call_llm_for_collaboration_detection(
-                    task_summary=task_summary,
-                    task_name=relation["task_name"],
-                    potential_collaborators=potential_collaborators,
-                    emp_name=relation["emp_name"]
-                )
-                
-                if llm_collaboration_result.get("is_collaboration", False):
-                    confirmed_collaborations.append({
-                        **relation,
-                        "confirmed_collaborators": llm_collaboration_result.get("collaborators", []),
-                        "collaboration_description": llm_collaboration_result.get("description", ""),
-                        "collaboration_confirmed": True
-                    })
+        target_relations = [
+            relation for relation in state["collaboration_relationships"]
+            if relation["task_summary"] and relation["potential_collaborators"]
+        ]
+        
+        def detect_collaboration(relation: Dict) -> Dict:
+            return call_llm_for_collaboration_detection(
+                task_summary=relation["task_summary"],
+                task_name=relation["task_name"],
+                potential_collaborators=relation["potential_collaborators"],
+                emp_name=relation["emp_name"]
+            )
+        
+        # 관계별 협업 감지는 서로 독립이므로 동시에 호출 (결과는 관계 순서 유지)
+        detection_results = llm_gateway.map(detect_collaboration, target_relations, module="module4")
+        
+        for relation, llm_collaboration_result in zip(target_relations, detection_results):
+            if llm_collaboration_result.get("is_collaboration", False):
+                confirmed_collaborations.append({
+                    **relation,
+                    "confirmed_collaborators": llm_collaboration_result.get("collaborators", []),
+                    "collaboration_description": llm_collaboration_result.get("description", ""),
+                    "collaboration_confirmed": True
+                })
     
     # 2. 개인별 협업 패턴 분석
     team_members = fetch_team_members_with_tasks(state["team_id"], state["period_id"])
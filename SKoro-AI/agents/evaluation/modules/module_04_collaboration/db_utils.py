@@ -4,17 +4,18 @@
 
 import json
 from typing import Dict, List, Optional, Any
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from config.settings import *
+from db import get_engine
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict[str, Any]:
     """SQLAlchemy Row 객체를 딕셔너리로 변환합니다."""
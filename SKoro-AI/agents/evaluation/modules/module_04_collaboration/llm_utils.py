@@ -13,9 +13,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from agents.evaluation.modules.module_04_collaboration.db_utils import *
+from shared.llm_gateway import get_llm_gateway
 
-# LLM 클라이언트 초기화
-llm_client = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# LLM 클라이언트 초기화 (공용 게이트웨이의 클라이언트 재사용)
+LLM_MODEL = "gpt-4o-mini"
+llm_gateway = get_llm_gateway()
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 
 def _extract_json_from_llm_response(text: str) -> str:
     """LLM 응답 텍스트에서 ```json ... ``` 블록만 추출합니다."""
@@ -78,10 +81,9 @@ def call_llm_for_collaboration_detection(task_summary: str, task_name: str, pote
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         json_output_raw = _get_llm_content(response)
         json_output = _extract_json_from_llm_response(json_output_raw)
         llm_parsed_data = json.loads(json_output)
@@ -98,6 +100,8 @@ def call_llm_for_collaboration_detection(task_summary: str, task_name: str, pote
         
     except Exception as e:
         print(f"LLM 협업 감지 오류: {e}")
+        # 파싱에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return {"is_collaboration": False, "collaborators": [], "description": "분석 실패"}
 
 def call_llm_for_team_role_analysis(task_summaries: List[str], emp_name: str, emp_no: str) -> Dict:
@@ -142,10 +146,9 @@ def call_llm_for_team_role_analysis(task_summaries: List[str], emp_name: str, em
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         json_output_raw = _get_llm_content(response)
         json_output = _extract_json_from_llm_response(json_output_raw)
         llm_parsed_data = json.loads(json_output)
@@ -158,6 +161,8 @@ def call_llm_for_team_role_analysis(task_summaries: List[str], emp_name: str, em
         
     except Exception as e:
         print(f"LLM 역할 분석 오류: {e}")
+        # 파싱에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return {
             "main_work_content": "분석 실패",
             "role_type": "분석 실패", 
@@ -224,10 +229,9 @@ def call_llm_for_collaboration_bias_analysis(collaboration_data: Dict, emp_name:
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         json_output_raw = _get_llm_content(response)
         json_output = _extract_json_from_llm_response(json_output_raw)
         llm_parsed_data = json.loads(json_output)
@@ -244,6 +248,8 @@ def call_llm_for_collaboration_bias_analysis(collaboration_data: Dict, emp_name:
         
     except Exception as e:
         print(f"LLM 편중도 분석 오류: {e}")
+        # 파싱에 실패한 응답이 캐시에 남아 재사용되지 않도록 제거
+        llm_gateway.discard_cached(messages, model=LLM_MODEL)
         return {
             "bias_level": "보통",
             "bias_description": "분석 실패",
@@ -276,16 +282,17 @@ def call_llm_for_peer_talk_summary(peer_talk_content: str, emp_name: str) -> str
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         summary = _get_llm_content(response).strip()
         
         # 따옴표 제거 처리
         if summary.startswith('"') and summary.endswith('"'):
             summary = summary[1:-1]
         
+        if not summary:
+            llm_gateway.discard_cached(messages, model=LLM_MODEL)  # 빈 응답은 캐시에서 제거
         return summary if summary else f"{emp_name} 동료평가 요약 없음"
         
     except Exception as e:
@@ -327,11 +334,12 @@ def call_llm_for_overall_evaluation(collaboration_analysis: Dict, emp_name: str,
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         evaluation = _get_llm_content(response).strip()
+        if not evaluation:
+            llm_gateway.discard_cached(messages, model=LLM_MODEL)  # 빈 응답은 캐시에서 제거
         return evaluation if evaluation else f"{emp_name}({emp_no})님의 협업 평가를 완료하지 못했습니다."
         
     except Exception as e:
@@ -392,11 +400,12 @@ def call_llm_for_team_summary(collaboration_matrix: List[Dict], team_summary_sta
         HumanMessage(content=human_prompt)
     ])
     
-    chain = prompt | llm_client
-
+    messages = prompt.format_messages()
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module4")
         summary = _get_llm_content(response).strip()
+        if not summary:
+            llm_gateway.discard_cached(messages, model=LLM_MODEL)  # 빈 응답은 캐시에서 제거
         return summary if summary else "팀 협업 종합 분석 코멘트 생성에 실패했습니다."
         
     except Exception as e:
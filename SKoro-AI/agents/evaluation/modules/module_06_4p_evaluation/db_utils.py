@@ -4,15 +4,16 @@
 
 import json
 from typing import Dict, List, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from sqlalchemy.exc import OperationalError
 
 from config.settings import *
+from db import get_engine, unit_of_work
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -316,8 +317,34 @@ def save_quarterly_4p_results(feedback_report_id: int, integrated_result: Dict)
         },
     }
 
+    attitude = get_attitude_grade(integrated_result["average_score"])
+
+    # 4P 결과와 attitude 등급을 한 번의 UPDATE / 한 트랜잭션으로 저장
+    try:
+        with unit_of_work() as connection:
+            result = connection.execute(
+                text(
+                    """
+                    UPDATE feedback_reports 
+                    SET ai_4p_evaluation = :ai_4p_evaluation,
+                        attitude = :attitude
+                    WHERE feedback_report_id = :feedback_report_id
+                """
+                ),
+                {
+                    "feedback_report_id": feedback_report_id,
+                    "ai_4p_evaluation": json.dumps(
+                        quarterly_format, ensure_ascii=False
+                    ),
+                    "attitude": attitude,
+                },
+            )
+            return result.rowcount > 0
+    except Exception as e:
+        print(f"분기 저장 오류 (일괄 저장): {e}")
+
     with engine.connect() as connection:
-        # ai_4p_evaluation 컬럼이 있는지 확인하고 없으면 추가
+        # ai_4p_evaluation / attitude 컬럼이 없는 경우 - 기존 방식으로 저장하며 컬럼 추가
         try:
             query = text(
                 """
@@ -339,7 +366,6 @@ def save_quarterly_4p_results(feedback_report_id: int, integrated_result: Dict)
             connection.commit()
             # 4P 저장 성공 시 attitude 등급도 업데이트
             if result.rowcount > 0:
-                attitude = get_attitude_grade(integrated_result["average_score"])
                 update_feedback_report_attitude(feedback_report_id, attitude)
                 return True
             return False
@@ -13,12 +13,16 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from agents.evaluation.modules.module_06_4p_evaluation.db_utils import *
 from config.settings import *
+from shared.llm_gateway import get_llm_gateway
 
 # ================================================================
 # LLM 클라이언트 설정
 # ================================================================
 
-llm_client = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# 4P 평가 4개는 LangGraph에서 동시에 실행되므로 공용 게이트웨이로 속도 제한 / 동시 호출 상한 적용
+LLM_MODEL = "gpt-4o-mini"
+llm_gateway = get_llm_gateway()
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 print(f"LLM Client initialized: {llm_client.model_name}")
 
 
@@ -120,11 +124,9 @@ def parse_criteria_with_llm(raw_text: str) -> Dict[str, str]:
         SystemMessage(content=system_prompt), 
         HumanMessage(content=human_prompt)
     ])
-
-    chain = prompt | llm_client
     
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(prompt.format_messages(), model=LLM_MODEL, module="module6")
         content = str(response.content)  # 타입 안전성 확보
         match = re.search(r"```json\s*(.*?)```", content, re.DOTALL)
         extracted = match.group(1).strip() if match else content.strip()
@@ -255,10 +257,9 @@ def call_llm_for_passionate_evaluation(
         [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
     )
 
-    chain = prompt | llm_client
 
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(prompt.format_messages(), model=LLM_MODEL, module="module6")
         content = str(response.content)  # 타입 안전성 확보
         json_output = _extract_json_from_llm_response(content)
         result = json.loads(json_output)
@@ -350,10 +351,9 @@ def call_llm_for_proactive_evaluation(
         [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
     )
 
-    chain = prompt | llm_client
 
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(prompt.format_messages(), model=LLM_MODEL, module="module6")
         content = str(response.content)  # 타입 안전성 확보
         json_output = _extract_json_from_llm_response(content)
         result = json.loads(json_output)
@@ -445,10 +445,9 @@ def call_llm_for_professional_evaluation(
         [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
     )
 
-    chain = prompt | llm_client
 
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(prompt.format_messages(), model=LLM_MODEL, module="module6")
         content = str(response.content)  # 타입 안전성 확보
         json_output = _extract_json_from_llm_response(content)
         result = json.loads(json_output)
@@ -572,10 +571,9 @@ def call_llm_for_people_evaluation(
         [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
     )
 
-    chain = prompt | llm_client
 
     try:
-        response = chain.invoke({})
+        response = llm_gateway.invoke(prompt.format_messages(), model=LLM_MODEL, module="module6")
         content = str(response.content)  # 타입 안전성 확보
         json_output = _extract_json_from_llm_response(content)
         result = json.loads(json_output)
@@ -5,17 +5,18 @@
 import json
 import statistics
 from typing import Dict, List, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Row
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from config.settings import *
+from db import get_engine, unit_of_work, bulk_update_isolating_failures
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -113,84 +114,114 @@ def fetch_team_quarterly_data(team_id: str, period_id: int) -> Dict:
         return quarterly_data
 
 def batch_update_temp_evaluations(score_data: List[Dict], period_id: int = 4) -> Dict:
-    """팀 전체 temp_evaluations 배치 업데이트 (raw_score, score 모두 저장)"""
+    """
+    팀 전체 temp_evaluations 배치 업데이트 (raw_score, score 모두 저장)
+    team_evaluation_id / 기존 행 조회 각 1회 + executemany UPDATE(team_evaluation_id별 1회)로 반영
+    같은 기간에 team_evaluation이 여러 개 걸리는 직원은 어느 행인지 알 수 없으므로 쓰지 않고 실패로 보고한다.
+    """
     success_count = 0
     failed_members = []
     
-    with engine.connect() as connection:
-        try:
+    emp_nos = [data["emp_no"] for data in score_data]
+    if not emp_nos:
+        print(f"배치 업데이트 완료: 성공 0건, 실패 0건")
+        return {"success_count": 0, "failed_members": []}
+    
+    try:
+        with unit_of_work() as connection:
+            # team_evaluation_id 조회 (직원 전체 1회)
+            team_eval_query = text("""
+                SELECT e.emp_no, te.team_evaluation_id
+                FROM team_evaluations te
+                JOIN employees e ON e.team_id = te.team_id
+                WHERE e.emp_no IN :emp_nos AND te.period_id = :period_id
+            """).bindparams(bindparam("emp_nos", expanding=True))
+            team_eval_candidates: Dict[str, set] = {}
+            for row in connection.execute(team_eval_query, {"emp_nos": emp_nos, "period_id": period_id}):
+                team_eval_candidates.setdefault(row.emp_no, set()).add(row.team_evaluation_id)
+            ambiguous = {emp_no: sorted(ids) for emp_no, ids in team_eval_candidates.items() if len(ids) > 1}
+            team_eval_ids = {
+                emp_no: next(iter(ids)) for emp_no, ids in team_eval_candidates.items() if len(ids) == 1
+            }
+            
+            # 업데이트할 temp_evaluations 행 존재 확인 (1회)
+            existing = set()
+            if team_eval_ids:
+                existing_query = text("""
+                    SELECT emp_no, team_evaluation_id
+                    FROM temp_evaluations
+                    WHERE emp_no IN :emp_nos AND team_evaluation_id IN :team_evaluation_ids
+                """).bindparams(bindparam("emp_nos", expanding=True), bindparam("team_evaluation_ids", expanding=True))
+                existing = {
+                    (row.emp_no, row.team_evaluation_id)
+                    for row in connection.execute(existing_query, {
+                        "emp_nos": list(team_eval_ids),
+                        "team_evaluation_ids": list(set(team_eval_ids.values()))
+                    })
+                }
+            
+            # team_evaluation_id별로 묶어 executemany UPDATE
+            rows_by_team_eval: Dict[int, Dict[str, Dict]] = {}
             for data in score_data:
-                try:
-                    # team_evaluation_id 조회
-                    team_eval_query = text("""
-                        SELECT te.team_evaluation_id
-                        FROM team_evaluations te
-                        JOIN employees e ON e.team_id = te.team_id
-                        WHERE e.emp_no = :emp_no AND te.period_id = :period_id
-                    """)
-                    
-                    team_eval_result = connection.execute(team_eval_query, {
-                        "emp_no": data["emp_no"],
-                        "period_id": period_id
-                    }).scalar_one_or_none()
-                    
-                    if not team_eval_result:
-                        failed_members.append(data["emp_no"])
-                        print(f"DB 업데이트 실패: {data['emp_no']} (team_evaluation_id 없음)")
-                        continue
-
-                    raw_score_val = data["raw_score"]
-                    try:
-                        # raw_score가 json 문자열일 경우 dict로 파싱, 아니면 그대로 사용
-                        raw_score_dict = json.loads(raw_score_val)
-                        display_raw_score = raw_score_dict.get('raw_hybrid_score', raw_score_val)
-                    except (json.JSONDecodeError, TypeError):
-                        display_raw_score = raw_score_val
-
-                    query = text("""
-                        UPDATE temp_evaluations 
-                        SET ai_reason = :ai_reason,
-                            raw_score = :raw_score,
-                            score = :score,
-                            comment = :comment
-                        WHERE emp_no = :emp_no AND team_evaluation_id = :team_evaluation_id
-                    """)
-                    
-                    result = connection.execute(query, {
-                        "emp_no": data["emp_no"],
-                        "team_evaluation_id": team_eval_result,
+                team_evaluation_id = team_eval_ids.get(data["emp_no"])
+                if (data["emp_no"], team_evaluation_id) in existing:
+                    rows_by_team_eval.setdefault(team_evaluation_id, {})[data["emp_no"]] = {
                         "ai_reason": data["ai_reason"],
-                        "raw_score": raw_score_val,  # JSON 문자열 저장
+                        "raw_score": data["raw_score"],  # JSON 문자열 저장
                         "score": data["score"],  # 정규화된 점수 저장
                         "comment": data["comment"]
-                    })
-                    
-                    if result.rowcount > 0:
-                        success_count += 1
-                        print(f"DB 업데이트 성공: {data['emp_no']} (원시: {display_raw_score}, 정규화: {data['score']})")
-                    else:
-                        failed_members.append(data["emp_no"])
-                        print(f"DB 업데이트 실패: {data['emp_no']} (행 없음)")
-                        
-                except Exception as e:
-                    failed_members.append(data["emp_no"])
-                    print(f"DB 업데이트 실패: {data['emp_no']} - {e}")
-            
-            connection.commit()
-            print(f"배치 업데이트 완료: 성공 {success_count}건, 실패 {len(failed_members)}건")
+                    }
             
-            return {
-                "success_count": success_count,
-                "failed_members": failed_members
-            }
-            
-        except Exception as e:
-            print(f"배치 업데이트 실패: {e}")
-            connection.rollback()
-            return {
-                "success_count": 0,
-                "failed_members": [data["emp_no"] for data in score_data]
-            }
+            errors = {}
+            for team_evaluation_id, rows in rows_by_team_eval.items():
+                errors.update(bulk_update_isolating_failures(
+                    connection, "temp_evaluations", "emp_no", rows,
+                    filters={"team_evaluation_id": team_evaluation_id}
+                ))
+        
+    except Exception as e:
+        print(f"배치 업데이트 실패: {e}")
+        return {
+            "success_count": 0,
+            "failed_members": emp_nos
+        }
+    
+    for data in score_data:
+        emp_no = data["emp_no"]
+        if emp_no in ambiguous:
+            failed_members.append(emp_no)
+            print(f"DB 업데이트 실패: {emp_no} (team_evaluation_id 여러 개: {ambiguous[emp_no]})")
+            continue
+        if emp_no not in team_eval_ids:
+            failed_members.append(emp_no)
+            print(f"DB 업데이트 실패: {emp_no} (team_evaluation_id 없음)")
+            continue
+        if (emp_no, team_eval_ids[emp_no]) not in existing:
+            failed_members.append(emp_no)
+            print(f"DB 업데이트 실패: {emp_no} (행 없음)")
+            continue
+        if emp_no in errors:
+            failed_members.append(emp_no)
+            print(f"DB 업데이트 실패: {emp_no} - {errors[emp_no]}")
+            continue
+        
+        raw_score_val = data["raw_score"]
+        try:
+            # raw_score가 json 문자열일 경우 dict로 파싱, 아니면 그대로 사용
+            raw_score_dict = json.loads(raw_score_val)
+            display_raw_score = raw_score_dict.get('raw_hybrid_score', raw_score_val)
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            display_raw_score = raw_score_val
+        
+        success_count += 1
+        print(f"DB 업데이트 성공: {emp_no} (원시: {display_raw_score}, 정규화: {data['score']})")
+    
+    print(f"배치 업데이트 완료: 성공 {success_count}건, 실패 {len(failed_members)}건")
+    
+    return {
+        "success_count": success_count,
+        "failed_members": failed_members
+    }
 
 # ================================================================
 # 테스트 및 디버깅 함수들
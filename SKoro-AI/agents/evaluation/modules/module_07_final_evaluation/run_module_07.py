@@ -9,16 +9,17 @@ from agents.evaluation.modules.module_07_final_evaluation.agent import TeamModul
 from agents.evaluation.modules.module_07_final_evaluation.db_utils import get_all_teams_with_data
 from agents.evaluation.modules.module_07_final_evaluation.scoring_utils import preview_achievement_scoring
 from agents.evaluation.modules.module_07_final_evaluation.llm_utils import *
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from config.settings import *
+from db import get_engine
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 # ================================================================
 # 실행 함수들
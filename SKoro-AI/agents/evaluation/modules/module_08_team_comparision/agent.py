@@ -11,7 +11,7 @@ from langgraph.graph import StateGraph, START, END
 from agents.evaluation.modules.module_08_team_comparision.db_utils import *
 from agents.evaluation.modules.module_08_team_comparision.comparison_utils import *
 from agents.evaluation.modules.module_08_team_comparision.llm_utils import *
-from shared.team_performance_comparator import TeamPerformanceComparator
+from shared.team_performance_comparator import SourceVersions, get_team_performance_comparator
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -30,6 +30,8 @@ class Module8AgentState(TypedDict):
     team_id: int
     period_id: int
     report_type: Literal["quarterly", "annual_manager"]
+    # 클러스터/통계 입력 지문 (전 팀 실행 전에 get_source_versions로 한 번 계산해 넘김, 없으면 팀마다 1회 계산)
+    source_versions: Optional[SourceVersions]
     
     # 클러스터링 결과
     our_team_cluster_id: int
@@ -52,6 +54,14 @@ class Module8AgentState(TypedDict):
     # 업데이트된 ID
     updated_team_evaluation_id: Optional[int]
 
+def prepare_period_source_versions(period_id: int) -> Optional[SourceVersions]:
+    """여러 팀을 실행하기 전에 기간 입력 지문을 한 번 계산 (실패하면 None - 팀별로 계산)"""
+    try:
+        return get_team_performance_comparator().get_source_versions(period_id)
+    except Exception as e:
+        logger.warning(f"⚠️ 클러스터 입력 지문 사전 계산 실패 - 팀별로 계산합니다: {e}")
+        return None
+
 # ================================================================
 # 서브모듈 함수 정의
 # ================================================================
@@ -60,13 +70,16 @@ def check_cluster_stats_submodule(state: Module8AgentState) -> Module8AgentState
     """1. 클러스터 통계 존재 확인"""
     period_id = state["period_id"]
     
-    # TeamPerformanceComparator 인스턴스 생성
-    comparator = TeamPerformanceComparator()
+    # 프로세스 공유 비교기 (팀마다 재생성하지 않음)
+    comparator = get_team_performance_comparator()
+    
+    # 입력 지문은 기간당 한 번만 계산 - 호출자가 넘기지 않았으면 여기서 계산해 다음 서브모듈과 공유
+    source_versions = state.get("source_versions") or comparator.get_source_versions(period_id)
     
     # 클러스터 통계 상태 확인
-    status = comparator.get_cluster_status(period_id)
+    status = comparator.get_cluster_status(period_id, source_versions)
     
-    if status["cache_file_exists"]:
+    if status["cache_file_exists"] and status.get("is_current"):
         message = f"클러스터 통계 확인 완료: 기존 캐시 사용 (Q{period_id})"
         logger.info(f"✅ 클러스터 캐시 파일 존재 - Q{period_id}")
     else:
@@ -75,6 +88,7 @@ def check_cluster_stats_submodule(state: Module8AgentState) -> Module8AgentState
     
     return {
         **state,
+        "source_versions": source_versions,
         "messages": state.get("messages", []) + [HumanMessage(content=message)]
     }
 
@@ -85,9 +99,11 @@ def calculate_cluster_stats_submodule(state: Module8AgentState) -> Module8AgentS
     
     logger.info(f"🔄 클러스터 분석 시작 - 팀 {team_id}")
     
-    # TeamPerformanceComparator로 클러스터 분석 실행
-    comparator = TeamPerformanceComparator()
-    result_data = comparator.analyze_team_cluster_performance(team_id, period_id)
+    # 클러스터/통계는 기간당 한 번만 계산되고 모든 팀이 공유
+    comparator = get_team_performance_comparator()
+    result_data = comparator.analyze_team_cluster_performance(
+        team_id, period_id, source_versions=state.get("source_versions")
+    )
     
     if not result_data["success"]:
         logger.error(f"❌ 클러스터 분석 실패: {result_data['error']}")
@@ -152,8 +168,11 @@ def kpi_comparison_submodule(state: Module8AgentState) -> Module8AgentState:
     
     logger.info(f"🔍 KPI 비교 분석 중 - {len(our_team_kpis)}개 KPI")
     
+    # 기간 전체 KPI로 학습한 TF-IDF 인덱스 (팀마다 재학습하지 않음)
+    text_index = get_period_kpi_index(state["period_id"], fetch_period_kpi_corpus(state["period_id"]))
+    
     # KPI별 비교 분석 실행
-    kpi_comparison_results = compare_kpis_with_similar_teams(our_team_kpis, similar_teams_performance)
+    kpi_comparison_results = compare_kpis_with_similar_teams(our_team_kpis, similar_teams_performance, text_index)
     
     # 비교 가능한 KPI 개수 계산
     comparable_kpis = len([kpi for kpi in kpi_comparison_results if kpi["comparison_result"] != "-"])
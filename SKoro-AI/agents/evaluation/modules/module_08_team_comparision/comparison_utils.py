@@ -2,42 +2,88 @@
 # comparison_utils_module8.py - 모듈 8 비교 분석 관련 유틸리티
 # ================================================================
 
+import hashlib
 import statistics
-from typing import Dict, List
+import threading
+from typing import Dict, List, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from agents.evaluation.modules.module_08_team_comparision.comparison_utils import *
 
 # ================================================================
-# KPI 비교 분석 함수들
+# KPI 텍스트 인덱스 (기간 단위 TF-IDF 1회 학습)
 # ================================================================
 
-def find_similar_kpis_by_text_similarity(our_kpi: Dict, similar_teams_kpis: List[Dict], 
-                                       threshold: float = 0.3) -> List[Dict]:
-    """텍스트 유사도 기반 KPI 매칭"""
-    our_kpi_text = f"{our_kpi['kpi_name']} {our_kpi['kpi_description']}"
-    
-    matched_kpis = []
+def _kpi_text(kpi: Dict) -> str:
+    return f"{kpi['kpi_name']} {kpi.get('kpi_description') or ''}"
+
+class KpiTextIndex:
+    """
+    기간 전체 팀 KPI로 TF-IDF를 한 번 학습하고 KPI 행렬(L2 정규화 sparse)을 미리 계산해 둔다.
+    유사도는 (우리 KPI 행렬) x (후보 KPI 행렬)^T 한 번의 sparse 곱으로 계산한다.
+    """
     
-    for kpi in similar_teams_kpis:
-        kpi_text = f"{kpi['kpi_name']} {kpi['kpi_description']}"
-        
-        # TF-IDF 유사도 계산
-        vectorizer = TfidfVectorizer(stop_words=None)
+    def __init__(self, corpus_kpis: List[Dict]):
+        self.row_by_kpi_id = {}
+        texts = []
+        for kpi in corpus_kpis:
+            if kpi["team_kpi_id"] in self.row_by_kpi_id:
+                continue
+            self.row_by_kpi_id[kpi["team_kpi_id"]] = len(texts)
+            texts.append(_kpi_text(kpi))
+        self.vectorizer = TfidfVectorizer(stop_words=None)
         try:
-            tfidf_matrix = vectorizer.fit_transform([our_kpi_text, kpi_text])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            if similarity >= threshold:
-                matched_kpis.append({
-                    "kpi": kpi,
-                    "similarity": similarity
-                })
-        except:
-            # 벡터화 실패 시 건너뛰기
-            continue
+            self.matrix = self.vectorizer.fit_transform(texts)
+        except ValueError:
+            # 어휘가 비어 있는 경우 (빈 텍스트 등) - 매칭 결과 없음
+            self.vectorizer = None
+            self.matrix = None
     
-    return matched_kpis
+    def vectors(self, kpis: List[Dict]):
+        """KPI 목록의 TF-IDF 행렬 (인덱스에 없는 KPI는 학습된 어휘로 변환)"""
+        rows = [self.row_by_kpi_id.get(kpi.get("team_kpi_id")) for kpi in kpis]
+        if all(row is not None for row in rows):
+            return self.matrix[rows]
+        return self.vectorizer.transform([_kpi_text(kpi) for kpi in kpis])
+    
+    def match(self, our_kpis: List[Dict], candidate_kpis: List[Dict], threshold: float = 0.3) -> List[List[Dict]]:
+        """우리 KPI별로 threshold 이상인 후보 KPI 목록 [{kpi, similarity}] (후보 순서 유지)"""
+        matches = [[] for _ in our_kpis]
+        if self.matrix is None or not our_kpis or not candidate_kpis:
+            return matches
+        similarities = (self.vectors(our_kpis) @ self.vectors(candidate_kpis).T).tocoo()
+        hits = sorted(
+            (i, j, value) for i, j, value in zip(similarities.row, similarities.col, similarities.data)
+            if value >= threshold
+        )
+        for i, j, value in hits:
+            matches[i].append({"kpi": candidate_kpis[j], "similarity": float(value)})
+        return matches
+
+_index_cache: Dict[int, tuple] = {}
+_index_cache_lock = threading.Lock()
+
+def get_period_kpi_index(period_id: int, corpus_kpis: List[Dict]) -> KpiTextIndex:
+    """기간별 KPI 인덱스 재사용 (KPI 텍스트가 바뀌면 다시 학습)"""
+    signature = hashlib.sha256(
+        "\n".join(f"{kpi['team_kpi_id']}\t{_kpi_text(kpi)}" for kpi in corpus_kpis).encode("utf-8")
+    ).hexdigest()
+    with _index_cache_lock:
+        cached = _index_cache.get(period_id)
+        if cached and cached[0] == signature:
+            return cached[1]
+        index = KpiTextIndex(corpus_kpis)
+        _index_cache[period_id] = (signature, index)
+        return index
+
+# ================================================================
+# KPI 비교 분석 함수들
+# ================================================================
+
+def find_similar_kpis_by_text_similarity(our_kpi: Dict, similar_teams_kpis: List[Dict], 
+                                       threshold: float = 0.3, text_index: Optional[KpiTextIndex] = None) -> List[Dict]:
+    """텍스트 유사도 기반 KPI 매칭"""
+    text_index = text_index or KpiTextIndex([our_kpi] + similar_teams_kpis)
+    return text_index.match([our_kpi], similar_teams_kpis, threshold)[0]
 
 def get_comparison_result_detailed(our_rate: float, stats: Dict) -> str:
     """통계적 기준으로 상세한 비교 결과 판정"""
@@ -63,14 +109,17 @@ def get_comparison_result_detailed(our_rate: float, stats: Dict) -> str:
     else:
         return "크게 개선 필요"
 
-def compare_kpis_with_similar_teams(our_kpis: List[Dict], similar_teams_kpis: List[Dict]) -> List[Dict]:
-    """KPI별 유사도 매칭 및 비교"""
+def compare_kpis_with_similar_teams(our_kpis: List[Dict], similar_teams_kpis: List[Dict],
+                                    text_index: Optional[KpiTextIndex] = None) -> List[Dict]:
+    """KPI별 유사도 매칭 및 비교 (text_index가 없으면 두 KPI 목록으로 한 번 학습)"""
     comparison_results = []
     min_sample_size = 3
     
-    for our_kpi in our_kpis:
-        # 유사 KPI 찾기
-        similar_kpis = find_similar_kpis_by_text_similarity(our_kpi, similar_teams_kpis)
+    # 유사 KPI 찾기 - 전체 KPI 쌍을 한 번에 계산
+    text_index = text_index or KpiTextIndex(our_kpis + similar_teams_kpis)
+    matches = text_index.match(our_kpis, similar_teams_kpis)
+    
+    for our_kpi, similar_kpis in zip(our_kpis, matches):
         
         if len(similar_kpis) >= min_sample_size:
             # 충분한 샘플 → 평균 계산
@@ -6,7 +6,7 @@ import sys
 import os
 import json
 from typing import Dict, List, Optional, Any
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from dotenv import load_dotenv
 from config.settings import *
@@ -19,10 +19,11 @@ project_root = os.path.abspath(os.path.join(current_dir, '../../../../'))
 sys.path.append(project_root)
 
 from config.settings import DatabaseConfig
+from db import get_engine
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict[str, Any]:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -141,6 +142,28 @@ def fetch_multiple_teams_kpis(team_ids: List[int], period_id: int) -> List[Dict]
         
         return all_kpis
 
+def fetch_period_kpi_corpus(period_id: int) -> List[Dict]:
+    """해당 연도 전체 팀 KPI 텍스트 조회 (KPI 유사도 인덱스 학습용)"""
+    year = get_year_from_period(period_id)
+    
+    with engine.connect() as connection:
+        query = text("""
+            SELECT tk.team_kpi_id, tk.kpi_name, tk.kpi_description
+            FROM team_kpis tk
+            WHERE tk.year = :year
+            ORDER BY tk.team_kpi_id
+        """)
+        results = connection.execute(query, {"year": year}).fetchall()
+        
+        return [
+            {
+                "team_kpi_id": row.team_kpi_id,
+                "kpi_name": row.kpi_name,
+                "kpi_description": row.kpi_description or ""
+            }
+            for row in results
+        ]
+
 def fetch_team_evaluation_id(team_id: int, period_id: int) -> Optional[int]:
     """team_evaluation_id 조회"""
     with engine.connect() as connection:
@@ -6,6 +6,8 @@
 import os
 import logging
 import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, List, Literal, TypedDict, Dict, Optional
 from langchain_core.messages import HumanMessage 
 import operator
@@ -14,6 +16,7 @@ from decimal import Decimal
 import math
 from datetime import datetime
 
+from config.settings import WorkflowConfig
 from agents.evaluation.modules.module_09_cl_normalization.db_utils import *
 from agents.evaluation.modules.module_09_cl_normalization.llm_utils import *
 
@@ -31,6 +34,8 @@ class Module9AgentState(TypedDict):
     # 입력 정보
     headquarter_id: int
     period_id: int  # 연말: 4
+    dry_run: bool        # True면 조정 결과만 계산하고 DB에 쓰지 않음 (시간 측정/회귀 비교용)
+    skip_ranking: bool   # True면 3단계에서 팀별 순위를 갱신하지 않음 (여러 본부 실행 후 한 번만 갱신)
     
     # 4단계 결과 저장 (확장)
     department_data: Dict[str, Dict]           # 1단계: 부문 데이터 수집 결과
@@ -166,11 +171,13 @@ def calculate_enhanced_captain_validity(member: Dict) -> Dict:
     else:
         magnitude_score = 0.1
     
-    # 2. 업무 증거 일치성 (신규)
-    task_evidence = analyze_task_evidence_consistency(member)
+    # 2. 업무 증거 일치성 (신규) - precompute_consistency_scores로 미리 계산된 값이 있으면 재사용
+    task_evidence = member['task_evidence_score'] if 'task_evidence_score' in member \
+        else analyze_task_evidence_consistency(member)
     
     # 3. 동료평가 일치성 (신규)
-    peer_consistency = analyze_peer_evaluation_consistency(member)
+    peer_consistency = member['peer_consistency_score'] if 'peer_consistency_score' in member \
+        else analyze_peer_evaluation_consistency(member)
     
     # 4. 업무 복잡도 고려 (신규)
     complexity_factor = calculate_task_complexity_factor(member)
@@ -207,6 +214,34 @@ def calculate_enhanced_captain_validity(member: Dict) -> Dict:
         }
     }
 
+def precompute_consistency_scores(members: List[Dict]) -> int:
+    """
+    팀장이 점수를 변경한 직원의 업무 증거 / 동료평가 일치성 LLM 분석을 한꺼번에 동시 실행해 member에 저장.
+    (직원 × 분석 2개)를 공용 게이트웨이의 module9 동시 호출 상한 안에서 실행하고, 결과는 입력 순서대로 반영한다.
+    이미 계산된 직원은 건너뛰므로 1~3단계에서 타당성을 여러 번 계산해도 LLM은 직원당 한 번씩만 호출된다.
+    반환값: 새로 분석한 직원 수
+    """
+    targets = [
+        member for member in members
+        if member.get('changed_by_manager', True) and 'task_evidence_score' not in member
+    ]
+    if not targets:
+        return 0
+    
+    checks = [
+        (member, analyze)
+        for member in targets
+        for analyze in (analyze_task_evidence_consistency, analyze_peer_evaluation_consistency)
+    ]
+    start_time = time.time()
+    scores = llm_gateway.map(lambda check: check[1](check[0]), checks, module="module9")
+    for i, member in enumerate(targets):
+        member['task_evidence_score'] = scores[2 * i]
+        member['peer_consistency_score'] = scores[2 * i + 1]
+    
+    print(f"   🧠 일치성 분석 {len(targets)}명 × 2건 동시 실행 ({time.time() - start_time:.1f}초)")
+    return len(targets)
+
 def get_validity_grade(validity_score: float) -> str:
     """타당성 점수를 등급으로 변환"""
     if validity_score >= 0.8:
@@ -591,6 +626,10 @@ def fetch_headquarter_cl_members_enhanced_filtered(headquarter_id: int, cl_group
     
     # 모든 직원 조회
     all_members = fetch_headquarter_cl_members_enhanced(headquarter_id, cl_group, period_id)
+    return classify_manager_changes(cl_group, all_members)
+
+def classify_manager_changes(cl_group: str, all_members: List[Dict]) -> List[Dict]:
+    """CL 그룹 직원들을 팀장 변경 여부로 분류 (changed_by_manager, score_diff, change_priority 설정)"""
     
     # 변경 여부 분석 (제외하지 않고 분류만)
     changed_count = 0
@@ -653,12 +692,22 @@ def department_data_collection(state: Module9AgentState) -> Module9AgentState:
         total_changed_members = 0
         adjustment_needed_cls = []
         
-        # 2. CL별 필터링된 데이터 수집
+        # 2. 모든 CL의 직원/업무/동료평가 데이터를 본부 단위로 한 번에 조회한 뒤 CL별 분류
+        #    (2단계 이후는 department_data의 members_data를 그대로 사용 - 추가 조회 없음)
+        headquarter_members = fetch_headquarter_members_bulk(headquarter_id, period_id)
+        members_by_cl = {
+            cl_group: classify_manager_changes(cl_group, headquarter_members.get(cl_group, []))
+            for cl_group in cl_groups
+        }
+        
+        # 3. 변경된 직원의 LLM 일치성 분석을 모든 CL에 걸쳐 한 번에 동시 실행
+        precompute_consistency_scores([member for members in members_by_cl.values() for member in members])
+        
         for cl_group in cl_groups:
             print(f"\n📊 {cl_group} 팀장 변경분 분석 중...")
             
             # 팀장이 변경한 직원만 조회
-            changed_members = fetch_headquarter_cl_members_enhanced_filtered(headquarter_id, cl_group, period_id)
+            changed_members = members_by_cl[cl_group]
             
             if len(changed_members) == 0:
                 print(f"   ✅ {cl_group}: 팀장 변경 없음 - 조정 불필요")
@@ -797,6 +846,7 @@ def enhanced_analysis_submodule(state: Module9AgentState) -> Module9AgentState:
             print(f"   대상: {cl_data['member_count']}명 (전체 {total_cl_members}명 중)")
             
             members = cl_data["members_data"]
+            precompute_consistency_scores(members)  # 1단계에서 계산된 직원은 건너뜀
             analyzed_members = []
             validity_distribution = {"매우 타당": [], "타당": [], "보통": [], "의심": [], "매우 의심": []}
             
@@ -1142,23 +1192,157 @@ def apply_standard_deviation_algorithm(llm_result: Dict, target_stdev: float, cl
         print(f"❌ {cl_group}: 결과 구조 복원 실패 - {str(e)}")
         return llm_result
 
+def execute_cl_supervisor(cl_group: str, cl_data: Dict, enhanced_analysis: Dict,
+                          headquarter_id: int, period_id: int, dry_run: bool = False) -> Dict:
+    """CL 그룹 하나의 LLM 제로섬 + 수학 표준편차 조정 및 점수 저장 (CL 그룹끼리는 서로 독립, dry_run이면 저장 생략)"""
+    
+    print(f"\n🎯 {cl_group} 2단계 처리 중... (surplus: {cl_data['surplus']:+.2f}점)")
+
+    # 1. Supervisor 입력 데이터 구성
+    supervisor_input = build_enhanced_supervisor_input_data(cl_group, cl_data, enhanced_analysis, headquarter_id)
+
+    # 2. LLM 제로섬 조정 실행 (표준편차 제외)
+    start_time = time.time()
+
+    print(f"🧠 {cl_group}: LLM 성과 기반 제로섬 조정")
+    llm_result = call_enhanced_supervisor_llm(supervisor_input)
+
+    processing_time = int((time.time() - start_time) * 1000)
+
+    # 3. LLM 결과 처리
+    if llm_result["success"]:
+        print(f"✅ {cl_group}: LLM 제로섬 조정 성공")
+
+        # 4. 표준편차 수학적 조정 실행
+        target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
+        print(f"📊 {cl_group}: 표준편차 수학적 조정 ({target_stdev:.1f}점 목표)")
+
+        # 구조에 맞게 전달
+        final_result = apply_standard_deviation_algorithm(llm_result["result"], target_stdev, cl_group)
+        supervisor_output = final_result
+        fallback_used = False
+
+    else:
+        print(f"🔧 {cl_group}: LLM 실패, Fallback 알고리즘 실행")
+
+        # Fallback 실행 전에 supervisor_input 확인
+        if not supervisor_input.get("members"):
+            print(f"❌ {cl_group}: supervisor_input에 members 데이터 없음")
+            return {
+                "success": False,
+                "error": "supervisor_input에 members 데이터 없음",
+                "adjustments_made": 0,
+                "fallback_used": True
+            }
+
+        try:
+            supervisor_output = execute_proper_zero_sum_adjustment(supervisor_input)
+            if not supervisor_output.get("adjustments"):
+                print(f"❌ {cl_group}: Fallback에서 adjustments 생성 실패")
+                return {
+                    "success": False,
+                    "error": "Fallback에서 adjustments 생성 실패",
+                    "adjustments_made": 0,
+                    "fallback_used": True
+                }
+        except Exception as fallback_error:
+            print(f"❌ {cl_group}: Fallback 실행 실패 - {str(fallback_error)}")
+            return {
+                "success": False,
+                "error": f"Fallback 실행 실패: {str(fallback_error)}",
+                "adjustments_made": 0,
+                "fallback_used": True
+            }
+
+        # Fallback 결과에도 표준편차 조정 적용
+        target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
+        fake_llm_result = {"result": supervisor_output, "success": True}
+        try:
+            final_result = apply_standard_deviation_algorithm(fake_llm_result, target_stdev, cl_group)
+            supervisor_output = final_result["result"]
+        except Exception as stdev_error:
+            print(f"⚠️ {cl_group}: 표준편차 조정 실패 - {str(stdev_error)}")
+            # 표준편차 조정 실패해도 원본 결과 사용
+            pass
+
+        fallback_used = True
+
+    # 5. 최종 검증
+    adjustments = supervisor_output["adjustments"]
+    target_reduction = cl_data["surplus"]
+    target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
+
+    validation_result = validate_zero_sum_result(adjustments, target_reduction, target_stdev, cl_group)
+
+    # 검증 결과 출력
+    if validation_result["valid"]:
+        print(f"✅ {cl_group} 2단계 처리 완료")
+        print(f"   📊 결과: 평균 {validation_result['metrics']['actual_mean']:.3f}, 표준편차 {validation_result['metrics']['actual_stdev']:.2f}")
+        print(f"   💰 차감: {validation_result['metrics']['actual_reduction']:.3f}/{validation_result['metrics']['target_reduction']:.3f}")
+    else:
+        print(f"⚠️ {cl_group} 검증 경고:")
+        for warning in validation_result["warnings"][:2]:
+            print(f"     - {warning}")
+
+    # 성과 역전 체크
+    if validation_result["performance_reversal"]["has_reversal"]:
+        print(f"   ⚠️ 성과 역전: {validation_result['performance_reversal']['reversal_count']}건")
+
+    # 6. DB 업데이트 (점수) - dry_run이면 조정 대상 인원만 집계
+    if dry_run:
+        print(f"🧪 {cl_group}: dry-run - 점수 저장 생략 ({len(adjustments)}명)")
+        update_result = {"success_count": len(adjustments), "failed_count": 0}
+    else:
+        update_result = batch_update_final_evaluation_reports(adjustments, period_id)
+
+    # 7. 결과 반환 (팀별 순위는 모든 CL 처리 후 한 번만 업데이트)
+    return {
+        "success": True,
+        "adjustments_made": update_result["success_count"],
+        "distribution_achieved": validation_result["valid"],
+        "processing_time_ms": processing_time,
+        "fallback_used": fallback_used,
+        "update_success_count": update_result["success_count"],
+        "update_failed_count": update_result["failed_count"],
+        "validation_result": validation_result,
+        "supervisor_output": supervisor_output,
+        "enhanced_features": {
+            "llm_zero_sum_used": not fallback_used,
+            "math_stdev_applied": True,
+            "two_stage_processing": True
+        }
+    }
+
 def cl_supervisor_execution_submodule(state: Module9AgentState) -> Module9AgentState:
-    """3단계: CL별 향상된 Supervisor 실행 서브모듈"""
+    """3단계: CL별 향상된 Supervisor 실행 서브모듈 - 조정이 필요한 CL 그룹을 동시에 처리"""
     
     try:
         department_data = state["department_data"]
         enhanced_analysis = state["enhanced_analysis"]
         headquarter_id = state["headquarter_id"]
         period_id = state["period_id"]
+        dry_run = state.get("dry_run", False)
         
-        print(f"🎯 3단계: LLM 제로섬 + 수학 표준편차 분리 실행 시작")
+        print(f"🎯 3단계: LLM 제로섬 + 수학 표준편차 분리 실행 시작{' (dry-run)' if dry_run else ''}")
         
         supervisor_results = {}
         total_adjustments = 0
         
-        # 조정이 필요한 CL들만 처리
+        # 조정이 필요한 CL들만 처리 (CL 그룹끼리는 직원이 겹치지 않으므로 동시에 실행)
+        target_cls = [cl_group for cl_group, cl_data in department_data.items() if cl_data["needs_adjustment"]]
+        futures = {}
+        if target_cls:
+            workers = max(1, min(len(target_cls), WorkflowConfig().MODULE9_CL_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="module9-cl") as pool:
+                futures = {
+                    cl_group: pool.submit(execute_cl_supervisor, cl_group, department_data[cl_group],
+                                          enhanced_analysis, headquarter_id, period_id, dry_run)
+                    for cl_group in target_cls
+                }
+        
+        # 결과는 1단계의 CL 순서대로 정리 (4단계 집계 순서 고정)
         for cl_group, cl_data in department_data.items():
-            if not cl_data["needs_adjustment"]:
+            if cl_group not in futures:
                 print(f"⏭️ {cl_group}: 조정 불필요 (surplus: {cl_data['surplus']:.2f})")
                 supervisor_results[cl_group] = {
                     "success": True,
@@ -1170,107 +1354,27 @@ def cl_supervisor_execution_submodule(state: Module9AgentState) -> Module9AgentS
                 }
                 continue
             
-            print(f"\n🎯 {cl_group} 2단계 처리 중... (surplus: {cl_data['surplus']:+.2f}점)")
-            
-            # 1. Supervisor 입력 데이터 구성
-            supervisor_input = build_enhanced_supervisor_input_data(cl_group, cl_data, enhanced_analysis, headquarter_id)
-            
-            # 2. LLM 제로섬 조정 실행 (표준편차 제외)
-            import time
-            start_time = time.time()
-            
-            print(f"🧠 {cl_group}: LLM 성과 기반 제로섬 조정")
-            llm_result = call_enhanced_supervisor_llm(supervisor_input)
-            
-            processing_time = int((time.time() - start_time) * 1000)
-            
-            # 3. LLM 결과 처리
-            if llm_result["success"]:
-                print(f"✅ {cl_group}: LLM 제로섬 조정 성공")
-                
-                # 4. 표준편차 수학적 조정 실행
-                target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
-                print(f"📊 {cl_group}: 표준편차 수학적 조정 ({target_stdev:.1f}점 목표)")
-                
-                # 구조에 맞게 전달
-                final_result = apply_standard_deviation_algorithm(llm_result["result"], target_stdev, cl_group)
-                supervisor_output = final_result
-                fallback_used = False
-                
-            else:
-                print(f"🔧 {cl_group}: LLM 실패, Fallback 알고리즘 실행")
-                
-                # Fallback 실행 전에 supervisor_input 확인
-                if not supervisor_input.get("members"):
-                    print(f"❌ {cl_group}: supervisor_input에 members 데이터 없음")
-                    supervisor_results[cl_group] = {
-                        "success": False,
-                        "error": "supervisor_input에 members 데이터 없음",
-                        "adjustments_made": 0,
-                        "fallback_used": True
-                    }
-                    continue
-                
-                try:
-                    supervisor_output = execute_proper_zero_sum_adjustment(supervisor_input)
-                    if not supervisor_output.get("adjustments"):
-                        print(f"❌ {cl_group}: Fallback에서 adjustments 생성 실패")
-                        supervisor_results[cl_group] = {
-                            "success": False,
-                            "error": "Fallback에서 adjustments 생성 실패",
-                            "adjustments_made": 0,
-                            "fallback_used": True
-                        }
-                        continue
-                except Exception as fallback_error:
-                    print(f"❌ {cl_group}: Fallback 실행 실패 - {str(fallback_error)}")
-                    supervisor_results[cl_group] = {
-                        "success": False,
-                        "error": f"Fallback 실행 실패: {str(fallback_error)}",
-                        "adjustments_made": 0,
-                        "fallback_used": True
-                    }
-                    continue
-                
-                # Fallback 결과에도 표준편차 조정 적용
-                target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
-                fake_llm_result = {"result": supervisor_output, "success": True}
-                try:
-                    final_result = apply_standard_deviation_algorithm(fake_llm_result, target_stdev, cl_group)
-                    supervisor_output = final_result["result"]
-                except Exception as stdev_error:
-                    print(f"⚠️ {cl_group}: 표준편차 조정 실패 - {str(stdev_error)}")
-                    # 표준편차 조정 실패해도 원본 결과 사용
-                    pass
-                    
-                fallback_used = True
-            
-            # 5. 최종 검증
-            adjustments = supervisor_output["adjustments"]
-            target_reduction = cl_data["surplus"]
-            target_stdev = cl_data.get("target_stdev", get_cl_target_stdev(cl_group))
-            
-            validation_result = validate_zero_sum_result(adjustments, target_reduction, target_stdev, cl_group)
-            
-            # 검증 결과 출력
-            if validation_result["valid"]:
-                print(f"✅ {cl_group} 2단계 처리 완료")
-                print(f"   📊 결과: 평균 {validation_result['metrics']['actual_mean']:.3f}, 표준편차 {validation_result['metrics']['actual_stdev']:.2f}")
-                print(f"   💰 차감: {validation_result['metrics']['actual_reduction']:.3f}/{validation_result['metrics']['target_reduction']:.3f}")
-            else:
-                print(f"⚠️ {cl_group} 검증 경고:")
-                for warning in validation_result["warnings"][:2]:
-                    print(f"     - {warning}")
-            
-            # 성과 역전 체크
-            if validation_result["performance_reversal"]["has_reversal"]:
-                print(f"   ⚠️ 성과 역전: {validation_result['performance_reversal']['reversal_count']}건")
-            
-            # 6. DB 업데이트 (점수)
-            update_result = batch_update_final_evaluation_reports(adjustments, period_id)
-            
-            # 7. 팀별 순위 업데이트 (새로 추가)
-            print(f"🏆 {cl_group}: 팀별 순위 업데이트 시작...")
+            try:
+                supervisor_results[cl_group] = futures[cl_group].result()
+            except Exception as cl_error:
+                # 한 CL이 실패해도 다른 CL이 저장한 점수의 순위 갱신은 진행
+                print(f"❌ {cl_group} 2단계 처리 실패: {str(cl_error)}")
+                supervisor_results[cl_group] = {
+                    "success": False,
+                    "error": str(cl_error),
+                    "adjustments_made": 0,
+                    "processing_time_ms": 0,
+                    "fallback_used": False
+                }
+                continue
+            total_adjustments += supervisor_results[cl_group]["adjustments_made"]
+            print(f"✅ {cl_group} 2단계 처리 완료: {supervisor_results[cl_group]['adjustments_made']}명 조정")
+        
+        # 팀별 순위 업데이트 - 모든 CL 점수를 저장한 뒤 한 번만 실행
+        # (저장에 일부 실패한 CL도 있을 수 있으므로 조정 인원과 무관하게 실행,
+        #  dry_run이거나 여러 본부를 모아서 실행할 때는 호출한 쪽에서 처리)
+        if not dry_run and not state.get("skip_ranking", False):
+            print(f"🏆 팀별 순위 업데이트 시작...")
             try:
                 ranking_result = update_team_rankings(period_id)
                 if ranking_result["success_count"] > 0:
@@ -1280,29 +1384,9 @@ def cl_supervisor_execution_submodule(state: Module9AgentState) -> Module9AgentS
             except Exception as ranking_error:
                 print(f"   ❌ 순위 업데이트 중 오류: {str(ranking_error)}")
                 ranking_result = {"success_count": 0, "error": str(ranking_error)}
-            
-            # 8. 결과 저장
-            supervisor_results[cl_group] = {
-                "success": True,
-                "adjustments_made": update_result["success_count"],
-                "distribution_achieved": validation_result["valid"],
-                "processing_time_ms": processing_time,
-                "fallback_used": fallback_used,
-                "update_success_count": update_result["success_count"],
-                "update_failed_count": update_result["failed_count"],
-                "validation_result": validation_result,
-                "supervisor_output": supervisor_output,
-                "ranking_update": ranking_result,
-                "enhanced_features": {
-                    "llm_zero_sum_used": not fallback_used,
-                    "math_stdev_applied": True,
-                    "two_stage_processing": True
-                }
-            }
-            
-            total_adjustments += update_result["success_count"]
-            
-            print(f"✅ {cl_group} 2단계 처리 완료: {update_result['success_count']}명 조정, 순위 업데이트 완료")
+            for result in supervisor_results.values():
+                if result.get("supervisor_output"):
+                    result["ranking_update"] = ranking_result
         
         # State 업데이트
         updated_state = state.copy()
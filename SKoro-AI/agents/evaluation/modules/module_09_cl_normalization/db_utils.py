@@ -1,15 +1,16 @@
 # ai-performance-management-system/shared/tools/py
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Row
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 import json
 
 from config.settings import DatabaseConfig
+from db import get_engine, unit_of_work, bulk_update, bulk_update_isolating_failures
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -32,6 +33,48 @@ def safe_decimal_to_float(value) -> float:
 # 데이터 조회 함수들
 # ================================================================
 
+def _task_row_to_dict(row: Row) -> Dict:
+    """업무 조회 결과 행 → 업무 dict (숫자 타입 변환)"""
+    task = row_to_dict(row)
+    task['task_weight'] = safe_decimal_to_float(task['task_weight'])
+    task['ai_contribution_score'] = safe_decimal_to_float(task['ai_contribution_score'])
+    task['ai_achievement_rate'] = safe_decimal_to_float(task['ai_achievement_rate'])
+    task['kpi_weight'] = safe_decimal_to_float(task['kpi_weight'])
+    return task
+
+def _parse_peer_evaluation_data(emp_no: str, raw_summary: Optional[str], period_id: int) -> Dict:
+    """ai_peer_talk_summary(JSON 문자열) → 동료평가 데이터 dict"""
+    peer_summary = {}
+    
+    if raw_summary:
+        try:
+            peer_summary = json.loads(raw_summary)
+        except json.JSONDecodeError:
+            print(f"⚠️ JSON 파싱 실패: {emp_no} 동료평가 요약")
+            peer_summary = {}
+    
+    return {
+        "peer_summary": peer_summary,
+        "strengths": peer_summary.get("strengths", ""),
+        "concerns": peer_summary.get("concerns", ""),
+        "collaboration_observations": peer_summary.get("collaboration_observations", ""),
+        "period_type": "annual" if period_id == 4 else "quarterly"
+    }
+
+def _member_row_to_dict(row: Row) -> Dict:
+    """CL 직원 조회 결과 행 → 직원 dict (점수 float 변환, 팀장 변경량 계산)"""
+    member = row_to_dict(row)
+    
+    # 점수들을 float로 변환
+    member['module7_score'] = safe_decimal_to_float(member['module7_score'])
+    member['baseline_score'] = safe_decimal_to_float(member['baseline_score'])
+    member['manager_score'] = safe_decimal_to_float(member['manager_score'])
+    member['kpi_achievement'] = safe_decimal_to_float(member['kpi_achievement'])
+    
+    # 차이 계산
+    member['score_diff'] = round(member['manager_score'] - member['baseline_score'], 2)
+    return member
+
 def fetch_member_task_data(emp_no: str, period_id: int) -> List[Dict]:
     """직원의 업무 데이터 조회 (tasks + task_summaries)"""
     
@@ -64,17 +107,7 @@ def fetch_member_task_data(emp_no: str, period_id: int) -> List[Dict]:
             "period_id": period_id
         }).fetchall()
         
-        tasks = []
-        for row in results:
-            task = row_to_dict(row)
-            # 숫자 타입 변환
-            task['task_weight'] = safe_decimal_to_float(task['task_weight'])
-            task['ai_contribution_score'] = safe_decimal_to_float(task['ai_contribution_score'])
-            task['ai_achievement_rate'] = safe_decimal_to_float(task['ai_achievement_rate'])
-            task['kpi_weight'] = safe_decimal_to_float(task['kpi_weight'])
-            tasks.append(task)
-        
-        return tasks
+        return [_task_row_to_dict(row) for row in results]
 
 def fetch_member_peer_evaluation_data(emp_no: str, team_evaluation_id: int, period_id: int) -> Dict:
     """직원의 동료평가 AI 요약 데이터 조회"""
@@ -105,22 +138,7 @@ def fetch_member_peer_evaluation_data(emp_no: str, team_evaluation_id: int, peri
         }).fetchone()
         
         # AI 요약 데이터 파싱
-        peer_summary = {}
-        
-        if result and result.peer_summary:
-            try:
-                peer_summary = json.loads(result.peer_summary)
-            except json.JSONDecodeError:
-                print(f"⚠️ JSON 파싱 실패: {emp_no} 동료평가 요약")
-                peer_summary = {}
-        
-        return {
-            "peer_summary": peer_summary,
-            "strengths": peer_summary.get("strengths", ""),
-            "concerns": peer_summary.get("concerns", ""),
-            "collaboration_observations": peer_summary.get("collaboration_observations", ""),
-            "period_type": "annual" if period_id == 4 else "quarterly"
-        }
+        return _parse_peer_evaluation_data(emp_no, result.peer_summary if result else None, period_id)
 
 def fetch_headquarter_cl_members_enhanced(headquarter_id: int, cl_group: str, period_id: int) -> List[Dict]:
     """본부 내 특정 CL 그룹의 모든 직원 데이터 조회 (업무+동료평가 포함)"""
@@ -161,16 +179,7 @@ def fetch_headquarter_cl_members_enhanced(headquarter_id: int, cl_group: str, pe
         
         members = []
         for row in results:
-            member = row_to_dict(row)
-            
-            # 점수들을 float로 변환
-            member['module7_score'] = safe_decimal_to_float(member['module7_score'])
-            member['baseline_score'] = safe_decimal_to_float(member['baseline_score'])
-            member['manager_score'] = safe_decimal_to_float(member['manager_score'])
-            member['kpi_achievement'] = safe_decimal_to_float(member['kpi_achievement'])
-            
-            # 차이 계산
-            member['score_diff'] = round(member['manager_score'] - member['baseline_score'], 2)
+            member = _member_row_to_dict(row)
             
             # 업무 데이터 조회
             member['task_data'] = fetch_member_task_data(member['emp_no'], period_id)
@@ -184,6 +193,97 @@ def fetch_headquarter_cl_members_enhanced(headquarter_id: int, cl_group: str, pe
         
         return members
 
+def fetch_headquarter_members_bulk(headquarter_id: int, period_id: int) -> Dict[str, List[Dict]]:
+    """
+    본부 내 모든 CL 그룹의 직원 데이터(업무+동료평가 포함)를 한 번에 조회 → {"CL3": [직원, ...], ...}
+    fetch_headquarter_cl_members_enhanced와 같은 직원 dict를 만들지만 직원/CL 수와 관계없이 쿼리 3번
+    (직원+점수, 본부 업무 요약, 본부 동료평가 요약)으로 끝난다.
+    """
+    
+    with engine.connect() as connection:
+        # 1. 직원 + 평가 점수 (final_evaluation_reports, temp_evaluations) - 모든 CL
+        member_rows = connection.execute(text("""
+            SELECT 
+                e.emp_no, e.emp_name, e.cl, e.position, e.team_id,
+                fer.score as module7_score,           -- 모듈7 정규화 점수
+                te.score as baseline_score,           -- 모듈7 원본 점수
+                te.manager_score,                     -- 팀장 수정 점수  
+                COALESCE(te.reason, '') as captain_reason,          -- 팀장 수정 사유
+                fer.ai_annual_achievement_rate as kpi_achievement,  -- KPI 달성률
+                fer.final_evaluation_report_id,
+                tea.team_evaluation_id                -- 동료평가 조회용
+            FROM employees e
+            JOIN teams t ON e.team_id = t.team_id
+            JOIN temp_evaluations te ON e.emp_no = te.emp_no
+            JOIN team_evaluations tea ON t.team_id = tea.team_id
+            JOIN final_evaluation_reports fer ON (e.emp_no = fer.emp_no AND tea.team_evaluation_id = fer.team_evaluation_id)
+            WHERE t.headquarter_id = :headquarter_id 
+              AND tea.period_id = :period_id
+              AND te.manager_score IS NOT NULL
+              AND fer.score IS NOT NULL
+            ORDER BY e.cl DESC, e.emp_no
+        """), {"headquarter_id": headquarter_id, "period_id": period_id}).fetchall()
+        
+        # 2. 본부 직원들의 업무 요약 (직원별 정렬은 기존 조회와 동일)
+        task_rows = connection.execute(text("""
+            SELECT 
+                t.emp_no,
+                t.task_id,
+                t.task_name,
+                t.task_detail,
+                t.target_level,
+                t.weight as task_weight,
+                ts.ai_contribution_score,
+                ts.ai_achievement_rate,
+                ts.ai_assessed_grade,
+                ts.ai_analysis_comment_task,
+                ts.task_performance,
+                tk.kpi_name,
+                tk.kpi_description,
+                tk.weight as kpi_weight
+            FROM tasks t
+            JOIN task_summaries ts ON t.task_id = ts.task_id
+            JOIN team_kpis tk ON t.team_kpi_id = tk.team_kpi_id
+            JOIN employees e ON t.emp_no = e.emp_no
+            JOIN teams tm ON e.team_id = tm.team_id
+            WHERE tm.headquarter_id = :headquarter_id 
+              AND ts.period_id = :period_id
+            ORDER BY t.emp_no, t.weight DESC, ts.ai_contribution_score DESC
+        """), {"headquarter_id": headquarter_id, "period_id": period_id}).fetchall()
+        
+        # 3. 본부 팀 평가의 동료평가 AI 요약 (연말: final_evaluation_reports, 분기: feedback_reports)
+        report_table = "final_evaluation_reports" if period_id == 4 else "feedback_reports"
+        peer_rows = connection.execute(text(f"""
+            SELECT 
+                r.emp_no,
+                r.team_evaluation_id,
+                r.ai_peer_talk_summary as peer_summary
+            FROM {report_table} r
+            JOIN team_evaluations tea ON r.team_evaluation_id = tea.team_evaluation_id
+            JOIN teams t ON tea.team_id = t.team_id
+            WHERE t.headquarter_id = :headquarter_id 
+              AND tea.period_id = :period_id
+        """), {"headquarter_id": headquarter_id, "period_id": period_id}).fetchall()
+    
+    tasks_by_emp: Dict[str, List[Dict]] = {}
+    for row in task_rows:
+        task = _task_row_to_dict(row)
+        tasks_by_emp.setdefault(task.pop('emp_no'), []).append(task)
+    
+    peer_by_key = {(row.emp_no, row.team_evaluation_id): row.peer_summary for row in peer_rows}
+    
+    members_by_cl: Dict[str, List[Dict]] = {}
+    for row in member_rows:
+        member = _member_row_to_dict(row)
+        member['task_data'] = tasks_by_emp.get(member['emp_no'], [])
+        member['peer_evaluation_data'] = _parse_peer_evaluation_data(
+            member['emp_no'], peer_by_key.get((member['emp_no'], member['team_evaluation_id'])), period_id
+        )
+        members_by_cl.setdefault(f"CL{member['cl']}", []).append(member)
+    
+    print(f"   📥 본부 {headquarter_id} 일괄 조회: 쿼리 3회, 직원 {len(member_rows)}명, 업무 {len(task_rows)}건, 동료평가 {len(peer_rows)}건")
+    return members_by_cl
+
 def get_all_cl_groups_in_headquarter(headquarter_id: int, period_id: int) -> List[str]:
     """본부 내 존재하는 모든 CL 그룹 조회"""
     with engine.connect() as connection:
@@ -211,194 +311,225 @@ def get_all_cl_groups_in_headquarter(headquarter_id: int, period_id: int) -> Lis
 # DB 업데이트 함수
 # ================================================================
 
+def compute_team_rankings(rows: List[Dict]) -> Dict[Any, int]:
+    """
+    팀별 점수 순위 계산 (RANK() OVER (PARTITION BY team_id ORDER BY score DESC)와 동일).
+    rows: [{"final_evaluation_report_id", "team_id", "score"}] → {final_evaluation_report_id: 순위}
+    같은 점수는 같은 순위이고 다음 순위는 건너뜀 (1, 2, 2, 4). 점수가 없는 행은 순위 없음.
+    """
+    rankings = {}
+    by_team: Dict[Any, List[Dict]] = {}
+    for row in rows:
+        if row["score"] is not None:
+            by_team.setdefault(row["team_id"], []).append(row)
+    
+    for team_rows in by_team.values():
+        team_rows.sort(key=lambda row: safe_decimal_to_float(row["score"]), reverse=True)
+        previous_score = None
+        rank = 0
+        for position, row in enumerate(team_rows, 1):
+            score = safe_decimal_to_float(row["score"])
+            if score != previous_score:
+                rank = position
+                previous_score = score
+            rankings[row["final_evaluation_report_id"]] = rank
+    return rankings
+
+def _update_team_rankings_window(connection, period_id: int) -> int:
+    """
+    기간 전체의 팀별 순위를 윈도 함수 + 상관 서브쿼리 UPDATE 한 문장으로 반영
+    (MariaDB/MySQL 전용 UPDATE ... JOIN 대신 표준 SQL만 사용 - SQLite 3.25+에서도 동작,
+     대상 테이블은 파생 테이블 안에서만 읽으므로 MySQL의 같은 테이블 UPDATE 제약에도 걸리지 않음)
+    """
+    result = connection.execute(text("""
+        UPDATE final_evaluation_reports
+        SET ranking = (
+            SELECT ranked.rank_num
+            FROM (
+                SELECT 
+                    fer2.final_evaluation_report_id,
+                    RANK() OVER (
+                        PARTITION BY tea2.team_id 
+                        ORDER BY fer2.score DESC
+                    ) as rank_num
+                FROM final_evaluation_reports fer2
+                JOIN team_evaluations tea2 ON fer2.team_evaluation_id = tea2.team_evaluation_id
+                WHERE tea2.period_id = :period_id
+                  AND fer2.score IS NOT NULL
+            ) ranked
+            WHERE ranked.final_evaluation_report_id = final_evaluation_reports.final_evaluation_report_id
+        )
+        WHERE team_evaluation_id IN (
+            SELECT team_evaluation_id FROM team_evaluations WHERE period_id = :period_id
+        )
+    """), {"period_id": period_id})
+    return result.rowcount
+
+def _update_team_rankings_python(connection, period_id: int) -> int:
+    """윈도 함수 UPDATE를 지원하지 않는 DB용 - 점수를 읽어 파이썬에서 순위 계산 후 다중 행 UPDATE"""
+    rows = connection.execute(text("""
+        SELECT 
+            fer.final_evaluation_report_id,
+            tea.team_id,
+            fer.score
+        FROM final_evaluation_reports fer
+        JOIN team_evaluations tea ON fer.team_evaluation_id = tea.team_evaluation_id
+        WHERE tea.period_id = :period_id
+    """), {"period_id": period_id}).fetchall()
+    
+    rows = [row_to_dict(row) for row in rows]
+    rankings = compute_team_rankings(rows)
+    return bulk_update(connection, "final_evaluation_reports", "final_evaluation_report_id", {
+        row["final_evaluation_report_id"]: {"ranking": rankings.get(row["final_evaluation_report_id"])}
+        for row in rows
+    })
+
 def update_team_rankings(period_id: int) -> Dict:
-    """팀별 독립 순위 업데이트 (같은 점수는 같은 순위: 1, 2, 2, 4 형태)"""
+    """
+    팀별 독립 순위 업데이트 (같은 점수는 같은 순위: 1, 2, 2, 4 형태)
+    기간 전체를 윈도 함수 UPDATE 한 문장으로 처리하고, 실패하면 파이썬 계산 경로로 재시도한다.
+    """
     
-    success_count = 0
-    failed_teams = []
-    total_teams = 0
+    teams = []
     
-    with engine.connect() as connection:
-        try:
-            # 1. 해당 기간의 모든 팀 조회
-            teams_query = text("""
-                SELECT DISTINCT t.team_id, t.team_name
-                FROM teams t
-                JOIN team_evaluations tea ON t.team_id = tea.team_id
-                JOIN final_evaluation_reports fer ON tea.team_evaluation_id = fer.team_evaluation_id
+    try:
+        with unit_of_work() as connection:
+            try:
+                with connection.begin_nested():
+                    updated_rows = _update_team_rankings_window(connection, period_id)
+                method = "window"
+            except Exception as window_error:
+                print(f"   ⚠️ 윈도 함수 순위 UPDATE 실패 - 파이썬 계산으로 재시도: {str(window_error)}")
+                updated_rows = _update_team_rankings_python(connection, period_id)
+                method = "python"
+            
+            # 팀별 순위 결과 확인 (쿼리 1회)
+            ranking_rows = connection.execute(text("""
+                SELECT 
+                    tea.team_id,
+                    t.team_name,
+                    fer.emp_no,
+                    fer.score,
+                    fer.ranking,
+                    e.emp_name
+                FROM final_evaluation_reports fer
+                JOIN team_evaluations tea ON fer.team_evaluation_id = tea.team_evaluation_id
+                JOIN teams t ON tea.team_id = t.team_id
+                JOIN employees e ON fer.emp_no = e.emp_no
                 WHERE tea.period_id = :period_id
                   AND fer.score IS NOT NULL
-                ORDER BY t.team_id
-            """)
-            
-            teams = connection.execute(teams_query, {"period_id": period_id}).fetchall()
-            total_teams = len(teams)
-            
-            print(f"📊 팀별 순위 업데이트 시작: {total_teams}개 팀")
-            
-            for team in teams:
-                team_id = team.team_id
-                team_name = team.team_name
-                
-                try:
-                    # 2. 각 팀별로 순위 계산 및 업데이트
-                    ranking_query = text("""
-                        UPDATE final_evaluation_reports fer
-                        SET ranking = (
-                            SELECT rank_num
-                            FROM (
-                                SELECT 
-                                    emp_no,
-                                    RANK() OVER (
-                                        PARTITION BY t2.team_id 
-                                        ORDER BY fer2.score DESC, fer2.emp_no ASC
-                                    ) as rank_num
-                                FROM final_evaluation_reports fer2
-                                JOIN team_evaluations tea2 ON fer2.team_evaluation_id = tea2.team_evaluation_id
-                                JOIN teams t2 ON tea2.team_id = t2.team_id
-                                WHERE t2.team_id = :team_id 
-                                  AND tea2.period_id = :period_id
-                                  AND fer2.score IS NOT NULL
-                            ) ranked
-                            WHERE ranked.emp_no = fer.emp_no
-                        )
-                        WHERE fer.team_evaluation_id IN (
-                            SELECT tea.team_evaluation_id 
-                            FROM team_evaluations tea 
-                            WHERE tea.team_id = :team_id 
-                              AND tea.period_id = :period_id
-                        )
-                    """)
-                    
-                    result = connection.execute(ranking_query, {
-                        "team_id": team_id,
-                        "period_id": period_id
-                    })
-                    
-                    # 3. 업데이트된 행 수 확인
-                    updated_rows = result.rowcount
-                    
-                    if updated_rows > 0:
-                        success_count += 1
-                        print(f"   ✅ {team_name} (팀ID: {team_id}): {updated_rows}명 순위 업데이트")
-                        
-                        # 4. 순위 결과 확인 (디버깅용)
-                        check_query = text("""
-                            SELECT 
-                                fer.emp_no,
-                                fer.score,
-                                fer.ranking,
-                                e.emp_name
-                            FROM final_evaluation_reports fer
-                            JOIN team_evaluations tea ON fer.team_evaluation_id = tea.team_evaluation_id
-                            JOIN employees e ON fer.emp_no = e.emp_no
-                            WHERE tea.team_id = :team_id 
-                              AND tea.period_id = :period_id
-                              AND fer.score IS NOT NULL
-                            ORDER BY fer.ranking ASC, fer.emp_no ASC
-                        """)
-                        
-                        rankings = connection.execute(check_query, {
-                            "team_id": team_id,
-                            "period_id": period_id
-                        }).fetchall()
-                        
-                        # 상위 3명만 출력
-                        for i, rank in enumerate(rankings[:3]):
-                            print(f"     {rank.ranking}위: {rank.emp_no} ({rank.emp_name}) - {rank.score:.2f}점")
-                        
-                    else:
-                        failed_teams.append(team_name)
-                        print(f"   ⚠️ {team_name} (팀ID: {team_id}): 순위 업데이트 실패 (업데이트된 행 없음)")
-                        
-                except Exception as e:
-                    failed_teams.append(team_name)
-                    print(f"   ❌ {team_name} (팀ID: {team_id}): 순위 업데이트 실패 - {str(e)}")
-            
-            connection.commit()
-            
-            success_rate = (success_count / total_teams * 100) if total_teams > 0 else 0
-            print(f"💾 팀별 순위 업데이트 완료: {success_count}/{total_teams}개 팀 성공 ({success_rate:.1f}%)")
-            
-            if failed_teams:
-                print(f"   ❌ 실패한 팀: {', '.join(failed_teams)}")
-            
-            return {
-                "success_count": success_count,
-                "failed_count": len(failed_teams),
-                "total_teams": total_teams,
-                "success_rate": round(success_rate, 1),
-                "failed_teams": failed_teams
-            }
-            
-        except Exception as e:
-            print(f"❌ 팀별 순위 업데이트 실패: {str(e)}")
-            connection.rollback()
-            return {
-                "success_count": 0,
-                "failed_count": total_teams,
-                "total_teams": total_teams,
-                "success_rate": 0.0,
-                "failed_teams": [team.team_name for team in teams] if 'teams' in locals() else [],
-                "error": str(e)
-            }
+                ORDER BY tea.team_id, fer.ranking ASC, fer.emp_no ASC
+            """), {"period_id": period_id}).fetchall()
+        
+        rankings_by_team: Dict[Any, List] = {}
+        for row in ranking_rows:
+            rankings_by_team.setdefault((row.team_id, row.team_name), []).append(row)
+        teams = list(rankings_by_team)
+        total_teams = len(teams)
+        
+        print(f"📊 팀별 순위 업데이트: {total_teams}개 팀, {updated_rows}행 ({'윈도 함수 UPDATE' if method == 'window' else '파이썬 계산'})")
+        
+        success_count = 0
+        failed_teams = []
+        for (team_id, team_name), rankings in rankings_by_team.items():
+            if all(rank.ranking is not None for rank in rankings):
+                success_count += 1
+                print(f"   ✅ {team_name} (팀ID: {team_id}): {len(rankings)}명 순위 업데이트")
+                # 상위 3명만 출력
+                for rank in rankings[:3]:
+                    print(f"     {rank.ranking}위: {rank.emp_no} ({rank.emp_name}) - {rank.score:.2f}점")
+            else:
+                failed_teams.append(team_name)
+                print(f"   ⚠️ {team_name} (팀ID: {team_id}): 순위 업데이트 실패 (순위 없는 직원 있음)")
+        
+        success_rate = (success_count / total_teams * 100) if total_teams > 0 else 0
+        print(f"💾 팀별 순위 업데이트 완료: {success_count}/{total_teams}개 팀 성공 ({success_rate:.1f}%)")
+        
+        if failed_teams:
+            print(f"   ❌ 실패한 팀: {', '.join(failed_teams)}")
+        
+        return {
+            "success_count": success_count,
+            "failed_count": len(failed_teams),
+            "total_teams": total_teams,
+            "success_rate": round(success_rate, 1),
+            "failed_teams": failed_teams,
+            "method": method
+        }
+        
+    except Exception as e:
+        print(f"❌ 팀별 순위 업데이트 실패: {str(e)}")
+        return {
+            "success_count": 0,
+            "failed_count": len(teams),
+            "total_teams": len(teams),
+            "success_rate": 0.0,
+            "failed_teams": [team_name for _, team_name in teams],
+            "error": str(e)
+        }
 
 def batch_update_final_evaluation_reports(adjustments: List[Dict], period_id: int) -> Dict:
-    """CL 그룹의 조정 결과를 final_evaluation_reports에 실제 업데이트"""
+    """
+    CL 그룹의 조정 결과를 final_evaluation_reports에 실제 업데이트
+    존재 확인 쿼리 1회 + executemany UPDATE 1회로 반영하고, 실패한 직원은 기존처럼 개별 보고한다.
+    """
     
     success_count = 0
     failed_members = []
     
-    with engine.connect() as connection:
-        try:
-            for adj in adjustments:
-                try:
-                    query = text("""
-                        UPDATE final_evaluation_reports fer
-                        SET score = :score,
-                            cl_reason = :cl_reason
-                        WHERE fer.final_evaluation_report_id = :report_id
-                    """)
-                    
-                    # 향상된 사유 생성
-                    validity_analysis = adj.get("validity_analysis", {})
-                    detailed_reason = f"{adj['reason']} | 타당성분석: 업무증거 {validity_analysis.get('task_evidence', 0):.2f}, 동료평가 {validity_analysis.get('peer_consistency', 0):.2f}"
-                    
-                    result = connection.execute(query, {
-                        "report_id": adj.get("final_evaluation_report_id"),
-                        "score": adj["final_score"],
-                        "cl_reason": detailed_reason
-                    })
-                    
-                    if result.rowcount > 0:
-                        success_count += 1
-                        print(f"   ✅ {adj['emp_no']}: {adj['original_score']:.2f} → {adj['final_score']:.2f} ({adj['change_amount']:+.2f}) | {validity_analysis.get('validity_grade', 'N/A')}")
-                    else:
-                        failed_members.append(adj["emp_no"])
-                        print(f"   ❌ {adj['emp_no']}: 업데이트 실패 (행 없음)")
-                        
-                except Exception as e:
-                    failed_members.append(adj["emp_no"])
-                    print(f"   ❌ {adj['emp_no']}: 업데이트 실패 - {str(e)}")
-            
-            connection.commit()
-            print(f"💾 DB 업데이트 완료: 성공 {success_count}건, 실패 {len(failed_members)}건")
-            
-            return {
-                "success_count": success_count,
-                "failed_count": len(failed_members),
-                "failed_members": failed_members
-            }
-            
-        except Exception as e:
-            print(f"❌ 배치 업데이트 실패: {str(e)}")
-            connection.rollback()
-            return {
-                "success_count": 0,
-                "failed_count": len(adjustments),
-                "failed_members": [adj["emp_no"] for adj in adjustments]
-            }
-        
+    # 향상된 사유 생성 (report_id → 저장할 값)
+    rows = {}
+    for adj in adjustments:
+        report_id = adj.get("final_evaluation_report_id")
+        if report_id is None:
+            continue
+        validity_analysis = adj.get("validity_analysis", {})
+        detailed_reason = f"{adj['reason']} | 타당성분석: 업무증거 {validity_analysis.get('task_evidence', 0):.2f}, 동료평가 {validity_analysis.get('peer_consistency', 0):.2f}"
+        rows[report_id] = {"score": adj["final_score"], "cl_reason": detailed_reason}
+    
+    try:
+        existing = set()
+        errors = {}
+        if rows:
+            with unit_of_work() as connection:
+                existing = {
+                    row[0] for row in connection.execute(text("""
+                        SELECT final_evaluation_report_id
+                        FROM final_evaluation_reports
+                        WHERE final_evaluation_report_id IN :report_ids
+                    """).bindparams(bindparam("report_ids", expanding=True)), {"report_ids": list(rows)})
+                }
+                errors = bulk_update_isolating_failures(
+                    connection, "final_evaluation_reports", "final_evaluation_report_id",
+                    {report_id: data for report_id, data in rows.items() if report_id in existing}
+                )
+    except Exception as e:
+        print(f"❌ 배치 업데이트 실패: {str(e)}")
+        return {
+            "success_count": 0,
+            "failed_count": len(adjustments),
+            "failed_members": [adj["emp_no"] for adj in adjustments]
+        }
+    
+    for adj in adjustments:
+        report_id = adj.get("final_evaluation_report_id")
+        if report_id not in existing:
+            failed_members.append(adj["emp_no"])
+            print(f"   ❌ {adj['emp_no']}: 업데이트 실패 (행 없음)")
+        elif report_id in errors:
+            failed_members.append(adj["emp_no"])
+            print(f"   ❌ {adj['emp_no']}: 업데이트 실패 - {errors[report_id]}")
+        else:
+            success_count += 1
+            print(f"   ✅ {adj['emp_no']}: {adj['original_score']:.2f} → {adj['final_score']:.2f} ({adj['change_amount']:+.2f}) | {adj.get('validity_analysis', {}).get('validity_grade', 'N/A')}")
+    
+    print(f"💾 DB 업데이트 완료: 성공 {success_count}건, 실패 {len(failed_members)}건")
+    
+    return {
+        "success_count": success_count,
+        "failed_count": len(failed_members),
+        "failed_members": failed_members
+    }
 
 def get_all_headquarters_info() -> List[Dict]:
     """모든 본부 정보 조회"""
@@ -11,8 +11,12 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
-# LLM 클라이언트 설정
-llm_client = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+from shared.llm_gateway import get_llm_gateway
+
+# LLM 클라이언트 초기화 (공용 게이트웨이의 클라이언트 재사용)
+LLM_MODEL = "gpt-4o-mini"
+llm_gateway = get_llm_gateway()
+llm_client = llm_gateway.get_client(LLM_MODEL, 0)
 logger = logging.getLogger(__name__)
 
 def _extract_json_from_llm_response(text: str) -> str:
@@ -160,7 +164,7 @@ def analyze_task_evidence_consistency(member: Dict) -> float:
             HumanMessage(content=user_prompt)
         ]
         
-        response = llm_client.invoke(messages)
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module9")
         response_text = str(response.content)  # 안전한 문자열 변환
         
         # JSON 추출 및 파싱
@@ -237,7 +241,7 @@ def analyze_peer_evaluation_consistency(member: Dict) -> float:
             HumanMessage(content=user_prompt)
         ]
         
-        response = llm_client.invoke(messages)
+        response = llm_gateway.invoke(messages, model=LLM_MODEL, module="module9")
         response_text = str(response.content)  # 안전한 문자열 변환
         
         # JSON 추출 및 파싱
@@ -3,13 +3,15 @@
 # ================================================================
 
 import logging
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 from langchain_core.messages import HumanMessage
 
 from agents.evaluation.modules.module_09_cl_normalization.agent import *
 from agents.evaluation.modules.module_09_cl_normalization.db_utils import *
 from agents.evaluation.modules.module_09_cl_normalization.llm_utils import *
+from config.settings import WorkflowConfig
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -202,10 +204,15 @@ def generate_enhanced_summary_report(state: Module9AgentState) -> Dict:
     
     return enhanced_summary_report
 
-def run_enhanced_module9_workflow_fixed(headquarter_id: int, period_id: int = 4):
-    """향상된 모듈9 완전한 워크플로우 실행"""
-    
-    print(f"🚀 향상된 모듈9 워크플로우 실행 시작")
+def run_enhanced_module9_workflow_fixed(headquarter_id: int, period_id: int = 4,
+                                        dry_run: bool = False, skip_ranking: bool = False):
+    """
+    향상된 모듈9 완전한 워크플로우 실행
+    - dry_run: 조정 결과만 계산하고 점수/순위를 DB에 쓰지 않음
+    - skip_ranking: 점수는 저장하되 팀별 순위 갱신은 호출한 쪽에 맡김 (여러 본부 일괄 실행용)
+    """
+    
+    print(f"🚀 향상된 모듈9 워크플로우 실행 시작{' (dry-run)' if dry_run else ''}")
     print(f"   본부: {headquarter_id}, 기간: {period_id}")
     print(f"   특징: 업무증거분석 + 동료평가통합 + 향상된타당성판단")
     print(f"   {'='*70}")
@@ -215,6 +222,8 @@ def run_enhanced_module9_workflow_fixed(headquarter_id: int, period_id: int = 4)
         messages=[HumanMessage(content=f"향상된 모듈9 시작: 본부 {headquarter_id}")],
         headquarter_id=headquarter_id,
         period_id=period_id,
+        dry_run=dry_run,
+        skip_ranking=skip_ranking,
         department_data={},
         enhanced_analysis={},
         supervisor_results={},
@@ -280,6 +289,8 @@ def execute_module9_pipeline(headquarter_id: int, period_id: int = 4) -> Dict:
             messages=[HumanMessage(content=f"향상된 모듈9 시작: 본부 {headquarter_id}")],
             headquarter_id=headquarter_id,
             period_id=period_id,
+            dry_run=False,
+            skip_ranking=False,
             department_data={},
             enhanced_analysis={},
             supervisor_results={},
@@ -453,39 +464,119 @@ def run_multiple_headquarters_module9(headquarter_ids: List[int], period_id: int
     
     return results
 
-def run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids: List[int], period_id: int = 4):
-    """여러 본부 향상된 일괄 실행"""
+def consolidate_enhanced_summary_reports(reports: List[Dict], period_id: int) -> Dict:
+    """본부별 generate_enhanced_summary_report 결과를 하나의 요약으로 합침"""
+    
+    def total(section: str, key: str):
+        return sum(report.get(section, {}).get(key, 0) for report in reports)
+    
+    validity_distribution = {"매우 타당": 0, "타당": 0, "보통": 0, "의심": 0, "매우 의심": 0}
+    for report in reports:
+        for grade, count in report.get("enhanced_analysis_stats", {}).get("validity_distribution", {}).items():
+            validity_distribution[grade] = validity_distribution.get(grade, 0) + count
+    
+    # 본부 평균 타당성은 분석한 CL 수로 가중 평균
+    analyzed_cls = total("enhanced_analysis_stats", "analyzed_cls")
+    weighted_validity = sum(
+        report.get("enhanced_analysis_stats", {}).get("avg_validity_score", 0)
+        * report.get("enhanced_analysis_stats", {}).get("analyzed_cls", 0)
+        for report in reports
+    )
     
-    print(f"🏢 여러 본부 향상된 모듈9 일괄 실행: {len(headquarter_ids)}개 본부")
+    return {
+        "period_id": period_id,
+        "execution_timestamp": datetime.now().isoformat(),
+        "version": "enhanced_v2.0",
+        "headquarter_ids": [report["headquarter_id"] for report in reports],
+        "initial_stats": {
+            "total_cls": total("initial_stats", "total_cls"),
+            "total_members": total("initial_stats", "total_members"),
+            "adjustment_needed_cls": total("initial_stats", "adjustment_needed_cls"),
+            "total_surplus": total("initial_stats", "total_surplus")
+        },
+        "enhanced_analysis_stats": {
+            "analyzed_cls": analyzed_cls,
+            "avg_validity_score": round(weighted_validity / analyzed_cls, 3) if analyzed_cls else 0,
+            "high_validity_members": total("enhanced_analysis_stats", "high_validity_members"),
+            "low_validity_members": total("enhanced_analysis_stats", "low_validity_members"),
+            "validity_distribution": validity_distribution
+        },
+        "final_stats": {
+            "processed_cls": total("final_stats", "processed_cls"),
+            "adjusted_members": total("final_stats", "adjusted_members"),
+            "distribution_achieved_cls": total("final_stats", "distribution_achieved_cls"),
+            "fallback_used_cls": total("final_stats", "fallback_used_cls"),
+            "enhanced_features_used_cls": total("final_stats", "enhanced_features_used_cls")
+        },
+        "total_processing_time_ms": total("performance_metrics", "total_processing_time_ms"),
+        "cl_details": [
+            {"headquarter_id": report["headquarter_id"], **cl_summary}
+            for report in reports for cl_summary in report.get("cl_details", [])
+        ],
+        "error_logs": [
+            f"본부 {report['headquarter_id']}: {error}"
+            for report in reports for error in report.get("error_logs", [])
+        ]
+    }
+
+def run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids: List[int], period_id: int = 4,
+                                                     dry_run: bool = False, max_workers: Optional[int] = None):
+    """
+    여러 본부 향상된 일괄 실행
+    - CL 제로섬 조정은 본부 단위이고 본부끼리 직원이 겹치지 않으므로 본부를 스레드로 동시에 실행
+      (LLM 호출은 공용 게이트웨이의 module9 동시 호출 상한을 함께 사용)
+    - 본부별 요약 보고서를 하나로 합친 뒤 팀별 순위는 기간당 한 번만 갱신
+    - dry_run: 조정 결과만 계산하고 점수/순위를 DB에 쓰지 않음 (시간 측정/회귀 비교용)
+    반환: {"results": {본부ID: 결과}, "consolidated_summary": 합친 요약, "ranking_update": 순위 갱신 결과, ...}
+    """
+    
+    workers = max(1, min(len(headquarter_ids) or 1, max_workers or WorkflowConfig().MODULE9_HQ_WORKERS))
+    
+    print(f"🏢 여러 본부 향상된 모듈9 일괄 실행: {len(headquarter_ids)}개 본부 (동시 {workers}개){' (dry-run)' if dry_run else ''}")
     print(f"   대상 본부: {headquarter_ids}")
     print(f"   향상된 기능: 업무증거분석 + 동료평가통합 + 다면검증")
     print(f"   {'='*80}")
     
-    results = {}
-    total_success = 0
-    total_failed = 0
-    total_processed_employees = 0
-    total_failed_employees = 0
+    start_time = datetime.now()
     
-    for i, hq_id in enumerate(headquarter_ids, 1):
-        print(f"\n🏢 본부 {hq_id} 향상된 처리 중... ({i}/{len(headquarter_ids)})")
-        print(f"   {'-'*60}")
-        
+    def run_headquarter(hq_id: int) -> Dict:
+        print(f"\n🏢 본부 {hq_id} 향상된 처리 시작")
         try:
-            result = run_enhanced_module9_workflow_fixed(hq_id, period_id)
-            results[hq_id] = result
-            
-            if result["success"]:
-                total_success += 1
-                total_processed_employees += result["total_processed"]
-                total_failed_employees += result["total_failed"]
-            else:
-                total_failed += 1
-                
+            return run_enhanced_module9_workflow_fixed(hq_id, period_id, dry_run=dry_run, skip_ranking=True)
         except Exception as e:
             print(f"❌ 본부 {hq_id} 향상된 처리 실패: {str(e)}")
-            results[hq_id] = {"success": False, "error": str(e)}
-            total_failed += 1
+            return {"success": False, "error": str(e)}
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="module9-hq") as pool:
+        futures = {hq_id: pool.submit(run_headquarter, hq_id) for hq_id in headquarter_ids}
+    
+    # 결과는 입력한 본부 순서대로 정리
+    results = {hq_id: future.result() for hq_id, future in futures.items()}
+    succeeded = [result for result in results.values() if result.get("success")]
+    total_success = len(succeeded)
+    total_failed = len(headquarter_ids) - total_success
+    total_processed_employees = sum(result["total_processed"] for result in succeeded)
+    total_failed_employees = sum(result["total_failed"] for result in succeeded)
+    
+    consolidated_summary = consolidate_enhanced_summary_reports(
+        [result["enhanced_summary_report"] for result in succeeded], period_id
+    )
+    
+    # 팀별 순위 업데이트 - 모든 본부의 점수를 저장한 뒤 기간당 한 번만 실행
+    # (도중에 실패한 본부도 일부 점수를 이미 저장했을 수 있으므로 합친 조정 인원과 무관하게 항상 실행)
+    ranking_result = None
+    if dry_run:
+        print(f"\n🧪 dry-run - 팀별 순위 업데이트 생략")
+    else:
+        print(f"\n🏆 팀별 순위 업데이트 시작 (Q{period_id})...")
+        try:
+            ranking_result = update_team_rankings(period_id)
+            print(f"   ✅ 순위 업데이트 완료: {ranking_result['success_count']}/{ranking_result['total_teams']}개 팀 성공")
+        except Exception as ranking_error:
+            print(f"   ❌ 순위 업데이트 중 오류: {str(ranking_error)}")
+            ranking_result = {"success_count": 0, "error": str(ranking_error)}
+    
+    execution_time = (datetime.now() - start_time).total_seconds()
     
     # 전체 결과 요약
     print(f"\n🎉 여러 본부 향상된 처리 완료!")
@@ -493,13 +584,23 @@ def run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids: List[int],
     print(f"🏁 전체 향상된 결과 요약:")
     print(f"   - 성공한 본부: {total_success}/{len(headquarter_ids)}개")
     print(f"   - 실패한 본부: {total_failed}/{len(headquarter_ids)}개")
-    print(f"   - 본부 성공률: {(total_success / len(headquarter_ids) * 100):.1f}%")
+    print(f"   - 본부 성공률: {(total_success / len(headquarter_ids) * 100) if headquarter_ids else 0:.1f}%")
     print(f"   - 총 처리 직원: {total_processed_employees}명")
     print(f"   - 총 실패 직원: {total_failed_employees}명")
     print(f"   - 직원 성공률: {(total_processed_employees / (total_processed_employees + total_failed_employees) * 100) if (total_processed_employees + total_failed_employees) > 0 else 0:.1f}%")
+    print(f"   - 총 조정 인원: {consolidated_summary['final_stats']['adjusted_members']}명")
+    print(f"   ⏱️  실행 시간: {execution_time:.2f}초")
     print(f"   🚀 적용된 향상 기능: 업무실적검증, 동료평가일치성분석, 종합타당성판단")
     
-    return results
+    return {
+        "results": results,
+        "consolidated_summary": consolidated_summary,
+        "ranking_update": ranking_result,
+        "dry_run": dry_run,
+        "total_success": total_success,
+        "total_failed": total_failed,
+        "execution_time_seconds": execution_time
+    }
 
 # ================================================================
 # 메인 실행 부분
@@ -553,7 +654,7 @@ print("  - test_module9()")
 print("  - run_multiple_headquarters_module9(headquarter_ids, period_id)")
 print("  - run_enhanced_module9_workflow_fixed(headquarter_id, period_id)")
 print("  - test_enhanced_module9_fixed()")
-print("  - run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids, period_id)")
+print("  - run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids, period_id, dry_run)")
 print()
 print("🚀 이제 다음과 같이 실행하세요:")
 print("   result = execute_module9_pipeline(1, 4)")
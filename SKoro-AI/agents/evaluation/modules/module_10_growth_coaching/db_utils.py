@@ -6,7 +6,7 @@ import sys
 import os
 import json
 from typing import Dict, List, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from dotenv import load_dotenv
 
@@ -14,10 +14,11 @@ load_dotenv()
 
 # DB 설정
 from config.settings import DatabaseConfig
+from db import get_engine, unit_of_work
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row: Row) -> Dict:
     """SQLAlchemy Row 객체를 딕셔너리로 변환"""
@@ -280,8 +281,9 @@ def calculate_ranking_by_achievement(emp_no: str, team_id: str, period_id: int,
 def save_individual_result(emp_no: str, period_id: int, report_type: str, 
                          individual_result: Dict, overall_comment: str) -> bool:
     """개인용 결과 + 종합 총평 저장"""
-    with engine.connect() as connection:
-        try:
+    try:
+        # 한 트랜잭션으로 처리 (블록 종료 시 한 번 commit, 실패 시 rollback)
+        with unit_of_work() as connection:
             if report_type == "quarterly":
                 # feedback_reports 테이블에 저장
                 query = text("""
@@ -318,18 +320,17 @@ def save_individual_result(emp_no: str, period_id: int, report_type: str,
                 "overall_comment": overall_comment
             })
             
-            connection.commit()
             return result.rowcount > 0
             
-        except Exception as e:
-            print(f"개인용 결과 저장 실패: {e}")
-            connection.rollback()
-            return False
+    except Exception as e:
+        print(f"개인용 결과 저장 실패: {e}")
+        return False
 
 def save_manager_result(emp_no: str, period_id: int, manager_result: Dict) -> bool:
     """팀장용 결과 저장 (team_evaluations.ai_team_coaching에 누적)"""
-    with engine.connect() as connection:
-        try:
+    try:
+        # 한 트랜잭션으로 처리 (블록 종료 시 한 번 commit, 실패 시 rollback)
+        with unit_of_work() as connection:
             # 기존 team_coaching 데이터 조회
             team_id_query = text("SELECT team_id FROM employees WHERE emp_no = :emp_no")
             team_result = connection.execute(team_id_query, {"emp_no": emp_no}).fetchone()
@@ -339,11 +340,12 @@ def save_manager_result(emp_no: str, period_id: int, manager_result: Dict) -> bo
                 
             team_id = team_result.team_id
             
-            # 기존 ai_team_coaching 데이터 조회
+            # 기존 ai_team_coaching 데이터 조회 (누적 갱신이므로 커밋 전까지 행 잠금)
             existing_query = text("""
                 SELECT ai_team_coaching 
                 FROM team_evaluations 
                 WHERE team_id = :team_id AND period_id = :period_id
+                FOR UPDATE
             """)
             
             existing_result = connection.execute(existing_query, {
@@ -399,13 +401,11 @@ def save_manager_result(emp_no: str, period_id: int, manager_result: Dict) -> bo
                 "result": json.dumps(existing_data, ensure_ascii=False)
             })
             
-            connection.commit()
             return result.rowcount > 0
             
-        except Exception as e:
-            print(f"팀장용 결과 저장 실패: {e}")
-            connection.rollback()
-            return False
+    except Exception as e:
+        print(f"팀장용 결과 저장 실패: {e}")
+        return False
 
 # ================================================================
 # 테스트 및 디버깅 함수들
@@ -8,7 +8,7 @@ from langchain_core.messages import HumanMessage
 from agents.evaluation.modules.module_10_growth_coaching.agent import Module10AgentState, create_module10_graph
 from agents.evaluation.modules.module_10_growth_coaching.db_utils import *
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import sys
 import os
 from dotenv import load_dotenv
@@ -17,10 +17,11 @@ load_dotenv()
 
 # DB 설정
 from config.settings import DatabaseConfig
+from db import get_engine
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 # ================================================================
 # 실행 함수들
@@ -5,12 +5,13 @@ import os
 import json
 import logging
 from typing import Dict, List, Optional, Any
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Row
 from sqlalchemy.exc import OperationalError
 
 # 기존 프로젝트의 DatabaseConfig 사용
 from config.settings import DatabaseConfig
+from db import get_engine
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ class DatabaseError(Module11Error):
 # 기존 프로젝트의 DatabaseConfig 사용
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 # ====================================
 # 기본 DB 연결 래퍼
@@ -150,12 +150,10 @@ def validate_plan_json_structure(result: Dict) -> bool:
 def get_year_from_period(period_id: int) -> int:
     """period_id로 연도 조회"""
     try:
-        from sqlalchemy import create_engine, text
-        from config.settings import DatabaseConfig
+        from sqlalchemy import text
+        from db import get_engine
         
-        db_config = DatabaseConfig()
-        DATABASE_URL = db_config.DATABASE_URL
-        engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+        engine = get_engine()
         
         with engine.connect() as connection:
             query = text("SELECT year FROM periods WHERE period_id = :period_id")
@@ -24,11 +24,11 @@ DATABASE_URL = (
 # --- 1) 엔진은 한 번만 생성 ---
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,            # 개발 시 SQL 로그 보기
-    pool_pre_ping=True,   # 쓸 때마다 ping 확인
-    pool_recycle=1800,    # 1시간마다 커넥션 재생성
-    pool_size=10,
-    max_overflow=20,
+    echo=db_config.DB_ECHO,                   # SQL 로그 (DB_ECHO=true일 때만)
+    pool_pre_ping=True,                       # 쓸 때마다 ping 확인
+    pool_recycle=db_config.DB_POOL_RECYCLE,   # 커넥션 재생성 주기
+    pool_size=db_config.DB_POOL_SIZE,
+    max_overflow=db_config.DB_MAX_OVERFLOW,
 )
 
 # --- 2) 세션 팩토리 역시 이 엔진을 바인딩 ---
@@ -4,20 +4,19 @@ import time
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from db import get_engine
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import ProgrammingError
 
-from config.settings import DatabaseConfig
 
 print("✅ 연말 개인 최종 평가 리포트 생성기 - 기본 라이브러리 임포트 완료")
 
 # --- 1. 데이터베이스 연동 함수 ---
 def get_db_engine() -> Engine:
-    db_config = DatabaseConfig()
-    engine = create_engine(db_config.DATABASE_URL, pool_pre_ping=True)
-    print("✅ 데이터베이스 엔진 생성 완료")
+    engine = get_engine()
+    print("✅ 데이터베이스 엔진 준비 완료")
     return engine
 
 # --- 2. 데이터 조회 함수 ---
@@ -4,12 +4,12 @@ import time
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from db import get_engine
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import ProgrammingError
 
-from config.settings import DatabaseConfig
 
 print("✅ 연말 팀 평가 리포트 생성기 - 기본 라이브러리 임포트 완료")
 
@@ -17,11 +17,10 @@ print("✅ 연말 팀 평가 리포트 생성기 - 기본 라이브러리 임포
 
 def get_db_engine() -> Engine:
     """
-    config.settings의 DatabaseConfig를 사용하여 SQLAlchemy 엔진을 생성합니다.
+    프로세스 공유 SQLAlchemy 엔진(db.get_engine)을 반환합니다.
     """
-    db_config = DatabaseConfig()
-    engine = create_engine(db_config.DATABASE_URL, pool_pre_ping=True)
-    print("✅ 데이터베이스 엔진 생성 완료")
+    engine = get_engine()
+    print("✅ 데이터베이스 엔진 준비 완료")
     return engine
 
 def clear_existing_team_reports(engine: Engine, teams: Optional[list] = None, period_id: Optional[int] = None):
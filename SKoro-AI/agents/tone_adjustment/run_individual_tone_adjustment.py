@@ -1,19 +1,18 @@
 import json
 import logging
 from typing import Dict, Any, List, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from db import get_engine
 from sqlalchemy.engine.base import Engine
 from langchain_openai import ChatOpenAI
 
-from config.settings import DatabaseConfig
 from agents.tone_adjustment.individual_tone_adjustment import IndividualToneAdjustmentAgent
 
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 
 def get_db_engine() -> Engine:
-    """데이터베이스 엔진 생성"""
-    db_config = DatabaseConfig()
-    engine = create_engine(db_config.DATABASE_URL, pool_pre_ping=True)
+    """데이터베이스 엔진 반환 (프로세스 공유 엔진)"""
+    engine = get_engine()
     return engine
 
 def fetch_team_emp_nos(engine: Engine, teams: list, period_id: int) -> list:
@@ -7,7 +7,7 @@ import sys
 import os
 import json
 from typing import Dict, List, Any
-from sqlalchemy import create_engine, text, Engine
+from sqlalchemy import text, Engine
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -16,11 +16,12 @@ load_dotenv()
 # DB 설정
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), '../../..')))
 from config.settings import DatabaseConfig
+from db import get_engine
 
 # 데이터베이스 설정
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 def row_to_dict(row) -> Dict:
     """SQLAlchemy Row를 Dictionary로 변환"""
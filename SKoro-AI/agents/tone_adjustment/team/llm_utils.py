@@ -8,6 +8,8 @@ from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 
+from shared.llm_gateway import get_llm_gateway
+
 class ManagerLLMClient:
     """팀장용 LLM 클라이언트"""
     
@@ -147,7 +149,13 @@ class ManagerLLMClient:
                 HumanMessage(content=character_limit_reminder + "\n\n" + report_text)
             ]
             
-            response = self.client.invoke(messages)
+            # 공용 게이트웨이 경유 (속도 제한 / 응답 캐시는 LLM_CACHE_MODULES에 tone_adjustment를 넣고 temperature 0으로 실행할 때만 사용)
+            response = get_llm_gateway().invoke(
+                messages,
+                model=self.client.model_name,
+                temperature=self.client.temperature,
+                module="tone_adjustment"
+            )
             return response.content
             
         except Exception as e:
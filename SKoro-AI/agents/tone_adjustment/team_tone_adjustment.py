@@ -4,6 +4,8 @@ from typing import Dict, Any, List, Optional
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 
+from shared.llm_gateway import get_llm_gateway
+
 # ================================================================
 # 팀장용 필드 매핑 설정 (실제 JSON 구조에 맞춰 수정)
 # ================================================================
@@ -425,7 +427,13 @@ class TeamLeaderToneAdjustmentAgent:
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm_client.invoke(messages)
+            # 공용 게이트웨이 경유 (속도 제한 / 응답 캐시는 LLM_CACHE_MODULES에 tone_adjustment를 넣고 temperature 0으로 실행할 때만 사용)
+            response = get_llm_gateway().invoke(
+                messages,
+                model=self.llm_client.model_name,
+                temperature=self.llm_client.temperature,
+                module="tone_adjustment"
+            )
             
             # response.content가 str | list 타입일 수 있으므로 str로 변환
             if isinstance(response.content, str):
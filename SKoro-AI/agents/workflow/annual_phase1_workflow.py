@@ -2,7 +2,7 @@
 # 연말 1단계 평가 워크플로우
 # =====================================
 # 목적: AI 기반 팀별 평가 수행 (모듈2,3,4,6,7) + 연말 중간평가 리포트 생성 및 톤 조정
-# Phase 1: 팀별 평가 (모듈2,3,4,6,7 순차 실행)
+# Phase 1: 팀별 평가 (모듈2 → 모듈3,4 병렬 → 모듈6 → 모듈7, 팀 간 병렬)
 # - 모듈2: 목표달성도 분석
 # - 모듈3: Peer Talk 분석  
 # - 모듈4: 협업 분석
@@ -31,6 +31,7 @@ import logging
 from agents.workflow.workflow_utils import (
     get_target_teams, run_team_module_with_retry, check_all_teams_phase_completed, update_team_status, parse_teams
 )
+from agents.workflow.parallel_executor import TeamModuleStep, TeamParallelExecutor, WorkflowRunContext
 from agents.evaluation.modules.module_02_goal_achievement.agent import create_module2_graph
 from agents.evaluation.modules.module_03_peer_talk.agent import create_module3_graph
 from agents.evaluation.modules.module_04_collaboration.agent import create_module4_graph
@@ -42,127 +43,122 @@ import sys
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# Phase 1: 모듈2,3,4,6,7 순차 실행 (팀별)
-def run_phase1_all_teams(teams, period_id):
-    logging.info("Phase1: 모듈2,3,4,6,7 순차 실행 시작")
+# Phase 1: 모듈2 → 모듈3,4 병렬 → 모듈6 → 모듈7 실행 (팀 병렬)
+def run_phase1_all_teams(teams, period_id, max_workers=None, run_context=None):
+    logging.info("Phase1: 모듈2 → 모듈3,4 병렬 → 모듈6 → 모듈7 실행 시작 (팀 병렬)")
+
+    # 1. 모듈2 (목표달성도)
+    def module2_func(team_id, period_id):
+        task_ids, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        state = {
+            "report_type": "annual",
+            "team_id": team_id,
+            "period_id": period_id,
+            "target_task_ids": task_ids,
+            "target_team_kpi_ids": kpi_ids,
+            "feedback_report_ids": [],
+            "final_evaluation_report_ids": [],
+            "updated_task_ids": [],
+            "updated_team_kpi_ids": [],
+            "team_evaluation_id": None,
+            "team_context_guide": {},
+            "messages": []
+        }
+        graph = create_module2_graph()
+        graph.invoke(state)
+        return True
     
-    for idx, team_id in enumerate(teams, 1):
-        logging.info(f"[Phase1] 팀 {team_id} ({idx}/{len(teams)}) 시작")
-        
-        # 1. 모듈2 (목표달성도)
-        logging.info(f"[Phase1][모듈2] 팀 {team_id} 실행")
-        def module2_func(team_id, period_id):
-            task_ids, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+    # 2. 모듈3 (Peer Talk)
+    def module3_func(team_id, period_id):
+        members = fetch_team_members(team_id)
+        for member in members:
+            if member.get('role') == 'MANAGER':
+                continue
             state = {
-                "report_type": "annual",
                 "team_id": team_id,
                 "period_id": period_id,
-                "target_task_ids": task_ids,
-                "target_team_kpi_ids": kpi_ids,
-                "feedback_report_ids": [],
-                "final_evaluation_report_ids": [],
-                "updated_task_ids": [],
-                "updated_team_kpi_ids": [],
-                "team_evaluation_id": None,
-                "team_context_guide": {},
+                "target_emp_no": member['emp_no'],
+                "peer_evaluation_ids": [],
+                "evaluator_emp_nos": [],
+                "evaluation_weights": [],
+                "keyword_collections": [],
+                "task_summaries": [],
+                "peer_evaluation_summary_sentences": [],
+                "strengths": [],
+                "concerns": [],
+                "collaboration_observations": [],
+                "weighted_analysis_result": {},
+                "feedback_report_id": None,
+                "final_evaluation_report_id": None,
                 "messages": []
             }
-            graph = create_module2_graph()
+            graph = create_module3_graph()
             graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module2_func, period_id)
-        
-        # 2. 모듈3 (Peer Talk)
-        logging.info(f"[Phase1][모듈3] 팀 {team_id} 실행")
-        def module3_func(team_id, period_id):
-            members = fetch_team_members(team_id)
-            for member in members:
-                if member.get('role') == 'MANAGER':
-                    continue
-                state = {
-                    "team_id": team_id,
-                    "period_id": period_id,
-                    "target_emp_no": member['emp_no'],
-                    "peer_evaluation_ids": [],
-                    "evaluator_emp_nos": [],
-                    "evaluation_weights": [],
-                    "keyword_collections": [],
-                    "task_summaries": [],
-                    "peer_evaluation_summary_sentences": [],
-                    "strengths": [],
-                    "concerns": [],
-                    "collaboration_observations": [],
-                    "weighted_analysis_result": {},
-                    "feedback_report_id": None,
-                    "final_evaluation_report_id": None,
-                    "messages": []
-                }
-                graph = create_module3_graph()
-                graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module3_func, period_id)
-        
-        # 3. 모듈4 (협업 분석)
-        logging.info(f"[Phase1][모듈4] 팀 {team_id} 실행")
-        def module4_func(team_id, period_id):
-            _, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
-            state = {
-                "report_type": "annual",
-                "team_id": team_id,
-                "period_id": period_id,
-                "target_team_kpi_ids": kpi_ids,
-                "collaboration_relationships": None,
-                "individual_collaboration_analysis": None,
-                "team_collaboration_matrix": None,
-                "team_evaluation_id": None,
-                "messages": None
-            }
-            graph = create_module4_graph()
-            graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module4_func, period_id)
-        
-        # 4. 모듈6 (4P BARS)
-        logging.info(f"[Phase1][모듈6] 팀 {team_id} 실행")
-        def module6_func(team_id, period_id):
-            members = fetch_team_members(team_id)
-            for member in members:
-                if member.get('role') == 'MANAGER':
-                    continue
-                state = {
-                    "report_type": "annual",
-                    "team_id": team_id,
-                    "period_id": period_id,
-                    "emp_no": member['emp_no'],
-                    "feedback_report_id": None,
-                    "final_evaluation_report_id": None,
-                    "raw_evaluation_criteria": "",
-                    "evaluation_criteria": {},
-                    "evaluation_results": {},
-                    "integrated_data": {},
-                    "messages": []
-                }
-                graph = create_module6_graph_efficient()
-                graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module6_func, period_id)
-        
-        # 5. 모듈7 (종합평가 점수 산정 + 팀내CL정규화)
-        logging.info(f"[Phase1][모듈7] 팀 {team_id} 실행")
-        def module7_func(team_id, period_id):
+        return True
+    
+    # 3. 모듈4 (협업 분석)
+    def module4_func(team_id, period_id):
+        _, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        state = {
+            "report_type": "annual",
+            "team_id": team_id,
+            "period_id": period_id,
+            "target_team_kpi_ids": kpi_ids,
+            "collaboration_relationships": None,
+            "individual_collaboration_analysis": None,
+            "team_collaboration_matrix": None,
+            "team_evaluation_id": None,
+            "messages": None
+        }
+        graph = create_module4_graph()
+        graph.invoke(state)
+        return True
+    
+    # 4. 모듈6 (4P BARS)
+    def module6_func(team_id, period_id):
+        members = fetch_team_members(team_id)
+        for member in members:
+            if member.get('role') == 'MANAGER':
+                continue
             state = {
                 "report_type": "annual",
                 "team_id": team_id,
                 "period_id": period_id,
+                "emp_no": member['emp_no'],
+                "feedback_report_id": None,
+                "final_evaluation_report_id": None,
+                "raw_evaluation_criteria": "",
+                "evaluation_criteria": {},
+                "evaluation_results": {},
+                "integrated_data": {},
                 "messages": []
             }
-            graph = create_team_module7_graph()
+            graph = create_module6_graph_efficient()
             graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module7_func, period_id)
-        
-        update_team_status(team_id, period_id, "AI_PHASE1_COMPLETED")
-        logging.info(f"[Phase1] 팀 {team_id} 완료")
+        return True
+    
+    # 5. 모듈7 (종합평가 점수 산정 + 팀내CL정규화)
+    def module7_func(team_id, period_id):
+        state = {
+            "report_type": "annual",
+            "team_id": team_id,
+            "period_id": period_id,
+            "messages": []
+        }
+        graph = create_team_module7_graph()
+        graph.invoke(state)
+        return True
+    
+    steps = [
+        TeamModuleStep("module2", module2_func),
+        TeamModuleStep("module3", module3_func, depends_on=["module2"]),
+        TeamModuleStep("module4", module4_func, depends_on=["module2"]),
+        # 모듈6(4P People)은 모듈3의 동료평가 요약과 모듈4의 협업 매트릭스를 읽으므로 두 모듈 이후 실행
+        TeamModuleStep("module6", module6_func, depends_on=["module3", "module4"]),
+        TeamModuleStep("module7", module7_func, depends_on=["module3", "module4", "module6"]),
+    ]
+    executor = TeamParallelExecutor(max_team_workers=max_workers, run_context=run_context)
+    return executor.run(teams, period_id, steps, completed_status="AI_PHASE1_COMPLETED", log_prefix="[Phase1]")
 
 # Phase 2: 연말 중간평가 리포트 생성 및 톤 조정
 def run_phase2_reports_and_tone(period_id: int, teams):
@@ -208,22 +204,28 @@ def run_phase2_reports_and_tone(period_id: int, teams):
     
     logging.info("Phase2: 전체 완료!")
 
-def run_auto_workflow(period_id: int, specific_teams=None):
+def run_auto_workflow(period_id: int, specific_teams=None, max_workers=None, run_context=None):
     """
     --auto 옵션: Phase1 → Phase2까지 자동 실행
+    run_context가 주어지면 Phase 사이마다 취소 여부를 확인한다.
+    반환값: 모든 Phase를 마쳤으면 True, 중간에 중단되면 False
     """
+    run_context = run_context or WorkflowRunContext()
     logging.info("[AUTO] 연말 1단계 평가 자동 실행 시작")
     teams = get_target_teams(period_id, specific_teams)
     logging.info(f"[AUTO] 평가 대상 팀: {teams}")
 
     # Phase1: 팀별 평가 (모듈2,3,4,6,7)
-    run_phase1_all_teams(teams, period_id)
+    run_phase1_all_teams(teams, period_id, max_workers, run_context)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase2를 실행하지 않습니다.")
+        return False
     
     # Phase1 완료 체크
     all_completed = check_all_teams_phase_completed(teams, period_id, 'AI_PHASE1_COMPLETED')
     if not all_completed:
         logging.error(f"[AUTO] 일부 팀이 Phase1을 완료하지 못했습니다. Phase2를 실행할 수 없습니다.")
-        return
+        return False
     else:
         logging.info("[AUTO] 모든 팀이 Phase1을 완료했습니다.")
 
@@ -231,6 +233,7 @@ def run_auto_workflow(period_id: int, specific_teams=None):
     run_phase2_reports_and_tone(period_id, teams)
     
     logging.info("[AUTO] 연말 1단계 평가 자동 실행 완료!")
+    return True
 
 def main():
     parser = argparse.ArgumentParser(
@@ -252,6 +255,7 @@ def main():
     parser.add_argument('--period-id', type=int, required=True, help='연말 1단계 ID (예: 4)')
     parser.add_argument('--teams', help='팀 ID (예: 1,2,3 또는 all)', required=False, default=None)
     parser.add_argument('--auto', action='store_true', help='모든 단계 자동 실행')
+    parser.add_argument('--max-workers', type=int, default=None, help='동시에 처리할 팀 수 (기본값: WORKFLOW_MAX_TEAM_WORKERS)')
     parser.add_argument('--phase', type=str, choices=['1', '2'], help='특정 Phase만 실행')
     args = parser.parse_args()
 
@@ -267,7 +271,7 @@ def main():
             logging.info(f"[AUTO] 지정된 팀만 자동 실행: {team_list}")
         else:
             logging.info("[AUTO] 전체 팀 자동 실행")
-        run_auto_workflow(args.period_id, team_list)
+        run_auto_workflow(args.period_id, team_list, args.max_workers)
         sys.exit(0)
 
     # --phase 옵션: 특정 Phase만 실행
@@ -276,7 +280,7 @@ def main():
         logging.info(f"[Phase{args.phase}] {len(teams)}개 팀 실행")
         
         if args.phase == '1':
-            run_phase1_all_teams(teams, args.period_id)
+            run_phase1_all_teams(teams, args.period_id, args.max_workers)
         elif args.phase == '2':
             # Phase1 완료 체크
             if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE1_COMPLETED"):
@@ -292,7 +296,7 @@ def main():
     logging.info(f"🚀 연말 1단계 평가 시작: {len(teams)}개 팀")
 
     # Phase1: 팀별 평가 (모듈2,3,4,6,7)
-    run_phase1_all_teams(teams, args.period_id)
+    run_phase1_all_teams(teams, args.period_id, args.max_workers)
     if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE1_COMPLETED"):
         logging.warning("일부 팀이 Phase1을 완료하지 못했습니다. 중단합니다.")
         return
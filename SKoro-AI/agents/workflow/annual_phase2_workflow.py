@@ -2,11 +2,11 @@
 # 연말 2단계 평가 워크플로우
 # =====================================
 # 목적: 전사 모듈 실행 (모듈8,9,10,11) + 연말 리포트 생성 + 톤 조정
-# Phase 3: 팀별 평가 (모듈8)
+# Phase 3: 팀별 평가 (모듈8, 팀 병렬)
 # - 모듈8: 팀 성과 비교
 # Phase 4: 본부별 평가 (모듈9)
 # - 모듈9: 부문별 CL 정규화
-# Phase 5: 팀별 평가 (모듈10,11 순차 실행)
+# Phase 5: 팀별 평가 (모듈10 팀 병렬 실행 → 모듈11)
 # - 모듈10: 개인 성장 코칭
 # - 모듈11: 팀 운영 리스크 분석
 # Phase 6: 연말 리포트 생성 및 톤 조정
@@ -39,12 +39,14 @@ import logging
 from agents.workflow.workflow_utils import (
     get_target_teams, run_team_module_with_retry, check_all_teams_phase_completed, update_team_status, parse_teams
 )
-from agents.evaluation.modules.module_08_team_comparision.agent import create_module8_graph
+from agents.workflow.parallel_executor import TeamModuleStep, TeamParallelExecutor, WorkflowRunContext
+from config.settings import WorkflowConfig
+from agents.evaluation.modules.module_08_team_comparision.agent import create_module8_graph, prepare_period_source_versions
 from agents.evaluation.modules.module_10_growth_coaching.agent import create_module10_graph
 from agents.evaluation.modules.module_11_team_coaching.agent import Module11TeamRiskManagementAgent
 from agents.evaluation.modules.module_11_team_coaching.db_utils import Module11DataAccess, SQLAlchemyDBWrapper, engine
 from agents.evaluation.modules.module_09_cl_normalization.db_utils import get_all_headquarters_info
-from agents.evaluation.modules.module_09_cl_normalization.run_module_09 import run_enhanced_module9_workflow_fixed
+from agents.evaluation.modules.module_09_cl_normalization.run_module_09 import run_multiple_headquarters_enhanced_module9_fixed
 from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_team_members, fetch_team_evaluation_id
 
 import asyncio
@@ -71,29 +73,34 @@ def check_all_teams_submitted(teams, period_id):
     logging.info(f"팀장 제출 상태 체크: {count}개 팀이 아직 SUBMITTED 미달성")
     return count == 0
 
-# Phase 3: 모듈8 (팀별)
-def run_phase3_module8(period_id: int, teams):
+# Phase 3: 모듈8 (팀 병렬)
+def run_phase3_module8(period_id: int, teams, max_workers=None, run_context=None):
     """
     Phase3: 모듈8(팀 성과 비교) 실행
     """
     logging.info("Phase3: 모듈8(팀 성과 비교) 실행 시작")
     logging.info(f"[Phase3] 전체 대상 팀: {teams}")
 
-    for team_id in teams:
-        try:
-            logging.info(f"[Phase3][모듈8] 팀 {team_id} 실행")
-            module8_graph = create_module8_graph()
-            state8 = {
-                "team_id": team_id,
-                "period_id": period_id,
-                "report_type": "annual",
-                "messages": []
-            }
-            module8_graph.invoke(state8)
-            update_team_status(team_id, period_id, "AI_PHASE3_COMPLETED")
-            logging.info(f"[Phase3][모듈8] 팀 {team_id} 완료")
-        except Exception as e:
-            logging.error(f"[Phase3][모듈8] 팀 {team_id} 실패: {e}")
+    # 클러스터/통계 입력 지문은 팀마다 다시 조회하지 않고 한 번만 계산해 모든 팀이 공유
+    source_versions = prepare_period_source_versions(period_id)
+
+    def module8_func(team_id, period_id):
+        module8_graph = create_module8_graph()
+        state8 = {
+            "team_id": team_id,
+            "period_id": period_id,
+            "report_type": "annual",
+            "source_versions": source_versions,
+            "messages": []
+        }
+        module8_graph.invoke(state8)
+        return True
+
+    steps = [TeamModuleStep("module8", module8_func)]
+    executor = TeamParallelExecutor(max_team_workers=max_workers, run_context=run_context)
+    # 모듈8이 성공한 팀만 AI_PHASE3_COMPLETED로 업데이트
+    executor.run(teams, period_id, steps, completed_status="AI_PHASE3_COMPLETED",
+                 log_prefix="[Phase3]", require_success=True)
 
     logging.info("Phase3: 모듈8 완료")
 
@@ -107,70 +114,69 @@ def run_phase4_module9(period_id: int):
     try:
         headquarters = get_all_headquarters_info()
         logging.info(f"[Phase4] 대상 본부: {len(headquarters)}개")
-        for hq in headquarters:
-            headquarter_id = hq["headquarter_id"]
-            headquarter_name = hq["headquarter_name"]
-            try:
-                logging.info(f"[Phase4][모듈9] 본부 {headquarter_id} ({headquarter_name}) 실행")
-                # headquarter_id를 정수로 변환 (새로운 버전은 int를 요구함)
-                headquarter_id_int = int(headquarter_id) if isinstance(headquarter_id, str) else headquarter_id
-                result = run_enhanced_module9_workflow_fixed(headquarter_id_int, period_id)
-                if result and result.get("success"):
-                    logging.info(f"[Phase4][모듈9] 본부 {headquarter_id} 완료: {result.get('total_processed', 0)}명 처리")
-                else:
-                    logging.error(f"[Phase4][모듈9] 본부 {headquarter_id} 실패: {result.get('error', 'Unknown error')}")
-            except Exception as e:
-                logging.error(f"[Phase4][모듈9] 본부 {headquarter_id} 실패: {e}")
+        # headquarter_id를 정수로 변환 (새로운 버전은 int를 요구함)
+        headquarter_ids = [
+            int(hq["headquarter_id"]) if isinstance(hq["headquarter_id"], str) else hq["headquarter_id"]
+            for hq in headquarters
+        ]
+        # 본부 동시 실행 → 팀별 순위는 모든 본부 완료 후 한 번만 갱신
+        summary = run_multiple_headquarters_enhanced_module9_fixed(headquarter_ids, period_id)
+        for headquarter_id, result in summary["results"].items():
+            if result.get("success"):
+                logging.info(f"[Phase4][모듈9] 본부 {headquarter_id} 완료: {result.get('total_processed', 0)}명 처리")
+            else:
+                logging.error(f"[Phase4][모듈9] 본부 {headquarter_id} 실패: {result.get('error', 'Unknown error')}")
         logging.info("Phase4: 모듈9 완료")
     except Exception as e:
         logging.error(f"[Phase4][모듈9] 부문별 CL 정규화 실패: {e}")
 
-# Phase 5: 모듈10,11 (팀별 순차 실행)
-def run_phase5_modules_10_11(period_id: int, teams):
+# Phase 5: 모듈10 (팀 병렬) → 모듈11
+def run_phase5_modules_10_11(period_id: int, teams, max_workers=None, run_context=None):
     """
     Phase5: 모듈10(개인 성장 코칭), 11(팀 리스크 분석) 순차 실행
     """
     logging.info("Phase5: 모듈10,11 순차 실행 시작")
     logging.info(f"[Phase5] 전체 대상 팀: {teams}")
 
-    # 1. 모듈10: 개인 성장 코칭 (팀원별)
+    # 1. 모듈10: 개인 성장 코칭 (팀원별, 팀 병렬)
     logging.info("[Phase5][모듈10] 개인 성장 코칭 시작")
-    for team_id in teams:
-        try:
-            members = fetch_team_members(team_id)
-            for member in members:
-                # 팀장 제외
-                if member.get('role') == 'MANAGER':
-                    continue
-                emp_no = member["emp_no"]
-                logging.info(f"[Phase5][모듈10] 팀 {team_id} - {emp_no} 실행")
-                module10_graph = create_module10_graph()
-                state10 = {
-                    "emp_no": emp_no,
-                    "period_id": period_id,
-                    "report_type": "annual",
-                    "messages": [],
-                    "basic_info": {},
-                    "performance_data": {},
-                    "peer_talk_data": {},
-                    "fourp_data": {},
-                    "collaboration_data": {},
-                    "module7_score_data": {},
-                    "module9_final_data": {},
-                    "growth_analysis": {},
-                    "focus_coaching_needed": False,
-                    "focus_coaching_analysis": {},
-                    "individual_growth_result": {},
-                    "manager_coaching_result": {},
-                    "overall_comment": "",
-                    "storage_result": {},
-                    "processing_status": "",
-                    "error_messages": []
-                }
-                module10_graph.invoke(state10)
-                logging.info(f"[Phase5][모듈10] 팀 {team_id} - {emp_no} 완료")
-        except Exception as e:
-            logging.error(f"[Phase5][모듈10] 팀 {team_id} 실패: {e}")
+    def module10_func(team_id, period_id):
+        members = fetch_team_members(team_id)
+        for member in members:
+            # 팀장 제외
+            if member.get('role') == 'MANAGER':
+                continue
+            emp_no = member["emp_no"]
+            logging.info(f"[Phase5][모듈10] 팀 {team_id} - {emp_no} 실행")
+            module10_graph = create_module10_graph()
+            state10 = {
+                "emp_no": emp_no,
+                "period_id": period_id,
+                "report_type": "annual",
+                "messages": [],
+                "basic_info": {},
+                "performance_data": {},
+                "peer_talk_data": {},
+                "fourp_data": {},
+                "collaboration_data": {},
+                "module7_score_data": {},
+                "module9_final_data": {},
+                "growth_analysis": {},
+                "focus_coaching_needed": False,
+                "focus_coaching_analysis": {},
+                "individual_growth_result": {},
+                "manager_coaching_result": {},
+                "overall_comment": "",
+                "storage_result": {},
+                "processing_status": "",
+                "error_messages": []
+            }
+            module10_graph.invoke(state10)
+            logging.info(f"[Phase5][모듈10] 팀 {team_id} - {emp_no} 완료")
+        return True
+
+    executor = TeamParallelExecutor(max_team_workers=max_workers, run_context=run_context)
+    executor.run(teams, period_id, [TeamModuleStep("module10", module10_func)], log_prefix="[Phase5]")
     logging.info("[Phase5][모듈10] 개인 성장 코칭 완료")
 
     # 2. 모듈11: 팀 리스크 분석 (팀 단위, async)
@@ -266,12 +272,27 @@ def run_phase6_reports_and_tone(period_id: int, teams):
             logging.warning(f"[Phase6] 팀 {team_id} 톤 조정 실패로 COMPLETED 상태 업데이트 건너뜀")
     
     logging.info(f"Phase6: 완료된 팀 {len(completed_teams)}/{len(teams)}")
+
+    # 4. 완료된 팀 리포트를 챗봇 벡터DB에 증분 반영 (변경된 청크만 재임베딩)
+    if completed_teams and WorkflowConfig().SYNC_VECTOR_DB:
+        logging.info(f"[Phase6] 벡터DB 증분 동기화 시작: {completed_teams}")
+        from agents.chatbot.vector_sync import sync_team_reports
+        sync_team_reports(period_id, completed_teams)
+
+    # 5. 완료된 팀의 챗봇 사용자 메타데이터 캐시 무효화 (다음 채팅에서 최신 role/team으로 다시 조회)
+    if completed_teams:
+        from agents.chatbot.user_metadata import invalidate_user_metadata
+        invalidate_user_metadata(team_ids=completed_teams)
+
     logging.info("Phase6: 전체 완료!")
 
-def run_auto_workflow(period_id: int, specific_teams=None):
+def run_auto_workflow(period_id: int, specific_teams=None, max_workers=None, run_context=None):
     """
     --auto 옵션: Phase3 → Phase4 → Phase5 → Phase6까지 자동 실행
+    run_context가 주어지면 Phase 사이마다 취소 여부를 확인한다.
+    반환값: 모든 Phase를 마쳤으면 True, 중간에 중단되면 False
     """
+    run_context = run_context or WorkflowRunContext()
     logging.info("[AUTO] 연말 2단계 평가 자동 실행 시작")
     teams = get_target_teams(period_id, specific_teams)
     logging.info(f"[AUTO] 평가 대상 팀: {teams}")
@@ -280,31 +301,41 @@ def run_auto_workflow(period_id: int, specific_teams=None):
     all_submitted = check_all_teams_submitted(teams, period_id)
     if not all_submitted:
         logging.error(f"[AUTO] 일부 팀이 아직 SUBMITTED 상태가 아닙니다. 팀장 수정 및 제출을 완료해주세요.")
-        return
+        return False
     else:
         logging.info("[AUTO] 모든 팀이 SUBMITTED 상태입니다. Phase3를 시작합니다.")
 
     # Phase3: 모듈8 (팀별)
-    run_phase3_module8(period_id, teams)
+    run_phase3_module8(period_id, teams, max_workers, run_context)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase4를 실행하지 않습니다.")
+        return False
     
     # Phase3 완료 체크
     all_completed = check_all_teams_phase_completed(teams, period_id, 'AI_PHASE3_COMPLETED')
     if not all_completed:
         logging.error(f"[AUTO] 일부 팀이 Phase3를 완료하지 못했습니다. Phase4를 실행할 수 없습니다.")
-        return
+        return False
     else:
         logging.info("[AUTO] 모든 팀이 Phase3를 완료했습니다.")
 
     # Phase4: 모듈9 (본부별)
     run_phase4_module9(period_id)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase5를 실행하지 않습니다.")
+        return False
     
     # Phase5: 모듈10,11 (팀별 순차)
-    run_phase5_modules_10_11(period_id, teams)
+    run_phase5_modules_10_11(period_id, teams, max_workers, run_context)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase6를 실행하지 않습니다.")
+        return False
     
     # Phase6: 연말 리포트 생성 및 톤 조정
     run_phase6_reports_and_tone(period_id, teams)
     
     logging.info("[AUTO] 연말 2단계 평가 자동 실행 완료!")
+    return True
 
 def main():
     parser = argparse.ArgumentParser(
@@ -334,6 +365,7 @@ def main():
     parser.add_argument('--period-id', type=int, required=True, help='연말 기간 ID (예: 4)')
     parser.add_argument('--teams', help='팀 ID (예: 1,2,3 또는 all)', required=False, default=None)
     parser.add_argument('--auto', action='store_true', help='모든 단계 자동 실행')
+    parser.add_argument('--max-workers', type=int, default=None, help='동시에 처리할 팀 수 (기본값: WORKFLOW_MAX_TEAM_WORKERS)')
     parser.add_argument('--phase', type=str, choices=['3', '4', '5', '6'], help='특정 Phase만 실행')
     parser.add_argument('--module', type=int, choices=[8, 9, 10, 11], help='특정 모듈만 실행')
     args = parser.parse_args()
@@ -350,7 +382,7 @@ def main():
             logging.info(f"[AUTO] 지정된 팀만 자동 실행: {team_list}")
         else:
             logging.info("[AUTO] 전체 팀 자동 실행")
-        run_auto_workflow(args.period_id, team_list)
+        run_auto_workflow(args.period_id, team_list, args.max_workers)
         sys.exit(0)
 
     # --phase 옵션: 특정 Phase만 실행
@@ -359,7 +391,7 @@ def main():
         logging.info(f"[Phase{args.phase}] {len(teams)}개 팀 실행")
         
         if args.phase == '3':
-            run_phase3_module8(args.period_id, teams)
+            run_phase3_module8(args.period_id, teams, args.max_workers)
         elif args.phase == '4':
             # Phase3 완료 체크
             if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE3_COMPLETED"):
@@ -367,7 +399,7 @@ def main():
                 return
             run_phase4_module9(args.period_id)
         elif args.phase == '5':
-            run_phase5_modules_10_11(args.period_id, teams)
+            run_phase5_modules_10_11(args.period_id, teams, args.max_workers)
         elif args.phase == '6':
             run_phase6_reports_and_tone(args.period_id, teams)
         
@@ -381,7 +413,7 @@ def main():
         
         if args.module == 8:
             # 모듈8: 팀 성과 비교
-            run_phase3_module8(args.period_id, teams)
+            run_phase3_module8(args.period_id, teams, args.max_workers)
         
         elif args.module == 9:
             # 모듈9: 부문별 CL 정규화 (팀 지정 불필요)
@@ -389,11 +421,11 @@ def main():
         
         elif args.module == 10:
             # 모듈10: 개인 성장 코칭
-            run_phase5_modules_10_11(args.period_id, teams)
+            run_phase5_modules_10_11(args.period_id, teams, args.max_workers)
         
         elif args.module == 11:
             # 모듈11: 팀 리스크 분석
-            run_phase5_modules_10_11(args.period_id, teams)
+            run_phase5_modules_10_11(args.period_id, teams, args.max_workers)
         
         logging.info(f"[Module{args.module}] 완료!")
         sys.exit(0)
@@ -408,7 +440,7 @@ def main():
         return
 
     # Phase3: 모듈8 (팀별)
-    run_phase3_module8(args.period_id, teams)
+    run_phase3_module8(args.period_id, teams, args.max_workers)
     if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE3_COMPLETED"):
         logging.warning("일부 팀이 Phase3를 완료하지 못했습니다. 중단합니다.")
         return
@@ -417,7 +449,7 @@ def main():
     run_phase4_module9(args.period_id)
     
     # Phase5: 모듈10,11 (팀별 순차)
-    run_phase5_modules_10_11(args.period_id, teams)
+    run_phase5_modules_10_11(args.period_id, teams, args.max_workers)
     
     # Phase6: 연말 리포트 생성 및 톤 조정
     run_phase6_reports_and_tone(args.period_id, teams)
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+
+from db import get_engine, unit_of_work
+
+# 모듈 입력 지문(fingerprint) 저장 테이블 - (module, period_id, team_id, emp_no)당 한 행, 팀 단위 모듈은 emp_no = ''
+FINGERPRINT_TABLE = "evaluation_fingerprints"
+TEAM_SCOPE = ""
+
+def fingerprint_table_exists() -> bool:
+    """지문 테이블이 있는지 확인 (테이블은 migrations/에서 생성). 없으면 증분 실행을 끄고 전체 재계산"""
+    try:
+        if inspect(get_engine()).has_table(FINGERPRINT_TABLE):
+            return True
+        logging.warning(f"[증분] {FINGERPRINT_TABLE} 테이블이 없어 전체 재계산합니다 - 'python -m migrations'로 생성하세요")
+    except Exception as e:
+        logging.warning(f"[증분] 지문 테이블 확인 실패 - 전체 재계산합니다: {e}")
+    return False
+
+
+def fingerprint_rows(rows) -> str:
+    payload = json.dumps(rows, ensure_ascii=False, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fetch_rows(connection, query: str, params: Dict) -> List[Dict]:
+    return [dict(row._mapping) for row in connection.execute(text(query), params)]
+
+
+def _group_by_emp(rows: List[Dict], key: str = "emp_no") -> Dict[str, List[Dict]]:
+    grouped: Dict[str, List[Dict]] = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(row)
+    return grouped
+
+
+# ---------------- 모듈별 입력 조회 (팀 단위 set 조회) ----------------
+
+def _fetch_members(connection, team_id: int) -> List[Dict]:
+    return _fetch_rows(connection, """
+        SELECT emp_no, emp_name, cl, position, role
+        FROM employees WHERE team_id = :team_id
+        ORDER BY emp_no
+    """, {"team_id": team_id})
+
+
+def _fetch_task_rows(connection, team_id: int, period_id: int, include_ai_results: bool) -> List[Dict]:
+    """
+    팀원 Task + 해당 분기까지의 task_summaries 입력 컬럼.
+    include_ai_results=True이면 모듈2가 기록한 ai_* 결과도 포함 (모듈3/4/6은 모듈2 결과를 입력으로 사용)
+    """
+    ai_columns = """,
+               ts.ai_achievement_rate, ts.ai_contribution_score, ts.ai_assessed_grade, ts.ai_analysis_comment_task""" \
+        if include_ai_results else ""
+    return _fetch_rows(connection, f"""
+        SELECT t.task_id, t.emp_no, t.team_kpi_id, t.task_name, t.target_level, t.weight, t.task_detail,
+               t.start_date, t.end_date,
+               ts.task_summary_id, ts.period_id, ts.task_summary, ts.task_performance{ai_columns}
+        FROM tasks t
+        JOIN employees e ON t.emp_no = e.emp_no
+        LEFT JOIN task_summaries ts ON ts.task_id = t.task_id AND ts.period_id <= :period_id
+        WHERE e.team_id = :team_id
+        ORDER BY t.task_id, ts.period_id
+    """, {"team_id": team_id, "period_id": period_id})
+
+
+def _fetch_kpi_rows(connection, team_id: int) -> List[Dict]:
+    return _fetch_rows(connection, """
+        SELECT team_kpi_id, year, kpi_name, kpi_description, weight, evaluation_type
+        FROM team_kpis WHERE team_id = :team_id
+        ORDER BY team_kpi_id
+    """, {"team_id": team_id})
+
+
+def _fetch_grade_rows(connection, team_id: int) -> List[Dict]:
+    return _fetch_rows(connection, """
+        SELECT g.grade_id, g.team_kpi_id, g.task_id, g.grade_rule, g.grade_s, g.grade_a, g.grade_b, g.grade_c, g.grade_d
+        FROM grades g
+        WHERE g.team_kpi_id IN (SELECT team_kpi_id FROM team_kpis WHERE team_id = :team_id)
+           OR g.team_kpi_id IS NULL
+        ORDER BY g.grade_id
+    """, {"team_id": team_id})
+
+
+def _fetch_peer_rows(connection, team_id: int, period_id: int) -> List[Dict]:
+    """
+    팀원이 받은 해당 분기 동료평가 전체 (다른 팀 평가자 포함) - 평가자 사번/가중치/공동 업무와
+    키워드 이름까지 포함해 평가자 측 입력이 바뀌어도 지문이 달라지게 한다.
+    """
+    return _fetch_rows(connection, """
+        SELECT pe.target_emp_no, pe.peer_evaluation_id, pe.emp_no, pe.weight, pe.joint_task, pe.is_completed,
+               pek.keyword_id, pek.custom_keyword, k.keyword_name
+        FROM team_evaluations te
+        JOIN peer_evaluations pe ON te.team_evaluation_id = pe.team_evaluation_id
+        JOIN employees target ON target.emp_no = pe.target_emp_no
+        LEFT JOIN peer_evaluation_keywords pek ON pe.peer_evaluation_id = pek.peer_evaluation_id
+        LEFT JOIN keywords k ON pek.keyword_id = k.keyword_id
+        WHERE target.team_id = :team_id AND te.period_id = :period_id
+        ORDER BY pe.peer_evaluation_id, pek.peer_evaluation_keyword_id
+    """, {"team_id": team_id, "period_id": period_id})
+
+
+def _fetch_peer_talk_rows(connection, team_id: int, period_id: int) -> List[Dict]:
+    """모듈6이 읽는 팀원별 최신 Peer Talk 요약 (모듈3 결과)"""
+    return _fetch_rows(connection, """
+        SELECT fr.emp_no, te.period_id, fr.ai_peer_talk_summary
+        FROM feedback_reports fr
+        JOIN team_evaluations te ON fr.team_evaluation_id = te.team_evaluation_id
+        JOIN employees e ON e.emp_no = fr.emp_no
+        WHERE e.team_id = :team_id AND te.period_id <= :period_id
+        ORDER BY fr.emp_no, te.period_id
+    """, {"team_id": team_id, "period_id": period_id})
+
+
+def _fetch_collaboration_rows(connection, team_id: int, period_id: int) -> List[Dict]:
+    """모듈6이 읽는 팀 협업 매트릭스 (모듈4 결과)"""
+    return _fetch_rows(connection, """
+        SELECT period_id, ai_collaboration_matrix
+        FROM team_evaluations
+        WHERE team_id = :team_id AND period_id <= :period_id AND ai_collaboration_matrix IS NOT NULL
+        ORDER BY period_id
+    """, {"team_id": team_id, "period_id": period_id})
+
+
+def _fetch_prompt_rows(connection) -> List[Dict]:
+    return _fetch_rows(connection, "SELECT prompt_id, prompt FROM prompts ORDER BY prompt_id", {})
+
+
+class IncrementalTracker:
+    """
+    증분 재평가용 입력 지문 관리.
+    - 모듈2/4: 팀 단위, 모듈3/6: 팀원 단위로 실제로 읽는 입력 행을 해시
+    - 모듈10/8/11/Phase3: 입력이 앞 모듈 결과이므로 앞 모듈 지문을 묶어서 해시
+    - 모듈3/6 팀원 지문에는 평가자 측 입력(동료평가/키워드)과 모듈6이 읽는 Peer Talk·협업 매트릭스도 포함
+    - enabled=False(전체 재계산)이면 지문을 계산/기록하지 않음 - 첫 증분 실행이 전체를 계산하며 기준을 만든다
+    지문은 모듈이 성공한 뒤에만 기록하므로, 실패/중단된 단위는 다음 실행에서 다시 계산된다.
+    """
+
+    def __init__(self, period_id: int, enabled: bool = False):
+        self.period_id = period_id
+        self.enabled = enabled and fingerprint_table_exists()
+        self.available = self.enabled
+        self._stored: Optional[Dict[Tuple[str, int, str], str]] = None
+        self._lock = threading.Lock()
+        self.skipped: Dict[str, int] = {}
+        self.changed_teams = set()
+
+    def _load_stored(self) -> Dict[Tuple[str, int, str], str]:
+        with self._lock:
+            if self._stored is None:
+                self._stored = {}
+                if self.available:
+                    try:
+                        with get_engine().connect() as connection:
+                            rows = connection.execute(text(f"""
+                                SELECT module, team_id, emp_no, fingerprint FROM {FINGERPRINT_TABLE}
+                                WHERE period_id = :period_id
+                            """), {"period_id": self.period_id})
+                            self._stored = {(row.module, row.team_id, row.emp_no): row.fingerprint for row in rows}
+                    except Exception as e:
+                        logging.warning(f"[증분] 저장된 지문 조회 실패 - 전체 재계산합니다: {e}")
+            return self._stored
+
+    # ---------------- 지문 계산 ----------------
+
+    def compute(self, module: str, team_id: int) -> Dict[str, str]:
+        """
+        module의 현재 입력 지문 {emp_no: fingerprint} (팀 단위 모듈은 {'': fingerprint}).
+        모듈 실행 직전 DB 상태 기준으로 팀당 한 번의 set 조회로 계산한다.
+        계산에 실패하면 빈 dict를 반환하므로 해당 모듈은 항상 재계산된다.
+        """
+        if not self.available:
+            return {}
+        try:
+            return self._compute(module, team_id)
+        except Exception as e:
+            logging.warning(f"[증분] {module} 팀 {team_id} 입력 지문 계산 실패 - 재계산합니다: {e}")
+            return {}
+
+    def _compute(self, module: str, team_id: int) -> Dict[str, str]:
+        with get_engine().connect() as connection:
+            if module == "module2":
+                return {TEAM_SCOPE: fingerprint_rows([
+                    _fetch_members(connection, team_id),
+                    _fetch_task_rows(connection, team_id, self.period_id, include_ai_results=False),
+                    _fetch_kpi_rows(connection, team_id),
+                    _fetch_grade_rows(connection, team_id),
+                ])}
+            if module == "module4":
+                return {TEAM_SCOPE: fingerprint_rows([
+                    _fetch_members(connection, team_id),
+                    _fetch_task_rows(connection, team_id, self.period_id, include_ai_results=True),
+                    _fetch_kpi_rows(connection, team_id),
+                ])}
+            if module in ("module3", "module6"):
+                members = _fetch_members(connection, team_id)
+                tasks_by_emp = _group_by_emp(_fetch_task_rows(connection, team_id, self.period_id, include_ai_results=True))
+                peers_by_emp = _group_by_emp(_fetch_peer_rows(connection, team_id, self.period_id), key="target_emp_no")
+                prompts, collaboration = [], []
+                peer_talk_by_emp: Dict[str, List[Dict]] = {}
+                if module == "module6":
+                    prompts = _fetch_prompt_rows(connection)
+                    collaboration = _fetch_collaboration_rows(connection, team_id, self.period_id)
+                    peer_talk_by_emp = _group_by_emp(_fetch_peer_talk_rows(connection, team_id, self.period_id))
+                return {
+                    member["emp_no"]: fingerprint_rows([
+                        member,
+                        tasks_by_emp.get(member["emp_no"], []),
+                        peers_by_emp.get(member["emp_no"], []),
+                        peer_talk_by_emp.get(member["emp_no"], []),
+                        collaboration,
+                        prompts,
+                    ])
+                    for member in members
+                }
+        raise ValueError(f"입력 지문을 계산할 수 없는 모듈: {module}")
+
+    def combine(self, team_id: int, modules: Iterable[str], emp_no: Optional[str] = None) -> str:
+        """
+        앞 모듈들의 기록된 지문을 묶은 지문.
+        emp_no가 주어지면 팀 단위 지문 + 해당 팀원 지문만, 없으면 팀 전체 지문을 사용한다.
+        """
+        stored = self._load_stored()
+        modules = set(modules)
+        with self._lock:
+            parts = sorted(
+                (module, key_emp_no, fingerprint)
+                for (module, key_team_id, key_emp_no), fingerprint in stored.items()
+                if module in modules and key_team_id == team_id
+                and (emp_no is None or key_emp_no in (TEAM_SCOPE, emp_no))
+            )
+        return fingerprint_rows(parts)
+
+    # ---------------- 판단 / 기록 ----------------
+
+    def is_unchanged(self, module: str, team_id: int, fingerprint: Optional[str], emp_no: str = TEAM_SCOPE) -> bool:
+        """증분 모드이고 지난 성공 실행과 입력이 같으면 True (건너뛰어도 됨)"""
+        if not self.enabled or not fingerprint:
+            return False
+        unchanged = self._load_stored().get((module, team_id, emp_no)) == fingerprint
+        if unchanged:
+            with self._lock:
+                self.skipped[module] = self.skipped.get(module, 0) + 1
+        return unchanged
+
+    def record(self, module: str, team_id: int, fingerprints: Dict[str, str]):
+        """성공한 단위의 지문 저장 {emp_no: fingerprint} - 저장된 값과 같은 지문은 다시 쓰지 않음"""
+        if not self.available:
+            return
+        stored = self._load_stored()
+        with self._lock:
+            fingerprints = {
+                emp_no: fp for emp_no, fp in fingerprints.items()
+                if fp and stored.get((module, team_id, emp_no)) != fp
+            }
+        if not fingerprints:
+            return
+        now = datetime.now()
+        try:
+            with unit_of_work() as connection:
+                connection.execute(text(f"""
+                    DELETE FROM {FINGERPRINT_TABLE}
+                    WHERE module = :module AND period_id = :period_id AND team_id = :team_id AND emp_no IN :emp_nos
+                """).bindparams(bindparam("emp_nos", expanding=True)), {
+                    "module": module, "period_id": self.period_id, "team_id": team_id,
+                    "emp_nos": list(fingerprints)
+                })
+                connection.execute(text(f"""
+                    INSERT INTO {FINGERPRINT_TABLE} (module, period_id, team_id, emp_no, fingerprint, updated_at)
+                    VALUES (:module, :period_id, :team_id, :emp_no, :fingerprint, :updated_at)
+                """), [
+                    {"module": module, "period_id": self.period_id, "team_id": team_id,
+                     "emp_no": emp_no, "fingerprint": fingerprint, "updated_at": now}
+                    for emp_no, fingerprint in fingerprints.items()
+                ])
+        except Exception as e:
+            logging.warning(f"[증분] {module} 팀 {team_id} 지문 저장 실패: {e}")
+            return
+        with self._lock:
+            for emp_no, fingerprint in fingerprints.items():
+                stored[(module, team_id, emp_no)] = fingerprint
+            self.changed_teams.add(team_id)
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"건너뜀 {dict(self.skipped)}, 재계산된 팀 {sorted(self.changed_teams)}"
@@ -0,0 +1,177 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from agents.workflow.workflow_utils import run_team_module_with_retry, update_team_status
+from config.settings import WorkflowConfig
+
+
+@dataclass
+class TeamModuleStep:
+    """
+    팀 단위로 실행되는 모듈 하나. func(team_id, period_id) 형태로 호출된다.
+    depends_on에 지정한 모듈이 모두 끝난 뒤에 실행된다.
+    """
+    name: str
+    func: Callable
+    depends_on: List[str] = field(default_factory=list)
+
+
+class WorkflowRunContext:
+    """
+    워크플로우 실행 단위의 공유 상태 (평가 Job에서 사용).
+    - cancel_event: 설정되면 아직 시작하지 않은 팀/모듈을 건너뛴다 (실행 중인 모듈은 끝까지 수행)
+    - progress_callback(team_id, module_name, status): 모듈 상태 변화 통지 (RUNNING/COMPLETED/FAILED/SKIPPED)
+    """
+
+    def __init__(self, cancel_event: Optional[threading.Event] = None,
+                 progress_callback: Optional[Callable[[int, str, str], None]] = None):
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_callback = progress_callback
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report(self, team_id: int, module_name: str, status: str):
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(team_id, module_name, status)
+        except Exception as e:
+            logging.warning(f"진행 상황 기록 실패 (팀 {team_id}, {module_name}): {e}")
+
+
+def build_step_stages(steps: List[TeamModuleStep]) -> List[List[TeamModuleStep]]:
+    """
+    의존 관계를 기준으로 모듈을 단계(stage)로 묶는다.
+    같은 단계의 모듈은 서로 독립이므로 동시에 실행할 수 있다.
+    """
+    remaining = {step.name: step for step in steps}
+    unknown = {dep for step in steps for dep in step.depends_on} - set(remaining)
+    if unknown:
+        raise ValueError(f"정의되지 않은 선행 모듈: {sorted(unknown)}")
+
+    done = set()
+    stages = []
+    while remaining:
+        stage = [step for step in remaining.values() if set(step.depends_on) <= done]
+        if not stage:
+            raise ValueError(f"모듈 의존 관계에 순환이 있습니다: {sorted(remaining)}")
+        stages.append(stage)
+        for step in stage:
+            done.add(step.name)
+            del remaining[step.name]
+    return stages
+
+
+class TeamParallelExecutor:
+    """
+    팀 간 병렬 실행 엔진.
+    - 팀 단위로 bounded worker pool에 분배 (팀끼리는 상태를 공유하지 않음)
+    - 팀 내부에서는 의존 관계가 없는 모듈을 동시에 실행 (예: 모듈2 이후 모듈3/4)
+    - 모듈별 동시 실행 상한(module_limits)으로 LLM/DB 부하 제어
+    - 각 모듈은 기존과 동일하게 run_team_module_with_retry로 실행
+    """
+
+    def __init__(self, max_team_workers: Optional[int] = None, module_limits: Optional[Dict[str, int]] = None,
+                 run_context: Optional[WorkflowRunContext] = None):
+        config = WorkflowConfig()
+        self.run_context = run_context or WorkflowRunContext()
+        self.max_team_workers = max(1, max_team_workers or config.MAX_TEAM_WORKERS)
+        limits = config.module_limits
+        limits.update(module_limits or {})
+        self.module_limits = limits
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._semaphore_lock = threading.Lock()
+
+    def _get_semaphore(self, module_name: str) -> threading.BoundedSemaphore:
+        with self._semaphore_lock:
+            if module_name not in self._semaphores:
+                limit = self.module_limits.get(module_name, self.max_team_workers)
+                self._semaphores[module_name] = threading.BoundedSemaphore(limit)
+            return self._semaphores[module_name]
+
+    def _run_step(self, team_id: int, period_id: int, step: TeamModuleStep, log_prefix: str) -> bool:
+        with self._get_semaphore(step.name):
+            if self.run_context.is_cancelled():
+                self.run_context.report(team_id, step.name, "SKIPPED")
+                return False
+            logging.info(f"{log_prefix}[{step.name}] 팀 {team_id} 실행")
+            self.run_context.report(team_id, step.name, "RUNNING")
+            result = run_team_module_with_retry(team_id, step.func, period_id)
+        # run_team_module_with_retry는 최종 실패 시 False를 반환
+        success = result is not False
+        self.run_context.report(team_id, step.name, "COMPLETED" if success else "FAILED")
+        return success
+
+    def _run_team(self, team_id: int, period_id: int, stages: List[List[TeamModuleStep]],
+                  module_pool: ThreadPoolExecutor, log_prefix: str) -> Dict[str, bool]:
+        results = {}
+        for stage in stages:
+            if len(stage) == 1:
+                step = stage[0]
+                results[step.name] = self._run_step(team_id, period_id, step, log_prefix)
+                continue
+            futures = {
+                module_pool.submit(self._run_step, team_id, period_id, step, log_prefix): step.name
+                for step in stage
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    def run(self, teams: List[int], period_id: int, steps: List[TeamModuleStep],
+            completed_status: Optional[str] = None, log_prefix: str = "[Phase1]",
+            require_success: bool = False) -> Dict[int, Dict[str, bool]]:
+        """
+        모든 팀에 대해 steps를 실행한다.
+        팀의 모든 모듈이 끝나면 completed_status로 team_evaluations.status를 업데이트한다.
+        require_success=True이면 모든 모듈이 성공한 팀만 상태를 업데이트한다.
+        반환값: {team_id: {module_name: 성공여부}}
+        """
+        stages = build_step_stages(steps)
+        max_parallel_steps = max(len(stage) for stage in stages) if stages else 1
+        team_workers = min(self.max_team_workers, max(1, len(teams)))
+        logging.info(
+            f"{log_prefix} 팀 병렬 실행: {len(teams)}개 팀, 동시 팀 {team_workers}개, "
+            f"단계 {[[step.name for step in stage] for stage in stages]}"
+        )
+
+        team_results: Dict[int, Dict[str, bool]] = {}
+        # 팀 워커가 모듈 워커를 기다리므로 두 풀을 분리해 교착을 방지
+        with ThreadPoolExecutor(max_workers=team_workers, thread_name_prefix="team") as team_pool, \
+                ThreadPoolExecutor(max_workers=team_workers * max_parallel_steps, thread_name_prefix="module") as module_pool:
+
+            def run_single_team(idx: int, team_id: int) -> Dict[str, bool]:
+                if self.run_context.is_cancelled():
+                    logging.info(f"{log_prefix} 팀 {team_id} 취소됨 - 건너뜀")
+                    return {step.name: False for step in steps}
+                logging.info(f"{log_prefix} 팀 {team_id} ({idx}/{len(teams)}) 시작")
+                results = self._run_team(team_id, period_id, stages, module_pool, log_prefix)
+                if self.run_context.is_cancelled():
+                    logging.info(f"{log_prefix} 팀 {team_id} 취소됨 - 상태 업데이트 건너뜀")
+                    return results
+                if completed_status and (not require_success or all(results.values())):
+                    update_team_status(team_id, period_id, completed_status)
+                logging.info(f"{log_prefix} 팀 {team_id} 완료")
+                return results
+
+            futures = {
+                team_pool.submit(run_single_team, idx, team_id): team_id
+                for idx, team_id in enumerate(teams, 1)
+            }
+            for future in as_completed(futures):
+                team_id = futures[future]
+                try:
+                    team_results[team_id] = future.result()
+                except Exception as e:
+                    logging.error(f"{log_prefix} 팀 {team_id} 실행 중 오류: {e}")
+                    team_results[team_id] = {}
+
+        failed = {team_id: [name for name, ok in results.items() if not ok] for team_id, results in team_results.items()}
+        failed = {team_id: names for team_id, names in failed.items() if names}
+        if failed:
+            logging.warning(f"{log_prefix} 실패한 모듈이 있는 팀: {failed}")
+        return team_results
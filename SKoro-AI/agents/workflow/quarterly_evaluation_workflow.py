@@ -2,7 +2,7 @@
 # 분기별 평가 워크플로우
 # =====================================
 # 목적: 분기별 AI 평가 수행 (모듈2,3,4,6,8,10,11)
-# Phase 1: 팀별 평가 (모듈2,3,4,6 순차 실행)
+# Phase 1: 팀별 평가 (모듈2 실행 후 모듈3,4 병렬 실행, 이어서 모듈6, 팀 간 병렬)
 # - 모듈2: 목표달성도 분석
 # - 모듈3: Peer Talk 분석  
 # - 모듈4: 협업 분석
@@ -29,6 +29,8 @@
 #   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --phase 1 --teams 1
 #   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --phase 2 --teams 1
 #   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --phase 3 --teams 1
+# 증분 실행 (지난 성공 실행 이후 입력이 바뀐 팀/팀원만 재계산, 지문 테이블은 python -m migrations로 생성):
+#   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --auto --incremental
 # 특정 모듈만 실행:
 #   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --module 2 --teams 1
 #   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --module 3 --teams 1
@@ -46,12 +48,15 @@ import logging
 from agents.workflow.workflow_utils import (
     get_target_teams, run_team_module_with_retry, check_all_teams_phase_completed, update_team_status, parse_teams
 )
+from agents.workflow.parallel_executor import TeamModuleStep, TeamParallelExecutor, WorkflowRunContext
+from config.settings import WorkflowConfig
+from agents.workflow.incremental import IncrementalTracker, TEAM_SCOPE
 from agents.evaluation.modules.module_02_goal_achievement.agent import create_module2_graph
 from agents.evaluation.modules.module_03_peer_talk.agent import create_module3_graph
 from agents.evaluation.modules.module_04_collaboration.agent import create_module4_graph
 from agents.evaluation.modules.module_06_4p_evaluation.agent import create_module6_graph_efficient
 from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_team_tasks_and_kpis, fetch_team_members
-from agents.evaluation.modules.module_08_team_comparision.agent import create_module8_graph
+from agents.evaluation.modules.module_08_team_comparision.agent import create_module8_graph, prepare_period_source_versions
 from agents.evaluation.modules.module_10_growth_coaching.agent import create_module10_graph
 from agents.evaluation.modules.module_11_team_coaching.agent import Module11TeamRiskManagementAgent
 from agents.evaluation.modules.module_11_team_coaching.db_utils import Module11DataAccess, SQLAlchemyDBWrapper, engine
@@ -61,125 +66,154 @@ import sys
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# Phase 1: 모듈2,3,4,6 순차 실행 (팀별)
-def run_phase1_all_teams(teams, period_id):
-    logging.info("Phase1: 모듈2,3,4,6 순차 실행 시작")
+# 증분 실행 시 Phase1 결과로 묶어 보는 모듈들
+PHASE1_MODULES = ["module2", "module3", "module4", "module6"]
+
+# Phase 1: 모듈2 → 모듈3,4 병렬 → 모듈6 실행 (팀 병렬)
+def run_phase1_all_teams(teams, period_id, max_workers=None, run_context=None, tracker=None):
+    logging.info("Phase1: 모듈2 → 모듈3,4 병렬 → 모듈6 실행 시작 (팀 병렬)")
+    tracker = tracker or IncrementalTracker(period_id)
+
+    # 1. 모듈2 (목표달성도)
+    def module2_func(team_id, period_id):
+        fingerprint = tracker.compute("module2", team_id).get(TEAM_SCOPE)
+        if tracker.is_unchanged("module2", team_id, fingerprint):
+            logging.info(f"[Phase1][module2] 팀 {team_id} 입력 변경 없음 - 건너뜀")
+            return True
+        task_ids, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        state = {
+            "report_type": "quarterly",
+            "team_id": team_id,
+            "period_id": period_id,
+            "target_task_ids": task_ids,
+            "target_team_kpi_ids": kpi_ids,
+            "feedback_report_ids": [],
+            "final_evaluation_report_ids": [],
+            "updated_task_ids": [],
+            "updated_team_kpi_ids": [],
+            "team_evaluation_id": None,
+            "team_context_guide": {},
+            "messages": []
+        }
+        graph = create_module2_graph()
+        graph.invoke(state)
+        tracker.record("module2", team_id, {TEAM_SCOPE: fingerprint})
+        return True
     
-    for idx, team_id in enumerate(teams, 1):
-        logging.info(f"[Phase1] 팀 {team_id} ({idx}/{len(teams)}) 시작")
-        
-        # 1. 모듈2 (목표달성도)
-        logging.info(f"[Phase1][모듈2] 팀 {team_id} 실행")
-        def module2_func(team_id, period_id):
-            task_ids, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+    # 2. 모듈3 (Peer Talk)
+    def module3_func(team_id, period_id):
+        members = fetch_team_members(team_id)
+        fingerprints = tracker.compute("module3", team_id)
+        for member in members:
+            if member.get('role') == 'MANAGER':
+                continue
+            emp_no = member['emp_no']
+            if tracker.is_unchanged("module3", team_id, fingerprints.get(emp_no), emp_no):
+                continue
             state = {
-                "report_type": "quarterly",
                 "team_id": team_id,
                 "period_id": period_id,
-                "target_task_ids": task_ids,
-                "target_team_kpi_ids": kpi_ids,
-                "feedback_report_ids": [],
-                "final_evaluation_report_ids": [],
-                "updated_task_ids": [],
-                "updated_team_kpi_ids": [],
-                "team_evaluation_id": None,
-                "team_context_guide": {},
+                "target_emp_no": member['emp_no'],
+                "peer_evaluation_ids": [],
+                "evaluator_emp_nos": [],
+                "evaluation_weights": [],
+                "keyword_collections": [],
+                "task_summaries": [],
+                "peer_evaluation_summary_sentences": [],
+                "strengths": [],
+                "concerns": [],
+                "collaboration_observations": [],
+                "weighted_analysis_result": {},
+                "feedback_report_id": None,
+                "final_evaluation_report_id": None,
                 "messages": []
             }
-            graph = create_module2_graph()
+            graph = create_module3_graph()
             graph.invoke(state)
+            tracker.record("module3", team_id, {emp_no: fingerprints.get(emp_no)})
+        return True
+    
+    # 3. 모듈4 (협업 분석)
+    def module4_func(team_id, period_id):
+        fingerprint = tracker.compute("module4", team_id).get(TEAM_SCOPE)
+        if tracker.is_unchanged("module4", team_id, fingerprint):
+            logging.info(f"[Phase1][module4] 팀 {team_id} 입력 변경 없음 - 건너뜀")
             return True
-        run_team_module_with_retry(team_id, module2_func, period_id)
-        
-        # 2. 모듈3 (Peer Talk)
-        logging.info(f"[Phase1][모듈3] 팀 {team_id} 실행")
-        def module3_func(team_id, period_id):
-            members = fetch_team_members(team_id)
-            for member in members:
-                if member.get('role') == 'MANAGER':
-                    continue
-                state = {
-                    "team_id": team_id,
-                    "period_id": period_id,
-                    "target_emp_no": member['emp_no'],
-                    "peer_evaluation_ids": [],
-                    "evaluator_emp_nos": [],
-                    "evaluation_weights": [],
-                    "keyword_collections": [],
-                    "task_summaries": [],
-                    "peer_evaluation_summary_sentences": [],
-                    "strengths": [],
-                    "concerns": [],
-                    "collaboration_observations": [],
-                    "weighted_analysis_result": {},
-                    "feedback_report_id": None,
-                    "final_evaluation_report_id": None,
-                    "messages": []
-                }
-                graph = create_module3_graph()
-                graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module3_func, period_id)
-        
-        # 3. 모듈4 (협업 분석)
-        logging.info(f"[Phase1][모듈4] 팀 {team_id} 실행")
-        def module4_func(team_id, period_id):
-            _, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        _, kpi_ids = fetch_team_tasks_and_kpis(team_id, period_id)
+        state = {
+            "report_type": "quarterly",
+            "team_id": team_id,
+            "period_id": period_id,
+            "target_team_kpi_ids": kpi_ids,
+            "collaboration_relationships": None,
+            "individual_collaboration_analysis": None,
+            "team_collaboration_matrix": None,
+            "team_evaluation_id": None,
+            "messages": None
+        }
+        graph = create_module4_graph()
+        graph.invoke(state)
+        tracker.record("module4", team_id, {TEAM_SCOPE: fingerprint})
+        return True
+    
+    # 4. 모듈6 (4P BARS)
+    def module6_func(team_id, period_id):
+        members = fetch_team_members(team_id)
+        fingerprints = tracker.compute("module6", team_id)
+        for member in members:
+            if member.get('role') == 'MANAGER':
+                continue
+            emp_no = member['emp_no']
+            if tracker.is_unchanged("module6", team_id, fingerprints.get(emp_no), emp_no):
+                continue
             state = {
                 "report_type": "quarterly",
                 "team_id": team_id,
                 "period_id": period_id,
-                "target_team_kpi_ids": kpi_ids,
-                "collaboration_relationships": None,
-                "individual_collaboration_analysis": None,
-                "team_collaboration_matrix": None,
-                "team_evaluation_id": None,
-                "messages": None
+                "emp_no": member['emp_no'],
+                "feedback_report_id": None,
+                "final_evaluation_report_id": None,
+                "raw_evaluation_criteria": "",
+                "evaluation_criteria": {},
+                "evaluation_results": {},
+                "integrated_data": {},
+                "messages": []
             }
-            graph = create_module4_graph()
+            graph = create_module6_graph_efficient()
             graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module4_func, period_id)
-        
-        # 4. 모듈6 (4P BARS)
-        logging.info(f"[Phase1][모듈6] 팀 {team_id} 실행")
-        def module6_func(team_id, period_id):
-            members = fetch_team_members(team_id)
-            for member in members:
-                if member.get('role') == 'MANAGER':
-                    continue
-                state = {
-                    "report_type": "quarterly",
-                    "team_id": team_id,
-                    "period_id": period_id,
-                    "emp_no": member['emp_no'],
-                    "feedback_report_id": None,
-                    "final_evaluation_report_id": None,
-                    "raw_evaluation_criteria": "",
-                    "evaluation_criteria": {},
-                    "evaluation_results": {},
-                    "integrated_data": {},
-                    "messages": []
-                }
-                graph = create_module6_graph_efficient()
-                graph.invoke(state)
-            return True
-        run_team_module_with_retry(team_id, module6_func, period_id)
-        
-        update_team_status(team_id, period_id, "AI_PHASE1_COMPLETED")
-        logging.info(f"[Phase1] 팀 {team_id} 완료")
+            tracker.record("module6", team_id, {emp_no: fingerprints.get(emp_no)})
+        return True
+    
+    steps = [
+        TeamModuleStep("module2", module2_func),
+        TeamModuleStep("module3", module3_func, depends_on=["module2"]),
+        TeamModuleStep("module4", module4_func, depends_on=["module2"]),
+        # 모듈6(4P People)은 모듈3의 동료평가 요약과 모듈4의 협업 매트릭스를 읽으므로 두 모듈 이후 실행
+        TeamModuleStep("module6", module6_func, depends_on=["module3", "module4"]),
+    ]
+    executor = TeamParallelExecutor(max_team_workers=max_workers, run_context=run_context)
+    return executor.run(teams, period_id, steps, completed_status="AI_PHASE1_COMPLETED", log_prefix="[Phase1]")
 
 # Phase 2: 전사 모듈8,10,11 순차 실행
-def run_phase2_all_modules(period_id: int, teams):
+def run_phase2_all_modules(period_id: int, teams, tracker=None):
     """
     Phase2: 전사 모듈8(팀 성과 비교), 10(개인 성장 코칭), 11(팀 리스크) 순차 실행
+    증분 실행 시 모듈8은 한 팀이라도 Phase1 결과가 바뀌면 전체 팀 재비교, 모듈10/11은 바뀐 팀원/팀만 실행
     """
     logging.info("Phase2: 전사 모듈8,10,11 순차 실행 시작")
     logging.info(f"[Phase2] 전체 대상 팀: {teams}")
+    tracker = tracker or IncrementalTracker(period_id)
 
-    # 1. 모듈8: 팀 성과 비교 (팀 단위)
+    # 1. 모듈8: 팀 성과 비교 (팀 단위) - 팀 간 비교이므로 변경 여부는 전체 팀 기준
     logging.info("[Phase2][모듈8] 팀 성과 비교 시작")
-    for team_id in teams:
+    module8_fingerprints = {team_id: tracker.combine(team_id, PHASE1_MODULES) for team_id in teams}
+    module8_teams = teams
+    if all(tracker.is_unchanged("module8", team_id, fingerprint) for team_id, fingerprint in module8_fingerprints.items()):
+        logging.info("[Phase2][모듈8] 모든 팀 Phase1 결과 변경 없음 - 건너뜀")
+        module8_teams = []
+    # 클러스터/통계 입력 지문은 팀마다 다시 조회하지 않고 한 번만 계산
+    source_versions = prepare_period_source_versions(period_id) if module8_teams else None
+    for team_id in module8_teams:
         try:
             logging.info(f"[Phase2][모듈8] 팀 {team_id} 실행")
             module8_graph = create_module8_graph()
@@ -187,9 +221,11 @@ def run_phase2_all_modules(period_id: int, teams):
                 "team_id": team_id,
                 "period_id": period_id,
                 "report_type": "quarterly",
+                "source_versions": source_versions,
                 "messages": []
             }
             module8_graph.invoke(state8)
+            tracker.record("module8", team_id, {TEAM_SCOPE: module8_fingerprints[team_id]})
             logging.info(f"[Phase2][모듈8] 팀 {team_id} 완료")
         except Exception as e:
             logging.error(f"[Phase2][모듈8] 팀 {team_id} 실패: {e}")
@@ -204,6 +240,9 @@ def run_phase2_all_modules(period_id: int, teams):
                 if member.get('role') == 'MANAGER':
                     continue
                 emp_no = member["emp_no"]
+                fingerprint = tracker.combine(team_id, PHASE1_MODULES, emp_no)
+                if tracker.is_unchanged("module10", team_id, fingerprint, emp_no):
+                    continue
                 logging.info(f"[Phase2][모듈10] 팀 {team_id} - {emp_no} 실행")
                 module10_graph = create_module10_graph()
                 state10 = {
@@ -229,6 +268,7 @@ def run_phase2_all_modules(period_id: int, teams):
                     "error_messages": []
                 }
                 module10_graph.invoke(state10)
+                tracker.record("module10", team_id, {emp_no: fingerprint})
                 logging.info(f"[Phase2][모듈10] 팀 {team_id} - {emp_no} 완료")
         except Exception as e:
             logging.error(f"[Phase2][모듈10] 팀 {team_id} 실패: {e}")
@@ -239,15 +279,24 @@ def run_phase2_all_modules(period_id: int, teams):
         db_wrapper = SQLAlchemyDBWrapper(engine)
         data_access = Module11DataAccess(db_wrapper)
         agent11 = Module11TeamRiskManagementAgent(data_access)
+
+        async def run_team(team_id, team_evaluation_id, fingerprint):
+            await agent11.execute(team_id, period_id, team_evaluation_id)
+            tracker.record("module11", team_id, {TEAM_SCOPE: fingerprint})
+
         tasks = []
         for team_id in teams:
             try:
+                fingerprint = tracker.combine(team_id, PHASE1_MODULES + ["module10"])
+                if tracker.is_unchanged("module11", team_id, fingerprint):
+                    logging.info(f"[Phase2][모듈11] 팀 {team_id} 변경 없음 - 건너뜀")
+                    continue
                 from agents.evaluation.modules.module_02_goal_achievement.db_utils import fetch_team_evaluation_id
                 team_evaluation_id = fetch_team_evaluation_id(team_id, period_id)
                 if not team_evaluation_id:
                     logging.error(f"[Phase2][모듈11] 팀 {team_id} team_evaluation_id 없음")
                     continue
-                tasks.append(agent11.execute(team_id, period_id, team_evaluation_id))
+                tasks.append(run_team(team_id, team_evaluation_id, fingerprint))
             except Exception as e:
                 logging.error(f"[Phase2][모듈11] 팀 {team_id} 실패: {e}")
         await asyncio.gather(*tasks)
@@ -262,11 +311,29 @@ def run_phase2_all_modules(period_id: int, teams):
     logging.info("Phase2: 완료")
 
 # Phase 3: 리포트 생성 + 톤 조정
-def run_phase3_reports_and_tone(period_id: int, teams):
+def run_phase3_reports_and_tone(period_id: int, teams, tracker=None):
     """
     Phase3: 개인별 리포트 생성 → 팀별 리포트 생성 → 개인별 톤 조정 → 팀별 톤 조정
+    증분 실행 시 모듈 결과가 바뀐 팀만 리포트를 다시 만들고, 나머지 팀은 바로 COMPLETED 처리
     """
     logging.info("Phase3: 리포트 생성 + 톤 조정 시작")
+    tracker = tracker or IncrementalTracker(period_id)
+    report_fingerprints = {
+        team_id: tracker.combine(team_id, PHASE1_MODULES + ["module8", "module10", "module11"])
+        for team_id in teams
+    }
+    unchanged_teams = [
+        team_id for team_id in teams
+        if tracker.is_unchanged("phase3", team_id, report_fingerprints[team_id])
+    ]
+    for team_id in unchanged_teams:
+        update_team_status(team_id, period_id, "COMPLETED")
+    teams = [team_id for team_id in teams if team_id not in unchanged_teams]
+    if unchanged_teams:
+        logging.info(f"[Phase3] 변경 없는 팀 {unchanged_teams} 리포트 재생성 건너뜀")
+    if not teams:
+        logging.info("Phase3: 재생성할 리포트 없음 - 완료")
+        return
     
     # 1. 개인별 리포트 생성
     logging.info("[Phase3] 개인별 리포트 생성 시작")
@@ -312,48 +379,75 @@ def run_phase3_reports_and_tone(period_id: int, teams):
         # 둘 다 성공한 팀만 COMPLETED 업데이트
         if individual_success and team_success:
             update_team_status(team_id, period_id, "COMPLETED")
+            tracker.record("phase3", team_id, {TEAM_SCOPE: report_fingerprints[team_id]})
             completed_teams.append(team_id)
             logging.info(f"[Phase3] 팀 {team_id} 최종 완료 상태 업데이트")
         else:
             logging.warning(f"[Phase3] 팀 {team_id} 톤 조정 실패로 COMPLETED 상태 업데이트 건너뜀")
     
     logging.info(f"Phase3: 완료된 팀 {len(completed_teams)}/{len(teams)}")
+
+    # 4. 완료된 팀 리포트를 챗봇 벡터DB에 증분 반영 (변경된 청크만 재임베딩)
+    if completed_teams and WorkflowConfig().SYNC_VECTOR_DB:
+        logging.info(f"[Phase3] 벡터DB 증분 동기화 시작: {completed_teams}")
+        from agents.chatbot.vector_sync import sync_team_reports
+        sync_team_reports(period_id, completed_teams)
+
+    # 5. 완료된 팀의 챗봇 사용자 메타데이터 캐시 무효화 (다음 채팅에서 최신 role/team으로 다시 조회)
+    if completed_teams:
+        from agents.chatbot.user_metadata import invalidate_user_metadata
+        invalidate_user_metadata(team_ids=completed_teams)
+
     logging.info("Phase3: 전체 완료!")
 
-def run_auto_workflow(period_id: int, specific_teams=None):
+def run_auto_workflow(period_id: int, specific_teams=None, max_workers=None, run_context=None, incremental=False):
     """
     --auto 옵션: Phase1 → Phase2 → Phase3까지 자동 실행
+    run_context가 주어지면 Phase 사이마다 취소 여부를 확인한다.
+    incremental=True이면 지난 성공 실행 이후 입력이 바뀐 팀/팀원만 재계산한다.
+    반환값: 모든 Phase를 마쳤으면 True, 중간에 중단되면 False
     """
-    logging.info("[AUTO] 전체 평가 자동 실행 시작")
+    run_context = run_context or WorkflowRunContext()
+    tracker = IncrementalTracker(period_id, enabled=incremental)
+    logging.info(f"[AUTO] 전체 평가 자동 실행 시작{' (증분)' if tracker.enabled else ''}")
     teams = get_target_teams(period_id, specific_teams)
     logging.info(f"[AUTO] 평가 대상 팀: {teams}")
 
     # Phase1: 팀별 평가 (모듈2,3,4,6)
-    run_phase1_all_teams(teams, period_id)
+    run_phase1_all_teams(teams, period_id, max_workers, run_context, tracker)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase2를 실행하지 않습니다.")
+        return False
     
     # Phase1 완료 체크
     all_completed = check_all_teams_phase_completed(teams, period_id, 'AI_PHASE1_COMPLETED')
     if not all_completed:
         logging.error(f"[AUTO] 일부 팀이 Phase1을 완료하지 못했습니다. Phase2를 실행할 수 없습니다.")
-        return
+        return False
     else:
         logging.info("[AUTO] 모든 팀이 Phase1을 완료했습니다.")
 
     # Phase2: 전사 모듈 (모듈8,10,11)
-    run_phase2_all_modules(period_id, teams)
+    run_phase2_all_modules(period_id, teams, tracker)
+    if run_context.is_cancelled():
+        logging.warning("[AUTO] 평가 실행이 취소되었습니다. Phase3를 실행하지 않습니다.")
+        return False
     
     # Phase2 완료 체크
     all_completed = check_all_teams_phase_completed(teams, period_id, 'AI_PHASE2_COMPLETED')
     if not all_completed:
         logging.error(f"[AUTO] 일부 팀이 Phase2를 완료하지 못했습니다. Phase3를 실행할 수 없습니다.")
-        return
+        return False
     else:
         logging.info("[AUTO] 모든 팀이 Phase2를 완료했습니다.")
 
     # Phase3: 리포트 생성 + 톤 조정
-    run_phase3_reports_and_tone(period_id, teams)
+    run_phase3_reports_and_tone(period_id, teams, tracker)
     
+    if tracker.enabled:
+        logging.info(f"[AUTO] 증분 실행 결과: {tracker.summary()}")
     logging.info("[AUTO] 전체 평가 자동 실행 완료!")
+    return True
 
 def main():
     parser = argparse.ArgumentParser(
@@ -367,6 +461,9 @@ def main():
   # 특정 팀만 자동 실행
   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --auto --teams 1
   
+  # 증분 실행 (입력이 바뀐 팀/팀원만 재계산)
+  python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --auto --incremental
+  
   # 특정 단계만 실행
   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --phase 1 --teams 1
   python agents/workflow/quarterly_evaluation_workflow.py --period-id 2 --phase 2 --teams 1
@@ -385,8 +482,10 @@ def main():
     parser.add_argument('--period-id', type=int, required=True, help='분기 ID (예: 2)')
     parser.add_argument('--teams', help='팀 ID (예: 1,2,3 또는 all)', required=False, default=None)
     parser.add_argument('--auto', action='store_true', help='모든 단계 자동 실행')
+    parser.add_argument('--max-workers', type=int, default=None, help='동시에 처리할 팀 수 (기본값: WORKFLOW_MAX_TEAM_WORKERS)')
     parser.add_argument('--phase', type=str, choices=['1', '2', '3'], help='특정 Phase만 실행')
     parser.add_argument('--module', type=int, choices=[2, 3, 4, 6, 8, 10, 11], help='특정 모듈만 실행')
+    parser.add_argument('--incremental', action='store_true', help='지난 실행 이후 입력이 바뀐 팀/팀원만 재계산 (--auto, --phase, 기본 실행)')
     args = parser.parse_args()
 
     # 팀 목록 파싱
@@ -401,28 +500,29 @@ def main():
             logging.info(f"[AUTO] 지정된 팀만 자동 실행: {team_list}")
         else:
             logging.info("[AUTO] 전체 팀 자동 실행")
-        run_auto_workflow(args.period_id, team_list)
+        run_auto_workflow(args.period_id, team_list, args.max_workers, incremental=args.incremental)
         sys.exit(0)
 
     # --phase 옵션: 특정 Phase만 실행
     if args.phase:
         teams = get_target_teams(args.period_id, team_list)
         logging.info(f"[Phase{args.phase}] {len(teams)}개 팀 실행")
+        tracker = IncrementalTracker(args.period_id, enabled=args.incremental)
         
         if args.phase == '1':
-            run_phase1_all_teams(teams, args.period_id)
+            run_phase1_all_teams(teams, args.period_id, args.max_workers, tracker=tracker)
         elif args.phase == '2':
             # Phase1 완료 체크
             if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE1_COMPLETED"):
                 logging.error("일부 팀이 Phase1을 완료하지 못했습니다.")
                 return
-            run_phase2_all_modules(args.period_id, teams)
+            run_phase2_all_modules(args.period_id, teams, tracker)
         elif args.phase == '3':
             # Phase2 완료 체크
             if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE2_COMPLETED"):
                 logging.error("일부 팀이 Phase2를 완료하지 못했습니다.")
                 return
-            run_phase3_reports_and_tone(args.period_id, teams)
+            run_phase3_reports_and_tone(args.period_id, teams, tracker)
         
         logging.info(f"[Phase{args.phase}] 완료!")
         sys.exit(0)
@@ -528,6 +628,7 @@ def main():
         
         elif args.module == 8:
             # 모듈8: 팀 성과 비교
+            source_versions = prepare_period_source_versions(args.period_id)
             for team_id in teams:
                 logging.info(f"[Module8] 팀 {team_id} 실행")
                 module8_graph = create_module8_graph()
@@ -535,6 +636,7 @@ def main():
                     "team_id": team_id,
                     "period_id": args.period_id,
                     "report_type": "quarterly",
+                    "source_versions": source_versions,
                     "messages": []
                 }
                 module8_graph.invoke(state8)
@@ -602,21 +704,22 @@ def main():
     # 기본 실행: 모든 단계 순차 실행
     teams = get_target_teams(args.period_id, team_list)
     logging.info(f"🚀 평가 시작: {len(teams)}개 팀")
+    tracker = IncrementalTracker(args.period_id, enabled=args.incremental)
 
     # Phase1: 팀별 평가 (모듈2,3,4,6)
-    run_phase1_all_teams(teams, args.period_id)
+    run_phase1_all_teams(teams, args.period_id, args.max_workers, tracker=tracker)
     if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE1_COMPLETED"):
         logging.warning("일부 팀이 Phase1을 완료하지 못했습니다. 중단합니다.")
         return
     
     # Phase2: 전사 모듈 (모듈8,10,11)
-    run_phase2_all_modules(args.period_id, teams)
+    run_phase2_all_modules(args.period_id, teams, tracker)
     if not check_all_teams_phase_completed(teams, args.period_id, "AI_PHASE2_COMPLETED"):
         logging.warning("일부 팀이 Phase2를 완료하지 못했습니다. 중단합니다.")
         return
     
     # Phase3: 리포트 생성 + 톤 조정
-    run_phase3_reports_and_tone(args.period_id, teams)
+    run_phase3_reports_and_tone(args.period_id, teams, tracker)
     
     logging.info("분기별 평가 워크플로우 전체 완료!")
 
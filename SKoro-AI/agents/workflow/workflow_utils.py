@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from agents.evaluation.modules.module_02_goal_achievement import db_utils
 from sqlalchemy import bindparam
 
@@ -59,6 +59,29 @@ def check_all_teams_phase_completed(teams: List[int], period_id: int, phase_stat
     logging.info(f"동기화 체크: {count}개 팀이 아직 {phase_status} 미달성")
     return count == 0
 
+def fetch_team_statuses(period_id: int, teams: Optional[List[int]] = None) -> Dict[int, str]:
+    """
+    team_evaluations의 팀별 status를 조회한다. (평가 Job 진행 상황 조회용)
+    """
+    with db_utils.engine.connect() as connection:
+        if teams:
+            query = db_utils.text(
+                """
+                SELECT team_id, status FROM team_evaluations
+                WHERE period_id = :period_id AND team_id IN :team_ids
+                """
+            ).bindparams(bindparam('team_ids', expanding=True))
+            result = connection.execute(query, {"period_id": period_id, "team_ids": teams})
+        else:
+            query = db_utils.text(
+                """
+                SELECT team_id, status FROM team_evaluations
+                WHERE period_id = :period_id
+                """
+            )
+            result = connection.execute(query, {"period_id": period_id})
+        return {row[0]: row[1] for row in result}
+
 def update_team_status(team_id: int, period_id: int, status: str):
     """
     team_evaluations의 status를 업데이트한다.
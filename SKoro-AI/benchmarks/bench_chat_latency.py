@@ -0,0 +1,80 @@
+# =============================================================================
+# bench_chat_latency.py - /api/ai/chat/skoro 응답 지연 p50/p95 (요청마다 자원 생성 vs 워커 공유)
+# =============================================================================
+# 실제 임베딩 모델 / OpenAI / 벡터 저장소(Pinecone 또는 CHATBOT_VECTOR_BACKEND=faiss)와 DB가 필요하다.
+# cold: 요청마다 ChatbotConfig를 새로 만들어 모델 로드·클라이언트 생성·인덱스 연결을 반복 (레지스트리 도입 전 동작)
+# warm: 워커 시작 시 warm_up() 한 번 후 같은 자원을 재사용
+#
+#   python -m benchmarks.bench_chat_latency --user-id 240001 --requests 20
+
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from agents.chatbot import agent as chatbot_agent
+from agents.chatbot import llm_utils, rag_retriever
+
+DEFAULT_MESSAGES = [
+    "이번 분기 내 평가 결과 요약해줘",
+    "팀 KPI 달성률이 어떻게 돼?",
+    "동료 평가에서 강점이 뭐였어?",
+    "평가 이의 제기는 어떻게 해?",
+]
+
+
+def reset_chatbot_resources() -> llm_utils.ChatbotConfig:
+    """프로세스 공유 자원을 버리고 새 레지스트리로 교체 (다음 요청이 모든 자원을 다시 생성)"""
+    config = llm_utils.ChatbotConfig()
+    retriever = rag_retriever.UnifiedRAGRetriever(config)
+    llm_utils._chatbot_config = config
+    rag_retriever._rag_retriever = retriever
+    chatbot_agent.config = config
+    chatbot_agent.rag_retriever = retriever
+    return config
+
+
+def percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+def measure(client: TestClient, user_id: str, requests: int, cold: bool):
+    timings = []
+    for i in range(requests):
+        if cold:
+            reset_chatbot_resources()
+        payload = {"user_id": user_id, "chat_mode": "default", "message": DEFAULT_MESSAGES[i % len(DEFAULT_MESSAGES)]}
+        started = time.perf_counter()
+        response = client.post("/api/ai/chat/skoro", json=payload)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return {"p50": percentile(timings, 0.5), "p95": percentile(timings, 0.95), "mean": statistics.mean(timings)}
+
+
+def run(user_id: str, requests: int = 20):
+    client = TestClient(main.app)  # startup 워밍업은 warm 측정 직전에 직접 수행
+
+    cold = measure(client, user_id, requests, cold=True)
+
+    config = reset_chatbot_resources()
+    started = time.perf_counter()
+    config.warm_up()
+    warm_up_ms = (time.perf_counter() - started) * 1000
+    warm = measure(client, user_id, requests, cold=False)
+
+    print(f"📊 /api/ai/chat/skoro 지연 ({requests}회씩)")
+    print(f"   요청마다 자원 생성 : p50 {cold['p50']:8.0f} ms, p95 {cold['p95']:8.0f} ms")
+    print(f"   워커 공유 (워밍업 후): p50 {warm['p50']:8.0f} ms, p95 {warm['p95']:8.0f} ms "
+          f"(워밍업 {warm_up_ms:.0f} ms, 1회)")
+    return {"cold": cold, "warm": warm, "warm_up_ms": warm_up_ms}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="챗봇 응답 지연 벤치마크")
+    parser.add_argument("--user-id", required=True, help="메타데이터가 있는 사번")
+    parser.add_argument("--requests", type=int, default=20)
+    options = parser.parse_args()
+    run(options.user_id, options.requests)
@@ -0,0 +1,79 @@
+# =============================================================================
+# bench_module2_snapshot.py - 모듈 2 팀 데이터 적재: 항목별 조회 vs TeamPeriodSnapshot
+# =============================================================================
+# 합성 팀(기본 20명)을 인메모리 SQLite에 만들고, 기존 방식(Task/KPI마다 fetch_* 호출)과
+# TeamPeriodSnapshot.load의 쿼리 수와 소요 시간을 비교한다.
+#
+#   python -m benchmarks.bench_module2_snapshot --members 20 --repeat 20
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from agents.evaluation.modules.module_02_goal_achievement import db_utils
+from tests.synthetic_db import count_queries, create_schema, seed_module2_team
+
+
+def load_per_item(team_id: int, period_id: int, task_ids, kpi_ids):
+    """스냅샷 도입 전 방식 - 팀원 1회 + Task마다 1회 + KPI마다 3회 조회"""
+    members = db_utils.fetch_team_members(team_id)
+    tasks = {task_id: db_utils.fetch_cumulative_task_data(task_id, period_id) for task_id in task_ids}
+    kpis = {kpi_id: db_utils.fetch_team_kpi_data(kpi_id) for kpi_id in kpi_ids}
+    kpi_tasks = {kpi_id: db_utils.fetch_kpi_tasks(kpi_id, period_id) for kpi_id in kpi_ids}
+    evaluation_types = {kpi_id: db_utils.check_evaluation_type(kpi_id) for kpi_id in kpi_ids}
+    return members, tasks, kpis, kpi_tasks, evaluation_types
+
+
+def load_snapshot(team_id: int, period_id: int, task_ids, kpi_ids):
+    return db_utils.TeamPeriodSnapshot.load(team_id, period_id, task_ids, kpi_ids)
+
+
+def measure(engine, loader, repeat: int, *args):
+    with count_queries(engine) as statements:
+        loader(*args)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        loader(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return len(statements), statistics.median(timings)
+
+
+def run(members: int = 20, tasks_per_member: int = 3, kpis: int = 5, period_id: int = 2, repeat: int = 20):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    original_engine = db_utils.engine
+    db_utils.engine = engine
+    try:
+        create_schema(engine)
+        seeded = seed_module2_team(engine, members=members, kpis=kpis,
+                                   tasks_per_member=tasks_per_member, period_id=period_id)
+        args = (1, period_id, seeded["task_ids"], seeded["kpi_ids"])
+        before_queries, before_ms = measure(engine, load_per_item, repeat, *args)
+        after_queries, after_ms = measure(engine, load_snapshot, repeat, *args)
+    finally:
+        db_utils.engine = original_engine
+        engine.dispose()
+
+    print(f"📊 모듈 2 팀 데이터 적재 (팀원 {members}명, Task {len(seeded['task_ids'])}개, KPI {kpis}개)")
+    print(f"   항목별 조회       : 쿼리 {before_queries:4d}회, {before_ms:8.2f} ms (median, {repeat}회)")
+    print(f"   TeamPeriodSnapshot: 쿼리 {after_queries:4d}회, {after_ms:8.2f} ms (median, {repeat}회)")
+    return {"before": {"queries": before_queries, "ms": before_ms},
+            "after": {"queries": after_queries, "ms": after_ms}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모듈 2 스냅샷 적재 벤치마크")
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--tasks-per-member", type=int, default=3)
+    parser.add_argument("--kpis", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    options = parser.parse_args()
+    run(members=options.members, tasks_per_member=options.tasks_per_member,
+        kpis=options.kpis, repeat=options.repeat)
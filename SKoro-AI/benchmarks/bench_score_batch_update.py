@@ -0,0 +1,111 @@
+# =============================================================================
+# bench_score_batch_update.py - 점수 일괄 저장: 행마다 commit vs CASE WHEN 다중 행 UPDATE vs executemany
+# =============================================================================
+# 모듈 7/9의 점수 저장(기본 1,000명)을 세 방식으로 반영하고 소요 시간을 비교한다.
+# 기본은 인메모리 SQLite이고 --url로 MariaDB 등 실제 DB를 지정할 수 있다.
+# 실제 테이블은 건드리지 않고 임시 테이블(bench_score_updates)을 만들어 쓰고 끝나면 삭제한다.
+#
+#   python -m benchmarks.bench_score_batch_update --rows 1000 --repeat 5
+#   python -m benchmarks.bench_score_batch_update --url "mysql+pymysql://user:pw@host:3306/skoro"
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+import db
+
+TABLE = "bench_score_updates"
+KEY_COLUMN = "final_evaluation_report_id"
+
+
+def create_table(engine, rows: int):
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        connection.execute(text(f"""
+            CREATE TABLE {TABLE} (
+                {KEY_COLUMN} INTEGER PRIMARY KEY,
+                score DECIMAL(5, 2),
+                cl_reason TEXT
+            )
+        """))
+        connection.execute(text(f"INSERT INTO {TABLE} ({KEY_COLUMN}, score, cl_reason) VALUES (:id, 3.0, NULL)"),
+                           [{"id": report_id} for report_id in range(1, rows + 1)])
+
+
+def adjustments(rows: int, round_index: int):
+    """batch_update_final_evaluation_reports가 만드는 {report_id: {score, cl_reason}} (회차마다 값이 바뀌도록)"""
+    return {
+        report_id: {"score": round(2.0 + (report_id + round_index) % 300 / 100, 2),
+                    "cl_reason": f"CL 조정 {round_index} | 타당성분석: 업무증거 0.70, 동료평가 0.60"}
+        for report_id in range(1, rows + 1)
+    }
+
+
+def write_per_row_commit(engine, rows):
+    """일괄 저장 도입 전 방식 - 직원마다 연결 → UPDATE → commit"""
+    for report_id, data in rows.items():
+        with engine.begin() as connection:
+            connection.execute(text(f"UPDATE {TABLE} SET score = :score, cl_reason = :cl_reason "
+                                    f"WHERE {KEY_COLUMN} = :id"), {**data, "id": report_id})
+
+
+def write_case_when(engine, rows):
+    """한 트랜잭션 + CASE WHEN 다중 행 UPDATE (청크당 1문장)"""
+    with db.unit_of_work(bind=engine) as connection:
+        db.bulk_update(connection, TABLE, KEY_COLUMN, rows)
+
+
+def write_executemany(engine, rows):
+    """현재 방식 - 한 트랜잭션 + 세이브포인트 안의 준비된 UPDATE executemany"""
+    with db.unit_of_work(bind=engine) as connection:
+        db.bulk_update_isolating_failures(connection, TABLE, KEY_COLUMN, rows)
+
+
+def measure(engine, writer, rows: int, repeat: int) -> float:
+    timings = []
+    for round_index in range(repeat):
+        data = adjustments(rows, round_index)
+        started = time.perf_counter()
+        writer(engine, data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run(rows: int = 1000, repeat: int = 5, url: str = None):
+    if url:
+        engine = create_engine(url, pool_pre_ping=True)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    results = {}
+    try:
+        create_table(engine, rows)
+        for name, writer in (("per_row_commit", write_per_row_commit),
+                             ("case_when", write_case_when),
+                             ("executemany", write_executemany)):
+            results[name] = measure(engine, writer, rows, repeat)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        engine.dispose()
+
+    print(f"📊 점수 일괄 저장 {rows}건 ({engine.dialect.name}, median {repeat}회)")
+    print(f"   행마다 commit        : {results['per_row_commit']:9.2f} ms")
+    print(f"   CASE WHEN 다중 행    : {results['case_when']:9.2f} ms")
+    print(f"   executemany (현재)   : {results['executemany']:9.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="점수 일괄 저장 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None, help="SQLAlchemy DB URL (생략 시 인메모리 SQLite)")
+    options = parser.parse_args()
+    run(rows=options.rows, repeat=options.repeat, url=options.url)
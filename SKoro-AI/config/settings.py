@@ -12,6 +12,18 @@ class DatabaseConfig:
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "3306")
     DB_NAME = os.getenv("DB_NAME", "skoro_db")
+    # 읽기 전용 복제본 (설정하지 않으면 primary로 조회)
+    DB_READ_HOST = os.getenv("DB_READ_HOST")
+    DB_READ_PORT = os.getenv("DB_READ_PORT", DB_PORT)
+
+    # 커넥션 풀 설정 (프로세스 전체에서 하나의 엔진을 공유)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # 커넥션을 받기까지 이 시간(ms)을 넘기면 풀 대기로 집계 (/health-check/db-pool의 checkout_waits)
+    DB_POOL_WAIT_THRESHOLD_MS = int(os.getenv("DB_POOL_WAIT_THRESHOLD_MS", "100"))
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
 
     @property
     def DATABASE_URL(self):
@@ -20,6 +32,140 @@ class DatabaseConfig:
         # f"{self.DB_TYPE}+pymysql://..." 형태로 MariaDB 드라이버를 사용
         return f"{self.DB_TYPE}+pymysql://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def READ_DATABASE_URL(self):
+        if not self.DB_READ_HOST:
+            return None
+        if self.DB_PASSWORD is None:
+            raise ValueError("DB_PASSWORD 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        return f"{self.DB_TYPE}+pymysql://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_READ_HOST}:{self.DB_READ_PORT}/{self.DB_NAME}"
+
+
+class WorkflowConfig:
+    # 동시에 처리할 팀 수 (1이면 기존처럼 팀 순차 실행)
+    MAX_TEAM_WORKERS = int(os.getenv("WORKFLOW_MAX_TEAM_WORKERS", "4"))
+    # 모듈별 동시 실행 상한 (예: "module2:4,module3:2,module6:2") - 지정하지 않은 모듈은 MAX_TEAM_WORKERS를 따름
+    MODULE_LIMITS = os.getenv("WORKFLOW_MODULE_LIMITS", "")
+    # API로 요청된 평가 Job 동시 실행 수 (서로 다른 기간의 평가를 나란히 실행)
+    MAX_CONCURRENT_JOBS = int(os.getenv("EVALUATION_MAX_CONCURRENT_JOBS", "2"))
+    # 종료된 Job 보관 기간(초)과 최대 보관 개수 (넘으면 오래된 Job부터 목록에서 제거)
+    JOB_TTL_SECONDS = int(os.getenv("EVALUATION_JOB_TTL_SECONDS", "86400"))
+    MAX_FINISHED_JOBS = int(os.getenv("EVALUATION_MAX_FINISHED_JOBS", "100"))
+    # 리포트/톤 조정이 끝난 팀의 리포트를 챗봇 벡터DB에 바로 증분 반영 (기본 꺼짐)
+    # 켜기 전에 migrations 적용과 'python -m agents.chatbot.vector_sync --migrate-legacy-ids'를 한 번 실행해야 함
+    SYNC_VECTOR_DB = os.getenv("WORKFLOW_SYNC_VECTOR_DB", "false").lower() == "true"
+    # 모듈9 본부 내 CL 그룹 동시 처리 수 (CL 그룹끼리는 직원이 겹치지 않음)
+    MODULE9_CL_WORKERS = int(os.getenv("WORKFLOW_MODULE9_CL_WORKERS", "3"))
+    # 모듈9 본부 동시 처리 수 (CL 제로섬 조정은 본부 단위로 독립, LLM 호출은 module9 상한을 함께 사용)
+    MODULE9_HQ_WORKERS = int(os.getenv("WORKFLOW_MODULE9_HQ_WORKERS", "2"))
+
+    @property
+    def module_limits(self):
+        limits = {}
+        for item in self.MODULE_LIMITS.split(","):
+            if ":" not in item:
+                continue
+            name, limit = item.split(":", 1)
+            if name.strip() and limit.strip().isdigit():
+                limits[name.strip()] = max(1, int(limit.strip()))
+        return limits
+
+
+def _parse_limits(value: str, fields: int):
+    """"name:a:b,name2:c:d" 형태의 설정 문자열을 {name: (a, b)}로 변환"""
+    limits = {}
+    for item in value.split(","):
+        parts = [part.strip() for part in item.split(":")]
+        if len(parts) != fields + 1 or not parts[0]:
+            continue
+        if all(part.isdigit() for part in parts[1:]):
+            values = tuple(max(1, int(part)) for part in parts[1:])
+            limits[parts[0]] = values if fields > 1 else values[0]
+    return limits
+
+
+class LLMConfig:
+    # 모델별 분당 요청 수 / 분당 토큰 수 (예: "gpt-4o:500:30000,gpt-4o-mini:500:200000")
+    RATE_LIMITS = os.getenv("LLM_RATE_LIMITS", "gpt-4o:500:30000,gpt-4o-mini:500:200000")
+    # 목록에 없는 모델에 적용할 기본값
+    DEFAULT_RPM = int(os.getenv("LLM_DEFAULT_RPM", "500"))
+    DEFAULT_TPM = int(os.getenv("LLM_DEFAULT_TPM", "30000"))
+    # 모듈별 동시 LLM 호출 상한 (예: "module3:4,module4:8,module6:4,module9:8")
+    MODULE_CONCURRENCY = os.getenv("LLM_MODULE_CONCURRENCY", "module3:4,module4:8,module6:4,module9:8")
+    DEFAULT_CONCURRENCY = int(os.getenv("LLM_DEFAULT_CONCURRENCY", "8"))
+    # 429 / 일시 오류 재시도
+    MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+    BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30.0"))
+    # 토큰 버킷 차감용 예상 출력 토큰 수 (응답 후 실제 사용량으로 보정)
+    EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "500"))
+
+    # 응답 캐시 (SQLite) - 같은 (모델, temperature, 프롬프트, 스키마) 요청은 저장된 응답 재사용
+    CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    # 캐시를 사용할 모듈 (opt-in)
+    CACHE_MODULES = os.getenv("LLM_CACHE_MODULES", "module2,module3,module4")
+    CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")  # 비우면 data/cache/llm_cache.sqlite
+    CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+    CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+    # 이 값 이하의 temperature 호출만 캐시 (기본: 결정적 호출인 0만)
+    CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0"))
+
+    @property
+    def rate_limits(self):
+        return _parse_limits(self.RATE_LIMITS, 2)
+
+    @property
+    def module_concurrency(self):
+        return _parse_limits(self.MODULE_CONCURRENCY, 1)
+
+    @property
+    def cache_modules(self):
+        return {name.strip() for name in self.CACHE_MODULES.split(",") if name.strip()}
+
+
+
+class ChatbotSettings:
+    # 임베딩 백엔드: torch(HuggingFaceEmbeddings) / onnx(ONNX Runtime) - 문제 시 torch로 되돌리면 됨
+    EMBEDDING_BACKEND = os.getenv("CHATBOT_EMBEDDING_BACKEND", "torch").lower()
+    # int8 양자화는 PyTorch 결과와 달라질 수 있어 기본 꺼짐. onnx 백엔드는 코사인 유사도가 기준 미만이면 torch로 대체
+    EMBEDDING_QUANTIZE = os.getenv("CHATBOT_EMBEDDING_QUANTIZE", "false").lower() == "true"
+    EMBEDDING_ONNX_TOLERANCE = float(os.getenv("CHATBOT_EMBEDDING_ONNX_TOLERANCE", "0.99"))
+    EMBEDDING_BATCH_SIZE = int(os.getenv("CHATBOT_EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_ONNX_DIR = os.getenv("CHATBOT_EMBEDDING_ONNX_DIR", "")  # 비우면 data/models
+
+    # 벡터 저장소: pinecone / faiss(로컬 파일, agents/chatbot/local_vector_store.py로 생성)
+    VECTOR_BACKEND = os.getenv("CHATBOT_VECTOR_BACKEND", "pinecone").lower()
+    VECTOR_STORE_DIR = os.getenv("CHATBOT_VECTOR_STORE_DIR", "")  # 비우면 data/vector_store
+
+    # 질의 임베딩 캐시 (정규화된 질의 → 벡터) - 메모리 LRU + 선택적 SQLite 영구 저장 (질의 해시만 저장, 기본 꺼짐)
+    EMBEDDING_CACHE_SIZE = int(os.getenv("CHATBOT_EMBEDDING_CACHE_SIZE", "2048"))
+    EMBEDDING_CACHE_PERSIST = os.getenv("CHATBOT_EMBEDDING_CACHE_PERSIST", "false").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.getenv("CHATBOT_EMBEDDING_CACHE_PATH", "")  # 비우면 data/cache/query_embeddings.sqlite
+    # 시작 시 미리 임베딩할 질의 ("|" 구분) + 저장된 질의 중 많이 쓰인 상위 N개를 메모리에 적재
+    PREWARM_QUERIES = os.getenv(
+        "CHATBOT_PREWARM_QUERIES",
+        "내 등급은?|내 점수는?|달성률이 왜 낮아?|평가 기준이 뭐야?|내 성과 알려줘|팀 순위는?"
+    )
+    PREWARM_TOP_N = int(os.getenv("CHATBOT_PREWARM_TOP_N", "500"))
+
+    # 세션 저장소: memory(프로세스 LRU) / sqlite(로컬 파일) / mariadb(공유 DB) - 오래 쓰지 않은 세션은 TTL 후 만료
+    SESSION_BACKEND = os.getenv("CHATBOT_SESSION_BACKEND", "memory").lower()
+    SESSION_MAX = int(os.getenv("CHATBOT_SESSION_MAX", "1000"))
+    SESSION_TTL_SECONDS = int(os.getenv("CHATBOT_SESSION_TTL_SECONDS", "86400"))
+    SESSION_DB_PATH = os.getenv("CHATBOT_SESSION_DB_PATH", "")  # 비우면 data/cache/chatbot_sessions.sqlite
+    # 대화 기록이 토큰 예산을 넘으면 최근 N개 메시지만 남기고 나머지는 요약으로 압축 (0이면 압축 안 함)
+    SESSION_TOKEN_BUDGET = int(os.getenv("CHATBOT_SESSION_TOKEN_BUDGET", "3000"))
+    SESSION_KEEP_RECENT = int(os.getenv("CHATBOT_SESSION_KEEP_RECENT", "6"))
+
+    # 권한 제어용 사용자 메타데이터(role/team) 캐시 유지 시간 - 인사 변경은 무효화 API/워크플로우 훅으로 즉시 반영
+    USER_METADATA_TTL_SECONDS = int(os.getenv("CHATBOT_USER_METADATA_TTL_SECONDS", "21600"))
+    # 다른 워커/서버의 무효화 기록(user_metadata_invalidations)을 확인하는 주기
+    USER_METADATA_SYNC_SECONDS = float(os.getenv("CHATBOT_USER_METADATA_SYNC_SECONDS", "5"))
+
+    @property
+    def prewarm_queries(self):
+        return [query.strip() for query in self.PREWARM_QUERIES.split("|") if query.strip()]
+
 
 if __name__ == "__main__":
     # 이 스크립트를 직접 실행할 때도 .env 파일이 로드되어야 합니다.
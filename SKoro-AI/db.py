@@ -1,17 +1,283 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
 from config.settings import DatabaseConfig
 
+logger = logging.getLogger(__name__)
+
 # 설정 객체 생성
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
 
-# SQLAlchemy 엔진 생성
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # 연결 확인 옵션
-    echo=True  # SQL 출력 (개발 시에만 True)
-)
+# =====================================
+# 프로세스 전역 엔진 레지스트리
+# =====================================
+# 모듈별로 create_engine을 호출하면 모듈 수만큼 커넥션 풀이 생기므로
+# 모든 db_utils는 get_engine() / get_read_engine()으로 같은 엔진을 공유한다.
+
+_engines: Dict[str, Engine] = {}
+_pool_stats: Dict[str, Dict[str, int]] = {}
+_registry_lock = threading.Lock()
+# 풀 이벤트는 여러 워커 스레드에서 동시에 발생하므로 카운터 증가/조회는 lock 안에서
+_stats_lock = threading.Lock()
+
+
+def _attach_pool_listeners(name: str, engine: Engine):
+    stats = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0,
+             "checkout_waits": 0, "checkout_wait_ms_total": 0, "checkout_wait_ms_max": 0, "pool_timeouts": 0}
+    _pool_stats[name] = stats
+    wait_threshold_ms = db_config.DB_POOL_WAIT_THRESHOLD_MS
+
+    def increment(*keys: str):
+        with _stats_lock:
+            for key in keys:
+                stats[key] += 1
+
+    def record_wait(waited_ms: int):
+        with _stats_lock:
+            stats["checkout_waits"] += 1
+            stats["checkout_wait_ms_total"] += waited_ms
+            stats["checkout_wait_ms_max"] = max(stats["checkout_wait_ms_max"], waited_ms)
+
+    # 풀 대기 측정 - 커넥션을 요청한 시점부터 받을 때까지 걸린 시간 (checkout 이벤트는 받은 뒤에만 발생)
+    # Engine.connect()는 항상 raw_connection()으로 풀에서 꺼내므로 여기서 감싼다 (dispose로 풀이 바뀌어도 유지).
+    # 새 물리 연결 생성 / pre-ping 시간도 포함되므로 임계값 이하는 대기로 보지 않는다.
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        except PoolTimeoutError:
+            increment("pool_timeouts")
+            raise
+        finally:
+            waited_ms = int((time.perf_counter() - started) * 1000)
+            if waited_ms >= wait_threshold_ms:
+                record_wait(waited_ms)
+
+    engine.raw_connection = timed_raw_connection
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        increment("invalidations")
+
+
+def _build_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        pool_pre_ping=True,  # 연결 확인 옵션
+        pool_size=db_config.DB_POOL_SIZE,
+        max_overflow=db_config.DB_MAX_OVERFLOW,
+        pool_recycle=db_config.DB_POOL_RECYCLE,
+        pool_timeout=db_config.DB_POOL_TIMEOUT,
+        echo=db_config.DB_ECHO  # SQL 출력 (DB_ECHO=true일 때만)
+    )
+
+
+def get_engine(url: Optional[str] = None) -> Engine:
+    """
+    공유 엔진 반환 (없으면 생성). url을 생략하면 기본 DATABASE_URL(primary)을 사용한다.
+    """
+    url = url or DATABASE_URL
+    name = "primary" if url == DATABASE_URL else url.split("@")[-1]
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
+    with _registry_lock:
+        if name not in _engines:
+            engine = _build_engine(url)
+            _attach_pool_listeners(name, engine)
+            _engines[name] = engine
+        return _engines[name]
+
+
+def get_read_engine() -> Engine:
+    """
+    조회 전용 엔진. DB_READ_HOST가 설정되어 있으면 복제본, 아니면 primary 엔진을 반환한다.
+    """
+    read_url = db_config.READ_DATABASE_URL
+    if not read_url:
+        return get_engine()
+    engine = _engines.get("replica")
+    if engine is not None:
+        return engine
+    with _registry_lock:
+        if "replica" not in _engines:
+            engine = _build_engine(read_url)
+            _attach_pool_listeners("replica", engine)
+            _engines["replica"] = engine
+        return _engines["replica"]
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, int]]:
+    """
+    엔진별 커넥션 풀 지표 (모니터링용)
+    """
+    metrics = {}
+    for name, engine in list(_engines.items()):
+        pool = engine.pool
+        with _stats_lock:
+            stats = dict(_pool_stats.get(name, {}))
+        metrics[name] = {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **stats,
+        }
+    return metrics
+
+
+def dispose_engines():
+    """
+    모든 공유 엔진의 풀을 정리한다. (프로세스 종료 / fork 이후 사용)
+    """
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _pool_stats.clear()
+
+
+# SQLAlchemy 엔진 (공유 엔진)
+engine = get_engine()
+
+# =====================================
+# 배치 쓰기 / Unit of Work
+# =====================================
+# 행마다 connect → UPDATE → commit 하면 팀 하나에 수백 번 왕복하므로
+# 저장 서브모듈은 unit_of_work 안에서 bulk_update로 모아서 쓴다.
+
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+@contextmanager
+def unit_of_work(connection: Optional[Connection] = None, bind: Optional[Engine] = None) -> Iterator[Connection]:
+    """
+    하나의 트랜잭션으로 묶인 커넥션을 제공한다. 블록이 끝나면 한 번 commit, 예외 시 전체 rollback.
+    이미 열린 connection을 넘기면 그 트랜잭션에 합류한다 (commit은 바깥 블록이 담당).
+    """
+    if connection is not None:
+        yield connection
+        return
+    with (bind or engine).begin() as conn:
+        yield conn
+
+
+def bulk_update(connection: Connection, table: str, key_column: str, rows: Dict[Any, Dict[str, Any]],
+                filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    {key: {column: value}} 형태의 여러 행을 CASE WHEN 다중 행 UPDATE로 반영한다.
+    컬럼 구성이 같은 행끼리 묶어 청크(BULK_UPDATE_CHUNK_SIZE)당 한 번의 UPDATE를 실행한다.
+    filters({column: value})를 주면 WHERE에 등호 조건으로 추가한다 (복합 키 테이블용).
+    반환값: 영향받은 행 수
+    """
+    filters = filters or {}
+    filter_clause = "".join(f" AND {column} = :f_{column}" for column in filters)
+    groups: Dict[tuple, List[Any]] = {}
+    for key, data in rows.items():
+        if key is None or not data:
+            continue
+        groups.setdefault(tuple(sorted(data.keys())), []).append(key)
+
+    updated = 0
+    for columns, keys in groups.items():
+        for start in range(0, len(keys), BULK_UPDATE_CHUNK_SIZE):
+            chunk = keys[start:start + BULK_UPDATE_CHUNK_SIZE]
+            params: Dict[str, Any] = {f"f_{column}": value for column, value in filters.items()}
+            set_clauses = []
+            for col_idx, column in enumerate(columns):
+                cases = []
+                for row_idx, key in enumerate(chunk):
+                    params[f"k{row_idx}"] = key
+                    params[f"v{col_idx}_{row_idx}"] = rows[key][column]
+                    cases.append(f"WHEN :k{row_idx} THEN :v{col_idx}_{row_idx}")
+                set_clauses.append(f"{column} = CASE {key_column} {' '.join(cases)} ELSE {column} END")
+            key_params = ", ".join(f":k{row_idx}" for row_idx in range(len(chunk)))
+            query = text(f"""
+                UPDATE {table}
+                SET {', '.join(set_clauses)}
+                WHERE {key_column} IN ({key_params}){filter_clause}
+            """)
+            updated += connection.execute(query, params).rowcount
+    return updated
+
+
+def executemany_update(connection: Connection, table: str, key_column: str, rows: Dict[Any, Dict[str, Any]],
+                       filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    {key: {column: value}} 형태의 여러 행을 한 행짜리 준비된 UPDATE 문 + executemany로 반영한다.
+    컬럼 구성이 같은 행끼리 묶어 컬럼 구성당 한 번 실행한다 (CASE WHEN 다중 행 UPDATE보다 DB가 계획하기 쉬움).
+    filters({column: value})를 주면 WHERE에 등호 조건으로 추가한다 (복합 키 테이블용).
+    반환값: 영향받은 행 수
+    """
+    filters = filters or {}
+    filter_clause = "".join(f" AND {column} = :f_{column}" for column in filters)
+    filter_params = {f"f_{column}": value for column, value in filters.items()}
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for key, data in rows.items():
+        if key is None or not data:
+            continue
+        columns = tuple(sorted(data.keys()))
+        params = {f"v_{column}": data[column] for column in columns}
+        groups.setdefault(columns, []).append({**params, **filter_params, "k": key})
+
+    updated = 0
+    for columns, params_list in groups.items():
+        set_clause = ", ".join(f"{column} = :v_{column}" for column in columns)
+        query = text(f"UPDATE {table} SET {set_clause} WHERE {key_column} = :k{filter_clause}")
+        updated += connection.execute(query, params_list).rowcount
+    return updated
+
+
+def bulk_update_isolating_failures(connection: Connection, table: str, key_column: str,
+                                   rows: Dict[Any, Dict[str, Any]],
+                                   filters: Optional[Dict[str, Any]] = None) -> Dict[Any, str]:
+    """
+    executemany_update를 세이브포인트 안에서 실행하고, 실패하면 행마다 다시 실행해 실패한 행만 골라낸다.
+    (정상 경로는 컬럼 구성당 executemany 한 번, 행별 실패 보고는 기존 한 건씩 UPDATE와 동일)
+    반환값: {key: 오류 메시지} - 실패한 행만
+    """
+    if not rows:
+        return {}
+    try:
+        with connection.begin_nested():
+            executemany_update(connection, table, key_column, rows, filters)
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ {table} 일괄 UPDATE 실패 - 행 단위로 재시도: {e}")
+
+    failed: Dict[Any, str] = {}
+    for key, data in rows.items():
+        try:
+            with connection.begin_nested():
+                executemany_update(connection, table, key_column, {key: data}, filters)
+        except Exception as e:
+            failed[key] = str(e)
+    if failed:
+        logger.warning(f"⚠️ {table} 행 단위 재시도 후 실패 {len(failed)}/{len(rows)}건")
+    return failed
+
 
 # 세션 팩토리 생성 (ORM 쓸 경우에만 사용)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
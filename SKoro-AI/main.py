@@ -1,8 +1,12 @@
+import threading
+
 from fastapi import FastAPI, APIRouter, Depends
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from auth.auth import admin_required
-from routers import evaluation_router, chat_router, kpi_generator_router, chatbot_summary_router
+from routers import evaluation_router, chat_router, kpi_generator_router, chatbot_summary_router, chatbot_cache_router, health_check_router
 from auth.auth import verify_token
+from agents.chatbot.llm_utils import get_chatbot_config
 
 app = FastAPI(
     title="SKoro-AI API",
@@ -32,6 +36,9 @@ secured_router = APIRouter(
 secured_router.include_router(evaluation_router.router, prefix="/evaluation")
 secured_router.include_router(kpi_generator_router.router, prefix="/kpi")
 secured_router.include_router(chatbot_summary_router.router, prefix="/chatbot-summary")
+secured_router.include_router(chatbot_cache_router.router, prefix="/chatbot-cache")
+# 내부 지표(풀/캐시 현황)는 관리자만 조회 - /api/ai/health-check/...
+secured_router.include_router(health_check_router.router, prefix="/health-check")
 
 # 🔓 누구나 접근 가능한 chat API
 public_router = APIRouter()
@@ -41,6 +48,29 @@ public_router.include_router(chat_router.router, prefix="/chat")
 app.include_router(secured_router, prefix="/api/ai")
 app.include_router(public_router, prefix="/api/ai")
 
+@app.on_event("startup")
+def warm_up_chatbot():
+    # 임베딩 모델 로드는 수십 초 걸릴 수 있어 백그라운드에서 진행 (준비 여부는 /health-check/ready)
+    def _warm_up():
+        try:
+            get_chatbot_config().warm_up()
+        except Exception as e:
+            print(f"❌ 챗봇 자원 워밍업 실패: {e}")
+
+    threading.Thread(target=_warm_up, name="chatbot-warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def flush_chatbot_caches():
+    get_chatbot_config().flush()
+
+
 @app.get("/health-check")
 def health_check():
     return {"message": "SKoro-AI FastAPI is running!"}
+
+
+@app.get("/health-check/ready")
+def readiness():
+    status = get_chatbot_config().status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
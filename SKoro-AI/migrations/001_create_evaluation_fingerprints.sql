@@ -0,0 +1,10 @@
+-- 증분 재평가용 모듈 입력 지문 - (module, period_id, team_id, emp_no)당 한 행, 팀 단위 모듈은 emp_no = ''
+CREATE TABLE IF NOT EXISTS evaluation_fingerprints (
+    module VARCHAR(20) NOT NULL,
+    period_id BIGINT NOT NULL,
+    team_id BIGINT NOT NULL,
+    emp_no VARCHAR(20) NOT NULL DEFAULT '',
+    fingerprint CHAR(64) NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (module, period_id, team_id, emp_no)
+);
@@ -0,0 +1,12 @@
+-- 챗봇 리포트 벡터DB 증분 동기화 manifest - (index_name, doc_id)당 한 행, 청크 내용 해시로 변경 여부 판단
+CREATE TABLE IF NOT EXISTS vector_sync_manifest (
+    index_name VARCHAR(100) NOT NULL,
+    doc_id VARCHAR(200) NOT NULL,
+    period_id BIGINT NOT NULL,
+    team_id BIGINT NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (index_name, doc_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_vector_sync_manifest_scope ON vector_sync_manifest (index_name, period_id, team_id);
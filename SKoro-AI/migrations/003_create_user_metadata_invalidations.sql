@@ -0,0 +1,17 @@
+-- 챗봇 사용자 메타데이터 캐시 무효화 기록 - 모든 서버/워커가 주기적으로 읽어 로컬 캐시에 반영
+-- user_metadata_generation: 무효화할 때마다 1씩 증가하는 세대 번호 (행 1개)
+-- user_metadata_invalidations: 사원별 마지막 무효화 세대 (emp_no = '*'는 전체 무효화)
+CREATE TABLE IF NOT EXISTS user_metadata_generation (
+    id INT NOT NULL PRIMARY KEY,
+    generation BIGINT NOT NULL
+);
+
+INSERT INTO user_metadata_generation (id, generation) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS user_metadata_invalidations (
+    emp_no VARCHAR(20) NOT NULL PRIMARY KEY,
+    generation BIGINT NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_metadata_invalidations_generation ON user_metadata_invalidations (generation);
@@ -0,0 +1,9 @@
+-- 챗봇 세션 저장소 (CHATBOT_SESSION_BACKEND=mariadb) - 여러 서버/워커가 같은 세션을 공유
+-- payload: 세션 데이터 JSON, updated_at: 마지막 저장 시각 (epoch 초, TTL 만료 판단용)
+CREATE TABLE IF NOT EXISTS chatbot_sessions (
+    session_key VARCHAR(100) NOT NULL PRIMARY KEY,
+    payload LONGTEXT NOT NULL,
+    updated_at DOUBLE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chatbot_sessions_updated_at ON chatbot_sessions (updated_at);
@@ -0,0 +1,53 @@
+# =============================================================================
+# migrations - AI 서버가 소유하는 보조 테이블 스키마
+# =============================================================================
+# 평가 원본 테이블은 백엔드가 관리하고, 이 디렉터리에는 AI 서버만 쓰는 테이블의 DDL을 둔다.
+# 배포 시 한 번 실행한다:  python -m migrations
+# 적용한 파일은 schema_migrations에 기록하므로 여러 번 실행해도 같은 파일은 다시 적용하지 않는다.
+
+import logging
+import os
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def migration_files() -> List[str]:
+    return sorted(name for name in os.listdir(MIGRATIONS_DIR) if name.endswith(".sql"))
+
+
+def _statements(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def apply_migrations(engine: Optional[Engine] = None) -> List[str]:
+    """아직 적용하지 않은 .sql 파일을 순서대로 실행하고 적용한 파일명 목록을 반환"""
+    if engine is None:
+        from db import get_engine
+        engine = get_engine()
+
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(100) NOT NULL PRIMARY KEY,
+                applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        applied = {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+    newly_applied = []
+    for name in migration_files():
+        if name in applied:
+            continue
+        with engine.begin() as connection:
+            for statement in _statements(os.path.join(MIGRATIONS_DIR, name)):
+                connection.execute(text(statement))
+            connection.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": name})
+        logging.info(f"[migrations] {name} 적용")
+        newly_applied.append(name)
+    return newly_applied
@@ -0,0 +1,8 @@
+import logging
+
+from migrations import apply_migrations
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    applied = apply_migrations()
+    print(f"✅ 마이그레이션 {len(applied)}개 적용" + (f": {', '.join(applied)}" if applied else " (이미 최신)"))
@@ -1,4 +1,7 @@
+import json
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from schemas.chat import ChatRequest, ChatResponse
 from pydantic import BaseModel
 from services.chat_service import ChatService
@@ -14,4 +17,29 @@ def chat_with_skoro(request: ChatRequest):
 
     response_dict = chat_service.chat_with_skoro(request)
 
-    return ChatResponse(**response_dict)
\ No newline at end of file
+    return ChatResponse(**response_dict)
+
+
+def _sse_events(request: ChatRequest):
+    """
+    chat_stream 이벤트를 SSE 형식(event/data)으로 변환. 오류도 error 이벤트로 전달.
+    클라이언트 연결이 끊겨 이 제너레이터가 닫히면 chat_stream도 바로 닫아 받은 만큼의 대화를 세션에 저장한다.
+    """
+    events = chat_service.stream_chat_with_skoro(request)
+    try:
+        for event in events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+    except Exception as e:
+        print(f"❌ 스트리밍 응답 실패: {e}")
+        yield f"event: error\ndata: {json.dumps({'message': str(e)}, ensure_ascii=False)}\n\n"
+    finally:
+        events.close()
+
+# 챗봇 SKoro와 대화 (SSE 스트리밍)
+@router.post("/skoro/stream", summary="SKoro와 대화 (스트리밍)")
+def stream_chat_with_skoro(request: ChatRequest):
+    return StreamingResponse(
+        _sse_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from schemas.chat import UserMetadataInvalidateRequest, UserMetadataInvalidateResponse
+from services.chatbot_cache_service import ChatbotCacheService
+
+chatbot_cache_service = ChatbotCacheService()
+
+router = APIRouter(tags=["챗봇 캐시"])
+
+# 사용자 메타데이터 캐시 무효화 (인사 변경 반영)
+@router.post("/user-metadata/invalidate", response_model=UserMetadataInvalidateResponse, summary="사용자 메타데이터 캐시 무효화")
+def invalidate_user_metadata(request: UserMetadataInvalidateRequest):
+    return chatbot_cache_service.invalidate_user_metadata(request)
+
+# 사용자 메타데이터 캐시 현황
+@router.get("/user-metadata", summary="사용자 메타데이터 캐시 현황")
+def user_metadata_stats():
+    return chatbot_cache_service.user_metadata_stats()
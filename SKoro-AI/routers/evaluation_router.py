@@ -1,23 +1,56 @@
-from fastapi import APIRouter
-from services.evaluation_service import EvaluationService
-from schemas.evaluation import EvaluationRequest, EvaluationResponse
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from services.evaluation_service import EvaluationService, JobConflictError
+from schemas.evaluation import EvaluationRequest, EvaluationResponse, EvaluationJobResponse
 
 router = APIRouter()
 evaluation_service = EvaluationService()
 
 router = APIRouter(tags=["평가"])
 
-# 분기 평가 시작
-@router.post("/quarterly", response_model=EvaluationResponse, summary="분기 평가 시작")
+
+def _start_or_conflict(start, *args):
+    """대상 팀이 겹치는 다른 Job이 실행 중이면 409 (같은 팀 구성이면 기존 Job을 202로 반환)"""
+    try:
+        return start(*args)
+    except JobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+# 분기 평가 시작 (백그라운드 Job으로 실행, job_id 즉시 반환)
+@router.post("/quarterly", response_model=EvaluationResponse, status_code=202, summary="분기 평가 시작")
 def start_quarterly_evaluation(request: EvaluationRequest):
-    return evaluation_service.start_quarterly_evaluation(request.period_id, request.teams)
+    return _start_or_conflict(evaluation_service.start_quarterly_evaluation,
+                              request.period_id, request.teams, request.incremental)
 
 # 중간 평가 시작
-@router.post("/middle", response_model=EvaluationResponse, summary="중간 평가 시작")
+@router.post("/middle", response_model=EvaluationResponse, status_code=202, summary="중간 평가 시작")
 def start_middle_evaluation(request: EvaluationRequest):
-    return evaluation_service.start_middle_evaluation(request.period_id, request.teams)
+    return _start_or_conflict(evaluation_service.start_middle_evaluation, request.period_id, request.teams)
 
 # 최종 평가 시작
-@router.post("/final", response_model=EvaluationResponse, summary="최종 평가 시작")
+@router.post("/final", response_model=EvaluationResponse, status_code=202, summary="최종 평가 시작")
 def start_final_evaluation(request: EvaluationRequest):
-    return evaluation_service.start_final_evaluation(request.period_id, request.teams)
\ No newline at end of file
+    return _start_or_conflict(evaluation_service.start_final_evaluation, request.period_id, request.teams)
+
+# 평가 Job 목록
+@router.get("/jobs", response_model=List[EvaluationJobResponse], summary="평가 Job 목록 조회")
+def list_evaluation_jobs(period_id: Optional[int] = None):
+    return evaluation_service.list_jobs(period_id)
+
+# 평가 Job 진행 상황 (Phase/팀/모듈별)
+@router.get("/jobs/{job_id}", response_model=EvaluationJobResponse, summary="평가 Job 진행 상황 조회")
+def get_evaluation_job(job_id: str):
+    job = evaluation_service.get_job_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 평가 Job이 없습니다.")
+    return job
+
+# 평가 Job 취소
+@router.post("/jobs/{job_id}/cancel", response_model=EvaluationJobResponse, summary="평가 Job 취소")
+def cancel_evaluation_job(job_id: str):
+    job = evaluation_service.cancel_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 평가 Job이 없습니다.")
+    return job
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from db import get_pool_metrics
+from shared.llm_gateway import get_llm_gateway
+from agents.chatbot.llm_utils import get_chatbot_config
+
+router = APIRouter(tags=["상태 점검"])
+
+# DB 커넥션 풀 현황
+@router.get("/db-pool", summary="DB 커넥션 풀 현황")
+def db_pool_metrics():
+    return get_pool_metrics()
+
+# LLM 응답 캐시 현황
+@router.get("/llm-cache", summary="LLM 응답 캐시 현황")
+def llm_cache_metrics():
+    return get_llm_gateway().cache_stats()
+
+# 챗봇 질의 임베딩 캐시 현황
+@router.get("/embedding-cache", summary="챗봇 임베딩 캐시 현황")
+def embedding_cache_metrics():
+    return get_chatbot_config().embedding_cache.stats()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 class ChatRequest(BaseModel):
     user_id: str
@@ -12,4 +12,12 @@ class ChatResponse(BaseModel):
     response: Optional[str] = None
     summary: Optional[str] = None
     message: Optional[str] = None 
-    user_id: str
\ No newline at end of file
+    user_id: str
+
+class UserMetadataInvalidateRequest(BaseModel):
+    emp_nos: Optional[List[str]] = None
+    team_ids: Optional[List[int]] = None
+
+class UserMetadataInvalidateResponse(BaseModel):
+    invalidated: int
+    entries: int
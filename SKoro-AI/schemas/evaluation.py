@@ -1,11 +1,29 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class EvaluationRequest(BaseModel):
     period_id: int
     teams: Optional[List[int]] = None
+    incremental: bool = False  # 분기 평가만 지원 - 입력이 바뀐 팀/팀원만 재계산
 
 class EvaluationResponse(BaseModel):
     period_id: int
     code: int
-    message: str
\ No newline at end of file
+    message: str
+    job_id: Optional[str] = None
+
+class EvaluationJobResponse(BaseModel):
+    job_id: str
+    evaluation_type: str
+    period_id: int
+    teams: Optional[List[int]] = None
+    incremental: bool = False
+    status: str
+    message: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    module_progress: Dict[int, Dict[str, str]] = {}
+    team_statuses: Optional[Dict[int, str]] = None
+    phase_counts: Optional[Dict[str, int]] = None
@@ -1,3 +1,5 @@
+from typing import Dict, Iterator
+
 from schemas.chat import ChatRequest, ChatResponse
 from agents.chatbot.main_chatbot import SKChatbot
 
@@ -11,4 +13,12 @@ class ChatService:
             chat_mode=request.chat_mode,
             user_input=request.message,
             appeal_complete=request.appeal_complete or False
-        )
\ No newline at end of file
+        )
+
+    def stream_chat_with_skoro(self, request: ChatRequest) -> Iterator[Dict]:
+        return self.chatbot.chat_stream(
+            user_id=request.user_id,
+            chat_mode=request.chat_mode,
+            user_input=request.message,
+            appeal_complete=request.appeal_complete or False
+        )
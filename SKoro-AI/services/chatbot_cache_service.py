@@ -0,0 +1,14 @@
+from schemas.chat import UserMetadataInvalidateRequest
+from agents.chatbot.user_metadata import get_user_metadata_cache, invalidate_user_metadata
+
+class ChatbotCacheService:
+    def invalidate_user_metadata(self, request: UserMetadataInvalidateRequest) -> dict:
+        """emp_nos / team_ids를 모두 비우면 전체 무효화"""
+        invalidated = invalidate_user_metadata(request.emp_nos, request.team_ids)
+        return {
+            "invalidated": invalidated,
+            "entries": get_user_metadata_cache().stats()["entries"]
+        }
+
+    def user_metadata_stats(self) -> dict:
+        return get_user_metadata_cache().stats()
@@ -1,18 +1,274 @@
-from typing import Optional, List
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
 from agents.workflow.quarterly_evaluation_workflow import run_auto_workflow as run_quarterly_workflow
 from agents.workflow.annual_phase1_workflow import run_auto_workflow as run_middle_workflow
 from agents.workflow.annual_phase2_workflow import run_auto_workflow as run_final_workflow
+from agents.workflow.parallel_executor import WorkflowRunContext
+from agents.workflow.workflow_utils import fetch_team_statuses
+from config.settings import WorkflowConfig
+
+# 평가 유형별 워크플로우 / 완료 메시지
+EVALUATION_WORKFLOWS = {
+    "quarterly": (run_quarterly_workflow, "분기 평가"),
+    "middle": (run_middle_workflow, "중간 평가"),
+    "final": (run_final_workflow, "최종 평가"),
+}
+
+# Job 상태
+JOB_PENDING = "PENDING"
+JOB_RUNNING = "RUNNING"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+JOB_CANCELLING = "CANCELLING"
+JOB_CANCELLED = "CANCELLED"
+ACTIVE_JOB_STATUSES = (JOB_PENDING, JOB_RUNNING, JOB_CANCELLING)
+FINISHED_JOB_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobConflictError(Exception):
+    """같은 평가 유형/기간에 대상 팀이 겹치지만 같지 않은 Job이 실행 중 (라우터에서 409로 응답)"""
+
+    def __init__(self, job: "EvaluationJob"):
+        super().__init__(f"대상 팀이 겹치는 평가 Job이 실행 중입니다: {job.job_id} (teams {job.teams})")
+        self.job = job
+
+
+def normalize_teams(teams: Optional[List[int]]) -> Optional[frozenset]:
+    """Job 중복 판단용 팀 집합 - None/빈 목록은 전체 팀(None)"""
+    return frozenset(teams) if teams else None
+
+
+def teams_overlap(left: Optional[frozenset], right: Optional[frozenset]) -> bool:
+    if left is None or right is None:
+        return True
+    return bool(left & right)
+
+
+class EvaluationJob:
+    def __init__(self, evaluation_type: str, period_id: int, teams: Optional[List[int]], incremental: bool = False):
+        self.job_id = uuid.uuid4().hex
+        self.evaluation_type = evaluation_type
+        self.period_id = period_id
+        self.teams = teams
+        self.incremental = incremental
+        self.status = JOB_PENDING
+        self.message = ""
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # {team_id: {module_name: RUNNING/COMPLETED/FAILED/SKIPPED}}
+        self.module_progress: Dict[int, Dict[str, str]] = {}
+        self.lock = threading.Lock()
+        self.run_context = WorkflowRunContext(progress_callback=self.record_module_progress)
+
+    def record_module_progress(self, team_id: int, module_name: str, status: str):
+        with self.lock:
+            self.module_progress.setdefault(team_id, {})[module_name] = status
+
+    def set_status(self, status: str, message: Optional[str] = None, started: bool = False, finished: bool = False):
+        """상태 전이는 항상 lock 안에서 (워커 스레드와 취소/조회 요청이 동시에 접근)"""
+        with self.lock:
+            self.status = status
+            if message is not None:
+                self.message = message
+            if started:
+                self.started_at = datetime.now()
+            if finished:
+                self.finished_at = datetime.now()
+
+    def request_cancel(self) -> bool:
+        """실행 전/실행 중인 Job에 취소 신호를 보낸다. 이미 끝난 Job이면 False"""
+        with self.lock:
+            if self.status not in ACTIVE_JOB_STATUSES:
+                return False
+            self.run_context.cancel_event.set()
+            if self.status == JOB_RUNNING:
+                self.status = JOB_CANCELLING
+                self.message = "취소 요청됨 - 실행 중인 모듈이 끝나면 중단됩니다."
+            return True
+
+    def is_active(self) -> bool:
+        with self.lock:
+            return self.status in ACTIVE_JOB_STATUSES
+
+    def is_expired(self, now: datetime, ttl_seconds: int) -> bool:
+        with self.lock:
+            return (self.status in FINISHED_JOB_STATUSES and self.finished_at is not None
+                    and (now - self.finished_at).total_seconds() > ttl_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "job_id": self.job_id,
+                "evaluation_type": self.evaluation_type,
+                "period_id": self.period_id,
+                "teams": self.teams,
+                "incremental": self.incremental,
+                "status": self.status,
+                "message": self.message,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "module_progress": {team_id: dict(modules) for team_id, modules in self.module_progress.items()},
+            }
+
+
+class EvaluationJobManager:
+    """
+    평가 워크플로우를 백그라운드 executor에서 실행하고 Job 단위로 상태를 관리한다.
+    - 같은 평가 유형/기간/대상 팀의 Job이 실행 중이면 새로 만들지 않고 기존 Job을 반환
+    - 대상 팀이 겹치지만 같지 않은 Job이 실행 중이면 JobConflictError (겹치지 않는 팀은 별도 Job으로 실행)
+    - 서로 다른 기간의 Job은 MAX_CONCURRENT_JOBS까지 동시에 실행
+    - 종료된 Job은 job_ttl_seconds가 지나거나 max_finished_jobs개를 넘으면 오래된 것부터 제거
+    """
+
+    def __init__(self, max_concurrent_jobs: Optional[int] = None, job_ttl_seconds: Optional[int] = None,
+                 max_finished_jobs: Optional[int] = None):
+        config = WorkflowConfig()
+        max_workers = max_concurrent_jobs or config.MAX_CONCURRENT_JOBS
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evaluation-job")
+        self.jobs: Dict[str, EvaluationJob] = {}
+        self.lock = threading.Lock()
+        self.job_ttl_seconds = job_ttl_seconds if job_ttl_seconds is not None else config.JOB_TTL_SECONDS
+        self.max_finished_jobs = max_finished_jobs if max_finished_jobs is not None else config.MAX_FINISHED_JOBS
+
+    def _evict_finished_jobs(self):
+        """self.lock을 잡은 상태에서 호출 - 만료되었거나 보관 개수를 넘은 종료 Job 제거"""
+        now = datetime.now()
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.is_expired(now, self.job_ttl_seconds)]:
+            del self.jobs[job_id]
+        finished = sorted(
+            (job for job in self.jobs.values() if not job.is_active()),
+            key=lambda job: job.finished_at or job.created_at
+        )
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.job_id]
+
+    def submit(self, evaluation_type: str, period_id: int, teams: Optional[List[int]] = None,
+               incremental: bool = False) -> Tuple[EvaluationJob, bool]:
+        """
+        Job을 등록하고 즉시 반환한다. 반환값: (job, 새로 생성 여부)
+        대상 팀이 겹치는 다른 Job이 실행 중이면 JobConflictError
+        """
+        requested_teams = normalize_teams(teams)
+        with self.lock:
+            self._evict_finished_jobs()
+            for job in self.jobs.values():
+                if (job.evaluation_type != evaluation_type or job.period_id != period_id
+                        or not job.is_active()):
+                    continue
+                active_teams = normalize_teams(job.teams)
+                if active_teams == requested_teams:
+                    return job, False
+                if teams_overlap(active_teams, requested_teams):
+                    raise JobConflictError(job)
+            job = EvaluationJob(evaluation_type, period_id, teams, incremental)
+            self.jobs[job.job_id] = job
+        self.executor.submit(self._run_job, job)
+        return job, True
+
+    def _run_job(self, job: EvaluationJob):
+        workflow, label = EVALUATION_WORKFLOWS[job.evaluation_type]
+        with job.lock:
+            if job.run_context.is_cancelled():
+                job.status = JOB_CANCELLED
+                job.message = f"{label}가 시작 전에 취소되었습니다."
+                job.finished_at = datetime.now()
+                return
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now()
+        logging.info(f"[Job {job.job_id}] {label} 시작 (period {job.period_id}, teams {job.teams})")
+        try:
+            # 증분 실행은 분기 평가 워크플로우만 지원
+            options = {"incremental": True} if job.incremental else {}
+            completed = workflow(period_id=job.period_id, specific_teams=job.teams, run_context=job.run_context, **options)
+            if job.run_context.is_cancelled():
+                status, message = JOB_CANCELLED, f"{label}가 취소되었습니다."
+            elif completed:
+                status, message = JOB_COMPLETED, f"{label}가 완료되었습니다."
+            else:
+                status, message = JOB_FAILED, f"{label}가 일부 팀의 단계 미완료로 중단되었습니다."
+        except Exception as e:
+            logging.error(f"[Job {job.job_id}] {label} 실패: {e}")
+            status, message = JOB_FAILED, f"{label} 실패: {e}"
+        job.set_status(status, message, finished=True)
+        logging.info(f"[Job {job.job_id}] 종료: {status}")
+
+    def get(self, job_id: str) -> Optional[EvaluationJob]:
+        with self.lock:
+            self._evict_finished_jobs()
+            return self.jobs.get(job_id)
+
+    def list_jobs(self, period_id: Optional[int] = None) -> List[EvaluationJob]:
+        with self.lock:
+            self._evict_finished_jobs()
+            jobs = list(self.jobs.values())
+        if period_id is not None:
+            jobs = [job for job in jobs if job.period_id == period_id]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[EvaluationJob]:
+        """
+        취소 요청. 실행 중인 모듈은 끝까지 수행하고, 이후 팀/모듈/Phase는 건너뛴다.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.request_cancel()
+        return job
 
 
 class EvaluationService:
-    def start_quarterly_evaluation(self, period_id: int, teams: Optional[List[int]] = None):
-        run_quarterly_workflow(period_id=period_id, specific_teams=teams)
-        return {"period_id": period_id, "code": 201, "message": "분기 평가가 완료되었습니다."}
+    def __init__(self, job_manager: Optional[EvaluationJobManager] = None):
+        self.job_manager = job_manager or EvaluationJobManager()
+
+    def _start_evaluation(self, evaluation_type: str, period_id: int, teams: Optional[List[int]] = None,
+                          incremental: bool = False):
+        _, label = EVALUATION_WORKFLOWS[evaluation_type]
+        job, created = self.job_manager.submit(evaluation_type, period_id, teams, incremental)
+        if created:
+            message = f"{label}가 시작되었습니다."
+        else:
+            message = f"이미 실행 중인 {label}가 있습니다."
+        return {"period_id": period_id, "code": 202, "message": message, "job_id": job.job_id}
+
+    def start_quarterly_evaluation(self, period_id: int, teams: Optional[List[int]] = None, incremental: bool = False):
+        return self._start_evaluation("quarterly", period_id, teams, incremental)
 
     def start_middle_evaluation(self, period_id: int, teams: Optional[List[int]] = None):
-        run_middle_workflow(period_id=period_id, specific_teams=teams)
-        return {"period_id": period_id, "code": 201, "message": "중간 평가가 완료되었습니다."}
+        return self._start_evaluation("middle", period_id, teams)
 
     def start_final_evaluation(self, period_id: int, teams: Optional[List[int]] = None):
-        run_final_workflow(period_id=period_id, specific_teams=teams)
-        return {"period_id": period_id, "code": 201, "message": "최종 평가가 완료되었습니다."}
+        return self._start_evaluation("final", period_id, teams)
+
+    def get_job_status(self, job_id: str) -> Optional[dict]:
+        """
+        Job 상태 + team_evaluations.status 기반 팀별/Phase별 진행 상황
+        """
+        job = self.job_manager.get(job_id)
+        if job is None:
+            return None
+        result = job.to_dict()
+        try:
+            team_statuses = fetch_team_statuses(job.period_id, job.teams)
+        except Exception as e:
+            logging.warning(f"[Job {job_id}] 팀 상태 조회 실패: {e}")
+            team_statuses = {}
+        phase_counts: Dict[str, int] = {}
+        for status in team_statuses.values():
+            phase_counts[status] = phase_counts.get(status, 0) + 1
+        result["team_statuses"] = team_statuses
+        result["phase_counts"] = phase_counts
+        return result
+
+    def list_jobs(self, period_id: Optional[int] = None) -> List[dict]:
+        return [job.to_dict() for job in self.job_manager.list_jobs(period_id)]
+
+    def cancel_job(self, job_id: str) -> Optional[dict]:
+        job = self.job_manager.cancel(job_id)
+        return job.to_dict() if job else None
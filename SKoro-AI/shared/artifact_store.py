@@ -0,0 +1,169 @@
+# artifact_store.py
+# 기간 단위 계산 결과(클러스터, 통계 등) 저장소 - 원자적 쓰기, 파일 잠금, 압축 바이너리 포맷, 메모리 LRU
+
+import os
+import pickle
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# 저장 포맷이 바뀌면 올려서 기존 파일을 무시
+FORMAT_VERSION = 1
+
+
+class ArtifactStore:
+    """
+    key별로 하나의 결과(artifact)를 source_version과 함께 저장한다.
+    - source_version(입력 데이터 지문)이 다르면 저장된 결과는 무효
+    - 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일만 봄)
+    - get_or_compute는 key별 파일 잠금으로 여러 프로세스/워커가 동시에 계산하지 않게 한다
+    - 최근 사용한 결과는 메모리 LRU에 보관
+    """
+
+    def __init__(self, base_dir: str, max_memory_items: int = 32):
+        self.base_dir = base_dir
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, Tuple[str, Any, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        os.makedirs(base_dir, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.base_dir, f"{key}.v{FORMAT_VERSION}.bin")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _file_lock(self, key: str):
+        with self._key_lock(key):
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.base_dir, f"{key}.lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ---------------- 메모리 LRU ----------------
+
+    def _remember(self, key: str, source_version: str, value: Any, metadata: Dict):
+        with self._lock:
+            self._memory[key] = (source_version, value, metadata)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[Tuple[str, Any, Dict]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    # ---------------- 파일 ----------------
+
+    def _read_file(self, key: str) -> Optional[Tuple[str, Any, Dict]]:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.loads(zlib.decompress(f.read()))
+            return payload["source_version"], payload["value"], payload["metadata"]
+        except Exception as e:
+            print(f"아티팩트 로드 실패 ({key}): {e}")
+            return None
+
+    def _write_file(self, key: str, source_version: str, value: Any, metadata: Dict):
+        payload = {"source_version": source_version, "value": value, "metadata": metadata}
+        data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{key}.", dir=self.base_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ---------------- 공개 API ----------------
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, Any, Dict]]:
+        """버전과 관계없이 저장된 (source_version, value, metadata)"""
+        entry = self._recall(key)
+        if entry is None:
+            entry = self._read_file(key)
+            if entry is not None:
+                self._remember(key, *entry)
+        return entry
+
+    def get(self, key: str, source_version: str) -> Optional[Any]:
+        """source_version이 일치하는 결과만 반환"""
+        entry = self.get_entry(key)
+        if entry is None or entry[0] != source_version:
+            return None
+        return entry[1]
+
+    def put(self, key: str, source_version: str, value: Any, metadata: Optional[Dict] = None):
+        metadata = {**(metadata or {}), "created_at": time.time(), "source_version": source_version}
+        with self._file_lock(key):
+            self._write_file(key, source_version, value, metadata)
+        self._remember(key, source_version, value, metadata)
+
+    def get_or_compute(self, key: str, source_version: str, compute: Callable[[], Any],
+                       force: bool = False, metadata: Optional[Dict] = None) -> Any:
+        """
+        유효한 결과가 있으면 반환, 없으면 잠금을 잡고 계산 후 저장.
+        잠금을 기다리는 동안 다른 워커가 계산을 끝냈다면 그 결과를 재사용한다.
+        """
+        if not force:
+            value = self.get(key, source_version)
+            if value is not None:
+                return value
+        with self._file_lock(key):
+            if not force:
+                entry = self._read_file(key)
+                if entry is not None and entry[0] == source_version:
+                    self._remember(key, *entry)
+                    return entry[1]
+            value = compute()
+            metadata = {**(metadata or {}), "created_at": time.time(), "source_version": source_version}
+            self._write_file(key, source_version, value, metadata)
+        self._remember(key, source_version, value, metadata)
+        return value
+
+    def invalidate(self, key: str):
+        with self._file_lock(key):
+            with self._lock:
+                self._memory.pop(key, None)
+            if os.path.exists(self.path(key)):
+                os.remove(self.path(key))
+
+
+_stores: Dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(base_dir: str) -> ArtifactStore:
+    """디렉터리별로 하나의 저장소 인스턴스를 공유 (메모리 LRU 공유)"""
+    base_dir = os.path.abspath(base_dir)
+    with _stores_lock:
+        if base_dir not in _stores:
+            _stores[base_dir] = ArtifactStore(base_dir)
+        return _stores[base_dir]
@@ -0,0 +1,138 @@
+# llm_cache.py
+# LLM 응답 영구 캐시 - (모델, temperature, 프롬프트, 스키마) 해시 기준 SQLite 저장소
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_path() -> str:
+    """프로젝트 루트의 data/cache/llm_cache.sqlite"""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../'))
+    cache_dir = os.path.join(project_root, 'data', 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, 'llm_cache.sqlite')
+
+
+def _serialize_messages(messages: Any) -> Any:
+    if isinstance(messages, str):
+        return messages
+    if isinstance(messages, (list, tuple)):
+        return [[getattr(message, "type", type(message).__name__), str(getattr(message, "content", message))]
+                for message in messages]
+    return str(messages)
+
+
+def make_cache_key(model: str, temperature: float, messages: Any, schema: Optional[str] = None) -> str:
+    payload = json.dumps(
+        [model, float(temperature), _serialize_messages(messages), schema or ""],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    내용 주소(content-addressed) 기반 LLM 응답 캐시.
+    - TTL이 지난 항목은 조회하지 않고, 항목 수가 max_entries를 넘으면 오래 사용하지 않은 항목부터 삭제
+    - 모듈별 hit/miss 카운터 제공 (stats)
+    여러 스레드에서 하나의 SQLite 커넥션을 lock으로 보호해 공유한다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: int = 30 * 24 * 3600, max_entries: int = 50000):
+        self.path = path or default_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._writes_since_evict = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    module TEXT,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_cache (last_accessed_at)")
+            self._conn.commit()
+
+    def _count(self, module: Optional[str], field: str):
+        stats = self._stats.setdefault(module or "default", {"hits": 0, "misses": 0, "writes": 0})
+        stats[field] += 1
+
+    def get(self, key: str, module: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self._count(module, "misses")
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_accessed_at = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self._count(module, "hits")
+            return row[0]
+
+    def set(self, key: str, content: str, model: str, module: Optional[str] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (cache_key, model, module, content, created_at, last_accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, module, content, now, now)
+            )
+            self._conn.commit()
+            self._count(module, "writes")
+            self._writes_since_evict += 1
+            # 매 쓰기마다 정리하지 않고 일정 횟수마다 한 번씩 정리
+            if self._writes_since_evict >= 100:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache ORDER BY last_accessed_at LIMIT ?
+                )
+            """, (count - self.max_entries,))
+        self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+            self._conn.commit()
+
+    def evict(self):
+        with self._lock:
+            self._evict_locked()
+
+    def clear(self, module: Optional[str] = None):
+        with self._lock:
+            if module:
+                self._conn.execute("DELETE FROM llm_cache WHERE module = ?", (module,))
+            else:
+                self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            modules = {module: dict(counts) for module, counts in self._stats.items()}
+        return {"path": self.path, "entries": entries, "modules": modules}
@@ -0,0 +1,250 @@
+# llm_gateway.py
+# 공용 LLM 호출 게이트웨이 - 모델별 요청/토큰 속도 제한, 429 재시도, 모듈별 동시 호출 상한
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
+
+from config.settings import LLMConfig
+from shared.llm_cache import LLMResponseCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    분당 허용량(capacity)을 초당 capacity/60씩 채우는 토큰 버킷.
+    acquire는 필요한 만큼 쌓일 때까지 대기한다. 한 번에 capacity보다 큰 양을 요청하면
+    capacity만큼만 기다린 뒤 나머지는 빚(음수 잔량)으로 남겨 다음 요청이 기다리게 한다.
+    """
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1.0):
+        needed = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.available >= needed:
+                    self.available -= amount
+                    return
+                wait = (needed - self.available) / self.rate
+            time.sleep(wait)
+
+    def adjust(self, delta: float):
+        """예상치로 차감한 양을 실제 사용량에 맞춰 보정 (delta > 0이면 추가 차감)"""
+        with self.lock:
+            self._refill()
+            self.available = min(self.capacity, self.available - delta)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    name = type(error).__name__
+    message = str(error)
+    return name in ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError") \
+        or "429" in message or "rate limit" in message.lower()
+
+
+def estimate_tokens(messages: Any) -> int:
+    """요청 토큰 수 추정 (한글 위주 텍스트 기준 약 2자당 1토큰)"""
+    if isinstance(messages, str):
+        text = messages
+    elif isinstance(messages, Sequence):
+        text = "".join(str(getattr(message, "content", message)) for message in messages)
+    else:
+        text = str(messages)
+    return max(1, len(text) // 2)
+
+
+class LLMGateway:
+    """
+    모든 모듈이 공유하는 LLM 호출 창구.
+    - (model, temperature)별 ChatOpenAI 클라이언트 재사용
+    - 모델별 RPM/TPM 토큰 버킷 (gpt-4o와 gpt-4o-mini는 별도 한도)
+    - 429 등 일시 오류는 지수 백오프 + jitter로 재시도
+    - 모듈별 동시 호출 상한 (팀 병렬 실행 시에도 전체 합계 기준)
+    - opt-in 모듈의 결정적(temperature 0) 호출은 SQLite 응답 캐시 재사용
+    """
+
+    def __init__(self, config: Optional[LLMConfig] = None):
+        self.config = config or LLMConfig()
+        self._clients: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._module_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._cache: Optional[LLMResponseCache] = None
+        self._lock = threading.Lock()
+
+    # ---------------- 내부 자원 ----------------
+
+    def get_client(self, model: str = "gpt-4o-mini", temperature: float = 0) -> ChatOpenAI:
+        key = (model, float(temperature))
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = ChatOpenAI(model=model, temperature=temperature)
+            return self._clients[key]
+
+    def _get_buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            if model not in self._buckets:
+                rpm, tpm = self.config.rate_limits.get(model, (self.config.DEFAULT_RPM, self.config.DEFAULT_TPM))
+                self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+            return self._buckets[model]
+
+    def get_module_limit(self, module: Optional[str]) -> int:
+        return self.config.module_concurrency.get(module or "", self.config.DEFAULT_CONCURRENCY)
+
+    def _get_module_semaphore(self, module: Optional[str]) -> threading.BoundedSemaphore:
+        name = module or "default"
+        with self._lock:
+            if name not in self._module_semaphores:
+                self._module_semaphores[name] = threading.BoundedSemaphore(self.get_module_limit(module))
+            return self._module_semaphores[name]
+
+    def get_cache(self) -> LLMResponseCache:
+        with self._lock:
+            if self._cache is None:
+                self._cache = LLMResponseCache(
+                    path=self.config.CACHE_PATH or None,
+                    ttl_seconds=self.config.CACHE_TTL_SECONDS,
+                    max_entries=self.config.CACHE_MAX_ENTRIES
+                )
+            return self._cache
+
+    def _use_cache(self, module: Optional[str], temperature: float, cache: Optional[bool]) -> bool:
+        if not self.config.CACHE_ENABLED or cache is False:
+            return False
+        if temperature > self.config.CACHE_MAX_TEMPERATURE:
+            return False
+        return cache is True or (module or "") in self.config.cache_modules
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self._cache is None:
+            return {"entries": 0, "modules": {}}
+        return self._cache.stats()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """attempt(0부터)에 대한 full-jitter 지수 백오프 대기 시간"""
+        ceiling = min(self.config.BACKOFF_MAX, self.config.BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    # ---------------- 호출 API ----------------
+
+    def invoke(self, messages: Any, model: str = "gpt-4o-mini", temperature: float = 0,
+               module: Optional[str] = None, cache: Optional[bool] = None, schema: Optional[str] = None):
+        """
+        동기 호출. messages는 문자열 또는 LangChain 메시지 리스트.
+        속도 제한 대기 → 호출 → 429 등 일시 오류는 재시도, 그 외 예외는 그대로 전달한다.
+        cache: None이면 LLM_CACHE_MODULES 설정을 따름 / True·False로 호출별 강제
+        schema: 응답 형식(검증 함수 등)이 바뀌면 캐시를 분리하기 위한 구분자
+        """
+        cache_key = None
+        if self._use_cache(module, temperature, cache):
+            cache_key = make_cache_key(model, temperature, messages, schema)
+            try:
+                cached = self.get_cache().get(cache_key, module)
+            except Exception as e:
+                logger.warning(f"[LLM:{module or 'default'}] 캐시 조회 실패: {e}")
+                cached, cache_key = None, None
+            if cached is not None:
+                return AIMessage(content=cached)
+
+        response = self._invoke_with_limits(messages, model, temperature, module)
+
+        if cache_key is not None and isinstance(response.content, str):
+            try:
+                self.get_cache().set(cache_key, response.content, model, module)
+            except Exception as e:
+                logger.warning(f"[LLM:{module or 'default'}] 캐시 저장 실패: {e}")
+        return response
+
+    def discard_cached(self, messages: Any, model: str = "gpt-4o-mini", temperature: float = 0,
+                       schema: Optional[str] = None):
+        """검증에 실패한 응답을 캐시에서 제거 (재시도 시 새로 호출되도록)"""
+        if self._cache is not None:
+            self._cache.delete(make_cache_key(model, temperature, messages, schema))
+
+    def _invoke_with_limits(self, messages: Any, model: str, temperature: float, module: Optional[str]):
+        client = self.get_client(model, temperature)
+        request_bucket, token_bucket = self._get_buckets(model)
+        estimated = estimate_tokens(messages) + self.config.EXPECTED_OUTPUT_TOKENS
+
+        with self._get_module_semaphore(module):
+            for attempt in range(self.config.MAX_RETRIES):
+                request_bucket.acquire(1)
+                token_bucket.acquire(estimated)
+                try:
+                    response = client.invoke(messages)
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == self.config.MAX_RETRIES - 1:
+                        raise
+                    delay = self.backoff_delay(attempt)
+                    logger.warning(f"[LLM:{module or 'default'}] {model} 일시 오류, {delay:.1f}초 후 재시도 ({attempt + 1}): {e}")
+                    time.sleep(delay)
+                    continue
+
+                usage = getattr(response, "usage_metadata", None) or {}
+                if usage.get("total_tokens"):
+                    token_bucket.adjust(usage["total_tokens"] - estimated)
+                return response
+
+    def map(self, func: Callable, items: Sequence, module: Optional[str] = None,
+            max_workers: Optional[int] = None) -> List[Any]:
+        """
+        items의 각 원소로 func를 동시에 실행하고 입력 순서대로 결과를 반환 (스레드 배치 API).
+        func 안에서 invoke(module=...)를 호출하면 모듈 상한과 속도 제한이 그대로 적용된다.
+        """
+        items = list(items)
+        if not items:
+            return []
+        workers = min(len(items), max_workers or self.get_module_limit(module))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"llm-{module or 'default'}") as pool:
+            return list(pool.map(func, items))
+
+    def batch(self, messages_list: Sequence[Any], model: str = "gpt-4o-mini", temperature: float = 0,
+              module: Optional[str] = None) -> List[Any]:
+        """여러 요청을 동시에 호출하고 입력 순서대로 응답을 반환"""
+        return self.map(lambda messages: self.invoke(messages, model, temperature, module), messages_list, module)
+
+    async def ainvoke(self, messages: Any, model: str = "gpt-4o-mini", temperature: float = 0,
+                      module: Optional[str] = None):
+        """비동기 호출 - 속도 제한/재시도는 동기 호출과 같은 버킷을 공유"""
+        return await asyncio.to_thread(self.invoke, messages, model, temperature, module)
+
+    async def abatch(self, messages_list: Sequence[Any], model: str = "gpt-4o-mini", temperature: float = 0,
+                     module: Optional[str] = None) -> List[Any]:
+        return await asyncio.gather(*[
+            self.ainvoke(messages, model, temperature, module) for messages in messages_list
+        ])
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """프로세스 전역 게이트웨이 반환 (없으면 생성)"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
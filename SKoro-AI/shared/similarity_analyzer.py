@@ -15,7 +15,7 @@ from sklearn.metrics import silhouette_score
 from sklearn.metrics.pairwise import cosine_similarity
 
 # DB 연결
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import sys
 import os
 
@@ -25,10 +25,11 @@ project_root = os.path.abspath(os.path.join(current_dir, '../'))
 sys.path.append(project_root)
 
 from config.settings import DatabaseConfig
+from db import get_engine
 
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 
 class SimilarityDB:
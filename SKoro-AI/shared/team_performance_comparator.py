@@ -3,11 +3,13 @@
 
 import pandas as pd
 import numpy as np
+import hashlib
 import json
 import re
 import statistics
+import threading
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, NamedTuple, Tuple, Optional
 
 # 머신러닝 라이브러리
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -16,7 +18,7 @@ from sklearn.metrics import silhouette_score
 from sklearn.metrics.pairwise import cosine_similarity
 
 # DB 연결
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import sys
 import os
 
@@ -26,6 +28,8 @@ project_root = os.path.abspath(os.path.join(current_dir, '../'))
 sys.path.append(project_root)
 
 from config.settings import DatabaseConfig
+from db import get_engine
+from shared.artifact_store import get_artifact_store
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,7 +37,7 @@ load_dotenv()
 # DB 설정
 db_config = DatabaseConfig()
 DATABASE_URL = db_config.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = get_engine()
 
 
 class TeamPerformanceDB:
@@ -84,6 +88,45 @@ class TeamPerformanceDB:
                     "overall_rate": result.overall_rate or 0
                 }
             return None
+    
+    def fetch_period_team_performances(self, period_id: int) -> Dict[int, Dict]:
+        """해당 분기 전체 팀 성과 데이터 일괄 조회 {team_id: 성과}"""
+        with self.engine.connect() as connection:
+            query = text("""
+                SELECT 
+                    te.team_id,
+                    te.average_achievement_rate as overall_rate,
+                    t.team_name
+                FROM team_evaluations te
+                JOIN teams t ON te.team_id = t.team_id
+                WHERE te.period_id = :period_id
+                ORDER BY te.team_id
+            """)
+            
+            results = connection.execute(query, {"period_id": period_id}).fetchall()
+            return {
+                row.team_id: {
+                    "team_id": row.team_id,
+                    "team_name": row.team_name,
+                    "overall_rate": row.overall_rate or 0
+                }
+                for row in results
+            }
+    
+    def fetch_task_summaries_signature(self, period_id: int) -> Dict:
+        """해당 분기 task_summaries 변경 감지용 요약 (행 수 + 내용 체크섬)"""
+        with self.engine.connect() as connection:
+            query = text("""
+                SELECT 
+                    COUNT(*) AS row_count,
+                    COALESCE(SUM(CRC32(CONCAT_WS('|', task_summary_id, task_id, task_summary, task_performance,
+                                                 ai_achievement_rate, ai_contribution_score))), 0) AS checksum
+                FROM task_summaries
+                WHERE period_id = :period_id
+            """)
+            
+            result = connection.execute(query, {"period_id": period_id}).fetchone()
+            return {"row_count": result.row_count, "checksum": int(result.checksum)}
 
 
 class TextPreprocessor:
@@ -130,10 +173,11 @@ class TeamClusteringAnalyzer:
         self.cluster_labels = None
         self.similarity_threshold = 0.2
         
-    def load_team_data(self):
-        """팀 KPI 데이터 로드 및 전처리"""
+    def load_team_data(self, raw_data: Optional[List[Dict]] = None):
+        """팀 KPI 데이터 로드 및 전처리 (raw_data가 주어지면 DB 조회 생략)"""
         print("팀 KPI 데이터 로드 중...")
-        raw_data = self.db.fetch_all_team_kpis()
+        if raw_data is None:
+            raw_data = self.db.fetch_all_team_kpis()
         
         if not raw_data:
             raise ValueError("팀 KPI 데이터가 없습니다.")
@@ -250,83 +294,98 @@ class TeamClusteringAnalyzer:
         return clusters
 
 
+def _fingerprint(data) -> str:
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SourceVersions(NamedTuple):
+    """클러스터/통계 입력 지문 - 기간 실행당 한 번 계산해 팀별 호출에 넘긴다 (조회 3회 + 전사 KPI 스캔)"""
+    raw_kpis: List[Dict]
+    clusters_version: str
+    stats_version: str
+
+
 class ClusterPerformanceStatsManager:
-    """클러스터 성과 통계 관리 클래스"""
+    """
+    클러스터 성과 통계 관리 클래스.
+    클러스터(팀 KPI 텍스트 기준)와 분기별 통계(팀 달성률 + task_summaries 기준)를 각각 입력 지문과 함께
+    ArtifactStore에 저장하고, 입력이 바뀌었을 때만 다시 계산한다.
+    """
     
     def __init__(self, cache_dir="./data/cache"):
         self.cache_dir = cache_dir
         self.db = TeamPerformanceDB()
-        os.makedirs(cache_dir, exist_ok=True)
+        self.store = get_artifact_store(os.path.join(cache_dir, "artifacts"))
+    
+    def get_stats_key(self, period_id: int) -> str:
+        return f"cluster_performance_Q{period_id}_2024"
     
     def get_cache_file_path(self, period_id: int) -> str:
         """캐시 파일 경로 생성"""
-        return os.path.join(self.cache_dir, f"cluster_performance_Q{period_id}_2024.json")
+        return self.store.path(self.get_stats_key(period_id))
+    
+    def get_source_versions(self, period_id: int) -> SourceVersions:
+        """(팀 KPI 원본, 클러스터 입력 지문, 통계 입력 지문) - 호출할 때마다 DB를 조회하므로 결과를 재사용할 것"""
+        raw_kpis = self.db.fetch_all_team_kpis()
+        clusters_version = _fingerprint(raw_kpis)
+        stats_version = _fingerprint([
+            clusters_version,
+            sorted((team_id, perf["overall_rate"]) for team_id, perf in self.db.fetch_period_team_performances(period_id).items()),
+            self.db.fetch_task_summaries_signature(period_id)
+        ])
+        return SourceVersions(raw_kpis, clusters_version, stats_version)
     
-    def check_stats_exists(self, period_id: int) -> bool:
-        """클러스터 통계 파일 존재 확인"""
-        return os.path.exists(self.get_cache_file_path(period_id))
+    def get_team_clusters(self, raw_kpis: List[Dict], clusters_version: str, force_recalculate: bool = False) -> Dict[int, List[int]]:
+        """팀 KPI 텍스트가 바뀌었을 때만 클러스터링 수행 {cluster_id: [team_id]}"""
+        def compute():
+            clustering_analyzer = TeamClusteringAnalyzer()
+            clustering_analyzer.load_team_data(raw_kpis)
+            clustering_analyzer.perform_clustering()
+            return clustering_analyzer.get_clusters_mapping()
+        
+        return self.store.get_or_compute("team_clusters_2024", clusters_version, compute, force_recalculate)
+    
+    def check_stats_exists(self, period_id: int, source_versions: Optional[SourceVersions] = None) -> bool:
+        """현재 데이터 기준으로 유효한 클러스터 통계가 있는지 확인"""
+        source_versions = source_versions or self.get_source_versions(period_id)
+        return self.store.get(self.get_stats_key(period_id), source_versions.stats_version) is not None
     
     def load_cluster_stats(self, period_id: int) -> Dict:
-        """클러스터 성과 통계 로드"""
-        cache_file = self.get_cache_file_path(period_id)
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get("cluster_stats", {})
-            except Exception as e:
-                print(f"캐시 파일 로드 실패: {e}")
-                return {}
-        return {}
+        """저장된 클러스터 성과 통계 로드 (버전 확인 없음)"""
+        entry = self.store.get_entry(self.get_stats_key(period_id))
+        return entry[1] if entry else {}
     
-    def save_cluster_stats(self, cluster_stats: Dict, period_id: int):
+    def save_cluster_stats(self, cluster_stats: Dict, period_id: int, source_version: str = ""):
         """클러스터 성과 통계 저장"""
-        cache_file = self.get_cache_file_path(period_id)
-        stats_with_metadata = {
-            "cluster_stats": cluster_stats,
-            "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "period_id": period_id,
-                "total_clusters": len(cluster_stats),
-                "total_teams": sum(len(stats["teams"]) for stats in cluster_stats.values())
-            }
-        }
-        
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(stats_with_metadata, f, ensure_ascii=False, indent=2)
-        
-        print(f"클러스터 통계 저장 완료: {cache_file}")
+        self.store.put(self.get_stats_key(period_id), source_version, cluster_stats, {"period_id": period_id})
+        print(f"클러스터 통계 저장 완료: {self.get_cache_file_path(period_id)}")
     
-    def calculate_cluster_performance_stats(self, period_id: int, force_recalculate: bool = False) -> Dict:
-        """클러스터별 성과 통계 계산"""
-        
-        # 기존 캐시 확인
-        if not force_recalculate and self.check_stats_exists(period_id):
-            print(f"기존 클러스터 통계 사용 (Q{period_id})")
-            return self.load_cluster_stats(period_id)
-        
-        print(f"클러스터별 성과 통계 계산 시작 (Q{period_id})...")
-        
-        # 1. 팀 클러스터링 수행
-        clustering_analyzer = TeamClusteringAnalyzer()
-        clustering_analyzer.load_team_data()
-        clustering_analyzer.perform_clustering()
-        
-        # 2. 클러스터별로 그룹화
-        clusters = clustering_analyzer.get_clusters_mapping()
-        
-        # 3. 각 클러스터별 성과 통계 계산
+    def calculate_cluster_performance_stats(self, period_id: int, force_recalculate: bool = False,
+                                            source_versions: Optional[SourceVersions] = None) -> Dict:
+        """클러스터별 성과 통계 계산 (입력이 그대로면 저장된 결과 재사용, 동시 요청은 한 번만 계산)"""
+        raw_kpis, clusters_version, stats_version = source_versions or self.get_source_versions(period_id)
+        
+        def compute():
+            print(f"클러스터별 성과 통계 계산 시작 (Q{period_id})...")
+            clusters = self.get_team_clusters(raw_kpis, clusters_version, force_recalculate)
+            cluster_stats = self._calculate_stats(clusters, period_id)
+            print(f"클러스터 통계 계산 완료: {len(cluster_stats)}개 클러스터")
+            return cluster_stats
+        
+        return self.store.get_or_compute(
+            self.get_stats_key(period_id), stats_version, compute, force_recalculate, {"period_id": period_id}
+        )
+    
+    def _calculate_stats(self, clusters: Dict[int, List[int]], period_id: int) -> Dict:
+        """각 클러스터별 성과 통계 계산"""
+        performances = self.db.fetch_period_team_performances(period_id)
         cluster_stats = {}
         
         for cluster_id, team_ids in clusters.items():
             print(f"클러스터 {cluster_id} 처리 중... ({len(team_ids)}개 팀)")
             
-            cluster_team_performances = []
-            
-            for team_id in team_ids:
-                team_perf = self.db.fetch_team_performance_data(team_id, period_id)
-                if team_perf:
-                    cluster_team_performances.append(team_perf)
+            cluster_team_performances = [performances[team_id] for team_id in team_ids if team_id in performances]
             
             if not cluster_team_performances:
                 print(f"클러스터 {cluster_id}: 성과 데이터 없음")
@@ -349,15 +408,12 @@ class ClusterPerformanceStatsManager:
             print(f"  클러스터 {cluster_id}: 평균 {cluster_stats[str(cluster_id)]['overall_stats']['avg_rate']}%, "
                   f"표준편차 {cluster_stats[str(cluster_id)]['overall_stats']['std_rate']}%")
         
-        # 4. 결과 저장
-        self.save_cluster_stats(cluster_stats, period_id)
-        print(f"클러스터 통계 계산 완료: {len(cluster_stats)}개 클러스터")
-        
         return cluster_stats
     
-    def get_team_cluster_info(self, team_id: int, period_id: int) -> Optional[Dict]:
+    def get_team_cluster_info(self, team_id: int, period_id: int, cluster_stats: Optional[Dict] = None) -> Optional[Dict]:
         """특정 팀의 클러스터 정보 조회"""
-        cluster_stats = self.load_cluster_stats(period_id)
+        if cluster_stats is None:
+            cluster_stats = self.load_cluster_stats(period_id)
         
         for cluster_id, stats in cluster_stats.items():
             if team_id in stats["teams"]:
@@ -390,16 +446,19 @@ class TeamPerformanceComparator:
         self.stats_manager = ClusterPerformanceStatsManager(cache_dir)
         self.clustering_analyzer = TeamClusteringAnalyzer()
     
-    def analyze_team_cluster_performance(self, team_id: int, period_id: int, force_recalculate: bool = False) -> Dict:
-        """팀 클러스터 성과 분석 실행"""
+    def analyze_team_cluster_performance(self, team_id: int, period_id: int, force_recalculate: bool = False,
+                                         source_versions: Optional[SourceVersions] = None) -> Dict:
+        """팀 클러스터 성과 분석 실행 (source_versions: 기간 단위로 미리 계산한 입력 지문)"""
         print(f"=== 팀 성과 비교 분석 시작: 팀 {team_id} (Q{period_id}) ===")
         
         try:
             # 1. 클러스터 통계 계산/로드
-            cluster_stats = self.stats_manager.calculate_cluster_performance_stats(period_id, force_recalculate)
+            cluster_stats = self.stats_manager.calculate_cluster_performance_stats(
+                period_id, force_recalculate, source_versions
+            )
             
             # 2. 우리팀 클러스터 정보 조회
-            team_cluster_info = self.stats_manager.get_team_cluster_info(team_id, period_id)
+            team_cluster_info = self.stats_manager.get_team_cluster_info(team_id, period_id, cluster_stats)
             
             if not team_cluster_info:
                 return {
@@ -426,38 +485,51 @@ class TeamPerformanceComparator:
                 "team_cluster_info": None
             }
     
-    def get_cluster_status(self, period_id: int) -> Dict:
-        """클러스터 상태 조회"""
-        cache_file = self.stats_manager.get_cache_file_path(period_id)
+    def get_source_versions(self, period_id: int) -> SourceVersions:
+        return self.stats_manager.get_source_versions(period_id)
+    
+    def get_cluster_status(self, period_id: int, source_versions: Optional[SourceVersions] = None) -> Dict:
+        """클러스터 상태 조회 (source_versions가 없으면 입력 지문을 새로 계산)"""
+        entry = self.stats_manager.store.get_entry(self.stats_manager.get_stats_key(period_id))
         
         status = {
-            "cache_file_exists": os.path.exists(cache_file),
+            "cache_file_exists": entry is not None,
             "period_id": period_id,
-            "cache_file_path": cache_file
+            "cache_file_path": self.stats_manager.get_cache_file_path(period_id)
         }
         
-        if status["cache_file_exists"]:
+        if entry is not None:
+            source_version, cluster_stats, metadata = entry
+            status.update({
+                "total_clusters": len(cluster_stats),
+                "total_teams": sum(len(stats["teams"]) for stats in cluster_stats.values()),
+                "created_at": datetime.fromtimestamp(metadata.get("created_at", 0)).isoformat(),
+                "cluster_distribution": {
+                    cluster_id: len(stats["teams"])
+                    for cluster_id, stats in cluster_stats.items()
+                }
+            })
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    metadata = data.get("metadata", {})
-                    cluster_stats = data.get("cluster_stats", {})
-                    
-                    status.update({
-                        "total_clusters": metadata.get("total_clusters", 0),
-                        "total_teams": metadata.get("total_teams", 0),
-                        "created_at": metadata.get("created_at", "Unknown"),
-                        "cluster_distribution": {
-                            cluster_id: len(stats["teams"])
-                            for cluster_id, stats in cluster_stats.items()
-                        }
-                    })
+                source_versions = source_versions or self.stats_manager.get_source_versions(period_id)
+                status["is_current"] = source_version == source_versions.stats_version
             except Exception as e:
-                status["error"] = f"캐시 파일 읽기 실패: {e}"
+                status["error"] = f"데이터 버전 확인 실패: {e}"
         
         return status
 
 
+_comparators: Dict[str, TeamPerformanceComparator] = {}
+_comparators_lock = threading.Lock()
+
+
+def get_team_performance_comparator(cache_dir="./data/cache") -> TeamPerformanceComparator:
+    """프로세스 공유 비교기 (팀마다 새로 만들지 않고 저장소/메모리 캐시를 공유)"""
+    with _comparators_lock:
+        if cache_dir not in _comparators:
+            _comparators[cache_dir] = TeamPerformanceComparator(cache_dir)
+        return _comparators[cache_dir]
+
+
 # 모듈 실행 시 기본 설정
 if __name__ == "__main__":
     print("team_performance_comparator.py는 모듈로 사용됩니다.")
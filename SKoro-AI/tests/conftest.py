@@ -0,0 +1,42 @@
+# =============================================================================
+# conftest.py - 테스트 공통 설정 / fixture
+# =============================================================================
+# config.settings와 db는 import 시점에 환경 변수를 읽고 엔진을 만든다.
+# 엔진은 실제로 연결할 때까지 DB에 접속하지 않으므로 기본값만 채워 두고,
+# DB가 필요한 테스트는 sqlite_engine fixture(인메모리 SQLite)로 바꿔 끼운다.
+
+import os
+
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def sqlite_engine():
+    """스레드 간에 같은 연결을 공유하는 인메모리 SQLite 엔진"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def use_engine(monkeypatch):
+    """db 모듈의 공유 엔진(get_engine 포함)과 지정한 db_utils 모듈의 engine을 테스트 엔진으로 교체"""
+    import db
+
+    def apply(engine, *modules):
+        monkeypatch.setattr(db, "engine", engine)
+        monkeypatch.setitem(db._engines, "primary", engine)
+        for module in modules:
+            monkeypatch.setattr(module, "engine", engine)
+        return engine
+
+    return apply
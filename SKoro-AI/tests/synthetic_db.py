@@ -0,0 +1,285 @@
+# =============================================================================
+# synthetic_db.py - 테스트/벤치마크용 SQLite 스키마와 합성 데이터
+# =============================================================================
+# 운영 스키마(MariaDB)는 백엔드가 관리하므로, 모듈 쿼리가 읽고 쓰는 컬럼만 SQLite로 재현한다.
+
+import json
+import random
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+SCHEMA = [
+    """CREATE TABLE headquarters (
+        headquarter_id INTEGER PRIMARY KEY,
+        headquarter_name TEXT
+    )""",
+    """CREATE TABLE teams (
+        team_id INTEGER PRIMARY KEY,
+        team_name TEXT,
+        headquarter_id INTEGER
+    )""",
+    """CREATE TABLE employees (
+        emp_no TEXT PRIMARY KEY,
+        emp_name TEXT,
+        cl INTEGER,
+        position TEXT,
+        role TEXT,
+        team_id INTEGER
+    )""",
+    """CREATE TABLE periods (
+        period_id INTEGER PRIMARY KEY,
+        year INTEGER,
+        is_final INTEGER DEFAULT 0
+    )""",
+    """CREATE TABLE team_kpis (
+        team_kpi_id INTEGER PRIMARY KEY,
+        team_id INTEGER,
+        year INTEGER,
+        kpi_name TEXT,
+        kpi_description TEXT,
+        weight REAL,
+        evaluation_type TEXT,
+        ai_kpi_progress_rate REAL,
+        ai_kpi_analysis_comment TEXT
+    )""",
+    """CREATE TABLE grades (
+        grade_id INTEGER PRIMARY KEY,
+        team_kpi_id INTEGER,
+        task_id INTEGER,
+        grade_rule TEXT,
+        grade_s TEXT, grade_a TEXT, grade_b TEXT, grade_c TEXT, grade_d TEXT
+    )""",
+    """CREATE TABLE tasks (
+        task_id INTEGER PRIMARY KEY,
+        task_name TEXT,
+        task_detail TEXT,
+        target_level TEXT,
+        weight REAL,
+        emp_no TEXT,
+        team_kpi_id INTEGER,
+        start_date TEXT,
+        end_date TEXT
+    )""",
+    """CREATE TABLE task_summaries (
+        task_summary_id INTEGER PRIMARY KEY,
+        task_id INTEGER,
+        period_id INTEGER,
+        task_summary TEXT,
+        task_performance TEXT,
+        ai_contribution_score REAL,
+        ai_achievement_rate REAL,
+        ai_assessed_grade TEXT,
+        ai_analysis_comment_task TEXT
+    )""",
+    """CREATE TABLE team_evaluations (
+        team_evaluation_id INTEGER PRIMARY KEY,
+        team_id INTEGER,
+        period_id INTEGER,
+        status TEXT,
+        ai_collaboration_matrix TEXT,
+        report TEXT
+    )""",
+    """CREATE TABLE temp_evaluations (
+        temp_evaluation_id INTEGER PRIMARY KEY,
+        emp_no TEXT,
+        team_evaluation_id INTEGER,
+        score REAL,
+        raw_score TEXT,
+        manager_score REAL,
+        reason TEXT,
+        ai_reason TEXT,
+        comment TEXT
+    )""",
+    """CREATE TABLE final_evaluation_reports (
+        final_evaluation_report_id INTEGER PRIMARY KEY,
+        emp_no TEXT,
+        team_evaluation_id INTEGER,
+        score REAL,
+        ranking INTEGER,
+        cl_reason TEXT,
+        ai_annual_achievement_rate REAL,
+        ai_peer_talk_summary TEXT,
+        report TEXT
+    )""",
+    """CREATE TABLE feedback_reports (
+        feedback_report_id INTEGER PRIMARY KEY,
+        emp_no TEXT,
+        team_evaluation_id INTEGER,
+        ai_peer_talk_summary TEXT,
+        report TEXT
+    )""",
+    """CREATE TABLE peer_evaluations (
+        peer_evaluation_id INTEGER PRIMARY KEY,
+        team_evaluation_id INTEGER,
+        emp_no TEXT,
+        target_emp_no TEXT,
+        weight REAL,
+        joint_task TEXT,
+        is_completed INTEGER
+    )""",
+    """CREATE TABLE keywords (
+        keyword_id INTEGER PRIMARY KEY,
+        keyword_name TEXT
+    )""",
+    """CREATE TABLE peer_evaluation_keywords (
+        peer_evaluation_keyword_id INTEGER PRIMARY KEY,
+        peer_evaluation_id INTEGER,
+        keyword_id INTEGER,
+        custom_keyword TEXT
+    )""",
+    """CREATE TABLE prompts (
+        prompt_id INTEGER PRIMARY KEY,
+        prompt TEXT
+    )""",
+]
+
+
+def create_schema(engine: Engine):
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+
+
+def insert_rows(engine: Engine, table: str, rows: List[Dict]):
+    if not rows:
+        return
+    columns = list(rows[0])
+    with engine.begin() as connection:
+        connection.execute(
+            text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+            rows
+        )
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[List[str]]:
+    """블록 안에서 실행된 SQL 문장을 기록 (len()이 쿼리 수)"""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+# =============================================================================
+# 모듈 2 - 팀 하나 (팀원 / KPI / Task / 분기별 task_summaries)
+# =============================================================================
+
+def seed_module2_team(engine: Engine, team_id: int = 1, members: int = 20, kpis: int = 5,
+                      tasks_per_member: int = 3, period_id: int = 2, year: int = 2024, seed: int = 0,
+                      kpi_specific_grade: bool = False) -> Dict:
+    """팀원 members명, 팀원마다 tasks_per_member개 Task, 1~period_id 분기 요약이 있는 팀. 반환: task_ids / kpi_ids"""
+    rng = random.Random(seed)
+    insert_rows(engine, "periods", [{"period_id": p, "year": year} for p in range(1, period_id + 1)])
+    insert_rows(engine, "teams", [{"team_id": team_id, "team_name": f"팀{team_id}", "headquarter_id": 1}])
+    emp_nos = [f"E{team_id:02d}{i:03d}" for i in range(members)]
+    insert_rows(engine, "employees", [
+        {"emp_no": emp_no, "emp_name": f"직원{emp_no}", "cl": 1 + i % 3, "position": "사원",
+         "role": "MANAGER" if i == 0 else "MEMBER", "team_id": team_id}
+        for i, emp_no in enumerate(emp_nos)
+    ])
+    kpi_ids = [team_id * 100 + k for k in range(kpis)]
+    insert_rows(engine, "team_kpis", [
+        {"team_kpi_id": kpi_id, "team_id": team_id, "year": year, "kpi_name": f"KPI {kpi_id}",
+         "kpi_description": f"KPI {kpi_id} 설명", "weight": 20.0,
+         "evaluation_type": "qualitative" if k % 2 else None,
+         "ai_kpi_progress_rate": None, "ai_kpi_analysis_comment": None}
+        for k, kpi_id in enumerate(kpi_ids)
+    ])
+    grades = [{"grade_id": 1, "team_kpi_id": None, "grade_rule": "공통 기준", "grade_s": "S", "grade_a": "A",
+               "grade_b": "B", "grade_c": "C", "grade_d": "D"}]
+    if kpi_specific_grade:
+        grades.append({"grade_id": 2, "team_kpi_id": kpi_ids[0], "grade_rule": "KPI 전용 기준", "grade_s": "S+",
+                       "grade_a": "A+", "grade_b": "B+", "grade_c": "C+", "grade_d": "D+"})
+    insert_rows(engine, "grades", grades)
+    tasks, summaries = [], []
+    for i, emp_no in enumerate(emp_nos):
+        for t in range(tasks_per_member):
+            task_id = team_id * 10000 + i * 10 + t
+            tasks.append({"task_id": task_id, "task_name": f"Task {task_id}", "task_detail": "상세",
+                          "target_level": "목표", "weight": 10.0 + t, "emp_no": emp_no,
+                          "team_kpi_id": kpi_ids[(i + t) % kpis]})
+            for p in range(1, period_id + 1):
+                summaries.append({
+                    "task_summary_id": task_id * 10 + p, "task_id": task_id, "period_id": p,
+                    "task_summary": f"{p}분기 {task_id} 요약", "task_performance": f"{p}분기 성과",
+                    "ai_contribution_score": round(rng.uniform(10, 90), 1),
+                    "ai_achievement_rate": round(rng.uniform(50, 120), 1),
+                    "ai_assessed_grade": rng.choice("SABCD"), "ai_analysis_comment_task": None,
+                })
+    insert_rows(engine, "tasks", tasks)
+    insert_rows(engine, "task_summaries", summaries)
+    return {"task_ids": [task["task_id"] for task in tasks], "kpi_ids": kpi_ids, "emp_nos": emp_nos}
+
+
+# =============================================================================
+# 모듈 7/9 - 본부 / 팀 평가 / 임시·최종 평가 / 동료평가 요약
+# =============================================================================
+
+def seed_headquarter(engine: Engine, headquarter_id: int = 1, teams: int = 2, members_per_team: int = 6,
+                     period_id: int = 4, tasks_per_member: int = 2, seed: int = 0,
+                     first_team_id: int = None) -> Dict:
+    """본부 하나에 teams개 팀, 팀마다 members_per_team명 (CL 1~3 섞임). 반환: emp_nos / team_evaluation_ids"""
+    rng = random.Random(seed)
+    first_team_id = first_team_id or headquarter_id * 10
+    insert_rows(engine, "headquarters", [{"headquarter_id": headquarter_id, "headquarter_name": f"본부{headquarter_id}"}])
+    team_ids = [first_team_id + t for t in range(teams)]
+    insert_rows(engine, "teams", [
+        {"team_id": team_id, "team_name": f"팀{team_id}", "headquarter_id": headquarter_id} for team_id in team_ids
+    ])
+    insert_rows(engine, "team_evaluations", [
+        {"team_evaluation_id": team_id * 10 + period_id, "team_id": team_id, "period_id": period_id,
+         "status": "COMPLETED"}
+        for team_id in team_ids
+    ])
+    employees, temp, final, feedback, kpis, tasks, summaries = [], [], [], [], [], [], []
+    for team_id in team_ids:
+        team_evaluation_id = team_id * 10 + period_id
+        kpis.append({"team_kpi_id": team_id, "team_id": team_id, "year": 2024, "kpi_name": f"KPI {team_id}",
+                     "kpi_description": "설명", "weight": 100.0, "evaluation_type": None,
+                     "ai_kpi_progress_rate": None, "ai_kpi_analysis_comment": None})
+        for i in range(members_per_team):
+            emp_no = f"H{headquarter_id}T{team_id}M{i:02d}"
+            employees.append({"emp_no": emp_no, "emp_name": f"직원{emp_no}", "cl": 1 + i % 3,
+                              "position": "사원", "role": "MEMBER", "team_id": team_id})
+            baseline = round(rng.uniform(2.5, 4.5), 2)
+            manager = baseline if i % 4 == 0 else round(baseline + rng.choice([-0.3, 0.2, 0.4]), 2)
+            temp.append({"emp_no": emp_no, "team_evaluation_id": team_evaluation_id, "score": baseline,
+                         "raw_score": json.dumps({"raw_hybrid_score": baseline}), "manager_score": manager,
+                         "reason": "팀장 사유" if manager != baseline else None,
+                         "ai_reason": None, "comment": None})
+            peer = json.dumps({"strengths": f"{emp_no} 강점", "concerns": "보완점",
+                               "collaboration_observations": "협업 관찰"}, ensure_ascii=False)
+            final.append({"emp_no": emp_no, "team_evaluation_id": team_evaluation_id, "score": manager,
+                          "ranking": None, "cl_reason": None,
+                          "ai_annual_achievement_rate": round(rng.uniform(60, 120), 1),
+                          "ai_peer_talk_summary": peer if i % 5 else None})
+            feedback.append({"emp_no": emp_no, "team_evaluation_id": team_evaluation_id,
+                             "ai_peer_talk_summary": peer})
+            for t in range(tasks_per_member):
+                task_id = len(tasks) + 1 + headquarter_id * 100000
+                tasks.append({"task_id": task_id, "task_name": f"Task {task_id}", "task_detail": "상세",
+                              "target_level": "목표", "weight": 10.0 * (t + 1), "emp_no": emp_no,
+                              "team_kpi_id": team_id})
+                summaries.append({"task_summary_id": task_id, "task_id": task_id, "period_id": period_id,
+                                  "task_summary": "요약", "task_performance": "성과",
+                                  "ai_contribution_score": round(rng.uniform(10, 90), 1),
+                                  "ai_achievement_rate": round(rng.uniform(50, 120), 1),
+                                  "ai_assessed_grade": rng.choice("SABCD"), "ai_analysis_comment_task": "코멘트"})
+    for table, rows in (("employees", employees), ("temp_evaluations", temp), ("final_evaluation_reports", final),
+                        ("feedback_reports", feedback), ("team_kpis", kpis), ("tasks", tasks),
+                        ("task_summaries", summaries)):
+        insert_rows(engine, table, rows)
+    return {
+        "team_ids": team_ids,
+        "emp_nos": [employee["emp_no"] for employee in employees],
+        "team_evaluation_ids": [team_id * 10 + period_id for team_id in team_ids],
+    }
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from agents.chatbot import agent
+from routers import chat_router
+from schemas.chat import ChatRequest
+
+
+class RecordingSessionManager:
+    def __init__(self):
+        self.saved = {}
+
+    def get_session_state(self, user_id, chat_mode):
+        return self.saved.get((user_id, chat_mode), {})
+
+    def save_session_state(self, user_id, chat_mode, state):
+        self.saved[(user_id, chat_mode)] = {"qna_dialog_log": list(state.get("qna_dialog_log", [])),
+                                            "llm_response": state.get("llm_response")}
+
+
+def _prepare(state):
+    state["qna_dialog_log"].append(f"사용자: {state['user_input']}")
+    state["timings"] = {"prepare_ms": 1.0}
+    return "prompt"
+
+
+@pytest.fixture
+def chat_env(monkeypatch):
+    sessions = RecordingSessionManager()
+    monkeypatch.setattr(agent, "session_manager", sessions)
+    monkeypatch.setattr(agent, "get_user_metadata", lambda user_id: {"role": "MEMBER", "team_id": 1})
+    monkeypatch.setitem(agent.NODE_STEPS, "qna_agent", (_prepare, agent.finalize_qna_response))
+
+    def use_llm(tokens, error=None):
+        def stream_llm(state, prompt):
+            yield from tokens
+            if error:
+                raise error
+            state["timings"] = {**state["timings"], "ttft_ms": 1.0, "llm_ms": 2.0}
+        monkeypatch.setattr(agent, "stream_llm", stream_llm)
+
+    return sessions, use_llm
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _post(message="내 등급은?"):
+    client = TestClient(main.app)
+    return client.post("/api/ai/chat/skoro/stream",
+                       json={"user_id": "E001", "chat_mode": "default", "message": message})
+
+
+def test_stream_emits_tokens_then_done(chat_env):
+    sessions, use_llm = chat_env
+    use_llm(["등급은 ", "A", "입니다"])
+
+    response = _post()
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert events[:3] == [("token", "등급은 "), ("token", "A"), ("token", "입니다")]
+    event, data = events[3]
+    assert event == "done" and len(events) == 4
+    assert data["type"] == "qna_response" and data["response"] == "등급은 A입니다"
+    assert data["timings"]["ttft_ms"] == 1.0
+    assert sessions.saved[("E001", "default")]["qna_dialog_log"] == ["사용자: 내 등급은?", "챗봇: 등급은 A입니다"]
+
+
+def test_stream_error_becomes_error_event_and_keeps_turn(chat_env):
+    sessions, use_llm = chat_env
+    use_llm(["부분 "], error=RuntimeError("LLM 연결 끊김"))
+
+    events = _events(_post().text)
+    assert events == [("token", "부분 "), ("error", {"message": "LLM 연결 끊김"})]
+    assert sessions.saved[("E001", "default")]["qna_dialog_log"] == ["사용자: 내 등급은?", "챗봇: 부분"]
+
+
+def test_client_disconnect_saves_partial_turn(chat_env):
+    sessions, use_llm = chat_env
+    use_llm(["첫 ", "토큰", " 이후"])
+
+    stream = chat_router._sse_events(ChatRequest(user_id="E001", chat_mode="default", message="질문"))
+    assert next(stream).startswith("event: token")
+    stream.close()  # StreamingResponse가 연결 종료 시 제너레이터를 닫는 것과 같음
+
+    assert sessions.saved[("E001", "default")]["qna_dialog_log"] == ["사용자: 질문", "챗봇: 첫"]
+
+
+def test_error_before_first_token_keeps_user_message(chat_env):
+    sessions, use_llm = chat_env
+    use_llm([], error=RuntimeError("timeout"))
+
+    assert _events(_post("질문").text) == [("error", {"message": "timeout"})]
+    assert sessions.saved[("E001", "default")]["qna_dialog_log"] == ["사용자: 질문"]
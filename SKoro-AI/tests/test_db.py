@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import db
+from tests.synthetic_db import count_queries
+
+
+def test_pool_counters_are_exact_under_concurrent_checkouts(tmp_path):
+    """여러 스레드가 동시에 checkout/checkin해도 풀 카운터가 누락 없이 집계된다"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.sqlite'}", pool_size=4, max_overflow=4)
+    db._attach_pool_listeners("test-pool", engine)
+
+    def work(_):
+        for _ in range(50):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(8)))
+        stats = db._pool_stats["test-pool"]
+        assert stats["checkouts"] == 400
+        assert stats["checkins"] == 400
+    finally:
+        db._pool_stats.pop("test-pool", None)
+        engine.dispose()
+
+
+
+def test_pool_waits_and_timeouts_are_measured(tmp_path, monkeypatch):
+    """풀이 가득 차 기다린 checkout과 pool_timeout 초과만 대기로 집계된다 (빈 슬롯을 바로 받은 checkout은 제외)"""
+    monkeypatch.setattr(db.db_config, "DB_POOL_WAIT_THRESHOLD_MS", 50)
+    engine = create_engine(f"sqlite:///{tmp_path / 'wait.sqlite'}", pool_size=1, max_overflow=0, pool_timeout=0.3)
+    db._attach_pool_listeners("test-wait", engine)
+
+    def hold(seconds, acquired):
+        with engine.connect():
+            acquired.set()
+            time.sleep(seconds)
+
+    try:
+        with engine.connect() as connection:  # 마지막 남은 슬롯을 바로 받음 - 대기 아님
+            connection.execute(text("SELECT 1"))
+        assert db._pool_stats["test-wait"]["checkout_waits"] == 0
+
+        acquired = threading.Event()
+        holder = threading.Thread(target=hold, args=(0.15, acquired))
+        holder.start()
+        acquired.wait(1)
+        with engine.connect() as connection:  # 앞 연결이 반납될 때까지 기다림
+            connection.execute(text("SELECT 1"))
+        holder.join()
+
+        acquired = threading.Event()
+        holder = threading.Thread(target=hold, args=(0.6, acquired))
+        holder.start()
+        acquired.wait(1)
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        holder.join()
+
+        stats = db._pool_stats["test-wait"]
+        assert stats["pool_timeouts"] == 1
+        assert stats["checkout_waits"] == 2
+        assert stats["checkout_wait_ms_max"] >= 250
+        assert stats["checkout_wait_ms_total"] >= 350
+    finally:
+        db._pool_stats.pop("test-wait", None)
+        engine.dispose()
+
+def _scores_table(engine):
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE scores (id INTEGER PRIMARY KEY, team INTEGER, score REAL CHECK (score <= 5), note TEXT)"
+        ))
+        connection.execute(text("INSERT INTO scores (id, team, score, note) VALUES (:id, :team, 1.0, NULL)"),
+                           [{"id": i, "team": 1 if i < 8 else 2} for i in range(10)])
+
+
+def _scores(engine):
+    with engine.connect() as connection:
+        return {row.id: (row.score, row.note) for row in connection.execute(text("SELECT * FROM scores"))}
+
+
+def test_executemany_update_runs_one_statement_per_column_set(sqlite_engine):
+    _scores_table(sqlite_engine)
+    rows = {i: {"score": 2.0 + i / 10, "note": f"n{i}"} for i in range(6)}
+    rows[6] = {"score": 4.5}
+    rows[9] = {"score": 3.0}  # 다른 팀 - filters로 제외
+
+    with count_queries(sqlite_engine) as statements, sqlite_engine.begin() as connection:
+        updated = db.executemany_update(connection, "scores", "id", rows, filters={"team": 1})
+
+    assert updated == 7
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 2
+    scores = _scores(sqlite_engine)
+    assert scores[3] == (2.3, "n3")
+    assert scores[6] == (4.5, None)
+    assert scores[9] == (1.0, None)
+
+
+def test_bulk_update_isolating_failures_reports_only_failed_rows(sqlite_engine, caplog):
+    _scores_table(sqlite_engine)
+    rows = {i: {"score": 2.0} for i in range(5)}
+    rows[2] = {"score": 9.0}  # CHECK 제약 위반
+
+    with sqlite_engine.begin() as connection:
+        failed = db.bulk_update_isolating_failures(connection, "scores", "id", rows)
+
+    assert list(failed) == [2]
+    assert "CHECK" in failed[2]
+    scores = _scores(sqlite_engine)
+    assert [scores[i][0] for i in range(5)] == [2.0, 2.0, 1.0, 2.0, 2.0]
+    assert any("행 단위로 재시도" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from agents.chatbot import embedding_backends
+from agents.chatbot.embedding_backends import AGREEMENT_SAMPLES, cosine_agreement, create_embedding_model
+
+MODEL_NAME = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+
+
+class FakeEmbeddings:
+    """문장 길이 기반 고정 벡터 - offset으로 결과를 PyTorch와 다르게 만든다"""
+
+    def __init__(self, offset=0.0):
+        self.offset = offset
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[len(text), 1.0, self.offset] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class FakeOnnx(FakeEmbeddings):
+    quantize = False
+
+    def __init__(self, onnx_dir, offset):
+        super().__init__(offset)
+        self.onnx_dir = onnx_dir
+        self.model_path = os.path.join(onnx_dir, "model.onnx")
+        self.agreement_path = os.path.join(onnx_dir, "agreement.json")
+        with open(self.model_path, "w") as f:
+            f.write("model")
+
+
+@pytest.fixture
+def fake_backends(monkeypatch, tmp_path):
+    created = {"torch": []}
+
+    def torch_embeddings(model_name, batch_size=32):
+        model = FakeEmbeddings()
+        created["torch"].append(model)
+        return model
+
+    def install(offset):
+        monkeypatch.setattr(embedding_backends, "OnnxSentenceEmbeddings",
+                            lambda *args, **kwargs: FakeOnnx(str(tmp_path), offset))
+        monkeypatch.setattr(embedding_backends, "_torch_embeddings", torch_embeddings)
+        return created
+
+    return install
+
+
+def test_onnx_backend_is_used_when_it_agrees_with_torch(fake_backends):
+    created = fake_backends(offset=0.0)
+    model = create_embedding_model(MODEL_NAME, backend="onnx")
+    assert isinstance(model, FakeOnnx)
+    assert len(created["torch"]) == 1
+
+    # 같은 모델 파일은 기록된 비교 결과를 재사용 (PyTorch 모델을 다시 로드하지 않음)
+    assert isinstance(create_embedding_model(MODEL_NAME, backend="onnx"), FakeOnnx)
+    assert len(created["torch"]) == 1
+
+
+def test_onnx_backend_is_refused_below_tolerance(fake_backends):
+    created = fake_backends(offset=50.0)
+    model = create_embedding_model(MODEL_NAME, backend="onnx", tolerance=0.99)
+    # 비교에 쓴 PyTorch 모델을 그대로 사용
+    assert model is created["torch"][0]
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_onnx_matches_torch_model(quantize):
+    """실제 KR-SBERT PyTorch 모델과 ONNX(fp32 / int8) 결과의 코사인 유사도가 기준 이상"""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("transformers")
+    pytest.importorskip("langchain_huggingface")
+    try:
+        reference = embedding_backends._torch_embeddings(MODEL_NAME)
+    except OSError as e:
+        pytest.skip(f"모델을 내려받을 수 없음: {e}")
+
+    candidate = embedding_backends.OnnxSentenceEmbeddings(MODEL_NAME, quantize=quantize)
+    assert min(cosine_agreement(reference, candidate, AGREEMENT_SAMPLES)) >= 0.99
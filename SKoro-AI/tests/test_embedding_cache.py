@@ -0,0 +1,89 @@
+import sqlite3
+
+from agents.chatbot.embedding_cache import QueryEmbeddingCache, normalize_query, query_key
+
+
+class RecordingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0, 0.5]
+
+
+def test_embeds_original_query_and_shares_normalized_key():
+    embed = RecordingEmbedder()
+    cache = QueryEmbeddingCache("model-a")
+
+    first = cache.get_or_embed("  내 평가 결과 알려줘?? ", embed)
+    second = cache.get_or_embed("내 평가  결과 알려줘", embed)
+
+    assert embed.calls == ["  내 평가 결과 알려줘?? "]
+    assert first == second
+    assert normalize_query("내 평가  결과 알려줘!") == "내 평가 결과 알려줘"
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    embed = RecordingEmbedder()
+    cache = QueryEmbeddingCache("model-a", max_items=2)
+    for query in ("a", "b", "a", "c"):
+        cache.get_or_embed(query, embed)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_persisted_store_keeps_hashes_only(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    embed = RecordingEmbedder()
+    cache = QueryEmbeddingCache("model-a", persist_path=path, flush_interval=60)
+    cache.get_or_embed("팀 KPI 달성률", embed)
+    cache.get_or_embed("팀 kpi 달성률?", embed)
+    cache.close()
+
+    with sqlite3.connect(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        rows = conn.execute("SELECT query_hash, hits FROM query_embedding_vectors").fetchall()
+    assert "query_embeddings" not in tables
+    assert rows == [(query_key("팀 KPI 달성률"), 1)]
+    assert "달성률" not in open(path, "rb").read().decode("utf-8", "ignore")
+
+    reloaded = QueryEmbeddingCache("model-a", persist_path=path)
+    assert reloaded.load() == 1
+    assert reloaded.get_or_embed("팀 KPI 달성률", embed) == [9.0, 1.0, 0.5]
+    assert len(embed.calls) == 1
+    reloaded.close()
+
+
+def test_writes_are_batched_off_the_request_path(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    embed = RecordingEmbedder()
+    cache = QueryEmbeddingCache("model-a", persist_path=path, flush_interval=60)
+    for i in range(50):
+        cache.get_or_embed(f"질의 {i}", embed)
+
+    # 요청 경로에서는 저장하지 않고 대기열에만 쌓는다
+    assert cache.stats()["pending_writes"] == 50
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM query_embedding_vectors").fetchone()[0] == 0
+
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    cache.flush()
+    assert cache.stats()["pending_writes"] == 0
+    assert sum(1 for s in statements if s.upper().startswith("COMMIT")) == 1
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM query_embedding_vectors").fetchone()[0] == 50
+    cache.close()
+
+
+def test_vectors_are_separated_by_model(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = QueryEmbeddingCache("model-a", persist_path=path)
+    cache.get_or_embed("질의", RecordingEmbedder())
+    cache.close()
+
+    other = QueryEmbeddingCache("model-b", persist_path=path)
+    assert other.load() == 0
+    other.close()
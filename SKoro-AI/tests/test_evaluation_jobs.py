@@ -0,0 +1,96 @@
+import threading
+import time
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from auth.auth import ALGORITHM, SECRET_KEY
+import main
+from routers import evaluation_router
+from services import evaluation_service
+from services.evaluation_service import EvaluationJobManager, EvaluationService, JobConflictError
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """모든 평가 유형의 워크플로우를 release.set() 전까지 실행 중으로 붙잡아 두는 가짜로 교체"""
+    event = threading.Event()
+    started = []
+
+    def workflow(period_id, specific_teams=None, run_context=None, **options):
+        started.append(specific_teams)
+        event.wait(5)
+        return True
+
+    for evaluation_type, (_, label) in list(evaluation_service.EVALUATION_WORKFLOWS.items()):
+        monkeypatch.setitem(evaluation_service.EVALUATION_WORKFLOWS, evaluation_type, (workflow, label))
+    event.started = started
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def manager(release):
+    manager = EvaluationJobManager(max_concurrent_jobs=4)
+    yield manager
+    release.set()
+    manager.executor.shutdown(wait=True)
+
+
+def test_same_team_set_returns_running_job(manager):
+    job, created = manager.submit("quarterly", 2, [1, 2])
+    assert created
+
+    same, created = manager.submit("quarterly", 2, [2, 1, 2])
+    assert (same, created) == (job, False)
+
+    # 다른 기간 / 다른 평가 유형은 별개 Job
+    assert manager.submit("quarterly", 3, [1, 2])[1]
+    assert manager.submit("middle", 2, [1, 2])[1]
+
+
+def test_overlapping_team_sets_conflict_and_disjoint_sets_run(manager, release):
+    job, _ = manager.submit("quarterly", 2, [1, 2])
+
+    for teams in ([2], [2, 3], None, []):
+        with pytest.raises(JobConflictError) as error:
+            manager.submit("quarterly", 2, teams)
+        assert error.value.job is job
+
+    other, created = manager.submit("quarterly", 2, [3])
+    assert created and other is not job
+
+    release.set()
+    for running in (job, other):
+        deadline = time.monotonic() + 5
+        while running.is_active() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert sorted(release.started) == [[1, 2], [3]]
+    # 끝난 Job은 중복 판단에서 빠진다
+    assert manager.submit("quarterly", 2, [2])[1]
+
+
+def test_all_teams_job_blocks_any_team_subset(manager):
+    manager.submit("quarterly", 2)
+    assert manager.submit("quarterly", 2, [])[1] is False
+    with pytest.raises(JobConflictError):
+        manager.submit("quarterly", 2, [7])
+
+
+def test_router_answers_409_for_overlapping_teams(manager, monkeypatch):
+    monkeypatch.setattr(evaluation_router, "evaluation_service", EvaluationService(manager))
+    token = jwt.encode({"sub": "tester", "role": "ADMIN"}, SECRET_KEY, algorithm=ALGORITHM)
+    client = TestClient(main.app, headers={"Authorization": f"Bearer {token}"})
+
+    def post(teams):
+        return client.post("/api/ai/evaluation/quarterly", json={"period_id": 2, "teams": teams})
+
+    first = post([1, 2])
+    assert first.status_code == 202
+    again = post([2, 1])
+    assert again.status_code == 202 and again.json()["job_id"] == first.json()["job_id"]
+    assert post([3]).json()["job_id"] != first.json()["job_id"]
+    conflict = post([2])
+    assert conflict.status_code == 409
+    assert first.json()["job_id"] in conflict.json()["detail"]
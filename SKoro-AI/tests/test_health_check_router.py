@@ -0,0 +1,33 @@
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from auth.auth import ALGORITHM, SECRET_KEY
+import main
+
+
+@pytest.fixture
+def client():
+    # with 블록 없이 사용해 startup 워밍업(임베딩 모델 로드)은 실행하지 않는다
+    return TestClient(main.app)
+
+
+def _headers(role: str):
+    token = jwt.encode({"sub": "tester", "role": role}, SECRET_KEY, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("path", ["db-pool", "llm-cache"])
+def test_diagnostic_endpoints_require_admin(client, path):
+    assert client.get(f"/api/ai/health-check/{path}").status_code in (401, 403)
+    assert client.get(f"/api/ai/health-check/{path}", headers=_headers("MEMBER")).status_code == 403
+    assert client.get(f"/api/ai/health-check/{path}", headers=_headers("ADMIN")).status_code == 200
+
+
+@pytest.mark.parametrize("path", ["db-pool", "llm-cache", "embedding-cache"])
+def test_diagnostic_endpoints_are_not_public(client, path):
+    assert client.get(f"/health-check/{path}").status_code == 404
+
+
+def test_liveness_probe_stays_public(client):
+    assert client.get("/health-check").status_code == 200
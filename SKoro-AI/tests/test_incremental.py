@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import inspect, text
+
+from agents.workflow.incremental import FINGERPRINT_TABLE, TEAM_SCOPE, IncrementalTracker
+from migrations import apply_migrations
+from tests.synthetic_db import count_queries, create_schema, insert_rows, seed_headquarter
+
+PERIOD_ID = 4
+
+
+@pytest.fixture
+def team_db(sqlite_engine, use_engine):
+    use_engine(sqlite_engine)
+    create_schema(sqlite_engine)
+    seeded = seed_headquarter(sqlite_engine, teams=2, members_per_team=3, period_id=PERIOD_ID)
+    team_id = seeded["team_ids"][0]
+    other_team_emp = seeded["emp_nos"][3]
+    target, evaluator = seeded["emp_nos"][0], seeded["emp_nos"][1]
+    insert_rows(sqlite_engine, "keywords", [{"keyword_id": 1, "keyword_name": "책임감"}])
+    insert_rows(sqlite_engine, "peer_evaluations", [
+        {"peer_evaluation_id": 1, "team_evaluation_id": team_id * 10 + PERIOD_ID, "emp_no": evaluator,
+         "target_emp_no": target, "weight": 1.0, "joint_task": "공동 업무", "is_completed": 1},
+        # 다른 팀 평가자의 평가 (평가자 팀의 team_evaluation에 기록됨)
+        {"peer_evaluation_id": 2, "team_evaluation_id": (team_id + 1) * 10 + PERIOD_ID, "emp_no": other_team_emp,
+         "target_emp_no": target, "weight": 0.5, "joint_task": None, "is_completed": 1},
+    ])
+    insert_rows(sqlite_engine, "peer_evaluation_keywords", [
+        {"peer_evaluation_keyword_id": 1, "peer_evaluation_id": 1, "keyword_id": 1, "custom_keyword": None},
+    ])
+    insert_rows(sqlite_engine, "prompts", [{"prompt_id": 1, "prompt": "4P 평가 프롬프트"}])
+    return sqlite_engine, team_id, target
+
+
+def _execute(engine, statement, params=None):
+    with engine.begin() as connection:
+        connection.execute(text(statement), params or {})
+
+
+def test_migrations_create_fingerprint_table_once(team_db):
+    engine, _, _ = team_db
+    assert apply_migrations(engine)[0] == "001_create_evaluation_fingerprints.sql"
+    assert inspect(engine).has_table(FINGERPRINT_TABLE)
+    assert apply_migrations(engine) == []
+
+
+def test_incremental_is_disabled_without_migrated_table(team_db):
+    _, team_id, _ = team_db
+    tracker = IncrementalTracker(PERIOD_ID, enabled=True)
+    assert not tracker.enabled
+    assert tracker.compute("module3", team_id) == {}
+
+
+def test_full_run_does_not_compute_or_write_fingerprints(team_db):
+    engine, team_id, _ = team_db
+    apply_migrations(engine)
+    tracker = IncrementalTracker(PERIOD_ID, enabled=False)
+
+    with count_queries(engine) as statements:
+        fingerprints = tracker.compute("module3", team_id)
+        tracker.record("module3", team_id, {"E1": "a" * 64})
+
+    assert fingerprints == {}
+    assert statements == []
+
+
+def test_record_skips_unchanged_fingerprints(team_db):
+    engine, team_id, _ = team_db
+    apply_migrations(engine)
+    tracker = IncrementalTracker(PERIOD_ID, enabled=True)
+    fingerprint = tracker.compute("module2", team_id)[TEAM_SCOPE]
+    tracker.record("module2", team_id, {TEAM_SCOPE: fingerprint})
+
+    with count_queries(engine) as statements:
+        tracker.record("module2", team_id, {TEAM_SCOPE: fingerprint})
+    assert statements == []
+
+    reloaded = IncrementalTracker(PERIOD_ID, enabled=True)
+    assert reloaded.is_unchanged("module2", team_id, fingerprint)
+
+
+@pytest.mark.parametrize("statement", [
+    "UPDATE peer_evaluations SET weight = 2.0 WHERE peer_evaluation_id = 2",  # 다른 팀 평가자의 가중치
+    "UPDATE peer_evaluations SET joint_task = '변경' WHERE peer_evaluation_id = 1",
+    "UPDATE keywords SET keyword_name = '주도성' WHERE keyword_id = 1",
+])
+def test_evaluator_side_inputs_change_target_fingerprint(team_db, statement):
+    engine, team_id, target = team_db
+    apply_migrations(engine)
+    tracker = IncrementalTracker(PERIOD_ID, enabled=True)
+    before = tracker.compute("module3", team_id)
+
+    _execute(engine, statement)
+    after = tracker.compute("module3", team_id)
+
+    assert after[target] != before[target]
+    assert {emp: fp for emp, fp in after.items() if emp != target} == \
+           {emp: fp for emp, fp in before.items() if emp != target}
+
+
+@pytest.mark.parametrize("statement", [
+    "UPDATE team_evaluations SET ai_collaboration_matrix = '{\"team_summary\": \"변경\"}' WHERE team_id = :team_id",
+    "UPDATE feedback_reports SET ai_peer_talk_summary = '{}' WHERE emp_no = :target",
+])
+def test_module6_fingerprint_includes_peer_and_team_outputs(team_db, statement):
+    engine, team_id, target = team_db
+    apply_migrations(engine)
+    tracker = IncrementalTracker(PERIOD_ID, enabled=True)
+    before = tracker.compute("module6", team_id)
+
+    _execute(engine, statement, {"team_id": team_id, "target": target})
+
+    assert tracker.compute("module6", team_id)[target] != before[target]
@@ -0,0 +1,64 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+from config.settings import LLMConfig
+from shared.llm_cache import LLMResponseCache
+from shared.llm_gateway import LLMGateway
+from agents.evaluation.modules.module_03_peer_talk import llm_utils as module3_llm
+from agents.evaluation.modules.module_04_collaboration import llm_utils as module4_llm
+
+
+@pytest.fixture
+def gateway(tmp_path, monkeypatch):
+    """응답을 고정 문자열로 돌려주는 캐시 사용 게이트웨이 (실제 API 호출 없음)"""
+    config = LLMConfig()
+    config.CACHE_ENABLED = True
+    config.CACHE_MODULES = "module3,module4"
+    gateway = LLMGateway(config)
+    gateway._cache = LLMResponseCache(path=str(tmp_path / "llm_cache.sqlite"))
+    calls = []
+
+    def fake_invoke(messages, model, temperature, module):
+        calls.append(module)
+        return AIMessage(content=gateway.next_content)
+
+    monkeypatch.setattr(gateway, "_invoke_with_limits", fake_invoke)
+    gateway.calls = calls
+    for module in (module3_llm, module4_llm):
+        monkeypatch.setattr(module, "llm_gateway", gateway)
+    return gateway
+
+
+def test_module3_invalid_json_is_not_cached(gateway):
+    gateway.next_content = "JSON이 아닌 응답"
+    first = module3_llm.call_llm_for_peer_evaluation_context("책임감", "프로젝트", 1.0)
+    assert first["context_sentence"] == "업무 진행 과정에서 동료가 다양한 특성을 보임"
+    assert gateway.get_cache().stats()["entries"] == 0
+
+    # 같은 프롬프트를 다시 호출하면 캐시가 아닌 LLM 응답을 사용
+    gateway.next_content = '{"context_sentence": "책임감 있게 일정을 관리함"}'
+    second = module3_llm.call_llm_for_peer_evaluation_context("책임감", "프로젝트", 1.0)
+    assert second["context_sentence"] == "책임감 있게 일정을 관리함"
+    assert len(gateway.calls) == 2
+    assert gateway.get_cache().stats()["entries"] == 1
+
+
+def test_module4_invalid_json_is_not_cached(gateway):
+    gateway.next_content = "{잘못된 JSON"
+    result = module4_llm.call_llm_for_team_role_analysis(["요약"], "홍길동", "E001")
+    assert result["role_type"] == "분석 실패"
+    assert gateway.get_cache().stats()["entries"] == 0
+
+
+def test_module4_valid_response_is_reused(gateway):
+    gateway.next_content = '{"main_work_content": "개발", "role_type": "주도", "team_role": "리더"}'
+    first = module4_llm.call_llm_for_team_role_analysis(["요약"], "홍길동", "E001")
+    second = module4_llm.call_llm_for_team_role_analysis(["요약"], "홍길동", "E001")
+    assert first == second
+    assert len(gateway.calls) == 1
+
+
+def test_tone_adjustment_is_not_cached_by_default():
+    # 톤 조정은 temperature 0.1로 실행되므로 기본 캐시 대상이 아니고, 명시해도 캐시되지 않는다
+    assert "tone_adjustment" not in LLMConfig().cache_modules
+    assert not LLMGateway(LLMConfig())._use_cache("tone_adjustment", 0.1, True)
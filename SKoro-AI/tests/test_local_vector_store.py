@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("faiss")
+
+from agents.chatbot.local_vector_store import LocalVectorIndex
+
+
+def _doc(doc_id, vector, emp_no, accessible_by, doc_type="individual_report"):
+    return {"id": doc_id, "values": vector,
+            "metadata": {"emp_no": emp_no, "accessible_by": accessible_by, "type": doc_type}}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalVectorIndex(str(tmp_path / "reports"))
+    index.upsert([
+        _doc("A_0", [1.0, 0.0, 0.0], "A", ["A", "M"]),
+        _doc("B_0", [0.9, 0.1, 0.0], "B", ["B", "M"]),
+        _doc("M_team", [0.95, 0.05, 0.0], "M", ["M"], doc_type="team_report"),
+        _doc("C_0", [0.0, 1.0, 0.0], "C", ["C"]),
+    ])
+    return index
+
+
+def _ids(result):
+    return [match["id"] for match in result["matches"]]
+
+
+def test_access_filter_is_applied_before_ranking(index):
+    # 가장 가까운 문서(A_0)에 권한이 없어도 top_k 안에서 빠지지 않고 B의 문서만 반환
+    result = index.query([1.0, 0.0, 0.0], top_k=1, filter={"accessible_by": {"$in": ["B"]}})
+    assert _ids(result) == ["B_0"]
+
+    manager = index.query([1.0, 0.0, 0.0], top_k=5, filter={"accessible_by": {"$in": ["M"]}})
+    assert _ids(manager) == ["A_0", "M_team", "B_0"]
+
+
+def test_type_and_non_indexed_conditions(index):
+    result = index.query([1.0, 0.0, 0.0], top_k=5,
+                         filter={"accessible_by": {"$in": ["M"]}, "type": {"$eq": "team_report"}})
+    assert _ids(result) == ["M_team"]
+
+    result = index.query([1.0, 0.0, 0.0], top_k=5, filter={"type": {"$ne": "team_report"}})
+    assert _ids(result) == ["A_0", "B_0", "C_0"]
+
+    assert _ids(index.query([1.0, 0.0, 0.0], filter={"accessible_by": {"$in": ["Z"]}})) == []
+
+
+def test_namespaces_are_separate(index):
+    index.upsert([_doc("P_0", [1.0, 0.0, 0.0], "P", ["P"])], namespace="policy")
+    assert _ids(index.query([1.0, 0.0, 0.0], namespace="policy")) == ["P_0"]
+    assert "P_0" not in _ids(index.query([1.0, 0.0, 0.0], top_k=10))
+
+
+def test_delete_by_ids_and_delete_all(index):
+    index.delete(ids=["A_0", "missing"])
+    assert _ids(index.query([1.0, 0.0, 0.0], top_k=10)) == ["M_team", "B_0", "C_0"]
+
+    index.upsert([_doc("P_0", [1.0, 0.0, 0.0], "P", ["P"])], namespace="policy")
+    index.delete(delete_all=True)
+    assert index.describe_index_stats()["namespaces"] == {"policy": {"vector_count": 1}}
+    assert _ids(index.query([1.0, 0.0, 0.0])) == []
+
+
+def test_upsert_replaces_existing_id(index):
+    index.upsert([_doc("C_0", [1.0, 0.0, 0.0], "C", ["C"])])
+    result = index.query([1.0, 0.0, 0.0], filter={"accessible_by": {"$in": ["C"]}})
+    assert result["matches"][0]["score"] == pytest.approx(1.0)
+    assert index.describe_index_stats()["total_vector_count"] == 4
+
+
+def test_save_and_reload(index):
+    index.save()
+    reloaded = LocalVectorIndex(index.path)
+    assert reloaded.version == index.version
+    assert _ids(reloaded.query([1.0, 0.0, 0.0], top_k=2, filter={"accessible_by": {"$in": ["M"]}})) == ["A_0", "M_team"]
+    assert reloaded.describe_index_stats()["dimension"] == 3
+
+    # 저장할 때마다 이전 버전 파일은 정리
+    index.delete(ids=["C_0"])
+    index.save()
+    files = sorted(os.listdir(index.path))
+    with open(os.path.join(index.path, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert files == sorted(["manifest.json", manifest["index_file"], manifest["docs_file"]])
+
+
+def test_reader_picks_up_save_from_another_instance(index):
+    index.save()
+    reader = LocalVectorIndex(index.path)
+    assert "D_0" not in _ids(reader.query([0.0, 0.0, 1.0], top_k=10))
+
+    writer = LocalVectorIndex(index.path)
+    writer.upsert([_doc("D_0", [0.0, 0.0, 1.0], "D", ["D"])])
+    writer.save()
+
+    assert _ids(reader.query([0.0, 0.0, 1.0], top_k=1)) == ["D_0"]
+    assert reader.version == writer.version
+
+
+def test_unsaved_changes_are_not_replaced_by_reload(index):
+    index.save()
+    other = LocalVectorIndex(index.path)
+    other.upsert([_doc("E_0", [0.0, 0.0, 1.0], "E", ["E"])])
+
+    index.delete(ids=["A_0"])
+    index.save()
+
+    # other의 저장 전 변경은 유지되고, 저장하면 그 상태가 최신 버전이 된다
+    assert "E_0" in _ids(other.query([0.0, 0.0, 1.0], top_k=10))
+
+
+def test_legacy_layout_is_still_readable(index, tmp_path):
+    import faiss
+
+    index.save()
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    with open(os.path.join(index.path, "manifest.json")) as f:
+        manifest = json.load(f)
+    faiss.write_index(faiss.read_index(os.path.join(index.path, manifest["index_file"])), str(legacy / "index.faiss"))
+    os.replace(os.path.join(index.path, manifest["docs_file"]), legacy / "docs.json")
+
+    assert _ids(LocalVectorIndex(str(legacy)).query([0.0, 1.0, 0.0], top_k=1)) == ["C_0"]
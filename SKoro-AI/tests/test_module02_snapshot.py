@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import text
+
+from agents.evaluation.modules.module_02_goal_achievement import db_utils
+from tests.synthetic_db import count_queries, create_schema, insert_rows, seed_module2_team
+
+
+@pytest.fixture
+def team(sqlite_engine, use_engine):
+    use_engine(sqlite_engine, db_utils)
+    create_schema(sqlite_engine)
+    seeded = seed_module2_team(sqlite_engine, members=20, period_id=2)
+    return sqlite_engine, seeded
+
+
+def test_snapshot_matches_per_item_fetches(team):
+    """스냅샷 조회 결과가 기존 fetch_* 함수 결과와 같다"""
+    _, seeded = team
+    snapshot = db_utils.TeamPeriodSnapshot.load(1, 2, seeded["task_ids"], seeded["kpi_ids"])
+
+    assert snapshot.members == db_utils.fetch_team_members(1)
+    for task_id in seeded["task_ids"]:
+        assert snapshot.get_cumulative_task(task_id) == db_utils.fetch_cumulative_task_data(task_id, 2)
+    for kpi_id in seeded["kpi_ids"]:
+        assert snapshot.get_kpi(kpi_id) == db_utils.fetch_team_kpi_data(kpi_id)
+        assert snapshot.get_evaluation_type(kpi_id) == db_utils.check_evaluation_type(kpi_id)
+        by_task = lambda rows: sorted(rows, key=lambda row: row["task_id"])
+        assert by_task(snapshot.get_kpi_tasks(kpi_id)) == by_task(db_utils.fetch_kpi_tasks(kpi_id, 2))
+
+
+def test_snapshot_prefers_kpi_specific_grades(team):
+    engine, seeded = team
+    kpi_id = seeded["kpi_ids"][0]
+    insert_rows(engine, "grades", [{"grade_id": 2, "team_kpi_id": kpi_id, "grade_rule": "KPI 전용 기준",
+                                    "grade_s": "S+", "grade_a": "A+", "grade_b": "B+", "grade_c": "C+",
+                                    "grade_d": "D+"}])
+    snapshot = db_utils.TeamPeriodSnapshot.load(1, 2, seeded["task_ids"], seeded["kpi_ids"])
+
+    assert snapshot.get_kpi(kpi_id)["grade_rule"] == "KPI 전용 기준"
+    assert snapshot.get_kpi(seeded["kpi_ids"][1])["grade_rule"] == "공통 기준"
+
+
+@pytest.mark.parametrize("members", [5, 20, 60])
+def test_snapshot_query_count_is_constant(sqlite_engine, use_engine, members):
+    """팀 규모와 무관하게 스냅샷 적재는 쿼리 4회"""
+    use_engine(sqlite_engine, db_utils)
+    create_schema(sqlite_engine)
+    seeded = seed_module2_team(sqlite_engine, members=members)
+
+    with count_queries(sqlite_engine) as statements:
+        db_utils.TeamPeriodSnapshot.load(1, 2, seeded["task_ids"], seeded["kpi_ids"])
+
+    assert len(statements) == 4
+
+
+def test_bulk_updates_report_only_existing_rows(team):
+    engine, seeded = team
+    kpi_id = seeded["kpi_ids"][0]
+    with engine.connect() as connection:
+        summary_ids = [row[0] for row in connection.execute(
+            text("SELECT task_summary_id FROM task_summaries ORDER BY task_summary_id LIMIT 2")
+        )]
+
+    with count_queries(engine) as statements:
+        saved = db_utils.bulk_update_task_summaries({
+            summary_ids[0]: {"ai_achievement_rate": 91.0},
+            999999: {"ai_achievement_rate": 50.0},
+            summary_ids[1]: {"ai_achievement_rate": 92.0},
+        })
+    assert saved == summary_ids
+    assert len(statements) == 2  # 존재 확인 1회 + 다중 행 UPDATE 1회
+
+    assert db_utils.bulk_update_team_kpis({888888: {"ai_kpi_progress_rate": 10.0},
+                                           kpi_id: {"ai_kpi_progress_rate": 77.0}}) == [kpi_id]
+    assert db_utils.bulk_update_team_kpis({888888: {"ai_kpi_progress_rate": 10.0}}) == []
+
+    with engine.connect() as connection:
+        rates = dict(connection.execute(text(
+            "SELECT task_summary_id, ai_achievement_rate FROM task_summaries WHERE task_summary_id IN (:a, :b)"
+        ), {"a": summary_ids[0], "b": summary_ids[1]}).fetchall())
+        kpi_rate = connection.execute(text(
+            "SELECT ai_kpi_progress_rate FROM team_kpis WHERE team_kpi_id = :kpi_id"
+        ), {"kpi_id": kpi_id}).scalar_one()
+    assert rates == {summary_ids[0]: 91.0, summary_ids[1]: 92.0}
+    assert kpi_rate == 77.0
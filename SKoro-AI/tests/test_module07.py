@@ -0,0 +1,36 @@
+from sqlalchemy import text
+
+from agents.evaluation.modules.module_07_final_evaluation import db_utils as module7_db
+from tests.synthetic_db import create_schema, insert_rows, seed_headquarter
+
+
+def _score_data(emp_no, score):
+    return {"emp_no": emp_no, "ai_reason": f"{emp_no} 사유", "raw_score": f'{{"raw_hybrid_score": {score}}}',
+            "score": score, "comment": None}
+
+
+def test_batch_update_temp_evaluations_fails_members_with_several_team_evaluations(sqlite_engine, use_engine):
+    create_schema(sqlite_engine)
+    seed_headquarter(sqlite_engine, headquarter_id=1, teams=2, members_per_team=3)
+    # 팀 11에는 같은 기간 team_evaluation이 두 개 - 어느 행에 쓸지 알 수 없다
+    insert_rows(sqlite_engine, "team_evaluations", [
+        {"team_evaluation_id": 999, "team_id": 11, "period_id": 4, "status": "COMPLETED"}
+    ])
+    insert_rows(sqlite_engine, "temp_evaluations", [
+        {"emp_no": "H1T11M00", "team_evaluation_id": 999, "score": 1.0, "raw_score": None, "manager_score": None,
+         "reason": None, "ai_reason": None, "comment": None}
+    ])
+    use_engine(sqlite_engine, module7_db)
+
+    score_data = [_score_data(emp_no, 4.2) for emp_no in ("H1T10M00", "H1T10M01", "H1T11M00", "H1T99M00")]
+    result = module7_db.batch_update_temp_evaluations(score_data, period_id=4)
+
+    assert result == {"success_count": 2, "failed_members": ["H1T11M00", "H1T99M00"]}
+    with sqlite_engine.connect() as connection:
+        scores = {
+            (row.emp_no, row.team_evaluation_id): row.score
+            for row in connection.execute(text("SELECT emp_no, team_evaluation_id, score FROM temp_evaluations"))
+        }
+    assert scores[("H1T10M00", 104)] == scores[("H1T10M01", 104)] == 4.2
+    assert scores[("H1T11M00", 114)] != 4.2
+    assert scores[("H1T11M00", 999)] == 1.0
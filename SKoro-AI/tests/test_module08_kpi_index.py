@@ -0,0 +1,49 @@
+from agents.evaluation.modules.module_08_team_comparision import comparison_utils
+from agents.evaluation.modules.module_08_team_comparision.comparison_utils import (
+    KpiTextIndex, compare_kpis_with_similar_teams, get_period_kpi_index,
+)
+
+
+def _kpi(kpi_id, name, description="", rate=80.0):
+    return {"team_kpi_id": kpi_id, "kpi_name": name, "kpi_description": description, "rate": rate}
+
+
+def test_match_filters_by_threshold_and_keeps_candidate_order():
+    ours = [_kpi(1, "매출 성장", "신규 고객 매출 확대"), _kpi(2, "장애 대응", "서비스 장애 복구 시간 단축")]
+    candidates = [
+        _kpi(10, "장애 대응", "장애 복구 시간 단축"),
+        _kpi(11, "매출 성장", "고객 매출 확대"),
+        _kpi(12, "채용 확대", "개발자 채용"),
+        _kpi(13, "매출 성장", "신규 고객 매출 확대"),
+    ]
+    matches = KpiTextIndex(ours + candidates).match(ours, candidates, threshold=0.3)
+
+    assert [m["kpi"]["team_kpi_id"] for m in matches[0]] == [11, 13]
+    assert [m["kpi"]["team_kpi_id"] for m in matches[1]] == [10]
+    assert matches[0][1]["similarity"] > 0.99  # 같은 텍스트
+
+
+def test_kpis_outside_the_index_use_the_fitted_vocabulary():
+    index = KpiTextIndex([_kpi(1, "매출 성장"), _kpi(2, "품질 개선")])
+    matches = index.match([_kpi(99, "매출 성장")], [_kpi(1, "매출 성장"), _kpi(2, "품질 개선")])
+    assert [m["kpi"]["team_kpi_id"] for m in matches[0]] == [1]
+
+
+def test_empty_vocabulary_returns_no_matches():
+    assert KpiTextIndex([_kpi(1, "")]).match([_kpi(1, "")], [_kpi(1, "")]) == [[]]
+
+
+def test_period_index_is_reused_until_kpi_texts_change(monkeypatch):
+    monkeypatch.setattr(comparison_utils, "_index_cache", {})
+    corpus = [_kpi(1, "매출 성장"), _kpi(2, "품질 개선")]
+    first = get_period_kpi_index(4, corpus)
+    assert get_period_kpi_index(4, [dict(kpi) for kpi in corpus]) is first
+    assert get_period_kpi_index(4, corpus + [_kpi(3, "비용 절감")]) is not first
+
+
+def test_compare_uses_matches_for_statistics():
+    ours = [_kpi(1, "매출 성장", "고객 매출", rate=100.0)]
+    candidates = [_kpi(10 + i, "매출 성장", "고객 매출", rate=rate) for i, rate in enumerate([70.0, 80.0, 90.0])]
+    [result] = compare_kpis_with_similar_teams(ours, candidates)
+    assert result["similar_kpis_count"] == 3
+    assert result["similar_avg_rate"] == 80.0
@@ -0,0 +1,285 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from agents.evaluation.modules.module_09_cl_normalization import agent as module9
+from agents.evaluation.modules.module_09_cl_normalization import db_utils as module9_db
+from agents.evaluation.modules.module_09_cl_normalization import run_module_09 as run9
+from tests.synthetic_db import count_queries, create_schema, seed_headquarter
+
+
+def _members(count):
+    return [{"emp_no": f"E{i:02d}", "changed_by_manager": True} for i in range(count)]
+
+
+def test_precompute_consistency_scores_writes_back_in_input_order(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def task_evidence(member):
+        index = int(member["emp_no"][1:])
+        time.sleep(0.002 * (10 - index))  # 뒤 직원의 결과가 먼저 끝나도록
+        with lock:
+            calls.append(("task", member["emp_no"]))
+        return index / 100
+
+    def peer_consistency(member):
+        index = int(member["emp_no"][1:])
+        time.sleep(0.001 * (index % 3))
+        with lock:
+            calls.append(("peer", member["emp_no"]))
+        return 0.5 + index / 100
+
+    monkeypatch.setattr(module9, "analyze_task_evidence_consistency", task_evidence)
+    monkeypatch.setattr(module9, "analyze_peer_evaluation_consistency", peer_consistency)
+    monkeypatch.setattr(module9.llm_gateway, "get_module_limit", lambda module=None: 8)
+
+    members = _members(10)
+    members[3]["changed_by_manager"] = False
+    members[5].update(task_evidence_score=0.99, peer_consistency_score=0.98)  # 이미 계산됨
+
+    assert module9.precompute_consistency_scores(members) == 8
+
+    # 분석은 입력 순서와 다르게 끝났지만 직원마다 자기 결과가 들어간다
+    task_order = [emp_no for kind, emp_no in calls if kind == "task"]
+    assert task_order != sorted(task_order)
+    for i, member in enumerate(members):
+        if i == 3:
+            assert "task_evidence_score" not in member
+        elif i == 5:
+            assert (member["task_evidence_score"], member["peer_consistency_score"]) == (0.99, 0.98)
+        else:
+            assert member["task_evidence_score"] == i / 100
+            assert member["peer_consistency_score"] == 0.5 + i / 100
+    assert len(calls) == 16
+
+    # 다시 호출해도 이미 계산된 직원은 건너뛴다
+    assert module9.precompute_consistency_scores(members) == 0
+    assert len(calls) == 16
+
+
+def _summary_report(headquarter_id, adjusted_members, analyzed_cls, avg_validity, distribution, errors=()):
+    return {
+        "headquarter_id": headquarter_id,
+        "initial_stats": {"total_cls": 3, "total_members": 10, "adjustment_needed_cls": 2, "total_surplus": 1.5},
+        "enhanced_analysis_stats": {"analyzed_cls": analyzed_cls, "avg_validity_score": avg_validity,
+                                    "high_validity_members": 2, "low_validity_members": 1,
+                                    "validity_distribution": distribution},
+        "final_stats": {"processed_cls": 3, "adjusted_members": adjusted_members, "distribution_achieved_cls": 2,
+                        "fallback_used_cls": 1, "enhanced_features_used_cls": 0},
+        "performance_metrics": {"total_processing_time_ms": 100},
+        "cl_details": [{"cl_group": "CL1", "adjustments_made": adjusted_members}],
+        "error_logs": list(errors),
+    }
+
+
+def test_consolidate_enhanced_summary_reports_merges_headquarters():
+    reports = [
+        _summary_report(1, 4, analyzed_cls=1, avg_validity=0.9, distribution={"타당": 2, "의심": 1}),
+        _summary_report(2, 6, analyzed_cls=3, avg_validity=0.5, distribution={"타당": 1, "매우 의심": 2},
+                        errors=["CL2 실패"]),
+    ]
+
+    summary = run9.consolidate_enhanced_summary_reports(reports, period_id=4)
+
+    assert summary["period_id"] == 4
+    assert summary["headquarter_ids"] == [1, 2]
+    assert summary["initial_stats"] == {"total_cls": 6, "total_members": 20, "adjustment_needed_cls": 4,
+                                        "total_surplus": 3.0}
+    assert summary["final_stats"]["adjusted_members"] == 10
+    assert summary["final_stats"]["fallback_used_cls"] == 2
+    analysis = summary["enhanced_analysis_stats"]
+    assert analysis["analyzed_cls"] == 4
+    assert analysis["avg_validity_score"] == 0.6  # 분석한 CL 수로 가중 평균 (0.9*1 + 0.5*3) / 4
+    assert analysis["validity_distribution"] == {"매우 타당": 0, "타당": 3, "보통": 0, "의심": 1, "매우 의심": 2}
+    assert summary["total_processing_time_ms"] == 200
+    assert summary["cl_details"] == [
+        {"headquarter_id": 1, "cl_group": "CL1", "adjustments_made": 4},
+        {"headquarter_id": 2, "cl_group": "CL1", "adjustments_made": 6},
+    ]
+    assert summary["error_logs"] == ["본부 2: CL2 실패"]
+
+
+def test_consolidate_enhanced_summary_reports_handles_no_reports():
+    summary = run9.consolidate_enhanced_summary_reports([], period_id=4)
+
+    assert summary["headquarter_ids"] == []
+    assert summary["final_stats"]["adjusted_members"] == 0
+    assert summary["enhanced_analysis_stats"]["avg_validity_score"] == 0
+
+
+@pytest.fixture
+def hq_engine(sqlite_engine, use_engine, monkeypatch):
+    """본부 2개를 시드하고 팀장 수정분만큼 모듈7 점수를 낮춰 모든 CL에 조정이 필요하게 만든 DB (LLM은 Fallback)"""
+    create_schema(sqlite_engine)
+    seed_headquarter(sqlite_engine, headquarter_id=1)
+    seed_headquarter(sqlite_engine, headquarter_id=2)
+    with sqlite_engine.begin() as connection:
+        connection.execute(text("UPDATE final_evaluation_reports SET score = score - 0.3"))
+    use_engine(sqlite_engine, module9_db)
+    monkeypatch.setattr(module9, "call_enhanced_supervisor_llm",
+                        lambda supervisor_input, retry_count=0: {"success": False, "error": "LLM 미사용"})
+    monkeypatch.setattr(module9, "analyze_task_evidence_consistency", lambda member: 0.7)
+    monkeypatch.setattr(module9, "analyze_peer_evaluation_consistency", lambda member: 0.6)
+    monkeypatch.setattr(module9.llm_gateway, "get_module_limit", lambda module=None: 4)
+    return sqlite_engine
+
+
+def _snapshot(engine):
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT emp_no, score, ranking, cl_reason FROM final_evaluation_reports ORDER BY emp_no"
+        )).fetchall()
+
+
+def test_dry_run_computes_adjustments_without_writing(hq_engine):
+    before = _snapshot(hq_engine)
+
+    with count_queries(hq_engine) as statements:
+        result = run9.run_multiple_headquarters_enhanced_module9_fixed([1, 2], period_id=4, dry_run=True)
+
+    assert result["total_success"] == 2
+    assert result["consolidated_summary"]["final_stats"]["adjusted_members"] > 0
+    assert result["ranking_update"] is None
+    assert statements and all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+    assert _snapshot(hq_engine) == before
+
+
+def test_ranking_runs_even_when_only_a_failed_headquarter_wrote_scores(monkeypatch):
+    # 본부 2는 점수 일부를 저장한 뒤 실패 - 합친 요약의 조정 인원은 0명이지만 순위는 갱신해야 한다
+    def workflow(headquarter_id, period_id, dry_run=False, skip_ranking=False):
+        assert skip_ranking
+        if headquarter_id == 2:
+            return {"success": False, "error": "중간 실패", "total_processed": 0, "total_failed": 0}
+        report = _summary_report(headquarter_id, 0, analyzed_cls=0, avg_validity=0, distribution={})
+        return {"success": True, "enhanced_summary_report": report, "total_processed": 0, "total_failed": 0}
+
+    ranking_calls = []
+    monkeypatch.setattr(run9, "run_enhanced_module9_workflow_fixed", workflow)
+    monkeypatch.setattr(run9, "update_team_rankings",
+                        lambda period_id: ranking_calls.append(period_id) or {"success_count": 2, "total_teams": 2})
+
+    result = run9.run_multiple_headquarters_enhanced_module9_fixed([1, 2], period_id=4)
+
+    assert result["consolidated_summary"]["final_stats"]["adjusted_members"] == 0
+    assert ranking_calls == [4]
+    assert result["ranking_update"] == {"success_count": 2, "total_teams": 2}
+
+    ranking_calls.clear()
+    run9.run_multiple_headquarters_enhanced_module9_fixed([1, 2], period_id=4, dry_run=True)
+    assert ranking_calls == []
+
+
+def test_cl_supervisor_ranks_after_a_failed_cl(monkeypatch):
+    department_data = {
+        "CL1": {"surplus": 0.0, "needs_adjustment": False},
+        "CL2": {"surplus": 1.2, "needs_adjustment": True},
+    }
+
+    def failing_supervisor(cl_group, *args):
+        raise RuntimeError("점수 저장 중 연결 끊김")
+
+    ranking_calls = []
+    monkeypatch.setattr(module9, "execute_cl_supervisor", failing_supervisor)
+    monkeypatch.setattr(module9, "update_team_rankings",
+                        lambda period_id: ranking_calls.append(period_id) or {"success_count": 1, "total_teams": 1})
+    state = {"department_data": department_data, "enhanced_analysis": {}, "headquarter_id": 1, "period_id": 4,
+             "messages": [], "error_logs": []}
+
+    result = module9.cl_supervisor_execution_submodule(state)
+
+    assert result["supervisor_results"]["CL2"]["success"] is False
+    assert result["supervisor_results"]["CL1"]["adjustments_made"] == 0
+    assert ranking_calls == [4]
+
+    for flags in ({"dry_run": True}, {"skip_ranking": True}):
+        module9.cl_supervisor_execution_submodule({**state, **flags})
+    assert ranking_calls == [4]
+
+
+@pytest.mark.parametrize("teams, members_per_team", [(1, 3), (4, 9)])
+def test_fetch_headquarter_members_bulk_uses_constant_query_count(sqlite_engine, use_engine, teams, members_per_team):
+    create_schema(sqlite_engine)
+    seed_headquarter(sqlite_engine, headquarter_id=1, teams=teams, members_per_team=members_per_team)
+    use_engine(sqlite_engine, module9_db)
+
+    with count_queries(sqlite_engine) as statements:
+        members_by_cl = module9_db.fetch_headquarter_members_bulk(1, 4)
+
+    assert sum(len(members) for members in members_by_cl.values()) == teams * members_per_team
+    assert len(statements) == 3
+
+
+@pytest.mark.parametrize("period_id", [2, 4])
+def test_fetch_headquarter_members_bulk_matches_per_member_queries(sqlite_engine, use_engine, period_id):
+    # 분기(feedback_reports)와 연말(final_evaluation_reports) 동료평가 경로 모두, 다른 본부 데이터가 섞이지 않는지 함께 확인
+    create_schema(sqlite_engine)
+    seed_headquarter(sqlite_engine, headquarter_id=1, teams=3, members_per_team=7, period_id=period_id, tasks_per_member=3)
+    seed_headquarter(sqlite_engine, headquarter_id=2, teams=1, members_per_team=4, period_id=period_id, seed=1)
+    use_engine(sqlite_engine, module9_db)
+
+    members_by_cl = module9_db.fetch_headquarter_members_bulk(1, period_id)
+
+    cl_groups = module9_db.get_all_cl_groups_in_headquarter(1, period_id)
+    assert sorted(members_by_cl) == sorted(cl_groups) == ["CL1", "CL2", "CL3"]
+    for cl_group in cl_groups:
+        expected = module9_db.fetch_headquarter_cl_members_enhanced(1, cl_group, period_id)
+        assert members_by_cl[cl_group] == expected
+        for member in expected:
+            assert member["task_data"] == module9_db.fetch_member_task_data(member["emp_no"], period_id)
+            assert member["peer_evaluation_data"] == module9_db.fetch_member_peer_evaluation_data(
+                member["emp_no"], member["team_evaluation_id"], period_id
+            )
+    assert any(member["peer_evaluation_data"]["strengths"] for members in members_by_cl.values() for member in members)
+    assert all(member["emp_no"].startswith("H1") for members in members_by_cl.values() for member in members)
+
+
+@pytest.fixture
+def ranking_engine(sqlite_engine, use_engine):
+    """4분기: 팀 10은 4.5 / 4.0 / 4.0 / 3.0 / 점수 없음, 팀 11은 2명. 3분기 본부 2는 순위를 건드리면 안 됨"""
+    create_schema(sqlite_engine)
+    seed_headquarter(sqlite_engine, headquarter_id=1, teams=2, members_per_team=5, period_id=4)
+    seed_headquarter(sqlite_engine, headquarter_id=2, teams=1, members_per_team=3, period_id=3)
+    scores = {"H1T10M00": 4.5, "H1T10M01": 4.0, "H1T10M02": 4.0, "H1T10M03": 3.0, "H1T10M04": None,
+              "H1T11M00": 2.0, "H1T11M01": 3.5, "H1T11M02": None, "H1T11M03": None, "H1T11M04": None}
+    with sqlite_engine.begin() as connection:
+        for emp_no, score in scores.items():
+            connection.execute(text("UPDATE final_evaluation_reports SET score = :score WHERE emp_no = :emp_no"),
+                               {"score": score, "emp_no": emp_no})
+        connection.execute(text("UPDATE final_evaluation_reports SET ranking = 99 WHERE emp_no = 'H1T10M04'"))
+    use_engine(sqlite_engine, module9_db)
+    return sqlite_engine
+
+
+def _rankings(engine):
+    with engine.connect() as connection:
+        return dict(connection.execute(text("SELECT emp_no, ranking FROM final_evaluation_reports")).fetchall())
+
+
+def _assert_team_rankings(rankings):
+    assert [rankings[f"H1T10M0{i}"] for i in range(5)] == [1, 2, 2, 4, None]
+    assert (rankings["H1T11M01"], rankings["H1T11M00"], rankings["H1T11M02"]) == (1, 2, None)
+    assert {rankings[f"H2T20M0{i}"] for i in range(3)} == {None}
+
+
+def test_update_team_rankings_window_statement(ranking_engine):
+    result = module9_db.update_team_rankings(4)
+
+    assert result["method"] == "window"
+    assert (result["success_count"], result["total_teams"]) == (2, 2)
+    _assert_team_rankings(_rankings(ranking_engine))
+
+
+def test_update_team_rankings_python_fallback(ranking_engine, monkeypatch):
+    def unsupported(connection, period_id):
+        raise RuntimeError("window function UPDATE not supported")
+
+    monkeypatch.setattr(module9_db, "_update_team_rankings_window", unsupported)
+
+    result = module9_db.update_team_rankings(4)
+
+    assert result["method"] == "python"
+    assert (result["success_count"], result["total_teams"]) == (2, 2)
+    _assert_team_rankings(_rankings(ranking_engine))
@@ -0,0 +1,49 @@
+import pytest
+
+from agents.workflow import annual_phase1_workflow, quarterly_evaluation_workflow
+from agents.workflow.parallel_executor import TeamModuleStep, build_step_stages
+
+
+def _stage_names(steps):
+    return [sorted(step.name for step in stage) for stage in build_step_stages(steps)]
+
+
+def test_build_step_stages_groups_independent_steps():
+    noop = lambda team_id, period_id: True
+    steps = [
+        TeamModuleStep("module2", noop),
+        TeamModuleStep("module3", noop, depends_on=["module2"]),
+        TeamModuleStep("module4", noop, depends_on=["module2"]),
+        TeamModuleStep("module6", noop, depends_on=["module3", "module4"]),
+    ]
+    assert _stage_names(steps) == [["module2"], ["module3", "module4"], ["module6"]]
+
+    with pytest.raises(ValueError):
+        build_step_stages([TeamModuleStep("module6", noop, depends_on=["module5"])])
+    with pytest.raises(ValueError):
+        build_step_stages([TeamModuleStep("a", noop, depends_on=["b"]), TeamModuleStep("b", noop, depends_on=["a"])])
+
+
+class RecordingExecutor:
+    """TeamParallelExecutor 대신 Phase1에 넘겨진 모듈 목록만 기록"""
+    steps = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def run(self, teams, period_id, steps, **kwargs):
+        RecordingExecutor.steps = steps
+        return {}
+
+
+@pytest.mark.parametrize("workflow, expected", [
+    (quarterly_evaluation_workflow, [["module2"], ["module3", "module4"], ["module6"]]),
+    (annual_phase1_workflow, [["module2"], ["module3", "module4"], ["module6"], ["module7"]]),
+])
+def test_phase1_runs_module6_after_peer_talk_and_collaboration(monkeypatch, workflow, expected):
+    # 모듈6은 모듈3(동료평가 요약)과 모듈4(협업 매트릭스)의 결과를 읽으므로 같은 단계에서 실행되면 안 된다
+    monkeypatch.setattr(workflow, "TeamParallelExecutor", RecordingExecutor)
+
+    workflow.run_phase1_all_teams([1], 4)
+
+    assert _stage_names(RecordingExecutor.steps) == expected
@@ -0,0 +1,177 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from agents.chatbot import session_store
+from agents.chatbot.agent import SessionManager
+from agents.chatbot.session_store import (
+    InMemorySessionStore, SessionStore, SQLiteSessionStore, compact_history,
+)
+from migrations import apply_migrations
+from tests.synthetic_db import count_queries
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store.time, "time", clock)
+    return clock
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = InMemorySessionStore(max_sessions=2)
+    store.save("a", {"n": 1})
+    store.save("b", {"n": 2})
+    assert store.get("a") == {"n": 1}  # a가 최근 사용됨
+    store.save("c", {"n": 3})
+    assert store.get("b") is None
+    assert store.get("a") and store.get("c")
+    assert store.stats()["sessions"] == 2
+
+
+def test_memory_store_expires_after_ttl(clock):
+    store = InMemorySessionStore(ttl_seconds=60)
+    store.save("a", {"n": 1})
+    store.save("b", {"n": 2})
+    clock.now += 30
+    store.save("b", {"n": 3})  # 저장하면 갱신 시각도 바뀜
+    clock.now += 45
+    assert store.get("a") is None
+    assert store.get("b") == {"n": 3}
+    clock.now += 61
+    assert store.purge_expired() == 1
+    assert store.stats()["sessions"] == 0
+
+
+def test_sqlite_store_expires_and_purges(tmp_path, clock):
+    path = str(tmp_path / "sessions.sqlite")
+    store = SQLiteSessionStore(path, ttl_seconds=60)
+    store.save("a", {"log": ["사용자: 안녕"]})
+    assert SQLiteSessionStore(path, ttl_seconds=60).get("a") == {"log": ["사용자: 안녕"]}
+
+    clock.now += 61
+    assert store.get("a") is None
+    assert store.purge_expired() == 1
+    assert store.stats()["sessions"] == 0
+
+
+def _count_tokens(text):
+    return len(text.split())
+
+
+def test_compact_history_keeps_recent_messages():
+    log = [f"메시지 {i}" for i in range(10)]
+    recent, summary = compact_history(log, "", token_budget=10, keep_recent=4, count_tokens=_count_tokens,
+                                      summarize=lambda previous, older: f"요약 {len(older)}개")
+    assert recent == log[6:] and summary == "요약 6개"
+
+    # 예산 이내이면 그대로, 요약 실패 시 원본 유지
+    assert compact_history(log[:3], "", 10, 4, _count_tokens, None) == (log[:3], "")
+
+    def failing(previous, older):
+        raise RuntimeError("LLM 오류")
+    assert compact_history(log, "", 10, 4, _count_tokens, failing) == (log, "")
+
+
+def _manager(summarize, token_budget=10, keep_recent=2):
+    manager = SessionManager(store=InMemorySessionStore(), count_tokens=_count_tokens, summarize=summarize)
+    manager.settings = SimpleNamespace(SESSION_TOKEN_BUDGET=token_budget, SESSION_KEEP_RECENT=keep_recent)
+    return manager
+
+
+def _state(messages, summary=""):
+    return {"qna_dialog_log": list(messages), "dialog_log": [], "history_summary": summary}
+
+
+def test_compaction_runs_in_background():
+    release = threading.Event()
+
+    def summarize(previous, older):
+        release.wait(5)
+        return f"{previous} + {len(older)}개 요약".strip(" +")
+
+    manager = _manager(summarize)
+    messages = [f"사용자: 질문 {i} 입니다" for i in range(6)]
+    manager.save_session_state("E001", "default", _state(messages))
+
+    # 요약이 끝나기 전에도 저장은 끝나 있고 원본이 그대로 보인다
+    assert manager.get_session_state("E001", "default")["qna_dialog_log"] == messages
+
+    release.set()
+    manager.wait_for_compactions(5)
+    saved = manager.get_session_state("E001", "default")
+    assert saved["qna_dialog_log"] == messages[-2:]
+    assert saved["history_summary"] == "4개 요약"
+
+
+def test_turns_saved_during_compaction_are_kept():
+    started, release = threading.Event(), threading.Event()
+
+    summarized = []
+
+    def summarize(previous, older):
+        summarized.append(older)
+        started.set()
+        release.wait(5)
+        return "이전 대화 요약"
+
+    manager = _manager(summarize)
+    messages = [f"사용자: 질문 {i} 입니다" for i in range(6)]
+    manager.save_session_state("E001", "default", _state(messages))
+    assert started.wait(5)
+
+    # 압축 중에 다음 턴 저장
+    newer = messages + ["챗봇: 새 응답 입니다"]
+    manager.save_session_state("E001", "default", _state(newer))
+    release.set()
+    manager.wait_for_compactions(5)
+
+    manager.wait_for_compactions(5)  # 압축 중 저장된 턴 기준 재확인
+
+    saved = manager.get_session_state("E001", "default")
+    assert saved["history_summary"] == "이전 대화 요약"
+    assert saved["qna_dialog_log"] == newer[-2:]
+    assert summarized[-1] == newer[4:5]  # 두 번째 압축은 첫 압축 뒤 남은 메시지만 요약
+
+
+def test_compaction_is_skipped_when_session_was_cleared():
+    release = threading.Event()
+    manager = _manager(lambda previous, older: release.wait(5) and "요약")
+    manager.save_session_state("E001", "default", _state([f"메시지 {i} 입니다" for i in range(6)]))
+    manager.clear_session("E001", "default")
+    release.set()
+    manager.wait_for_compactions(5)
+    assert manager.get_session_state("E001", "default") == {}
+
+
+def test_mariadb_store_uses_migrated_table_and_never_creates_it(sqlite_engine, use_engine, caplog):
+    use_engine(sqlite_engine)
+    settings = SimpleNamespace(SESSION_BACKEND="mariadb", SESSION_TTL_SECONDS=0, SESSION_MAX=10, SESSION_DB_PATH=None)
+
+    # 마이그레이션 전 - 테이블을 만들지 않고 경고 후 메모리 저장소로 대체
+    with count_queries(sqlite_engine) as statements:
+        store = session_store.create_session_store(settings)
+    assert isinstance(store, InMemorySessionStore)
+    assert not any("CREATE" in statement.upper() for statement in statements)
+    assert any(session_store.SESSION_TABLE in record.getMessage() for record in caplog.records)
+
+    assert "004_create_chatbot_sessions.sql" in apply_migrations(sqlite_engine)
+    with count_queries(sqlite_engine) as statements:
+        store = session_store.create_session_store(settings)
+    assert isinstance(store, session_store.MariaDBSessionStore)
+    assert not any("CREATE" in statement.upper() for statement in statements)
+    assert store.get("240001_default") is None
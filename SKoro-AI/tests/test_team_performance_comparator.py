@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+from agents.evaluation.modules.module_08_team_comparision import agent as module8_agent
+from shared.team_performance_comparator import TeamPerformanceComparator
+
+
+class RecordingPerformanceDB:
+    """TeamPerformanceDB와 같은 메서드를 제공하고 호출 횟수를 기록하는 메모리 DB"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def fetch_all_team_kpis(self):
+        self.calls["fetch_all_team_kpis"] += 1
+        return [
+            {"team_kpi_id": 1, "team_id": 1, "kpi_name": "매출 성장", "kpi_description": "고객 매출",
+             "team_name": "영업1팀", "headquarter_name": "영업본부"},
+            {"team_kpi_id": 2, "team_id": 2, "kpi_name": "매출 성장", "kpi_description": "신규 고객",
+             "team_name": "영업2팀", "headquarter_name": "영업본부"},
+        ]
+
+    def fetch_period_team_performances(self, period_id):
+        self.calls["fetch_period_team_performances"] += 1
+        return {
+            1: {"team_id": 1, "team_name": "영업1팀", "overall_rate": 90.0},
+            2: {"team_id": 2, "team_name": "영업2팀", "overall_rate": 70.0},
+        }
+
+    def fetch_task_summaries_signature(self, period_id):
+        self.calls["fetch_task_summaries_signature"] += 1
+        return {"row_count": 10, "checksum": 12345}
+
+
+@pytest.fixture
+def comparator(tmp_path):
+    comparator = TeamPerformanceComparator(cache_dir=str(tmp_path))
+    comparator.stats_manager.db = RecordingPerformanceDB()
+    return comparator
+
+
+def test_source_versions_are_computed_once_per_period_run(comparator):
+    db = comparator.stats_manager.db
+    source_versions = comparator.get_source_versions(2)
+
+    for team_id in (1, 2, 1, 2):
+        assert comparator.get_cluster_status(2, source_versions)
+        result = comparator.analyze_team_cluster_performance(team_id, 2, source_versions=source_versions)
+        assert result["success"]
+
+    assert db.calls["fetch_all_team_kpis"] == 1
+    assert db.calls["fetch_task_summaries_signature"] == 1
+    # 통계 계산(최초 1회)에서만 추가로 팀 성과를 읽는다
+    assert db.calls["fetch_period_team_performances"] == 2
+    assert comparator.get_cluster_status(2, source_versions)["is_current"]
+    assert comparator.stats_manager.check_stats_exists(2, source_versions)
+
+
+def test_stats_are_recomputed_when_source_versions_change(comparator):
+    first = comparator.get_source_versions(2)
+    comparator.analyze_team_cluster_performance(1, 2, source_versions=first)
+    changed = first._replace(stats_version="changed")
+
+    assert not comparator.stats_manager.check_stats_exists(2, changed)
+    comparator.analyze_team_cluster_performance(1, 2, source_versions=changed)
+    assert comparator.get_cluster_status(2, changed)["is_current"]
+
+
+def test_module8_check_submodule_shares_versions_with_next_step(comparator, monkeypatch):
+    monkeypatch.setattr(module8_agent, "get_team_performance_comparator", lambda: comparator)
+    db = comparator.stats_manager.db
+
+    state = module8_agent.check_cluster_stats_submodule({"team_id": 1, "period_id": 2, "messages": []})
+    state = module8_agent.calculate_cluster_stats_submodule(state)
+
+    assert state["similar_teams"] == [2]
+    assert db.calls["fetch_all_team_kpis"] == 1
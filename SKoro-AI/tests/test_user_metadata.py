@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import text
+
+from agents.chatbot.user_metadata import UserMetadataCache
+from migrations import apply_migrations
+from tests.synthetic_db import count_queries, create_schema, insert_rows
+
+
+def _execute(engine, statement, params=None):
+    with engine.begin() as connection:
+        connection.execute(text(statement), params or {})
+
+
+@pytest.fixture
+def hr_db(sqlite_engine, use_engine):
+    use_engine(sqlite_engine)
+    create_schema(sqlite_engine)
+    insert_rows(sqlite_engine, "teams", [{"team_id": 10, "team_name": "영업1팀", "headquarter_id": 1},
+                                         {"team_id": 20, "team_name": "영업2팀", "headquarter_id": 1}])
+    insert_rows(sqlite_engine, "employees", [
+        {"emp_no": "E1", "emp_name": "가", "cl": 2, "position": "사원", "role": "MEMBER", "team_id": 10},
+        {"emp_no": "E2", "emp_name": "나", "cl": 3, "position": "팀장", "role": "MANAGER", "team_id": 10},
+        {"emp_no": "E3", "emp_name": "다", "cl": 1, "position": "사원", "role": "MEMBER", "team_id": 20},
+    ])
+    return sqlite_engine
+
+
+def _workers(count=2):
+    """같은 DB를 보는 서로 다른 프로세스의 캐시"""
+    caches = [UserMetadataCache(ttl_seconds=0, sync_seconds=0) for _ in range(count)]
+    for cache in caches:
+        cache.preload()
+    return caches
+
+
+def test_team_move_invalidated_by_old_team_reaches_other_workers(hr_db):
+    apply_migrations(hr_db)
+    api_worker, chat_worker = _workers()
+    assert chat_worker.get("E1")["team_id"] == 10
+
+    _execute(hr_db, "UPDATE employees SET team_id = 20 WHERE emp_no = 'E1'")
+    # 옛 팀으로 무효화 - DB에서는 더 이상 10팀 소속이 아니지만 캐시에 남은 팀 정보로 E1을 찾는다
+    assert api_worker.invalidate(team_ids=[10]) == 2
+
+    assert chat_worker.get("E1")["team_id"] == 20
+    assert chat_worker.get("E3")["team_id"] == 20
+    assert chat_worker.stats()["misses"] == 1  # E1만 다시 조회
+
+
+def test_team_move_invalidated_by_new_team(hr_db):
+    apply_migrations(hr_db)
+    api_worker, chat_worker = _workers()
+    _execute(hr_db, "UPDATE employees SET team_id = 20, role = 'MANAGER' WHERE emp_no = 'E1'")
+
+    api_worker.invalidate(team_ids=[20])  # DB 기준 새 팀원(E1 포함)
+    assert chat_worker.get("E1") == {"emp_no": "E1", "role": "MANAGER", "team_id": 20, "team_name": "영업2팀"}
+
+
+def test_invalidate_by_emp_no_and_all(hr_db):
+    apply_migrations(hr_db)
+    api_worker, chat_worker = _workers()
+    _execute(hr_db, "UPDATE employees SET role = 'MANAGER' WHERE emp_no = 'E3'")
+    api_worker.invalidate(emp_nos=["E3"])
+    assert chat_worker.get("E3")["role"] == "MANAGER"
+    assert chat_worker.get("E1")["role"] == "MEMBER"
+
+    api_worker.invalidate()
+    chat_worker.sync_invalidations(force=True)
+    assert chat_worker.stats()["entries"] == 0
+
+
+def test_invalidation_check_is_rate_limited(hr_db):
+    apply_migrations(hr_db)
+    cache = UserMetadataCache(ttl_seconds=0, sync_seconds=60)
+    cache.preload()
+    with count_queries(hr_db) as statements:
+        for _ in range(20):
+            cache.get("E1")
+    assert statements == []
+
+
+def test_without_migration_invalidation_stays_local(hr_db):
+    api_worker, chat_worker = _workers()
+    _execute(hr_db, "UPDATE employees SET role = 'MANAGER' WHERE emp_no = 'E1'")
+    assert api_worker.invalidate(emp_nos=["E1"]) == 1
+    assert api_worker.get("E1")["role"] == "MANAGER"
+    assert chat_worker.get("E1")["role"] == "MEMBER"
+    assert not chat_worker.stats()["shared_invalidation"]
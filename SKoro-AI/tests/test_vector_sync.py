@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("faiss")
+
+from agents.chatbot.local_vector_store import LocalVectorIndex
+from agents.chatbot.vector_sync import MANIFEST_TABLE, ReportVectorSync
+from migrations import apply_migrations
+from tests.synthetic_db import create_schema, insert_rows, seed_headquarter
+
+PERIOD_ID = 2
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0, float(sum(map(ord, text)) % 97)] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def _execute(engine, statement, params=None):
+    with engine.begin() as connection:
+        connection.execute(text(statement), params or {})
+
+
+@pytest.fixture
+def report_db(sqlite_engine, use_engine):
+    use_engine(sqlite_engine)
+    create_schema(sqlite_engine)
+    apply_migrations(sqlite_engine)
+    seeded = seed_headquarter(sqlite_engine, teams=2, members_per_team=3, period_id=PERIOD_ID)
+    for team_id in seeded["team_ids"]:
+        _execute(sqlite_engine, "UPDATE employees SET role = 'MANAGER' WHERE emp_no = :emp_no",
+                 {"emp_no": f"H1T{team_id}M00"})
+        _execute(sqlite_engine, "UPDATE team_evaluations SET report = :report WHERE team_id = :team_id",
+                 {"report": json.dumps({"팀 요약": f"팀 {team_id} 성과"}, ensure_ascii=False), "team_id": team_id})
+    _execute(sqlite_engine, "UPDATE feedback_reports SET report = '{\"성과 요약\": \"' || emp_no || ' 성과\"}'")
+    return sqlite_engine, seeded
+
+
+@pytest.fixture
+def sync(report_db, tmp_path):
+    return ReportVectorSync(index=LocalVectorIndex(str(tmp_path / "reports")), embedding_model=FakeEmbeddings(),
+                            index_name="test:reports")
+
+
+def _ids(index):
+    return sorted(doc_id for ids in index.list() for doc_id in ids)
+
+
+def test_manifest_table_comes_from_migrations(sync):
+    assert sync.available
+
+
+def test_sync_is_incremental_and_manifest_is_portable(sync, report_db):
+    engine, seeded = report_db
+    first = sync.sync(PERIOD_ID)
+    assert first["upserted"] == first["built"] == 8  # 개인 6 + 팀 2
+    assert "H1T10M01_individual_p2_0" in _ids(sync.index)
+
+    second = sync.sync(PERIOD_ID)
+    assert (second["upserted"], second["unchanged"], second["deleted"]) == (0, 8, 0)
+
+    _execute(engine, "UPDATE feedback_reports SET report = '{\"성과 요약\": \"변경\"}' WHERE emp_no = 'H1T10M01'")
+    _execute(engine, "UPDATE feedback_reports SET report = NULL WHERE emp_no = 'H1T10M02'")
+    third = sync.sync(PERIOD_ID, [10])
+    assert (third["upserted"], third["deleted"]) == (1, 1)
+    assert "H1T10M02_individual_p2_0" not in _ids(sync.index)
+    with engine.connect() as connection:
+        assert connection.execute(text(f"SELECT COUNT(*) FROM {MANIFEST_TABLE}")).scalar() == 7
+
+
+def test_migrate_legacy_ids_replaces_old_scheme(sync):
+    sync.index.upsert([
+        {"id": "H1T10M01_individual_0", "values": [1.0, 0.0, 0.0], "metadata": {"accessible_by": ["H1T10M01"]}},
+        {"id": "H1T10M00_team_0", "values": [0.0, 1.0, 0.0], "metadata": {"accessible_by": ["H1T10M00"]}},
+    ])
+    sync.index.save()
+
+    dry = sync.migrate_legacy_ids(dry_run=True)
+    assert dry["legacy_deleted"] == 2
+    assert "H1T10M01_individual_0" in _ids(sync.index)
+
+    result = sync.migrate_legacy_ids()
+    ids = _ids(sync.index)
+    assert result["legacy_deleted"] == 2
+    assert [period["period_id"] for period in result["periods"]] == [PERIOD_ID]
+    assert "H1T10M01_individual_0" not in ids and "H1T10M00_team_0" not in ids
+    assert "H1T10M01_individual_p2_0" in ids and "team10_team_p2_0" in ids
+
+
+def _add_other_period_doc(index):
+    index.upsert([{"id": "H1T10M01_individual_p1_0", "values": [1.0, 0.0, 0.0],
+                   "metadata": {"accessible_by": ["H1T10M01"], "period_id": 1}}])
+    index.save()
+
+
+def test_rebuild_of_one_period_keeps_other_periods(sync):
+    sync.sync(PERIOD_ID)
+    _add_other_period_doc(sync.index)
+
+    stats = sync.rebuild(PERIOD_ID)
+    ids = _ids(sync.index)
+    assert stats["upserted"] == stats["built"] == 8
+    assert "H1T10M01_individual_p1_0" in ids
+    assert len(ids) == 9
+
+
+def test_rebuild_without_period_rebuilds_every_period(sync):
+    sync.sync(PERIOD_ID)
+    _add_other_period_doc(sync.index)
+
+    result = sync.rebuild()
+    assert [stats["period_id"] for stats in result["periods"]] == [PERIOD_ID]
+    assert "H1T10M01_individual_p1_0" not in _ids(sync.index)
+    assert len(_ids(sync.index)) == 8
+
+
+def test_incremental_sync_builds_chunks_in_process(sync, monkeypatch):
+    from agents.chatbot import vector_sync
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("증분 동기화는 프로세스 풀을 쓰지 않아야 함")
+
+    monkeypatch.setattr(vector_sync, "PROCESS_POOL_MIN_TEAMS", 1)
+    monkeypatch.setattr(vector_sync, "ProcessPoolExecutor", no_pool)
+    assert sync.sync(PERIOD_ID)["built"] == 8